@@ -3,6 +3,9 @@
 # Purpose: Provides functionality to parse Cabrillo log files into a Pandas DataFrame
 #          and extract log metadata. It uses a ContestDefinition object to guide
 #          the parsing of contest-specific header fields and QSO exchange formats.
+#          QSO lines are collected in one pass over the file and parsed as a
+#          block with the contest's exchange rules compiled into one pattern;
+#          custom parsers reuse the same reader and block parser.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -21,6 +24,7 @@ import os
 import logging
 
 from .contest_definitions import ContestDefinition
+from .exchange_compiler import compile_exchange_rules
 
 # --- Internal Regex Definitions for QSO lines ---
 
@@ -76,60 +80,230 @@ def parse_qso_common_fields(qso_line: str) -> Optional[Dict[str, Any]]:
     return dict(zip(common_groups, common_match.groups()))
 
 
-def parse_cabrillo_file(filepath: str, contest_definition: ContestDefinition) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+# Both line formats in one pattern: the HF frequency is tried before the VHF+
+# band, as parse_qso_common_fields() tries QSO_REGEX_HF before QSO_REGEX_VHF.
+QSO_REGEX_BLOCK = re.compile(r'QSO:\s+(?:(\d{4,5})|([A-Z0-9.]+))\s+([A-Z]{2})\s+(\d{4}-\d{2}-\d{2})\s+(\d{4})\s+([A-Z0-9/]+)\s+(.*)')
+QSO_COMMON_COLUMNS = ["FrequencyRaw", "Band", "Mode", "DateRaw", "TimeRaw", "MyCallRaw"]
+
+# Status codes returned by parse_qso_block() for lines that yield no QSO
+QSO_MALFORMED = -2
+QSO_UNMATCHED = -1
+
+
+class CabrilloRecords:
     """
-    Parses a Cabrillo log file into a Pandas DataFrame of QSOs and extracts header metadata.
+    The content of a Cabrillo file after one pass over its lines.
+
+    metadata holds header values mapped through the contest definition's
+    header_field_map; header_tags holds the first value of every header tag
+    (e.g. 'CALLSIGN', 'CONTEST', 'CATEGORY-STATION') for parsers that select
+    exchange rules from the header. records maps each requested record tag
+    ('QSO:', 'QTC:', ...) to its upper-cased lines, and originals holds the
+    same lines as written, for warnings. X-QSO lines are kept under 'X-QSO:'.
     """
-    log_metadata: Dict[str, Any] = {}
-    qso_records: List[Dict[str, Any]] = []
-    
-    x_qso_count = 0
-    parser_error_count = [0]  # Use list for mutable reference
-    max_warnings = 5
+    def __init__(self, filepath: str, record_tags: Tuple[str, ...]):
+        self.filepath = filepath
+        self.metadata: Dict[str, Any] = {}
+        self.header_tags: Dict[str, str] = {}
+        self.records: Dict[str, List[str]] = {tag: [] for tag in record_tags + ('X-QSO:',)}
+        self.originals: Dict[str, List[str]] = {tag: [] for tag in record_tags + ('X-QSO:',)}
+
 
+def read_cabrillo_records(filepath: str, contest_definition: ContestDefinition,
+                          record_tags: Tuple[str, ...] = ('QSO:',),
+                          validate_callsign: bool = False) -> CabrilloRecords:
+    """
+    Reads a Cabrillo file and splits it into header metadata and record lines.
+    Lines after END-OF-LOG: are ignored. With validate_callsign, an invalid
+    CALLSIGN header raises ValueError (see _validate_header_callsign).
+    """
     try:
         with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
             lines = f.readlines()
     except Exception as e:
         raise ValueError(f"Error reading Cabrillo file {filepath}: {e}")
 
-    for i, line in enumerate(lines):
+    cabrillo = CabrilloRecords(filepath, record_tags)
+    header_field_map = contest_definition.header_field_map
+    for line in lines:
         cleaned_line = line.replace('\u00a0', ' ').strip()
-        line_to_process = cleaned_line.upper() if cleaned_line.upper().startswith('QSO:') else cleaned_line
-        
-        if not line_to_process:
+        if not cleaned_line:
             continue
-        elif line_to_process.startswith('END-OF-LOG:'):
+        if cleaned_line.startswith('END-OF-LOG:'):
             break
-        elif line_to_process.startswith('X-QSO:'):
-            if x_qso_count < max_warnings:
-                logging.warning(f"Ignoring X-QSO line in {os.path.basename(filepath)}: {cleaned_line}")
-                x_qso_count += 1
-            elif x_qso_count == max_warnings:
-                logging.warning(f"Additional X-QSO messages suppressed (max {max_warnings} shown)")
-                x_qso_count += 1
-            continue
-        elif line_to_process.startswith('QSO:'):
-            qso_data = _parse_qso_line(line_to_process, contest_definition, log_metadata, cleaned_line, filepath, parser_error_count, max_warnings)
-            if qso_data:
-                qso_data['RawQSO'] = line_to_process
-                qso_records.append(qso_data)
-        elif line_to_process.startswith('START-OF-LOG:'):
-            continue
-        else:
-            for cabrillo_tag, df_key in contest_definition.header_field_map.items():
-                if line_to_process.startswith(f"{cabrillo_tag}:"):
-                    value = line_to_process[len(f"{cabrillo_tag}:"):].strip()
+        upper_line = cleaned_line.upper()
+        tag = upper_line[:upper_line.find(':') + 1]
+        if tag in record_tags:
+            cabrillo.records[tag].append(upper_line)
+            cabrillo.originals[tag].append(cleaned_line)
+        elif cleaned_line.startswith('X-QSO:'):
+            cabrillo.records['X-QSO:'].append(cleaned_line)
+            cabrillo.originals['X-QSO:'].append(cleaned_line)
+        elif not cleaned_line.startswith('START-OF-LOG:'):
+            tag, separator, value = cleaned_line.partition(':')
+            if separator:
+                cabrillo.header_tags.setdefault(tag.strip().upper(), value.strip())
+            for cabrillo_tag, df_key in header_field_map.items():
+                if cleaned_line.startswith(f"{cabrillo_tag}:"):
+                    value = cleaned_line[len(f"{cabrillo_tag}:"):].strip()
                     # Validate CALLSIGN header field
-                    if df_key == 'MyCall':
+                    if validate_callsign and df_key == 'MyCall':
                         value = _validate_header_callsign(value)
-                    log_metadata[df_key] = value
+                    cabrillo.metadata[df_key] = value
                     break
+    return cabrillo
+
+
+def parse_qso_block(qso_lines: List[str], rules: Any) -> Tuple[List[Tuple[Any, ...]], List[int], List[str]]:
+    """
+    Parses a block of QSO lines with QSO_REGEX_BLOCK and the exchange rules
+    compiled into a single pattern (see exchange_compiler).
+
+    Returns (records, status, exchange_columns):
+    - records: one tuple per line with the QSO_COMMON_COLUMNS values followed
+      by the exchange group values (None for groups of the matching rule that
+      did not participate, NaN otherwise).
+    - status: the index of the matching rule, QSO_UNMATCHED or QSO_MALFORMED.
+    - exchange_columns: the exchange group names, in rule order.
+    """
+    plan = compile_exchange_rules(rules)
+    blank_common = (float('nan'),) * len(QSO_COMMON_COLUMNS)
+    common_rows = []
+    exchanges = []
+    is_malformed = []
+    match = QSO_REGEX_BLOCK.match
+    for line in qso_lines:
+        m = match(line)
+        if m is None:
+            common_rows.append(blank_common)
+            exchanges.append('')
+            is_malformed.append(True)
+            continue
+        frequency, band, mode, date, time, mycall, exchange_rest = m.groups()
+        common_rows.append((frequency if band is None else float('nan'),
+                            band if band is not None else float('nan'),
+                            mode, date, time, mycall))
+        exchanges.append(exchange_rest.strip())
+        is_malformed.append(False)
+
+    rule_index, exchange_values = plan.parse(exchanges)
+    records = [common + values for common, values in zip(common_rows, exchange_values)]
+    status = [QSO_MALFORMED if malformed else index for malformed, index in zip(is_malformed, rule_index)]
+    return records, status, plan.group_names
+
+
+def _record_columns(records: List[Tuple[Any, ...]], exchange_columns: List[str],
+                    status: List[int], rules: Any) -> Tuple[List[str], List[str]]:
+    """
+    Common and exchange columns that the kept records actually use, in the
+    order per-line record dicts would have produced: the first record's
+    line format, then the groups of the rules that matched.
+    """
+    first = records[0] if records else None
+    if first is not None and isinstance(first[1], str):
+        common = ['Band', 'Mode', 'DateRaw', 'TimeRaw', 'MyCallRaw', 'FrequencyRaw']
+    else:
+        common = ['FrequencyRaw', 'Mode', 'DateRaw', 'TimeRaw', 'MyCallRaw', 'Band']
+    has_hf = any(isinstance(record[0], str) for record in records)
+    has_vhf = any(isinstance(record[1], str) for record in records)
+    common = [c for c in common if (c != 'FrequencyRaw' or has_hf) and (c != 'Band' or has_vhf)]
+
+    plan = compile_exchange_rules(rules)
+    matched_groups = {name for index in set(status) if index >= 0 for name in plan.rules[index]['groups']}
+    return common, [name for name in exchange_columns if name in matched_groups]
 
-    if not qso_records:
+
+def parse_qso_records(cabrillo: CabrilloRecords, rules: Any, keep_unmatched: bool = False,
+                      unmatched_label: Optional[str] = None) -> pd.DataFrame:
+    """
+    Shared body of the custom parsers: parses the QSO lines of a Cabrillo
+    file with the given exchange rule(s), which the parser has selected
+    from the header or the logger's location.
+
+    Malformed lines are dropped. Lines whose exchange matches no rule are
+    dropped too, with a warning naming unmatched_label if one is given,
+    unless keep_unmatched is set. Returns the common fields, the exchange
+    groups of the matching rule (None where a group did not participate)
+    and RawQSO; values are not otherwise cleaned.
+    """
+    qso_lines = cabrillo.records.get('QSO:', [])
+    records, status, exchange_columns = parse_qso_block(qso_lines, rules)
+
+    keep = []
+    for line, code in zip(qso_lines, status):
+        if code == QSO_UNMATCHED and unmatched_label:
+            logging.warning(f"Skipping {unmatched_label} QSO line (unrecognized exchange): {line}")
+        keep.append(code >= 0 or (code == QSO_UNMATCHED and keep_unmatched))
+
+    kept = [record for record, flag in zip(records, keep) if flag]
+    kept_status = [code for code, flag in zip(status, keep) if flag]
+    common, exchange = _record_columns(kept, exchange_columns, kept_status, rules)
+    df = pd.DataFrame(kept, columns=QSO_COMMON_COLUMNS + exchange_columns)
+    df['RawQSO'] = [line for line, flag in zip(qso_lines, keep) if flag]
+    # The column of the other line format goes after RawQSO, as a record dict would add it
+    late = common[-1:] if common[-1] in ('FrequencyRaw', 'Band') else []
+    return df[common[:len(common) - len(late)] + exchange + ['RawQSO'] + late]
+
+
+def parse_cabrillo_file(filepath: str, contest_definition: ContestDefinition) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Parses a Cabrillo log file into a Pandas DataFrame of QSOs and extracts header metadata.
+    The exchange rules for the log's CONTEST are applied to all QSO lines at once.
+    """
+    max_warnings = 5
+    filename = os.path.basename(filepath)
+    cabrillo = read_cabrillo_records(filepath, contest_definition, validate_callsign=True)
+    log_metadata = cabrillo.metadata
+
+    for i, line in enumerate(cabrillo.records['X-QSO:']):
+        if i < max_warnings:
+            logging.warning(f"Ignoring X-QSO line in {filename}: {line}")
+        elif i == max_warnings:
+            logging.warning(f"Additional X-QSO messages suppressed (max {max_warnings} shown)")
+            break
+
+    contest_name = log_metadata.get('ContestName') or ''
+    rules_for_contest = contest_definition.exchange_parsing_rules.get(contest_name)
+    if not rules_for_contest:
+        base_contest_name = contest_name.rsplit('-', 1)[0]
+        rules_for_contest = contest_definition.exchange_parsing_rules.get(base_contest_name, [])
+
+    records, status, exchange_columns = parse_qso_block(cabrillo.records['QSO:'], rules_for_contest)
+
+    # Malformed and unmatched lines share one warning limit, in line order.
+    parser_error_count = 0
+    for original_line, code in zip(cabrillo.originals['QSO:'], status):
+        if code >= 0:
+            continue
+        if parser_error_count < max_warnings:
+            if code == QSO_MALFORMED:
+                logging.warning(f"Skipping malformed QSO line in {filename}: {original_line}")
+            else:
+                logging.warning(f"Skipping QSO line with unmatched exchange format in {filename}: {original_line}")
+        elif parser_error_count == max_warnings:
+            logging.warning(f"Additional parser error messages suppressed (max {max_warnings} shown)")
+        parser_error_count += 1
+
+    keep = [code >= 0 for code in status]
+    kept = [record for record, flag in zip(records, keep) if flag]
+    if not kept:
         raise ValueError(f"No valid QSO lines found in Cabrillo file: {filepath}")
-    
-    df = pd.DataFrame(qso_records)
+    kept_status = [code for code, flag in zip(status, keep) if flag]
+    common, exchange = _record_columns(kept, exchange_columns, kept_status, rules_for_contest)
+
+    # Same columns and column order as per-line record dicts: defaults
+    # (pd.NA when unset), new common fields, exchange groups, then metadata.
+    parsed = pd.DataFrame(kept, columns=QSO_COMMON_COLUMNS + exchange_columns)
+    default_columns = list(contest_definition.default_qso_columns)
+    df = pd.DataFrame(pd.NA, index=parsed.index, columns=default_columns, dtype=object)
+    for col in common + exchange:
+        values = parsed[col]
+        if col in exchange:
+            values = values.str.strip()
+        df[col] = values.where(values.notna(), pd.NA) if col in default_columns else values
+    for key, value in log_metadata.items():
+        df[key] = value
+    df['RawQSO'] = [line for line, flag in zip(cabrillo.records['QSO:'], keep) if flag]
     return df, log_metadata
 
 def _parse_qso_line(
@@ -191,7 +365,7 @@ def _parse_qso_line(
     # Try to match exchange pattern
     exchange_matched = False
     for rule_info in rules_for_contest:
-        exchange_match = re.match(rule_info['regex'], exchange_rest)
+        exchange_match = contest_definition.compiled_regex(rule_info['regex']).match(exchange_rest)
         if exchange_match:
             for i, group_name in enumerate(rule_info['groups']):
                 val = exchange_match.groups()[i]
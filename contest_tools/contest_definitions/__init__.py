@@ -2,7 +2,8 @@
 #
 # Purpose: Defines the ContestDefinition class, responsible for loading and managing
 #          contest-specific rules and mappings from JSON files. It handles merging
-#          common Cabrillo field definitions with contest-specific overrides.
+#          common Cabrillo field definitions with contest-specific overrides, and
+#          keeps a process-wide cache of loaded, read-only definitions.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -16,22 +17,94 @@
 
 import json
 import os
+import re
 import copy
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Dict, Any, Optional, List, Pattern, Tuple
 
 # --- Constants ---
 # Name of the common Cabrillo fields JSON file
 COMMON_CABRILLO_FIELDS_FILE = '_common_cabrillo_fields.json'
 
+_DEFINITIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class _FrozenDict(dict):
+    """A dict that rejects mutation. Copies (copy/deepcopy/pickle) are plain, mutable dicts."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Contest definitions are read-only; copy the value before modifying it.")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list):
+    """A list that rejects mutation. Copies (copy/deepcopy/pickle) are plain, mutable lists."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Contest definitions are read-only; copy the value before modifying it.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively converts dicts and lists to their read-only counterparts."""
+    if isinstance(value, dict):
+        return _FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(v) for v in value)
+    return value
+
+
+def _definition_path(name: str) -> str:
+    return os.path.join(_DEFINITIONS_DIR, f"{name.lower().replace('-', '_').replace(' ', '_')}.json")
+
+
+def _file_stamp(path: str) -> Optional[int]:
+    """Modification time of a file in ns, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+# Process-wide cache: contest name -> (file stamps the definition was built from, definition)
+_REGISTRY: Dict[str, Tuple[Tuple[Tuple[str, Optional[int]], ...], 'ContestDefinition']] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
 class ContestDefinition:
     """
     Manages and provides access to contest-specific rules and data mappings
     loaded from JSON configuration files. Handles merging common definitions
     with contest-specific overrides.
+
+    Instances returned by from_json() are shared across the process and are
+    read-only: their dicts and lists raise TypeError on modification.
     """
 
     def __init__(self, data: Dict[str, Any]):
         self._data = data
+        self._compiled_regexes: Dict[str, Pattern] = {}
 
     @classmethod
     def _deep_merge_dicts(cls, base: Dict, new: Dict) -> Dict:
@@ -46,27 +119,57 @@ class ContestDefinition:
     @classmethod
     def from_json(cls, contest_name: str) -> 'ContestDefinition':
         """
-        Loads a contest definition from JSON, handling both explicit inheritance
-        ("inherits_from") and implicit generic/specific file patterns.
+        Returns the contest definition for contest_name, handling both explicit
+        inheritance ("inherits_from") and implicit generic/specific file patterns.
+        Each definition is loaded, merged, validated and compiled once per
+        process; it is reloaded if any of its source files change on disk.
         """
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        
+        cached = _REGISTRY.get(contest_name)
+        if cached is not None:
+            stamps, definition = cached
+            if all(_file_stamp(path) == mtime for path, mtime in stamps):
+                return definition
+
+        with _REGISTRY_LOCK:
+            stamps, data = cls._load_merged(contest_name)
+            definition = cls(_freeze(data))
+            definition._compile_regexes()
+            _REGISTRY[contest_name] = (stamps, definition)
+            return definition
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drops all cached definitions, forcing the next from_json() calls to reload."""
+        with _REGISTRY_LOCK:
+            _REGISTRY.clear()
+
+    @classmethod
+    def _load_merged(cls, contest_name: str) -> Tuple[Tuple[Tuple[str, Optional[int]], ...], Dict[str, Any]]:
+        """
+        Reads and merges the JSON files for contest_name. Also returns the
+        stamps of every file consulted, including a specific file that was
+        looked for but missing, so adding it later invalidates the cache.
+        """
+        stamps: List[Tuple[str, Optional[int]]] = []
+
         def find_and_load(name: str) -> Optional[dict]:
             """Helper to attempt loading a JSON file by its base name."""
-            file_path = os.path.join(current_dir, f"{name.lower().replace('-', '_').replace(' ', '_')}.json")
+            file_path = _definition_path(name)
+            stamps.append((file_path, _file_stamp(file_path)))
             if os.path.exists(file_path):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     return json.load(f)
             return None
 
         # Load common fields first as the absolute base
-        common_file_path = os.path.join(current_dir, COMMON_CABRILLO_FIELDS_FILE)
+        common_file_path = os.path.join(_DEFINITIONS_DIR, COMMON_CABRILLO_FIELDS_FILE)
+        stamps.append((common_file_path, _file_stamp(common_file_path)))
         with open(common_file_path, 'r', encoding='utf-8') as f:
             base_data = json.load(f)
 
         # 1. Attempt to load the specific contest file (e.g., arrl_ss_cw.json)
         contest_data = find_and_load(contest_name)
-        
+
         # 2. If specific fails, attempt to load the generic file (e.g., arrl_ss.json)
         if contest_data is None:
             try:
@@ -77,7 +180,7 @@ class ContestDefinition:
 
         if contest_data is None:
             raise FileNotFoundError(f"No definition file found for '{contest_name}'")
-            
+
         # 3. Handle explicit inheritance if present
         if "inherits_from" in contest_data:
             parent_data = find_and_load(contest_data["inherits_from"])
@@ -86,7 +189,37 @@ class ContestDefinition:
                 contest_data = cls._deep_merge_dicts(parent_data, contest_data)
 
         merged_data = cls._deep_merge_dicts(base_data, contest_data)
-        return cls(merged_data)
+        return tuple(stamps), merged_data
+
+    def _compile_regexes(self) -> None:
+        """
+        Validates and precompiles every exchange parsing regex. Raises
+        ValueError for a rule without a regex, a regex that does not compile,
+        or a regex whose group count does not match its 'groups' list.
+        """
+        for rule_key, rules in self.exchange_parsing_rules.items():
+            for rule in (rules if isinstance(rules, list) else [rules]):
+                pattern = rule.get('regex') if isinstance(rule, dict) else None
+                if not pattern:
+                    raise ValueError(f"{self.contest_name}: exchange rule '{rule_key}' has no regex")
+                try:
+                    compiled = self.compiled_regex(pattern)
+                except re.error as e:
+                    raise ValueError(f"{self.contest_name}: exchange rule '{rule_key}' has an invalid regex: {e}") from e
+                groups = rule.get('groups', [])
+                if compiled.groups != len(groups):
+                    raise ValueError(
+                        f"{self.contest_name}: exchange rule '{rule_key}' regex has {compiled.groups} "
+                        f"groups but lists {len(groups)} group names"
+                    )
+
+    def compiled_regex(self, pattern: str) -> Pattern:
+        """Returns the compiled form of a regex from this definition, compiling it on first use."""
+        compiled = self._compiled_regexes.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern)
+            self._compiled_regexes[pattern] = compiled
+        return compiled
 
     @property
     def contest_name(self) -> str:
@@ -31,7 +31,7 @@ from .cabrillo_parser import parse_cabrillo_file
 from .contest_definitions import ContestDefinition
 from .core_annotations import CtyLookup, process_dataframe_for_cty_data, process_contest_log_for_run_s_p, BandAllocator
 from .core_annotations._core_utils import normalize_zone
-from .utils.profiler import profile_section, ProfileContext
+from .utils.profiler import profile_section, ProfileContext, add_counter
 
 class ContestLog:
     """
@@ -98,6 +98,9 @@ class ContestLog:
         if cabrillo_filepath:
             self._ingest_cabrillo_data(cabrillo_filepath)
         
+        self._resolve_own_location_type()
+
+    def _resolve_own_location_type(self):
         # Run a custom location resolver if defined for the contest.
         resolver_name = self.contest_definition.custom_location_resolver
         if resolver_name:
@@ -111,22 +114,15 @@ class ContestLog:
             # Fallback to old generic method for legacy asymmetric contests
             self._determine_own_location_type_legacy()
 
-    def _filter_by_contest_period(self, df: pd.DataFrame, is_qso_df: bool) -> pd.DataFrame:
+    @staticmethod
+    def contest_period_bounds(contest_definition: ContestDefinition, log_date: pd.Timestamp,
+                              mode: Optional[str] = None) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
         """
-        Filters a DataFrame (QSOs or QTCs) to include only records within the
-        contest's valid time period.
+        Returns the (start, end) UTC bounds of the contest period containing
+        log_date, or None if no period applies. 'mode' selects the NAQP event.
         """
-        if df.empty or 'Datetime' not in df.columns:
-            return df
-
-        df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce', utc=True)
-        df.dropna(subset=['Datetime'], inplace=True)
-        if df.empty:
-            return df
+        contest_name = contest_definition.contest_name
 
-        contest_name = self.contest_definition.contest_name
-        log_date = df['Datetime'].iloc[0]
-        
         DAY_NAME_TO_INT = {
             'MONDAY': 0, 'TUESDAY': 1, 'WEDNESDAY': 2, 'THURSDAY': 3,
             'FRIDAY': 4, 'SATURDAY': 5, 'SUNDAY': 6
@@ -134,7 +130,7 @@ class ContestLog:
 
         # --- Special Case: NAQP ---
         if contest_name.startswith("NAQP"):
-            mode_from_contest = df['Mode'].iloc[0]
+            mode_from_contest = mode
             month = log_date.month
             # (start_weekday, week_of_month [0-indexed], start_time_utc) Saturday is 5
             rules = {
@@ -149,17 +145,16 @@ class ContestLog:
             }
             rule = rules.get((mode_from_contest, month))
             if not rule:
-                logging.warning(f"No valid contest period rule found for NAQP-{mode_from_contest} in month {month}.")
-                return df # Return unfiltered
+                return None
             
             first_day_of_month = log_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             start_day = first_day_of_month + WeekOfMonth(week=rule[1], weekday=rule[0])
             start_time = pd.to_datetime(start_day.strftime('%Y-%m-%d') + ' ' + rule[2], utc=True)
             end_time = start_time + pd.Timedelta(hours=12) # NAQP is a 12-hour contest
         else:
-            period = self.contest_definition.contest_period
+            period = contest_definition.contest_period
             if not period:
-                return df # No period defined, return unfiltered
+                return None
 
             start_time_str = period['start_time']
             end_time_str = period['end_time']
@@ -175,6 +170,30 @@ class ContestLog:
             end_date = start_date + pd.to_timedelta(days_to_add, unit='d')
             end_time = pd.to_datetime(end_date.strftime('%Y-%m-%d') + ' ' + end_time_str, utc=True)
 
+        return start_time, end_time
+
+    def _filter_by_contest_period(self, df: pd.DataFrame, is_qso_df: bool) -> pd.DataFrame:
+        """
+        Filters a DataFrame (QSOs or QTCs) to include only records within the
+        contest's valid time period.
+        """
+        if df.empty or 'Datetime' not in df.columns:
+            return df
+
+        df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce', utc=True)
+        df.dropna(subset=['Datetime'], inplace=True)
+        if df.empty:
+            return df
+
+        contest_name = self.contest_definition.contest_name
+        mode = df['Mode'].iloc[0] if 'Mode' in df.columns else None
+        bounds = self.contest_period_bounds(self.contest_definition, df['Datetime'].iloc[0], mode)
+        if bounds is None:
+            if contest_name.startswith("NAQP"):
+                logging.warning(f"No valid contest period rule found for NAQP-{mode} in month {df['Datetime'].iloc[0].month}.")
+            return df # No period defined, return unfiltered
+        start_time, end_time = bounds
+
         initial_count = len(df)
         # Use < end_time for an exclusive upper bound, which is standard for time ranges.
         df_filtered = df[(df['Datetime'] >= start_time) & (df['Datetime'] < end_time)].copy()
@@ -192,7 +211,7 @@ class ContestLog:
             
         return df_filtered
 
-    @profile_section("Cabrillo Data Ingestion")
+    @profile_section("Cabrillo Data Ingestion", 'parse')
     def _ingest_cabrillo_data(self, cabrillo_filepath: str):
         custom_parser_name = self.contest_definition.custom_parser_module
         if custom_parser_name:
@@ -200,7 +219,8 @@ class ContestLog:
                 parser_module = importlib.import_module(f"contest_tools.contest_specific_annotations.{custom_parser_name}")
                 
                 # The custom parser's return signature determines how we unpack
-                parser_output = parser_module.parse_log(cabrillo_filepath, self.contest_definition, self.root_input_dir, self.cty_dat_path)
+                parser_output = parser_module.parse_log(cabrillo_filepath, self.contest_definition, self.root_input_dir, self.cty_dat_path,
+                                                        shared_cty_lookup=self._shared_cty_lookup)
                 
                 if len(parser_output) == 3:
                     raw_df, self.qtcs_df, metadata = parser_output
@@ -220,6 +240,7 @@ class ContestLog:
         metadata.pop('ContestName', None)
         
         self.metadata.update(metadata)
+        add_counter('rows', len(raw_df))
         
         if raw_df.empty:
             self.qsos_df = pd.DataFrame(columns=self.contest_definition.default_qso_columns)
@@ -471,25 +492,30 @@ class ContestLog:
             if col in self.qsos_df.columns:
                 self.qsos_df[col] = self.qsos_df[col].astype('object')
 
+        add_counter('rows', len(self.qsos_df))
         try:
-            logging.info("Applying Run/S&P annotation...")
-            self.qsos_df = process_contest_log_for_run_s_p(self.qsos_df)
-            logging.info("Run/S&P annotation complete.")
+            with ProfileContext("Run/S&P Annotation", 'annotation'):
+                logging.info("Applying Run/S&P annotation...")
+                self.qsos_df = process_contest_log_for_run_s_p(self.qsos_df)
+                logging.info("Run/S&P annotation complete.")
         except Exception as e:
             logging.error(f"Error during Run/S&P annotation: {e}. Skipping.")
 
         try:
-            logging.info("Applying Universal DXCC/Zone lookup...")
-            # Use shared CTY lookup if available (performance optimization)
-            self.qsos_df = process_dataframe_for_cty_data(self.qsos_df, self.cty_dat_path, shared_cty_lookup=self._shared_cty_lookup)
-            logging.info("Universal DXCC/Zone lookup complete.")
+            with ProfileContext("DXCC/Zone Lookup", 'annotation'):
+                logging.info("Applying Universal DXCC/Zone lookup...")
+                # Use shared CTY lookup if available (performance optimization)
+                self.qsos_df = process_dataframe_for_cty_data(self.qsos_df, self.cty_dat_path, shared_cty_lookup=self._shared_cty_lookup)
+                logging.info("Universal DXCC/Zone lookup complete.")
         except Exception as e:
             logging.error(f"Error during Universal DXCC/Zone lookup: {e}. Skipping.")
         
-        self.apply_contest_specific_annotations()
+        with ProfileContext("Contest-Specific Annotation", 'annotation'):
+            self.apply_contest_specific_annotations()
         
         try:
-            self.metadata['OperatingTime'] = self._calculate_operating_time()
+            with ProfileContext("Operating Time", 'annotation'):
+                self.metadata['OperatingTime'] = self._calculate_operating_time()
         except Exception as e:
             logging.error(f"Error during on-time calculation: {e}. Skipping.")
         
@@ -530,12 +556,19 @@ class ContestLog:
 
     def apply_contest_specific_annotations(self):
         logging.info("Applying contest-specific annotations (Multipliers & Scoring)...")
+        self.qsos_df = self._annotate_contest_specific(self.qsos_df)
+
+    def _annotate_contest_specific(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Resolves multipliers and QSO points for the given QSO rows and returns them.
+        Used for the whole log here and for each batch of new QSOs in live mode.
+        """
         
         resolver_name = self.contest_definition.custom_multiplier_resolver
         if resolver_name:
             try:
                 resolver_module = importlib.import_module(f"contest_tools.contest_specific_annotations.{resolver_name}")
-                self.qsos_df = resolver_module.resolve_multipliers(self.qsos_df, self._my_location_type, self.root_input_dir, self.contest_definition)
+                df = resolver_module.resolve_multipliers(df, self._my_location_type, self.root_input_dir, self.contest_definition)
                 logging.info(f"Successfully applied '{resolver_name}' multiplier resolver.")
             except Exception as e:
                 logging.warning(f"Could not run '{resolver_name}' multiplier resolver: {e}")
@@ -558,7 +591,7 @@ class ContestLog:
  
                 if 'source_column' in rule:
                     source_col = rule.get('source_column')
-                    if source_col in self.qsos_df.columns:
+                    if source_col in df.columns:
                         # Check if this is a zone multiplier that needs normalization
                         rule_name = rule.get('name', '').lower()
                         is_zone_multiplier = 'zone' in rule_name.lower() or source_col.lower() == 'zone'
@@ -574,17 +607,17 @@ class ContestLog:
                                 zone_type = 'cq'
                             
                             # Normalize zone values to two-digit format
-                            self.qsos_df[dest_col] = self.qsos_df[source_col].apply(
+                            df[dest_col] = df[source_col].apply(
                                 lambda x: normalize_zone(x, zone_type=zone_type)
                             )
                         else:
                             # Not a zone multiplier, copy as-is
-                            self.qsos_df[dest_col] = self.qsos_df[source_col]
+                            df[dest_col] = df[source_col]
                         
                         if dest_name_col:
                             source_name_col = rule.get('source_name_column', f"{source_col}Name")
-                            if source_name_col in self.qsos_df.columns:
-                                self.qsos_df[dest_name_col] = self.qsos_df[source_name_col]
+                            if source_name_col in df.columns:
+                                df[dest_name_col] = df[source_name_col]
                             else:
                                 logging.warning(f"Name column '{source_name_col}' not found for source '{source_col}'.")
                     
@@ -592,14 +625,14 @@ class ContestLog:
                         logging.warning(f"Source column '{source_col}' not found for multiplier '{rule.get('name')}'.")
  
                 elif rule.get('source') == 'wae_dxcc':
-                    wae_mask = self.qsos_df['WAEName'].notna() & (self.qsos_df['WAEName'] != '')
+                    wae_mask = df['WAEName'].notna() & (df['WAEName'] != '')
                     
-                    self.qsos_df.loc[wae_mask, dest_col] = self.qsos_df.loc[wae_mask, 'WAEPfx']
-                    self.qsos_df.loc[~wae_mask, dest_col] = self.qsos_df.loc[~wae_mask, 'DXCCPfx']
+                    df.loc[wae_mask, dest_col] = df.loc[wae_mask, 'WAEPfx']
+                    df.loc[~wae_mask, dest_col] = df.loc[~wae_mask, 'DXCCPfx']
                     
                     if dest_name_col:
-                        self.qsos_df.loc[wae_mask, dest_name_col] = self.qsos_df.loc[wae_mask, 'WAEName']
-                        self.qsos_df.loc[~wae_mask, dest_name_col] = self.qsos_df.loc[~wae_mask, 'DXCCName']
+                        df.loc[wae_mask, dest_name_col] = df.loc[wae_mask, 'WAEName']
+                        df.loc[~wae_mask, dest_name_col] = df.loc[~wae_mask, 'DXCCName']
                 
                 elif rule.get('source') == 'calculation_module':
                     try:
@@ -609,7 +642,7 @@ class ContestLog:
                         module = importlib.import_module(f"contest_tools.contest_specific_annotations.{module_name}")
                         calculation_func = getattr(module, function_name)
                         
-                        self.qsos_df[dest_col] = calculation_func(self.qsos_df)
+                        df[dest_col] = calculation_func(df)
                         logging.info(f"Successfully applied '{function_name}' from '{module_name}'.")
                     except (ImportError, AttributeError, KeyError) as e:
                         logging.warning(f"Could not run calculation module for rule '{rule.get('name')}': {e}")
@@ -620,17 +653,17 @@ class ContestLog:
         my_call = self.metadata.get('MyCall')
         if not my_call:
             logging.warning("'MyCall' not found in metadata. Cannot calculate QSO points.")
-            self.qsos_df['QSOPoints'] = 0
-            return
+            df['QSOPoints'] = 0
+            return df
         
         try:
-            cty_lookup = CtyLookup(cty_dat_path=self.cty_dat_path)
+            cty_lookup = self._shared_cty_lookup if self._shared_cty_lookup else CtyLookup(cty_dat_path=self.cty_dat_path)
             my_call_info = cty_lookup.get_cty_DXCC_WAE(my_call)._asdict()
             my_call_info['MyCall'] = my_call
         except Exception as e:
             logging.warning(f"Could not determine own location for scoring due to CTY error: {e}")
-            self.qsos_df['QSOPoints'] = 0
-            return
+            df['QSOPoints'] = 0
+            return df
 
         scoring_module_name = self.contest_definition.scoring_module
         try:
@@ -639,16 +672,17 @@ class ContestLog:
             scoring_module = importlib.import_module(f"contest_tools.contest_specific_annotations.{scoring_module_name}")
         except ImportError as e:
             logging.warning(f"Could not load scoring module for contest '{self.contest_name}': {e}. Points will be 0.")
-            self.qsos_df['QSOPoints'] = 0
-            return
+            df['QSOPoints'] = 0
+            return df
 
         try:
-            self.qsos_df['QSOPoints'] = scoring_module.calculate_points(self.qsos_df, my_call_info)
+            df['QSOPoints'] = scoring_module.calculate_points(df, my_call_info)
             logging.info(f"Scoring complete.")
         except Exception as e:
             logging.error(f"Error during {self.contest_name} scoring: {e}")
-            self.qsos_df['QSOPoints'] = 0
+            df['QSOPoints'] = 0
 
+        return df
 
     def export_to_csv(self, output_filepath: str):
         if self.qsos_df.empty:
@@ -14,8 +14,8 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import pandas as pd
+import numpy as np
 import os
-import re
 import logging
 from typing import Dict, Any, Tuple
 
@@ -28,79 +28,48 @@ DXCC_TO_CATEGORY = {
     "Mexico": "Mexican States"
 }
 
-def _resolve_row(row: pd.Series, alias_lookup: AliasLookup, rules: Dict) -> pd.Series:
+# Worked entities that send a location instead of a serial number.
+WVE_DXCC_NAMES = ["United States", "Canada", "Mexico", "Alaska", "Hawaii"]
+
+
+def _parse_received(text: pd.Series, mask: pd.Series, rule: Dict, parsed: pd.DataFrame):
     """
-    Parses the received exchange and determines the multiplier for a single QSO row,
-    now with logic to handle ambiguous aliases based on context.
+    Parses the raw exchanges selected by mask with one exchange rule, writing
+    the RcvdLocation/RcvdSerial/RcvdITU groups into parsed. Like re.match,
+    the rule's regex is anchored at the start of the exchange only.
     """
-    # Initialize results for abbreviations and names
-    mult_state, mult_ve, mult_xe, mult_dxcc, mult_itu = pd.NA, pd.NA, pd.NA, pd.NA, pd.NA
-    mult_statename, mult_vename, mult_xename, mult_dxccname = pd.NA, pd.NA, pd.NA, pd.NA
-    rcvd_location, rcvd_serial, rcvd_itu = pd.NA, pd.NA, pd.NA
-    
-    worked_call = row.get('Call', '')
-    worked_dxcc = row.get('DXCCName', 'Unknown')
-    rcvd_exchange_full = str(row.get('RcvdExchangeFull', '')).strip()
+    subset = text[mask]
+    if subset.empty:
+        return
+    pattern = f"^(?:{rule['regex']})"
+    matched = subset.str.match(pattern)
+    extracted = subset[matched].str.extract(pattern)
+    extracted.columns = list(rule['groups'])[:extracted.shape[1]]
+    for col in parsed.columns:
+        # A matched exchange without this group leaves None, as dict.get() did.
+        values = extracted[col] if col in extracted.columns else pd.Series(None, index=extracted.index, dtype=object)
+        parsed.loc[extracted.index, col] = values.astype(object).where(values.notna(), None)
 
-    # --- Step 1: Determine which parsing rule to use based on station type ---
-    rule_key = None
-    if worked_call.endswith('/MM'):
-        rule_key = "ARRL-10-RCVD-MM"
-    elif worked_dxcc in ["United States", "Canada", "Mexico", "Alaska", "Hawaii"]:
-        rule_key = "ARRL-10-RCVD-WVE"
-    else:
-        rule_key = "ARRL-10-RCVD-DX"
-
-    # --- Step 2: Parse the raw exchange string with the selected rule ---
-    rule = rules.get(rule_key)
-    if rule:
-        match = re.match(rule['regex'], rcvd_exchange_full)
-        if match:
-            parsed_data = dict(zip(rule['groups'], match.groups()))
-            rcvd_location = parsed_data.get('RcvdLocation')
-            rcvd_serial = parsed_data.get('RcvdSerial')
-            rcvd_itu = parsed_data.get('RcvdITU')
 
-    # --- Step 3: Populate the final multiplier columns ---
-    if pd.notna(rcvd_itu):
-        mult_itu = f"ITU {rcvd_itu}"
-    elif pd.notna(rcvd_location):
-        # --- Multi-step lookup for State/Province/XE ---
-        mult_abbr, full_name = alias_lookup.get_multiplier(rcvd_location)
-
-        if pd.isna(mult_abbr) or mult_abbr == "Unknown":
-            mappings = alias_lookup.get_ambiguous_mappings(rcvd_location)
-            if mappings:
-                target_category = DXCC_TO_CATEGORY.get(worked_dxcc)
-                for abbr, category in mappings:
-                    if category == target_category:
-                        mult_abbr, full_name = alias_lookup.get_multiplier(abbr) # Re-lookup to get full name
-                        break
-        
-        if pd.notna(mult_abbr) and mult_abbr != "Unknown":
-            category = alias_lookup.get_category(mult_abbr)
-            if category == "US States":
-                mult_state = mult_abbr
-                mult_statename = full_name
-            elif category == "Canadian Provinces":
-                mult_ve = mult_abbr
-                mult_vename = full_name
-            elif category == "Mexican States":
-                mult_xe = mult_abbr
-                mult_xename = full_name
-    else: # Fallback to DXCC for non-W/VE/XE stations
-        if worked_dxcc not in ["United States", "Canada", "Mexico", "Alaska", "Hawaii", "Unknown"]:
-            mult_dxcc = row.get('DXCCPfx', 'Unknown') # Use Prefix as identifier
-            mult_dxccname = worked_dxcc # Use Name as the full name
-
-    return pd.Series([
-        rcvd_location, rcvd_serial, rcvd_itu,
-        mult_state, mult_statename,
-        mult_ve, mult_vename,
-        mult_xe, mult_xename,
-        mult_dxcc, mult_dxccname,
-        mult_itu
-    ])
+def _resolve_location(alias_lookup: AliasLookup, location: str, worked_dxcc: Any) -> Tuple[Any, Any, Any]:
+    """
+    Multi-step lookup for State/Province/XE: returns (category, abbreviation,
+    full name), using the worked station's country to settle ambiguous aliases.
+    """
+    mult_abbr, full_name = alias_lookup.get_multiplier(location)
+
+    if pd.isna(mult_abbr) or mult_abbr == "Unknown":
+        mappings = alias_lookup.get_ambiguous_mappings(location)
+        if mappings:
+            target_category = DXCC_TO_CATEGORY.get(worked_dxcc)
+            for abbr, category in mappings:
+                if category == target_category:
+                    mult_abbr, full_name = alias_lookup.get_multiplier(abbr) # Re-lookup to get full name
+                    break
+
+    if pd.notna(mult_abbr) and mult_abbr != "Unknown":
+        return alias_lookup.get_category(mult_abbr), mult_abbr, full_name
+    return None, pd.NA, pd.NA
 
 
 def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir: str, contest_def: ContestDefinition) -> pd.DataFrame:
@@ -118,7 +87,6 @@ def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir:
     # Dynamically build the list of target columns from the contest definition
     parsed_cols = ['RcvdLocation', 'RcvdSerial', 'RcvdITU']
     mult_cols = []
-    # Note: The order of rules in the JSON matters and must match the return order of _resolve_row
     for rule in contest_def.multiplier_rules:
         if 'value_column' in rule:
             mult_cols.append(rule['value_column'])
@@ -126,7 +94,59 @@ def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir:
             mult_cols.append(rule['name_column'])
     
     target_cols = parsed_cols + mult_cols
-    
-    df[target_cols] = df.apply(_resolve_row, axis=1, alias_lookup=alias_lookup, rules=rules)
+
+    worked_call = df['Call'].fillna('').astype(str) if 'Call' in df.columns else pd.Series('', index=df.index)
+    worked_dxcc = df['DXCCName'] if 'DXCCName' in df.columns else pd.Series('Unknown', index=df.index)
+    rcvd_exchange_full = (df['RcvdExchangeFull'].astype(str).str.strip()
+                          if 'RcvdExchangeFull' in df.columns else pd.Series('', index=df.index))
+
+    # --- Step 1: Determine which parsing rule to use based on station type ---
+    is_mm = worked_call.str.endswith('/MM')
+    is_wve = ~is_mm & worked_dxcc.isin(WVE_DXCC_NAMES)
+    is_dx = ~is_mm & ~is_wve
+
+    # --- Step 2: Parse the raw exchange strings, one rule at a time ---
+    parsed = pd.DataFrame(pd.NA, index=df.index, columns=parsed_cols, dtype=object)
+    for rule_key, mask in (("ARRL-10-RCVD-MM", is_mm), ("ARRL-10-RCVD-WVE", is_wve), ("ARRL-10-RCVD-DX", is_dx)):
+        rule = rules.get(rule_key)
+        if rule:
+            _parse_received(rcvd_exchange_full, mask, rule, parsed)
+    rcvd_location, rcvd_itu = parsed['RcvdLocation'], parsed['RcvdITU']
+
+    # --- Step 3: Populate the final multiplier columns ---
+    has_itu = rcvd_itu.notna()
+    has_location = ~has_itu & rcvd_location.notna()
+    # Fallback to DXCC for non-W/VE/XE stations
+    use_dxcc = ~has_itu & ~has_location & ~worked_dxcc.isin(WVE_DXCC_NAMES + ["Unknown"])
+
+    # Locations are resolved once per distinct (location, worked country).
+    location_keys = pd.DataFrame({'loc': rcvd_location[has_location], 'dxcc': worked_dxcc[has_location]})
+    resolved = {
+        (loc, dxcc): _resolve_location(alias_lookup, loc, dxcc)
+        for loc, dxcc in location_keys.drop_duplicates().itertuples(index=False)
+    }
+    location_results = [resolved[key] for key in location_keys.itertuples(index=False, name=None)]
+    category = pd.Series(None, index=df.index, dtype=object)
+    mult_abbr = pd.Series(pd.NA, index=df.index, dtype=object)
+    full_name = pd.Series(pd.NA, index=df.index, dtype=object)
+    if location_results:
+        category[has_location], mult_abbr[has_location], full_name[has_location] = (list(v) for v in zip(*location_results))
+
+    def select(condition: pd.Series, values: pd.Series) -> np.ndarray:
+        return np.select([condition.to_numpy(dtype=bool)], [values.to_numpy(dtype=object)], default=pd.NA)
+
+    is_state, is_ve, is_xe = (category == "US States"), (category == "Canadian Provinces"), (category == "Mexican States")
+    dxcc_pfx = df['DXCCPfx'] if 'DXCCPfx' in df.columns else pd.Series('Unknown', index=df.index)
+    columns = [
+        parsed['RcvdLocation'], parsed['RcvdSerial'], parsed['RcvdITU'],
+        select(is_state, mult_abbr), select(is_state, full_name),
+        select(is_ve, mult_abbr), select(is_ve, full_name),
+        select(is_xe, mult_abbr), select(is_xe, full_name),
+        select(use_dxcc, dxcc_pfx), select(use_dxcc, worked_dxcc),
+        select(has_itu, "ITU " + rcvd_itu.astype(str)),
+    ]
+    # Note: The order of rules in the JSON matters and must match the order of columns above
+    for col, values in zip(target_cols, columns):
+        df[col] = values
 
     return df
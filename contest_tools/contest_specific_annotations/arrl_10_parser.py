@@ -13,36 +13,27 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import pandas as pd
-import re
-from typing import Dict, Any, List, Tuple
-import os
 import logging
+from typing import Dict, Any, Optional, Tuple
 
 from ..contest_definitions import ContestDefinition
-from ..cabrillo_parser import parse_qso_common_fields
+from ..cabrillo_parser import read_cabrillo_records, parse_qso_records
 from ..core_annotations import CtyLookup
 
-def parse_log(filepath: str, contest_definition: ContestDefinition, root_input_dir: str, cty_dat_path: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+def parse_log(filepath: str, contest_definition: ContestDefinition, root_input_dir: str, cty_dat_path: str,
+              shared_cty_lookup: Optional[CtyLookup] = None) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Custom parser for the ARRL 10-Meter Contest.
+    The exchange rule depends on whether the logger is W/VE or DX.
     """
-    log_metadata: Dict[str, Any] = {}
-    qso_records: List[Dict[str, Any]] = []
+    cabrillo = read_cabrillo_records(filepath, contest_definition)
 
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-
-    # --- Pre-scan header to determine logger's location (W/VE or DX) ---
-    logger_call = ''
-    for line in lines[:30]:
-        if line.upper().startswith('CALLSIGN:'):
-            logger_call = line.split(':', 1)[1].strip()
-            break
-    
+    # --- Determine logger's location (W/VE or DX) from the header ---
+    logger_call = cabrillo.header_tags.get('CALLSIGN', '')
     if not logger_call:
         raise ValueError("CALLSIGN: tag not found in Cabrillo header.")
-        
-    cty_lookup = CtyLookup(cty_dat_path=cty_dat_path)
+
+    cty_lookup = shared_cty_lookup or CtyLookup(cty_dat_path=cty_dat_path)
     info = cty_lookup.get_cty_DXCC_WAE(logger_call)._asdict()
     logger_location_type = "WVE" if info['DXCCName'] in ["United States", "Canada", "Alaska", "Hawaii"] else "DX"
     logging.info(f"ARRL-10 parser: Logger location type determined as '{logger_location_type}'")
@@ -52,38 +43,7 @@ def parse_log(filepath: str, contest_definition: ContestDefinition, root_input_d
     if not rule_info:
         raise ValueError(f"Parsing rule '{rule_set_key}' not found in JSON definition.")
 
-    exchange_regex = re.compile(rule_info['regex'])
-    exchange_groups = rule_info['groups']
-
-    for line in lines:
-        cleaned_line = line.replace('\u00a0', ' ').strip()
-        line_to_process = cleaned_line.upper() if cleaned_line.upper().startswith('QSO:') else cleaned_line
-        
-        if not line_to_process or line_to_process.startswith(('END-OF-LOG:', 'START-OF-LOG:')):
-            continue
-        
-        if line_to_process.startswith('QSO:'):
-            common_data = parse_qso_common_fields(line_to_process)
-            if not common_data:
-                continue
-            
-            exchange_rest = common_data.pop('ExchangeRest', '').strip()
-            
-            exchange_match = exchange_regex.match(exchange_rest)
-            if exchange_match:
-                exchange_data = dict(zip(exchange_groups, exchange_match.groups()))
-                common_data.update(exchange_data)
-                common_data['RawQSO'] = line_to_process
-                qso_records.append(common_data)
-        else:
-            for cabrillo_tag, df_key in contest_definition.header_field_map.items():
-                if line_to_process.startswith(f"{cabrillo_tag}:"):
-                    value = line_to_process[len(f"{cabrillo_tag}:"):].strip()
-                    log_metadata[df_key] = value
-                    break
-
-    if not qso_records:
+    df = parse_qso_records(cabrillo, rule_info)
+    if df.empty:
         raise ValueError(f"No valid QSO lines found in Cabrillo file: {filepath}")
-        
-    df = pd.DataFrame(qso_records)
-    return df, log_metadata
+    return df, cabrillo.metadata
@@ -22,32 +22,19 @@ import logging
 from typing import Dict, Any, Set, Tuple, Optional
 
 from ..contest_definitions import ContestDefinition
-from ..core_annotations._iaru_mult_utils import load_officials_set, resolve_iaru_hq_official
+from ..core_annotations._iaru_mult_utils import load_officials_set, classify_iaru_exchanges
 from ..core_annotations._core_utils import normalize_zone
 
-def _resolve_row(row: pd.Series, officials_set: Set[str]) -> Dict[str, Optional[str]]:
+def _normalize_zones(zones: pd.Series) -> pd.Series:
     """
-    Parses the received exchange for a single QSO and returns the categorized
-    multiplier value.
+    Normalizes received ITU zones to two-digit format (IARU HF uses ITU Zones: 1-90).
+    Each distinct value is normalized once.
     """
-    mult_zone, mult_hq, mult_official = None, None, None
-    
-    # Get the clean multiplier value from the 'RcvdMult' column provided by the parser.
-    exchange = row.get('RcvdMult')
-    
-    if pd.notna(exchange):
-        exchange = str(exchange).strip()
-        
-        # 1. Check if it's a numeric ITU Zone (IARU-HF specific)
-        if exchange.isnumeric():
-            mult_zone = exchange
-        else:
-            # 2. Use shared utility for HQ/Official parsing
-            hq_official = resolve_iaru_hq_official(exchange, officials_set)
-            mult_hq = hq_official['hq']
-            mult_official = hq_official['official']
-
-    return {'zone': mult_zone, 'hq': mult_hq, 'official': mult_official}
+    normalized = pd.Series(pd.NA, index=zones.index, dtype=object)
+    present = zones.notna()
+    zone_map = {zone: normalize_zone(zone, zone_type='itu') for zone in zones[present].unique()}
+    normalized[present] = zones[present].map(zone_map)
+    return normalized
 
 def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir: str, contest_def: ContestDefinition) -> pd.DataFrame:
     """
@@ -55,7 +42,7 @@ def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir:
     RcvdMult column and populating the three distinct multiplier columns.
     """
     # This map provides a robust link between the rule name in the JSON
-    # and the key returned by the _resolve_row helper function.
+    # and the column returned by classify_iaru_exchanges().
     RULE_TO_KEY_MAP = {
         'Zones': 'zone',
         'HQ Stations': 'hq',
@@ -72,20 +59,17 @@ def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir:
 
     officials_set = load_officials_set(root_input_dir)
     
-    # Get the categorized multiplier data for all rows in a single pass.
-    categorized_mults = df.apply(_resolve_row, axis=1, officials_set=officials_set)
+    # Classify every received exchange column-wise in a single pass.
+    categorized_mults = classify_iaru_exchanges(df['RcvdMult'], officials_set)
 
     # Iterate through the rules from the JSON blueprint to assign data to the correct columns.
     for rule in contest_def.multiplier_rules:
         target_column = rule.get('value_column')
         data_key = RULE_TO_KEY_MAP.get(rule.get('name'))
         if target_column and data_key:
-            zone_values = categorized_mults.apply(lambda x: x.get(data_key))
-            
-            # Normalize zone values to two-digit format (IARU HF uses ITU Zones: 1-90)
             if data_key == 'zone':
-                df[target_column] = zone_values.apply(lambda x: normalize_zone(x, zone_type='itu'))
+                df[target_column] = _normalize_zones(categorized_mults['zone'])
             else:
-                df[target_column] = zone_values
+                df[target_column] = categorized_mults[data_key]
     
     return df
@@ -13,61 +13,51 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
-def _calculate_qso_points(row: pd.Series, my_continent: str, my_itu_zone: int) -> int:
-    """
-    Calculates the point value for a single QSO based on IARU HF Championship rules.
-    """
-    # Rule 0: Dupes are always worth 0 points.
-    if row['Dupe']:
-        return 0
-
-    # Rule 5.1.2: Contacts with an IARU HQ or IARU official station count one (1) point.
-    # This rule takes precedence over location-based scoring.
-    if pd.notna(row.get('Mult_HQ')) or pd.notna(row.get('Mult_Official')):
-        return 1
-
-    worked_continent = row.get('Continent')
-    worked_itu_zone = pd.to_numeric(row.get('Mult_Zone'), errors='coerce')
-
-    # If location data is missing for the worked station, no points can be awarded.
-    if pd.isna(worked_continent) or pd.isna(worked_itu_zone):
-        return 0
-    
-    # --- Location-Based Scoring for regular Zone stations ---
-
-    # Rule 5.1.5: Contacts with a different continent and ITU zone count five (5) points.
-    if worked_continent != my_continent and worked_itu_zone != my_itu_zone:
-        return 5
-    
-    # Rule 5.1.4: Contacts within your continent but in a different ITU zone count three (3) points.
-    if worked_continent == my_continent and worked_itu_zone != my_itu_zone:
-        return 3
-
-    # Rule 5.1.1 & 5.1.3: Contacts within your own ITU zone count one (1) point.
-    # This applies regardless of continent.
-    if worked_itu_zone == my_itu_zone:
-        return 1
-    
-    # Fallback case if no other rule matches.
-    return 0
-
-
 def calculate_points(df: pd.DataFrame, my_call_info: Dict[str, Any]) -> pd.Series:
     """
     Calculates QSO points for an entire DataFrame based on IARU HF Championship rules.
+    The rules are evaluated column-wise; the first matching rule sets the points.
     """
     my_continent = my_call_info.get('Continent')
     my_itu_zone = my_call_info.get('ITUZone')
     
     if not my_continent or pd.isna(my_itu_zone):
         raise ValueError("Logger's Continent and ITU Zone must be provided for scoring.")
-
-    return df.apply(
-        _calculate_qso_points,
-        axis=1,
-        my_continent=my_continent,
-        my_itu_zone=int(my_itu_zone)
+    my_itu_zone = int(my_itu_zone)
+
+    def column(name: str) -> pd.Series:
+        return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+    is_dupe = df['Dupe'].astype(bool)
+    is_hq_or_official = column('Mult_HQ').notna() | column('Mult_Official').notna()
+    worked_continent = column('Continent')
+    worked_itu_zone = pd.to_numeric(column('Mult_Zone'), errors='coerce').astype(float)
+    is_missing_location = worked_continent.isna() | worked_itu_zone.isna()
+    other_continent = worked_continent != my_continent
+    other_zone = worked_itu_zone != my_itu_zone
+
+    points = np.select(
+        [
+            # Rule 0: Dupes are always worth 0 points.
+            is_dupe,
+            # Rule 5.1.2: Contacts with an IARU HQ or IARU official station count one (1) point.
+            # This rule takes precedence over location-based scoring.
+            is_hq_or_official,
+            # If location data is missing for the worked station, no points can be awarded.
+            is_missing_location,
+            # Rule 5.1.5: Contacts with a different continent and ITU zone count five (5) points.
+            other_continent & other_zone,
+            # Rule 5.1.4: Contacts within your continent but in a different ITU zone count three (3) points.
+            ~other_continent & other_zone,
+            # Rule 5.1.1 & 5.1.3: Contacts within your own ITU zone count one (1) point.
+            # This applies regardless of continent.
+            ~other_zone,
+        ],
+        [0, 1, 0, 5, 3, 1],
+        default=0
     )
+    return pd.Series(points, index=df.index)
@@ -15,8 +15,8 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import pandas as pd
-import re
-from typing import Dict, Any, Optional
+import numpy as np
+from typing import Dict, Any
 from ..contest_definitions import ContestDefinition
 
 # The canonical prefixes used to construct the final multiplier ID.
@@ -29,57 +29,45 @@ _CANONICAL_PREFIX_MAP = {
 ELIGIBLE_DXCC_PREFIXES = set(_CANONICAL_PREFIX_MAP.keys())
 
 
-def _get_call_area_district(row: pd.Series) -> Optional[str]:
+def _get_call_area_districts(df: pd.DataFrame) -> pd.Series:
     """
-    Parses a callsign to find the call area district if it's from a
-    special country for WAE multipliers.
+    Parses each callsign to find the call area district if it's from a
+    special country for WAE multipliers. Returns a Series aligned to df with
+    the district (e.g. 'K1', 'UA99') or None.
+
+    Calls are resolved once per unique (Call, portableid, DXCCPfx).
     """
-    call = str(row.get('Call', ''))
-    portable_id = str(row.get('portableid', ''))
-    dxcc_pfx = str(row.get('DXCCPfx', ''))
-
-    # --- Step 1: Handle high-priority UA9 (Asiatic Russia) case for RA8/9/0 ---
-    if dxcc_pfx == 'UA9':
-        digit = None
-        if len(portable_id) == 1 and portable_id.isdigit():
-            digit = portable_id
-        else:
-            match = re.match(r'[A-Z]+(\d)', call)
-            if match:
-                digit = match.group(1)
-        
-        if digit in ['8', '9', '0']:
-            return f"UA9{digit}"
-        elif digit is not None: # It's a UA9 station but not 8, 9, or 0
-            return "UA99" # Fallback rule
-        else:
-            return None # No digit found
-
-    # --- Step 2: General Eligibility Check for other special prefixes ---
+    def as_text(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series('', index=df.index)
+        return df[col].astype(str)
+
+    keys = pd.DataFrame({'Call': as_text('Call'), 'portableid': as_text('portableid'), 'DXCCPfx': as_text('DXCCPfx')})
+    codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+    uniq = uniques.to_frame(index=False, name=list(keys.columns))
+
+    # --- Find Call Area Digit (prioritizing a single-digit portable suffix) ---
+    # Otherwise the first digit after the leading letters (VK2004ABC -> 2).
+    portable_digit = uniq['portableid'].where(uniq['portableid'].str.fullmatch(r'\d'))
+    call_digit = uniq['Call'].str.extract(r'^[A-Z]+(\d)', expand=False)
+    digit = portable_digit.fillna(call_digit)
+    has_digit = digit.notna()
+
+    district = pd.Series(np.full(len(uniq), None, dtype=object), index=uniq.index)
+
+    # --- UA9 (Asiatic Russia): RA8/9/0 are districts, other digits fall back to UA99 ---
+    is_ua9 = (uniq['DXCCPfx'] == 'UA9') & has_digit
+    ua9_district = 'UA9' + digit.where(digit.isin(['8', '9', '0']), '9')
+    district[is_ua9] = ua9_district[is_ua9]
+
+    # --- Other special prefixes ---
     # A call is only eligible if its DXCC entity prefix is on the special list.
     # This correctly excludes entities like KH6, KL, etc.
-    if dxcc_pfx not in ELIGIBLE_DXCC_PREFIXES:
-        return None
-
-    # --- Step 3: Determine Canonical Prefix ---
-    canonical_prefix = _CANONICAL_PREFIX_MAP.get(dxcc_pfx)
-
-    # --- Step 4: Find Call Area Digit (prioritizing portable suffix) ---
-    call_area_digit = None
-    if len(portable_id) == 1 and portable_id.isdigit():
-        call_area_digit = portable_id
-    else:
-        # Parse the main callsign for the first digit after letters.
-        # This correctly handles VK2004ABC -> 2
-        match = re.match(r'[A-Z]+(\d)', call)
-        if match:
-            call_area_digit = match.group(1)
-
-    # --- Step 5: Construct and Return Multiplier ---
-    if call_area_digit:
-        return f"{canonical_prefix}{call_area_digit}"
-    
-    return None
+    is_eligible = uniq['DXCCPfx'].isin(ELIGIBLE_DXCC_PREFIXES) & has_digit
+    canonical = uniq['DXCCPfx'].map(_CANONICAL_PREFIX_MAP)
+    district[is_eligible] = (canonical + digit)[is_eligible]
+
+    return pd.Series(district.to_numpy()[codes], index=df.index, dtype=object)
 
 
 def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir: str, contest_def: ContestDefinition) -> pd.DataFrame:
@@ -133,7 +121,7 @@ def resolve_multipliers(df: pd.DataFrame, my_location_type: str, root_input_dir:
         # Filter for QSOs with non-European stations
         non_eu_df = df[df['Continent'] != 'EU'].copy()
         if not non_eu_df.empty:
-            districts = non_eu_df.apply(_get_call_area_district, axis=1)
+            districts = _get_call_area_districts(non_eu_df)
             valid_districts = districts[districts.notna()]
             
             if not valid_districts.empty:
@@ -22,7 +22,7 @@ from typing import Dict, Any, List
 
 # Import the core annotation functions to make them available at the package level
 from .get_cty import CtyLookup
-from .run_s_p import process_contest_log_for_run_s_p
+from .run_s_p import process_contest_log_for_run_s_p, IncrementalRunSPClassifier
 from ._band_allocator import BandAllocator
 
 def process_dataframe_for_cty_data(df: pd.DataFrame, cty_dat_path: str, shared_cty_lookup=None) -> pd.DataFrame:
@@ -14,6 +14,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import os
+import numpy as np
 import pandas as pd
 from typing import Set, Optional, Dict
 
@@ -83,3 +84,35 @@ def resolve_iaru_hq_official(exchange: str, officials_set: Set[str]) -> Dict[str
         return {'hq': exchange.upper(), 'official': None}
     
     return {'hq': None, 'official': None}
+
+def classify_iaru_exchanges(exchanges: pd.Series, officials_set: Set[str]) -> pd.DataFrame:
+    """
+    Column-wise counterpart of resolve_iaru_hq_official() that also splits
+    out numeric ITU zones.
+
+    Each exchange is stripped and classified as:
+    - 'zone': all digits (returned as received; callers normalize it)
+    - 'official': in officials_set (case-insensitive), returned uppercase
+    - 'hq': any other alphabetic exchange, returned uppercase
+
+    Args:
+        exchanges: Received exchange values (RcvdMult column); NaN is no multiplier
+        officials_set: Set of valid IARU official abbreviations (from load_officials_set)
+
+    Returns:
+        DataFrame aligned to exchanges with 'zone', 'hq' and 'official'
+        columns, each holding the value or None.
+    """
+    present = exchanges.notna()
+    text = exchanges.where(present, '').astype(str).str.strip()
+    upper = text.str.upper()
+
+    is_zone = present & text.str.fullmatch(r'\d+')
+    is_official = present & ~is_zone & (text != '') & upper.isin(officials_set)
+    is_hq = present & ~is_zone & ~is_official & text.str.isalpha()
+
+    return pd.DataFrame({
+        'zone': np.where(is_zone, text, None),
+        'hq': np.where(is_hq, upper, None),
+        'official': np.where(is_official, upper, None),
+    }, index=exchanges.index)
@@ -181,7 +181,8 @@ def process_contest_log_for_run_s_p(
         if 'Run' in processed_df.columns:
             processed_df.drop(columns=['Run'], inplace=True)
 
-        df_sorted = processed_df.sort_values(by=[datetime_column])
+        # Stable sort: QSOs logged in the same minute keep their log order
+        df_sorted = processed_df.sort_values(by=[datetime_column], kind='stable')
         time_delta_threshold = pd.Timedelta(minutes=DEFAULT_RUN_TIME_WINDOW_MINUTES) + pd.Timedelta(seconds=1)
         
         results = []
@@ -215,6 +216,122 @@ def process_contest_log_for_run_s_p(
         raise
 
 
+class _StreamState:
+    """Pass 1 and Pass 2 state of one (band, mode) stream."""
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        self.active_run_freq = None
+        self.last_qso_on_run_freq_time = None
+        self.off_frequency_qso_count = 0
+        self.potential_new_run_freq = None
+        self.qso_buffer = deque()   # (row, time, freq) within the run window
+        self.recent = deque()       # (row, time) within the Unknown window
+
+
+class IncrementalRunSPClassifier:
+    """
+    Live counterpart of process_contest_log_for_run_s_p: QSOs are added one
+    at a time, in time order, and each is classified from per-stream state.
+
+    Pass 1 is the same sticky-run state machine; a newly detected run
+    promotes the earlier QSOs that form it. Pass 2 keeps, per S&P QSO, the
+    number of stream QSOs in the window before and after it, so a QSO
+    shown as 'Unknown' becomes 'S&P' once enough QSOs follow it.
+    """
+    def __init__(self, unknown_window_minutes: int = DEFAULT_UNKNOWN_WINDOW_MINUTES,
+                 unknown_qso_threshold: int = DEFAULT_UNKNOWN_QSO_THRESHOLD):
+        self.time_delta_threshold = pd.Timedelta(minutes=DEFAULT_RUN_TIME_WINDOW_MINUTES) + pd.Timedelta(seconds=1)
+        self.run_break_delta = pd.Timedelta(minutes=RUN_BREAK_TIME_MINUTES)
+        self.unknown_window = pd.Timedelta(minutes=unknown_window_minutes)
+        self.unknown_threshold = unknown_qso_threshold
+        self._streams = {}
+        self._is_run = []
+        self._preceding = []
+        self._following = []
+
+    def __len__(self) -> int:
+        return len(self._is_run)
+
+    def add(self, band: str, mode: str, qso_time: pd.Timestamp, frequency: float) -> int:
+        """Classifies one QSO and returns its row number."""
+        row = len(self._is_run)
+        self._is_run.append(False)
+        self._preceding.append(0)
+        self._following.append(0)
+
+        if pd.isna(qso_time) or pd.isna(frequency):
+            # The batch pass drops such QSOs; here they stay 'Unknown'
+            return row
+
+        key = (str(band), str(mode))
+        stream = self._streams.get(key)
+        if stream is None:
+            tolerance = DEFAULT_FREQ_TOLERANCE_CW if str(mode).upper() == 'CW' else DEFAULT_FREQ_TOLERANCE_PH
+            stream = self._streams[key] = _StreamState(tolerance)
+
+        self._update_rate_window(stream, row, qso_time)
+        self._update_run_state(stream, row, qso_time, frequency)
+        return row
+
+    def _update_rate_window(self, stream: _StreamState, row: int, qso_time: pd.Timestamp):
+        while stream.recent and stream.recent[0][1] < qso_time - self.unknown_window:
+            stream.recent.popleft()
+        preceding = 0
+        for prev_row, prev_time in stream.recent:
+            if prev_time < qso_time:
+                preceding += 1
+                self._following[prev_row] += 1
+        self._preceding[row] = preceding
+        stream.recent.append((row, qso_time))
+
+    def _update_run_state(self, stream: _StreamState, row: int, qso_time: pd.Timestamp, frequency: float):
+        stream.qso_buffer.append((row, qso_time, frequency))
+        while stream.qso_buffer and (qso_time - stream.qso_buffer[0][1]) > self.time_delta_threshold:
+            stream.qso_buffer.popleft()
+
+        if stream.active_run_freq is not None:
+            is_on_run_freq = abs(frequency - stream.active_run_freq) <= stream.tolerance
+            timed_out = (qso_time - stream.last_qso_on_run_freq_time) > self.run_break_delta
+
+            if is_on_run_freq and not timed_out:
+                self._is_run[row] = True
+                stream.last_qso_on_run_freq_time = qso_time
+                stream.off_frequency_qso_count = 0
+                stream.potential_new_run_freq = None
+            else:
+                if not is_on_run_freq:
+                    if stream.potential_new_run_freq and abs(frequency - stream.potential_new_run_freq) <= stream.tolerance:
+                        stream.off_frequency_qso_count += 1
+                    else:
+                        stream.potential_new_run_freq = frequency
+                        stream.off_frequency_qso_count = 1
+
+                if timed_out or stream.off_frequency_qso_count >= RUN_BREAK_QSO_COUNT:
+                    stream.active_run_freq = None
+
+        if stream.active_run_freq is None:
+            is_new_run, new_run_rows = _get_run_info_from_buffer(
+                frequency, stream.qso_buffer, DEFAULT_MIN_QSO_FOR_RUN, self.time_delta_threshold, stream.tolerance
+            )
+            if is_new_run:
+                stream.active_run_freq = frequency
+                stream.last_qso_on_run_freq_time = qso_time
+                stream.off_frequency_qso_count = 0
+                stream.potential_new_run_freq = None
+                for run_row in new_run_rows:
+                    self._is_run[run_row] = True
+
+    def status(self, row: int) -> str:
+        if self._is_run[row]:
+            return 'Run'
+        if self._preceding[row] < self.unknown_threshold and self._following[row] < self.unknown_threshold:
+            return 'Unknown'
+        return 'S&P'
+
+    def statuses(self) -> list:
+        return [self.status(row) for row in range(len(self._is_run))]
+
+
 if __name__ == "__main__":
     # Library-only module. Use process_contest_log_for_run_s_p() via contest_log or the web application.
     pass
\ No newline at end of file
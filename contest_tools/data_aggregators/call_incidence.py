@@ -0,0 +1,273 @@
+# contest_tools/data_aggregators/call_incidence.py
+#
+# Purpose: A session-level sparse incidence structure (call x band x mode x log)
+#          built once from all logs, from which unique/common breakdowns for
+#          any pair or subset of logs are computed with vectorized set
+#          operations on sorted integer call codes.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import weakref
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from contest_tools.utils.report_utils import get_valid_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Run status codes; counts are kept for the first three, as in
+# CategoricalAggregator._get_qso_mode_counts.
+RUN, SP, UNK, OTHER = 0, 1, 2, 3
+_RUN_CODES = {'run': RUN, 's&p': SP, 'unknown': UNK}
+_N_STATUS = 4
+_ANY_MODE = object()
+
+# LogManager -> {include_dupes: CallIncidenceMatrix}
+_SESSION_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+@dataclass
+class _IncidenceView:
+    """
+    Sparse (log, call) entries for one band/mode filter, sorted by log then call.
+
+    counts[k] holds per-status QSO counts of entry k, first_status[k] the Run
+    status of its first QSO (in log order) and first_time[k] that QSO's epoch seconds.
+    """
+    bounds: np.ndarray        # (n_logs + 1,) entry offsets per log
+    calls: np.ndarray         # (k,) int64 call codes
+    counts: np.ndarray        # (k, 4) int64
+    first_status: np.ndarray  # (k,) int8
+    first_time: np.ndarray    # (k,) int64
+
+    def log_slice(self, log_idx: int) -> slice:
+        return slice(self.bounds[log_idx], self.bounds[log_idx + 1])
+
+
+def _mode_counts(counts: np.ndarray) -> Dict[str, int]:
+    total = counts.sum(axis=0) if counts.ndim == 2 else counts
+    return {'run': int(total[RUN]), 'sp': int(total[SP]), 'unk': int(total[UNK])}
+
+
+class CallIncidenceMatrix:
+    """
+    Call x band x mode x log incidence for a fixed set of logs.
+
+    Views for each (band, mode) filter are derived lazily from one flat QSO
+    table and cached, so N logs cost one build regardless of how many pairs
+    or subsets are compared.
+    """
+    def __init__(self, logs: List[Any], include_dupes: bool = False):
+        self.logs = list(logs)
+        self.include_dupes = include_dupes
+        self._positions = {id(log): i for i, log in enumerate(self.logs)}
+        self._views: Dict[Tuple[Optional[str], Optional[str]], _IncidenceView] = {}
+        self._build()
+
+    @classmethod
+    def for_logs(cls, logs: List[Any], include_dupes: bool = False) -> "CallIncidenceMatrix":
+        """
+        Returns the session matrix covering 'logs'.
+
+        When the logs belong to a LogManager, one matrix over all of its logs is
+        built and reused by every report; otherwise a matrix for just these logs.
+        """
+        log_manager = getattr(logs[0], '_log_manager_ref', None) if logs else None
+        session_logs = getattr(log_manager, 'logs', None)
+        if not session_logs or not all(any(log is s for s in session_logs) for log in logs):
+            return cls(logs, include_dupes)
+
+        per_session = _SESSION_CACHE.setdefault(log_manager, {})
+        matrix = per_session.get(include_dupes)
+        if matrix is None or len(matrix.logs) != len(session_logs) or \
+                any(a is not b for a, b in zip(matrix.logs, session_logs)):
+            matrix = cls(session_logs, include_dupes)
+            per_session[include_dupes] = matrix
+        return matrix
+
+    # --- Construction ---
+
+    def _build(self) -> None:
+        parts = {'log': [], 'order': [], 'call': [], 'band': [], 'mode': [], 'run': [], 'time': []}
+        for log_idx, log in enumerate(self.logs):
+            df = get_valid_dataframe(log, include_dupes=self.include_dupes)
+            n = len(df)
+            parts['log'].append(np.full(n, log_idx, dtype=np.int64))
+            parts['order'].append(np.arange(n, dtype=np.int64))
+            parts['call'].append(df['Call'].to_numpy(dtype=object))
+            parts['band'].append(df['Band'].to_numpy(dtype=object) if 'Band' in df.columns else np.full(n, None, dtype=object))
+            # Logs without a Mode column pass any mode filter, as in CategoricalAggregator._apply_filters
+            parts['mode'].append(df['Mode'].to_numpy(dtype=object) if 'Mode' in df.columns else np.full(n, _ANY_MODE, dtype=object))
+            run = df['Run'].astype(str).str.lower().str.strip() if 'Run' in df.columns else pd.Series('', index=df.index)
+            parts['run'].append(run.map(_RUN_CODES).fillna(OTHER).to_numpy(np.int8))
+            times = df['Datetime'] if 'Datetime' in df.columns else pd.Series(pd.NaT, index=df.index)
+            parts['time'].append(pd.to_datetime(times, utc=True).to_numpy('datetime64[s]').astype(np.int64))
+
+        self._log = np.concatenate(parts['log']) if parts['log'] else np.empty(0, np.int64)
+        self._order = np.concatenate(parts['order']) if parts['order'] else np.empty(0, np.int64)
+        self._run = np.concatenate(parts['run']) if parts['run'] else np.empty(0, np.int8)
+        self._time = np.concatenate(parts['time']) if parts['time'] else np.empty(0, np.int64)
+
+        call_codes, self.calls = pd.factorize(np.concatenate(parts['call']) if parts['call'] else np.empty(0, object),
+                                              use_na_sentinel=False)
+        self._call = call_codes.astype(np.int64)
+        self._band_values = np.concatenate(parts['band']) if parts['band'] else np.empty(0, object)
+        self._mode_values = np.concatenate(parts['mode']) if parts['mode'] else np.empty(0, object)
+
+    def _view(self, band_filter: Optional[str] = None, mode_filter: Optional[str] = None) -> _IncidenceView:
+        key = (band_filter or None, mode_filter or None)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        mask = np.ones(len(self._call), dtype=bool)
+        if band_filter:
+            mask &= self._band_values == band_filter
+        if mode_filter:
+            mask &= (self._mode_values == mode_filter) | (self._mode_values == _ANY_MODE)
+
+        log, call, run = self._log[mask], self._call[mask], self._run[mask]
+        order, time = self._order[mask], self._time[mask]
+
+        # Sort by (log, call, order): entries become contiguous and the first row
+        # of each entry is its first QSO in log order.
+        idx = np.lexsort((order, call, log))
+        log, call, run, time = log[idx], call[idx], run[idx], time[idx]
+        is_start = np.ones(len(log), dtype=bool)
+        is_start[1:] = (log[1:] != log[:-1]) | (call[1:] != call[:-1])
+        starts = np.flatnonzero(is_start)
+
+        entry = np.cumsum(is_start) - 1
+        counts = np.bincount(entry * _N_STATUS + run, minlength=len(starts) * _N_STATUS).reshape(len(starts), _N_STATUS)
+
+        entry_logs = log[starts]
+        view = _IncidenceView(
+            bounds=np.searchsorted(entry_logs, np.arange(len(self.logs) + 1), side='left'),
+            calls=call[starts],
+            counts=counts.astype(np.int64),
+            first_status=run[starts],
+            first_time=time[starts],
+        )
+        self._views[key] = view
+        return view
+
+    def _index_of(self, log: Any) -> int:
+        return self._positions[id(log)]
+
+    # --- Queries ---
+
+    def get_call_set(self, log: Any, band_filter: str = None, mode_filter: str = None) -> List[str]:
+        """Distinct calls worked by 'log' under the filter."""
+        view = self._view(band_filter, mode_filter)
+        return self.calls[view.calls[view.log_slice(self._index_of(log))]].tolist()
+
+    def compute_comparison_breakdown(self, log1: Any, log2: Any, band_filter: str = None,
+                                     mode_filter: str = None) -> Dict[str, Any]:
+        """
+        Unique/common call breakdown for one pair of logs, in the structure of
+        CategoricalAggregator.compute_comparison_breakdown.
+        """
+        view = self._view(band_filter, mode_filter)
+        s1, s2 = view.log_slice(self._index_of(log1)), view.log_slice(self._index_of(log2))
+        calls1, calls2 = view.calls[s1], view.calls[s2]
+        counts1, counts2 = view.counts[s1], view.counts[s2]
+
+        common1 = np.isin(calls1, calls2, assume_unique=True)
+        common2 = np.isin(calls2, calls1, assume_unique=True)
+
+        # Both call arrays are sorted, so the common entries line up position by position
+        first1 = view.first_status[s1][common1]
+        first2 = view.first_status[s2][common2]
+        run_both = int(np.count_nonzero((first1 == RUN) & (first2 == RUN)))
+        sp_both = int(np.count_nonzero((first1 == SP) & (first2 == SP)))
+        n_common = int(common1.sum())
+
+        return {
+            "log1_unique": _mode_counts(counts1[~common1]),
+            "log2_unique": _mode_counts(counts2[~common2]),
+            "common": {'run_both': run_both, 'sp_both': sp_both, 'mixed': n_common - run_both - sp_both},
+            "common_detail": {"log1": _mode_counts(counts1[common1]), "log2": _mode_counts(counts2[common2])},
+            "metrics": {
+                "total_1": int(counts1.sum()),
+                "total_2": int(counts2.sum()),
+                "unique_1": int(len(calls1) - n_common),
+                "unique_2": int(len(calls2) - n_common),
+                "common_total": n_common,
+            }
+        }
+
+    def compute_band_distribution_breakdown(self, log1: Any, log2: Any, bands: List[str]) -> Dict[str, Any]:
+        """
+        Contest-wide uniqueness (calls not worked by the other log on any band)
+        distributed over the bands they were worked on, in the structure of
+        CategoricalAggregator.compute_band_distribution_breakdown.
+        """
+        i1, i2 = self._index_of(log1), self._index_of(log2)
+        overall = self._view()
+        calls1, calls2 = overall.calls[overall.log_slice(i1)], overall.calls[overall.log_slice(i2)]
+        unique1 = calls1[~np.isin(calls1, calls2, assume_unique=True)]
+        unique2 = calls2[~np.isin(calls2, calls1, assume_unique=True)]
+
+        result = {'bands': {}}
+        for band in bands:
+            view = self._view(band)
+            s1, s2 = view.log_slice(i1), view.log_slice(i2)
+            on_band1 = np.isin(view.calls[s1], unique1, assume_unique=True)
+            on_band2 = np.isin(view.calls[s2], unique2, assume_unique=True)
+            result['bands'][band] = {
+                'log1': _mode_counts(view.counts[s1][on_band1]),
+                'log2': _mode_counts(view.counts[s2][on_band2]),
+            }
+        return result
+
+    def compute_subset_breakdown(self, logs: List[Any], band_filter: str = None,
+                                 mode_filter: str = None) -> Dict[str, Any]:
+        """
+        N-way comparison for any subset of logs.
+
+        Structure:
+        {universe: int, common_all: int,
+         logs: {Callsign: {total_qsos, calls, unique_calls, unique: {run, sp, unk}}}}
+
+        'unique' calls were worked by this log only within the subset; 'common_all'
+        calls were worked by every log in it.
+        """
+        view = self._view(band_filter, mode_filter)
+        slices = [view.log_slice(self._index_of(log)) for log in logs]
+        all_calls = np.concatenate([view.calls[s] for s in slices]) if slices else np.empty(0, np.int64)
+        universe, log_counts = np.unique(all_calls, return_counts=True)
+        single = universe[log_counts == 1]
+
+        result = {"universe": int(len(universe)),
+                  "common_all": int(np.count_nonzero(log_counts == len(logs))) if logs else 0,
+                  "logs": {}}
+        for log, s in zip(logs, slices):
+            is_unique = np.isin(view.calls[s], single, assume_unique=True)
+            callsign = log.get_metadata().get('MyCall', 'Unknown')
+            result["logs"][callsign] = {
+                "total_qsos": int(view.counts[s].sum()),
+                "calls": int(s.stop - s.start),
+                "unique_calls": int(is_unique.sum()),
+                "unique": _mode_counts(view.counts[s][is_unique]),
+            }
+        return result
+
+    def get_first_qso_times(self, log: Any, band_filter: str = None, mode_filter: str = None) -> Dict[str, Any]:
+        """Call -> first QSO time (UTC ISO string) for one log under the filter."""
+        view = self._view(band_filter, mode_filter)
+        s = view.log_slice(self._index_of(log))
+        times = pd.to_datetime(view.first_time[s], unit='s', utc=True)
+        return {str(c): (t.isoformat() if not pd.isna(t) else None)
+                for c, t in zip(self.calls[view.calls[s]], times)}
@@ -16,6 +16,7 @@
 from typing import List, Dict, Union, Set, Tuple, Any
 import pandas as pd
 from contest_tools.utils.report_utils import get_valid_dataframe
+from contest_tools.data_aggregators.call_incidence import CallIncidenceMatrix
 
 # Placeholder type for type hinting only
 class ContestLog:
@@ -105,90 +106,10 @@ class CategoricalAggregator:
         Compares two logs for unique and common QSOs based on 'Call',
         and provides a breakdown of results by run/S&P mode.
         """
-        # 1. Internal: Get DataFrames
-        df1_raw = get_valid_dataframe(log1, include_dupes=include_dupes)
-        df2_raw = get_valid_dataframe(log2, include_dupes=include_dupes)
-        
-        df1 = self._apply_filters(df1_raw, band_filter, mode_filter)
-        df2 = self._apply_filters(df2_raw, band_filter, mode_filter)
-        
-        # Dynamic Uniqueness Key
-        # If filtering by band/mode, Call is sufficient.
-        # If global, we should technically use Call+Band+Mode, but standard practice is often just Call.
-        # Following original 'qso_comparison' logic (Source 1630): It uses simple set intersection on 'Call'.
-        # We will adhere to that standard.
-        uniqueness_cols = ['Call']
-            
-        set1 = set(df1['Call'].unique())
-        set2 = set(df2['Call'].unique())
-
-        common_keys = set1.intersection(set2)
-        unique1_keys = set1.difference(set2)
-        unique2_keys = set2.difference(set1)
-        
-        common_calls = common_keys
-        unique1_calls = unique1_keys
-        unique2_calls = unique2_keys
-
-        # 3. Categorical Breakdown for Unique Sets
-        df1_unique = df1[df1['Call'].isin(unique1_calls)].copy()
-        df2_unique = df2[df2['Call'].isin(unique2_calls)].copy()
-        
-        log1_unique_breakdown = self._get_qso_mode_counts(df1_unique)
-        log2_unique_breakdown = self._get_qso_mode_counts(df2_unique)
-
-        # 4. Categorical Breakdown for Common Set
-        common_breakdown: Dict[str, int] = {'run_both': 0, 'sp_both': 0, 'mixed': 0}
-        common_detail = {"log1": {'run': 0, 'sp': 0, 'unk': 0}, "log2": {'run': 0, 'sp': 0, 'unk': 0}}
-
-        if common_calls:
-            df_common_1 = df1[df1['Call'].isin(common_calls)].copy()
-            df_common_2 = df2[df2['Call'].isin(common_calls)].copy()
-
-            # Merge to align common QSOs and their Run/S&P status
-            df_merged = pd.merge(
-                df_common_1[['Call', 'Run']].drop_duplicates(subset=['Call']).rename(columns={'Run': 'Run1'}),
-                df_common_2[['Call', 'Run']].drop_duplicates(subset=['Call']).rename(columns={'Run': 'Run2'}),
-                on='Call',
-                how='inner'
-            )
-
-            if not df_merged.empty:
-                # 'Run' column contains 'Run', 'S&P', 'Unknown'
-                # run_both
-                common_breakdown['run_both'] = len(df_merged[
-                    (df_merged['Run1'] == 'Run') & (df_merged['Run2'] == 'Run')
-                ])
-                
-                # sp_both
-                common_breakdown['sp_both'] = len(df_merged[
-                    (df_merged['Run1'] == 'S&P') & (df_merged['Run2'] == 'S&P')
-                ])
-                
-                # mixed
-                common_breakdown['mixed'] = len(df_merged) - (common_breakdown['run_both'] + common_breakdown['sp_both'])
-            
-            # Calculate independent detail for the common set (required for text_qso_comparison)
-            common_detail["log1"] = self._get_qso_mode_counts(df_common_1)
-            common_detail["log2"] = self._get_qso_mode_counts(df_common_2)
-
-        # 5. Metrics
-        metrics = {
-            "total_1": len(df1),
-            "total_2": len(df2),
-            "unique_1": len(unique1_keys),
-            "unique_2": len(unique2_keys),
-            "common_total": len(common_keys)
-        }
-        
-        # 6. Final structure assembly
-        return {
-            "log1_unique": log1_unique_breakdown,
-            "log2_unique": log2_unique_breakdown,
-            "common": common_breakdown,
-            "common_detail": common_detail,
-            "metrics": metrics
-        }
+        # The session incidence matrix is built once for all logs; each pair is
+        # then a few set operations on sorted call codes.
+        matrix = CallIncidenceMatrix.for_logs([log1, log2], include_dupes=include_dupes)
+        return matrix.compute_comparison_breakdown(log1, log2, band_filter, mode_filter)
 
     def get_category_breakdown(self, log: ContestLog, category_col: str) -> List[Dict[str, Any]]:
         """
@@ -332,42 +253,5 @@ class CategoricalAggregator:
                 }
             }
         """
-        # 1. Get ALL QSOs (no band filter) to compute common set across all bands
-        df1_all = get_valid_dataframe(log1, include_dupes=include_dupes)
-        df2_all = get_valid_dataframe(log2, include_dupes=include_dupes)
-        
-        # 2. Compute common QSOs (intersection across all bands)
-        set1_all = set(df1_all['Call'].unique())
-        set2_all = set(df2_all['Call'].unique())
-        common_calls = set1_all.intersection(set2_all)
-        
-        # 3. Compute symmetric difference (unique to each log)
-        log1_unique_calls = set1_all - common_calls
-        log2_unique_calls = set2_all - common_calls
-        
-        # 4. Get valid bands from contest definition
-        contest_def = log1.contest_definition
-        valid_bands = contest_def.valid_bands
-        
-        # 5. For each band, filter unique QSOs worked on that band
-        result = {'bands': {}}
-        
-        for band in valid_bands:
-            # Filter each log's data to this band
-            df1_band = df1_all[df1_all['Band'] == band].copy()
-            df2_band = df2_all[df2_all['Band'] == band].copy()
-            
-            # Get unique QSOs worked on this band for each log
-            log1_unique_on_band = df1_band[df1_band['Call'].isin(log1_unique_calls)].copy()
-            log2_unique_on_band = df2_band[df2_band['Call'].isin(log2_unique_calls)].copy()
-            
-            # Categorize by Run/S&P/Unknown for each log
-            log1_breakdown = self._get_qso_mode_counts(log1_unique_on_band)
-            log2_breakdown = self._get_qso_mode_counts(log2_unique_on_band)
-            
-            result['bands'][band] = {
-                'log1': log1_breakdown,
-                'log2': log2_breakdown
-            }
-        
-        return result
\ No newline at end of file
+        matrix = CallIncidenceMatrix.for_logs([log1, log2], include_dupes=include_dupes)
+        return matrix.compute_band_distribution_breakdown(log1, log2, log1.contest_definition.valid_bands)
\ No newline at end of file
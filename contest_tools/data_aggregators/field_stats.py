@@ -0,0 +1,205 @@
+# contest_tools/data_aggregators/field_stats.py
+#
+# Purpose: Aggregates field-wide statistics (multiplier availability by hour,
+#          band activity heatmaps, unique calls) from a FieldDataset, one batch
+#          of log parts at a time, into a JSON-compatible structure (Pure
+#          Python Primitives).
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..contest_log import ContestLog
+from ..field_dataset import FieldDataset
+
+logger = logging.getLogger(__name__)
+
+# Partial results are merged every N batches, so memory is bounded by the
+# number of distinct keys rather than by the number of QSOs.
+_REDUCE_EVERY = 16
+
+
+class _CountReducer:
+    """Sums per-key counts from many partial frames, compacting periodically."""
+    def __init__(self, keys: List[str]):
+        self.keys = keys
+        self._pending: List[pd.DataFrame] = []
+        self._total: Optional[pd.DataFrame] = None
+
+    def add(self, frame: pd.DataFrame) -> None:
+        self._pending.append(frame)
+        if len(self._pending) >= _REDUCE_EVERY:
+            self._compact()
+
+    def _compact(self) -> None:
+        frames = self._pending + ([self._total] if self._total is not None else [])
+        self._pending = []
+        if frames:
+            self._total = pd.concat(frames, ignore_index=True).groupby(self.keys, as_index=False, sort=False).sum()
+
+    def result(self) -> pd.DataFrame:
+        self._compact()
+        if self._total is None:
+            return pd.DataFrame(columns=self.keys + ['logs', 'qsos'])
+        return self._total
+
+
+def _count_by(frame: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """QSO and distinct-station ('logs') counts per key within one batch of logs."""
+    per_station = frame.groupby(keys + ['MyCall'], sort=False, observed=True).size()
+    grouped = per_station.groupby(level=list(range(len(keys))), sort=False)
+    return pd.DataFrame({'qsos': grouped.sum(), 'logs': grouped.size()}).reset_index()
+
+
+class FieldStatsAggregator:
+    """
+    Field-wide aggregate queries over a FieldDataset.
+    Returns pure Python primitives (dict, list, int, str) suitable for JSON serialization.
+    """
+    _CANONICAL_BAND_ORDER = [b[1] for b in ContestLog._HAM_BANDS]
+
+    def __init__(self, dataset: FieldDataset):
+        self.dataset = dataset
+        self.master_index = dataset.get_master_time_index()
+
+    def _hours(self, datetimes: pd.Series) -> np.ndarray:
+        """Hour offsets from the first master time bin."""
+        t0 = self.master_index[0]
+        return ((datetimes - t0) // pd.Timedelta(hours=1)).to_numpy(np.int64)
+
+    def _time_bins(self) -> List[str]:
+        return [t.isoformat() for t in self.master_index] if self.master_index is not None else []
+
+    def get_multiplier_availability(self, mult_column: str = None) -> Dict[str, Any]:
+        """
+        Multiplier availability across the whole field.
+
+        A multiplier is 'available' in an hour if any log worked it in that hour.
+
+        Structure:
+        {time_bins, mult_column,
+         hourly: {available: [...], new: [...], cumulative: [...]},
+         multipliers: {Mult: {first_hour, stations, qsos}}}
+        """
+        mult_column = mult_column or next(iter(self.dataset.index.get('mult_columns') or []), None)
+        data = {"time_bins": self._time_bins(), "mult_column": mult_column,
+                "hourly": {"available": [], "new": [], "cumulative": []}, "multipliers": {}}
+        if self.master_index is None or not mult_column:
+            return data
+        n_bins = len(self.master_index)
+
+        reducer = _CountReducer(['hour', 'mult'])
+        stations = _CountReducer(['mult'])
+        for df in self.dataset.iter_frames(columns=['Datetime', mult_column]):
+            df = df[df[mult_column].notna() & (df[mult_column] != 'Unknown') & df['Datetime'].notna()]
+            if df.empty:
+                continue
+            batch = pd.DataFrame({'hour': self._hours(df['Datetime']), 'mult': df[mult_column].to_numpy(),
+                                  'MyCall': df['MyCall'].to_numpy()})
+            reducer.add(_count_by(batch, ['hour', 'mult']))
+            # A station working a multiplier in several hours counts once per multiplier
+            stations.add(_count_by(batch, ['mult']))
+
+        pairs = reducer.result()
+        if pairs.empty:
+            data["hourly"] = {k: [0] * n_bins for k in ("available", "new", "cumulative")}
+            return data
+
+        hours = pairs['hour'].to_numpy(np.int64)
+        available = np.bincount(hours, minlength=n_bins)[:n_bins]
+        first_hour = pairs.groupby('mult')['hour'].min()
+        new = np.bincount(first_hour.to_numpy(np.int64), minlength=n_bins)[:n_bins]
+
+        station_counts = stations.result().set_index('mult')['logs']
+        qso_counts = pairs.groupby('mult')['qsos'].sum()
+
+        data["hourly"] = {
+            "available": available.tolist(),
+            "new": new.tolist(),
+            "cumulative": np.cumsum(new).tolist(),
+        }
+        data["multipliers"] = {
+            str(mult): {
+                "first_hour": self.master_index[int(hour)].isoformat(),
+                "stations": int(station_counts.get(mult, 0)),
+                "qsos": int(qso_counts.get(mult, 0)),
+            }
+            for mult, hour in first_hour.sort_index().items()
+        }
+        return data
+
+    def get_activity_heatmap(self) -> Dict[str, Any]:
+        """
+        Band x hour activity for the whole field.
+
+        Structure:
+        {time_bins, bands: [...], qsos: [[per hour] per band], stations: [[per hour] per band]}
+        """
+        data = {"time_bins": self._time_bins(), "bands": [], "qsos": [], "stations": []}
+        if self.master_index is None:
+            return data
+        n_bins = len(self.master_index)
+
+        reducer = _CountReducer(['band', 'hour'])
+        for df in self.dataset.iter_frames(columns=['Datetime', 'Band']):
+            df = df[df['Band'].notna() & df['Datetime'].notna()]
+            if df.empty:
+                continue
+            batch = pd.DataFrame({'band': df['Band'].to_numpy(), 'hour': self._hours(df['Datetime']),
+                                  'MyCall': df['MyCall'].to_numpy()})
+            reducer.add(_count_by(batch, ['band', 'hour']))
+
+        cells = reducer.result()
+        if cells.empty:
+            return data
+
+        present = set(cells['band'])
+        bands = [b for b in self._CANONICAL_BAND_ORDER if b in present] + sorted(present - set(self._CANONICAL_BAND_ORDER))
+        band_pos = {b: i for i, b in enumerate(bands)}
+        rows = cells['band'].map(band_pos).to_numpy(np.int64)
+        flat = rows * n_bins + cells['hour'].to_numpy(np.int64)
+        size = len(bands) * n_bins
+
+        data["bands"] = bands
+        data["qsos"] = np.bincount(flat, weights=cells['qsos'], minlength=size).astype(np.int64).reshape(len(bands), n_bins).tolist()
+        data["stations"] = np.bincount(flat, weights=cells['logs'], minlength=size).astype(np.int64).reshape(len(bands), n_bins).tolist()
+        return data
+
+    def get_unique_calls(self, top_n: int = 50) -> Dict[str, Any]:
+        """
+        Worked-call statistics across the field.
+
+        'logs' is the number of field logs containing the call; calls found
+        in a single log are frequently busted calls.
+
+        Structure:
+        {total_logs, total_calls, single_log_calls, top_calls: [{call, logs, qsos}]}
+        """
+        reducer = _CountReducer(['call'])
+        for df in self.dataset.iter_frames(columns=['Call']):
+            df = df[df['Call'].notna()]
+            if df.empty:
+                continue
+            reducer.add(_count_by(df.rename(columns={'Call': 'call'}), ['call']))
+
+        calls = reducer.result()
+        top = calls.sort_values(['logs', 'qsos', 'call'], ascending=[False, False, True]).head(top_n)
+        return {
+            "total_logs": len(self.dataset.logs),
+            "total_calls": int(len(calls)),
+            "single_log_calls": int((calls['logs'] == 1).sum()) if not calls.empty else 0,
+            "top_calls": [{"call": str(c), "logs": int(l), "qsos": int(q)}
+                          for c, l, q in zip(top['call'], top['logs'], top['qsos'])],
+        }
@@ -1,6 +1,10 @@
 # contest_tools/data_aggregators/matrix_stats.py
 #
 # Purpose: Centralizes the calculation logic for 2D matrix statistics (Band x Time).
+#          Grids for all logs are filled in one vectorized pass: each QSO gets
+#          an integer cell key (log, row, time bin) and Run/S&P bit flags, and
+#          counts and activity status come from bincount and an OR-reduction
+#          over those keys.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -13,9 +17,89 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from ..contest_log import ContestLog
-from ..utils.report_utils import get_valid_dataframe, determine_activity_status
+from ..utils.report_utils import get_valid_dataframe
+
+# Per-QSO activity flags. Every QSO sets _QSO_FLAG, so a cell's OR-reduced
+# mask is 0 only when the cell has no QSOs.
+_RUN_FLAG = 1
+_SP_FLAG = 2
+_QSO_FLAG = 4
+
+# OR-reduced mask -> status, matching determine_activity_status():
+# Run and S&P together are 'Mixed'; QSOs with neither are 'Unknown'.
+_STATUS_BY_MASK = np.array(
+    ['Inactive', 'Inactive', 'Inactive', 'Inactive', 'Unknown', 'Run', 'S&P', 'Mixed'],
+    dtype=object
+)
+
+# Series order of the stacked (Run/S&P/Unknown) charts.
+_RUN_STATUSES = ('Run', 'S&P', 'Unknown')
+
+
+def _run_flags(df: pd.DataFrame) -> np.ndarray:
+    """Activity flags for each QSO; a missing 'Run' column leaves every QSO unclassified."""
+    flags = np.full(len(df), _QSO_FLAG, dtype=np.uint8)
+    if 'Run' in df.columns:
+        run = df['Run'].to_numpy(dtype=object)
+        flags[run == 'Run'] |= _RUN_FLAG
+        flags[run == 'S&P'] |= _SP_FLAG
+    return flags
+
+
+def _bin_positions(datetimes: pd.Series, bin_size: str, time_index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Position of each timestamp's bin in time_index, or -1 if the bin is not in
+    the index. Bins are floored to bin_size, which gives the same labels as
+    pd.Grouper(freq=bin_size) for bin sizes that divide a day.
+    """
+    return time_index.get_indexer(datetimes.dt.floor(bin_size))
+
+
+def _row_positions(values: pd.Series, rows: List[str]) -> np.ndarray:
+    """Position of each value in rows, or -1 if it is not a row (e.g. NaN)."""
+    return pd.Categorical(values, categories=rows).codes.astype(np.int64)
+
+
+def _cell_keys(frames: List[Tuple[int, pd.DataFrame]], row_column: str, rows: List[str],
+               bin_size: str, time_index: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer cell key ((log * len(rows) + row) * len(time_index) + bin) and
+    activity flags for every QSO of every log. QSOs whose row or bin falls
+    outside the grid are dropped.
+    """
+    n_rows, n_bins = len(rows), len(time_index)
+    keys, flags = [], []
+    for log_pos, df in frames:
+        row_pos = _row_positions(df[row_column], rows)
+        bin_pos = _bin_positions(df['Datetime'], bin_size, time_index)
+        valid = (row_pos >= 0) & (bin_pos >= 0)
+        keys.append((log_pos * n_rows + row_pos[valid]) * n_bins + bin_pos[valid])
+        flags.append(_run_flags(df)[valid])
+    if not keys:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8)
+    return np.concatenate(keys), np.concatenate(flags)
+
+
+def _or_reduce(keys: np.ndarray, flags: np.ndarray, size: int) -> np.ndarray:
+    """OR of the flags sharing each key, as a dense array of length size."""
+    masks = np.zeros(size, dtype=np.uint8)
+    if keys.size:
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        masks[sorted_keys[starts]] = np.bitwise_or.reduceat(flags[order], starts)
+    return masks
+
+
+def _status_index(flags: np.ndarray) -> np.ndarray:
+    """Index into _RUN_STATUSES for each QSO's flags."""
+    status = np.full(flags.shape, 2, dtype=np.int64)
+    status[(flags & _RUN_FLAG) != 0] = 0
+    status[(flags & _SP_FLAG) != 0] = 1
+    return status
+
 
 class MatrixAggregator:
     """
@@ -26,6 +110,24 @@ class MatrixAggregator:
     def __init__(self, logs: List[ContestLog]):
         self.logs = logs
 
+    def _log_frames(self, mode_filter: Optional[str] = None) -> List[Tuple[str, pd.DataFrame]]:
+        """(callsign, valid QSOs) for each log, optionally filtered to one mode."""
+        frames = []
+        for log in self.logs:
+            call = log.get_metadata().get('MyCall', 'Unknown')
+            df = get_valid_dataframe(log, include_dupes=False)
+            if mode_filter and not df.empty:
+                df = df[df['Mode'] == mode_filter]
+            frames.append((call, df))
+        return frames
+
+    @staticmethod
+    def _default_time_index(dfs: List[pd.DataFrame], bin_size: str) -> pd.DatetimeIndex:
+        full_concat = pd.concat(dfs)
+        min_time = full_concat['Datetime'].min().floor('h')
+        max_time = full_concat['Datetime'].max().ceil('h')
+        return pd.date_range(start=min_time, end=max_time, freq=bin_size, tz='UTC')
+
     def get_matrix_data(self, bin_size: str = '15min', mode_filter: Optional[str] = None, time_index: pd.DatetimeIndex = None) -> Dict[str, Any]:
         """
         Generates aligned 2D grids for all logs.
@@ -46,94 +148,72 @@ class MatrixAggregator:
         }
         """
         # --- 1. Establish Global Dimensions ---
-        all_dfs = []
-        all_bands = set()
-        
-        for log in self.logs:
-            df = get_valid_dataframe(log, include_dupes=False)
-            if not df.empty:
-                if mode_filter:
-                    df = df[df['Mode'] == mode_filter]
-                
-                if not df.empty:
-                    all_dfs.append(df)
-                    all_bands.update(df['Band'].unique())
-
+        frames = self._log_frames(mode_filter)
+        all_dfs = [df for _, df in frames if not df.empty]
         if not all_dfs:
             return {"time_bins": [], "bands": [], "logs": {}}
 
+        all_bands = set()
+        for df in all_dfs:
+            all_bands.update(df['Band'].unique())
+
         # Global Time Range
         if time_index is None:
-            full_concat = pd.concat(all_dfs)
-            min_time = full_concat['Datetime'].min().floor('h')
-            max_time = full_concat['Datetime'].max().ceil('h')
-            time_index = pd.date_range(start=min_time, end=max_time, freq=bin_size, tz='UTC')
-        
+            time_index = self._default_time_index(all_dfs, bin_size)
+
         # Global Band Order
         canonical_band_order = [b[1] for b in ContestLog._HAM_BANDS]
         sorted_bands = sorted(list(all_bands), key=lambda b: canonical_band_order.index(b) if b in canonical_band_order else -1)
 
+        # --- 2. Fill All Logs' Grids At Once ---
+        # Counts come from bincount over the cell keys; status from the
+        # OR-reduced flags of each cell, mapped through _STATUS_BY_MASK.
+        n_logs, n_bands, n_bins = len(frames), len(sorted_bands), len(time_index)
+        size = n_logs * n_bands * n_bins
+        keys, flags = _cell_keys(list(enumerate(df for _, df in frames)), 'Band', sorted_bands, bin_size, time_index)
+        counts = np.bincount(keys, minlength=size).reshape(n_logs, n_bands, n_bins)
+        statuses = _STATUS_BY_MASK[_or_reduce(keys, flags, size)].reshape(n_logs, n_bands, n_bins)
+
         result = {
             "time_bins": [t.isoformat() for t in time_index],
             "bands": sorted_bands,
             "logs": {}
         }
-
-        # --- 2. Populate Data Per Log ---
-        for log in self.logs:
-            call = log.get_metadata().get('MyCall', 'Unknown')
-            df = get_valid_dataframe(log, include_dupes=False)
-            
-            # Apply filter locally
-            if mode_filter and not df.empty:
-                df = df[df['Mode'] == mode_filter]
-
-            log_data = {
-                "qso_counts": [],
-                "activity_status": []
+        for log_pos, (call, _) in enumerate(frames):
+            # .tolist() converts numpy.int64 to plain int
+            result["logs"][call] = {
+                "qso_counts": counts[log_pos].tolist(),
+                "activity_status": statuses[log_pos].tolist()
             }
 
-            if df.empty:
-                # Fill with zeros/inactive if log is empty for this mode/slice
-                zeros = [0] * len(time_index)
-                inactive = ['Inactive'] * len(time_index)
-                for _ in sorted_bands:
-                    log_data["qso_counts"].append(zeros)
-                    log_data["activity_status"].append(inactive)
-            else:
-                # A. Pivot for QSO Counts
-                # We reindex to ensure every band and time bin is present
-                pivot_counts = df.pivot_table(
-                    index='Band', 
-                    columns=pd.Grouper(key='Datetime', freq=bin_size), 
-                    aggfunc='size', 
-                    fill_value=0
-                ).reindex(index=sorted_bands, columns=time_index, fill_value=0)
-
-                # B. Group for Activity Status
-                # We calculate status per band-row
-                status_grid = []
-                for band in sorted_bands:
-                    df_band = df[df['Band'] == band]
-                    if df_band.empty:
-                        status_row = ['Inactive'] * len(time_index)
-                    else:
-                        # Group by 15min bin and apply logic
-                        resampled = df_band.set_index('Datetime').groupby(pd.Grouper(freq=bin_size))['Run'].apply(determine_activity_status)
-                        # Reindex to full time range
-                        resampled = resampled.reindex(time_index, fill_value='Inactive')
-                        status_row = resampled.tolist()
-                    status_grid.append(status_row)
-
-                # Convert Numpy/Pandas structures to Pure Python Lists
-                # astype(int) ensures we don't return numpy.int64
-                log_data["qso_counts"] = pivot_counts.fillna(0).astype(int).values.tolist()
-                log_data["activity_status"] = status_grid
-
-            result["logs"][call] = log_data
-
         return result
 
+    def _stacked_counts(self, frames: List[Tuple[str, pd.DataFrame]], row_column: str, rows: List[str],
+                        bin_size: str, time_index: pd.DatetimeIndex) -> Dict[str, Dict[str, Dict[str, List[int]]]]:
+        """
+        QSO counts per (log, row, run status, time bin), built with one bincount
+        over all logs. Returns {call: {row: {"Run": [...], "S&P": [...], "Unknown": [...]}}}.
+        """
+        n_logs, n_rows, n_bins = len(frames), len(rows), len(time_index)
+        n_status = len(_RUN_STATUSES)
+        usable = [(pos, df) for pos, (_, df) in enumerate(frames) if not df.empty and row_column in df.columns]
+        keys, flags = _cell_keys(usable, row_column, rows, bin_size, time_index)
+
+        # Fold the run status in between the row and the bin: cell key
+        # (log, row, bin) becomes (log, row, status, bin).
+        cell, bin_pos = np.divmod(keys, n_bins)
+        stacked_keys = (cell * n_status + _status_index(flags)) * n_bins + bin_pos
+        counts = np.bincount(stacked_keys, minlength=n_logs * n_rows * n_status * n_bins)
+        counts = counts.reshape(n_logs, n_rows, n_status, n_bins).tolist()
+
+        logs = {}
+        for log_pos, (call, _) in enumerate(frames):
+            logs[call] = {
+                row: dict(zip(_RUN_STATUSES, counts[log_pos][row_pos]))
+                for row_pos, row in enumerate(rows)
+            }
+        return logs
+
     def get_stacked_matrix_data(self, bin_size: str = '60min', mode_filter: Optional[str] = None, time_index: pd.DatetimeIndex = None) -> Dict[str, Any]:
         """
         Generates 3D data (Band x Time x RunStatus) for stacked charts.
@@ -157,103 +237,31 @@ class MatrixAggregator:
         }
         """
         # --- 1. Establish Global Dimensions ---
-        all_dfs = []
-        all_bands = set()
-        
-        for log in self.logs:
-            df = get_valid_dataframe(log, include_dupes=False)
-            if not df.empty:
-                if mode_filter:
-                    df = df[df['Mode'] == mode_filter]
-                
-                if not df.empty:
-                    all_dfs.append(df)
-                    all_bands.update(df['Band'].unique())
-
+        frames = self._log_frames(mode_filter)
+        all_dfs = [df for _, df in frames if not df.empty]
         if not all_dfs:
             return {"time_bins": [], "bands": [], "logs": {}}
 
+        all_bands = set()
+        for df in all_dfs:
+            all_bands.update(df['Band'].unique())
+
         # Global Time Range
         if time_index is None:
-            full_concat = pd.concat(all_dfs)
-            min_time = full_concat['Datetime'].min().floor('h')
-            max_time = full_concat['Datetime'].max().ceil('h')
-            time_index = pd.date_range(start=min_time, end=max_time, freq=bin_size, tz='UTC')
-        
+            time_index = self._default_time_index(all_dfs, bin_size)
+
         # Global Band Order
         canonical_band_order = [b[1] for b in ContestLog._HAM_BANDS]
         sorted_bands = sorted(list(all_bands), key=lambda b: canonical_band_order.index(b) if b in canonical_band_order else -1)
 
-        result = {
+        # --- 2. Populate Data For All Logs ---
+        # QSOs with a missing or unrecognized 'Run' value count as 'Unknown'.
+        return {
             "time_bins": [t.isoformat() for t in time_index],
             "bands": sorted_bands,
-            "logs": {}
+            "logs": self._stacked_counts(frames, 'Band', sorted_bands, bin_size, time_index)
         }
 
-        # --- 2. Populate Data Per Log ---
-        for log in self.logs:
-            call = log.get_metadata().get('MyCall', 'Unknown')
-            df = get_valid_dataframe(log, include_dupes=False)
-            
-            # Apply filter locally
-            if mode_filter and not df.empty:
-                df = df[df['Mode'] == mode_filter]
-
-            result["logs"][call] = {}
-
-            if df.empty:
-                # Initialize empty structure for all bands
-                zeros = [0] * len(time_index)
-                for band in sorted_bands:
-                    result["logs"][call][band] = {
-                        "Run": list(zeros),
-                        "S&P": list(zeros),
-                        "Unknown": list(zeros)
-                    }
-                continue
-
-            # Standardize Run Status for grouping
-            # If 'Run' column exists, map NaNs to 'Unknown'.
-            # If it doesn't exist, treat all as 'Unknown'.
-            # Any deviation becomes 'Unknown'.
-            if 'Run' in df.columns:
-                df = df.copy()
-                df['RunStatus'] = df['Run'].fillna('Unknown')
-                known_statuses = {'Run', 'S&P'}
-                df.loc[~df['RunStatus'].isin(known_statuses), 'RunStatus'] = 'Unknown'
-            else:
-                df = df.copy()
-                df['RunStatus'] = 'Unknown'
-
-            # Pivot: Index=[Band, RunStatus], Columns=Time
-            pivot = df.pivot_table(
-                index=['Band', 'RunStatus'],
-                columns=pd.Grouper(key='Datetime', freq=bin_size),
-                aggfunc='size',
-                fill_value=0
-            )
-
-            # Iterate through bands to build the nested structure
-            for band in sorted_bands:
-                band_data = {
-                    "Run": [],
-                    "S&P": [],
-                    "Unknown": []
-                }
-                
-                for status in ["Run", "S&P", "Unknown"]:
-                    if (band, status) in pivot.index:
-                        # Extract the row, reindex to master time index to ensure alignment
-                        row = pivot.loc[(band, status)]
-                        row = row.reindex(time_index, fill_value=0)
-                        band_data[status] = row.astype(int).tolist()
-                    else:
-                        band_data[status] = [0] * len(time_index)
-                
-                result["logs"][call][band] = band_data
-
-        return result
-
     def get_mode_stacked_matrix_data(self, bin_size: str = '60min', time_index: pd.DatetimeIndex = None) -> Dict[str, Any]:
         """
         Generates 3D data (Mode x Time x RunStatus) for mode-dimension stacked charts.
@@ -277,88 +285,26 @@ class MatrixAggregator:
         }
         """
         # --- 1. Establish Global Dimensions ---
-        all_dfs = []
-        all_modes = set()
-        
-        for log in self.logs:
-            df = get_valid_dataframe(log, include_dupes=False)
-            if not df.empty and 'Mode' in df.columns:
-                all_dfs.append(df)
-                all_modes.update(df['Mode'].dropna().unique())
-
+        frames = self._log_frames()
+        all_dfs = [df for _, df in frames if not df.empty and 'Mode' in df.columns]
         if not all_dfs:
             return {"time_bins": [], "modes": [], "logs": {}}
 
+        all_modes = set()
+        for df in all_dfs:
+            all_modes.update(df['Mode'].dropna().unique())
+
         # Global Time Range
         if time_index is None:
-            full_concat = pd.concat(all_dfs)
-            min_time = full_concat['Datetime'].min().floor('h')
-            max_time = full_concat['Datetime'].max().ceil('h')
-            time_index = pd.date_range(start=min_time, end=max_time, freq=bin_size, tz='UTC')
-        
+            time_index = self._default_time_index(all_dfs, bin_size)
+
         # Global Mode Order
         mode_order = ['CW', 'PH', 'SSB', 'RTTY', 'FT8', 'FT4']  # Common mode order
         sorted_modes = sorted(list(all_modes), key=lambda m: (mode_order.index(m) if m in mode_order else 99, m))
 
-        result = {
+        # --- 2. Populate Data For All Logs ---
+        return {
             "time_bins": [t.isoformat() for t in time_index],
             "modes": sorted_modes,
-            "logs": {}
+            "logs": self._stacked_counts(frames, 'Mode', sorted_modes, bin_size, time_index)
         }
-
-        # --- 2. Populate Data Per Log ---
-        for log in self.logs:
-            call = log.get_metadata().get('MyCall', 'Unknown')
-            df = get_valid_dataframe(log, include_dupes=False)
-
-            result["logs"][call] = {}
-
-            if df.empty or 'Mode' not in df.columns:
-                # Initialize empty structure for all modes
-                zeros = [0] * len(time_index)
-                for mode in sorted_modes:
-                    result["logs"][call][mode] = {
-                        "Run": list(zeros),
-                        "S&P": list(zeros),
-                        "Unknown": list(zeros)
-                    }
-                continue
-
-            # Standardize Run Status for grouping
-            if 'Run' in df.columns:
-                df = df.copy()
-                df['RunStatus'] = df['Run'].fillna('Unknown')
-                known_statuses = {'Run', 'S&P'}
-                df.loc[~df['RunStatus'].isin(known_statuses), 'RunStatus'] = 'Unknown'
-            else:
-                df = df.copy()
-                df['RunStatus'] = 'Unknown'
-
-            # Pivot: Index=[Mode, RunStatus], Columns=Time
-            pivot = df.pivot_table(
-                index=['Mode', 'RunStatus'],
-                columns=pd.Grouper(key='Datetime', freq=bin_size),
-                aggfunc='size',
-                fill_value=0
-            )
-
-            # Iterate through modes to build the nested structure
-            for mode in sorted_modes:
-                mode_data = {
-                    "Run": [],
-                    "S&P": [],
-                    "Unknown": []
-                }
-                
-                for status in ["Run", "S&P", "Unknown"]:
-                    if (mode, status) in pivot.index:
-                        # Extract the row, reindex to master time index to ensure alignment
-                        row = pivot.loc[(mode, status)]
-                        row = row.reindex(time_index, fill_value=0)
-                        mode_data[status] = row.astype(int).tolist()
-                    else:
-                        mode_data[status] = [0] * len(time_index)
-                
-                result["logs"][call][mode] = mode_data
-
-        return result
\ No newline at end of file
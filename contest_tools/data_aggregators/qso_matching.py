@@ -0,0 +1,348 @@
+# contest_tools/data_aggregators/qso_matching.py
+#
+# Purpose: Cross-log QSO matching for field-wide log checking. Pairs each QSO
+#          with its counterpart in the other station's log by (call pair,
+#          band, mode) within a time tolerance and classifies the rest as
+#          not-in-log, busted-call, band-mismatch or unverified (no log).
+#
+#          Calls, bands and modes are factorized once into int64 codes so every
+#          join is a sorted as-of merge over integer keys, partitioned by band.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..contest_log import ContestLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_TOLERANCE_S = 300
+_MAX_MATCH_ROUNDS = 4
+_EPOCH = pd.Timestamp(0, tz='UTC')
+
+STATUS_MATCHED = 'matched'
+STATUS_BAND_MISMATCH = 'band_mismatch'
+STATUS_BUSTED_CALL = 'busted_call'
+STATUS_NOT_IN_LOG = 'not_in_log'
+STATUS_UNVERIFIED = 'unverified'
+STATUSES = [STATUS_MATCHED, STATUS_BAND_MISMATCH, STATUS_BUSTED_CALL, STATUS_NOT_IN_LOG, STATUS_UNVERIFIED]
+_CODE = {s: i for i, s in enumerate(STATUSES)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance; only called for the few busted-call candidates."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def is_similar_call(logged: str, actual: str) -> bool:
+    """True if 'logged' is a plausible miscopy of 'actual' (at most two edits, fewer than half the call)."""
+    if not logged or not actual or logged == actual:
+        return False
+    distance = _edit_distance(logged, actual)
+    return distance <= 2 and distance * 2 < min(len(logged), len(actual))
+
+
+class QsoMatchingEngine:
+    """
+    Matches QSOs across the logs of one event.
+
+    The per-QSO result (match()) is a DataFrame used internally and by other
+    aggregators; get_match_summary() returns pure Python primitives.
+    """
+    def __init__(self, logs: List[ContestLog], time_tolerance_s: int = DEFAULT_TIME_TOLERANCE_S):
+        self.logs = logs
+        self.time_tolerance_s = int(time_tolerance_s)
+        self._calls: Optional[pd.Index] = None
+        self._bands: Optional[pd.Index] = None
+        self._result: Optional[pd.DataFrame] = None
+
+    # --- Preparation ---
+
+    def _build_qso_table(self) -> pd.DataFrame:
+        # Raw column arrays are gathered per log and concatenated once; string
+        # normalization runs on the distinct callsigns only.
+        parts = {'log': [], 'row': [], 'time': [], 'my_call': [], 'call': [], 'band': [], 'mode': []}
+        for log_idx, log in enumerate(self.logs):
+            df = log.get_processed_data()
+            if df.empty:
+                continue
+            # Missing values are dropped once after concatenation
+            valid = ~df['Dupe'].to_numpy(dtype=bool) if 'Dupe' in df.columns else np.ones(len(df), dtype=bool)
+            count = int(valid.sum())
+            if not count:
+                continue
+            parts['log'].append(np.full(count, log_idx, dtype=np.int32))
+            parts['row'].append(df.index.to_numpy()[valid])
+            parts['time'].append(df['Datetime'].to_numpy(dtype='datetime64[ns]')[valid])
+            parts['my_call'].append(np.full(count, str(log.get_metadata().get('MyCall', '')), dtype=object))
+            parts['call'].append(df['Call'].to_numpy(dtype=object)[valid])
+            parts['band'].append(df['Band'].to_numpy(dtype=object)[valid])
+            parts['mode'].append(df['Mode'].to_numpy(dtype=object)[valid] if 'Mode' in df.columns
+                                 else np.full(count, '', dtype=object))
+        if not parts['log']:
+            return pd.DataFrame()
+
+        times = np.concatenate(parts['time'])
+        call_col = np.concatenate(parts['call'])
+        band_col = np.concatenate(parts['band'])
+        keep = ~(np.isnat(times) | pd.isna(call_col) | pd.isna(band_col))
+        my_call_col = np.concatenate(parts['my_call'])[keep]
+        call_col, band_col = call_col[keep], band_col[keep]
+        qsos = pd.DataFrame({
+            'log': np.concatenate(parts['log'])[keep],
+            'row': np.concatenate(parts['row'])[keep],
+            'time': times[keep].astype('datetime64[s]').astype(np.int64),
+        })
+        if qsos.empty:
+            return qsos
+
+        # One hash pass maps every callsign (logging and worked) to an int64 code,
+        # then codes of spellings that normalize to the same call are merged.
+        n = len(qsos)
+        raw_codes, raw_calls = pd.factorize(np.concatenate([my_call_col, call_col]))
+        norm_codes, calls = pd.factorize(pd.Index(raw_calls).astype(str).str.strip().str.upper())
+        codes = norm_codes[raw_codes].astype(np.int64)
+        qsos['me'] = codes[:n]
+        qsos['other'] = codes[n:]
+        band_codes, bands = pd.factorize(band_col)
+        mode_codes, modes = pd.factorize(np.concatenate(parts['mode'])[keep], use_na_sentinel=False)
+        qsos['band_code'] = band_codes.astype(np.int64)
+        qsos['mode_code'] = mode_codes.astype(np.int64)
+
+        # Worked stations that submitted a log
+        qsos['has_log'] = np.isin(qsos['other'].to_numpy(), np.unique(qsos['me'].to_numpy()))
+
+        self._calls, self._bands = calls, bands
+        self._n_calls, self._n_modes = len(calls), max(len(modes), 1)
+        return qsos
+
+    @staticmethod
+    def _pack(*parts) -> np.ndarray:
+        """Packs (values, cardinality) pairs into one int64 key."""
+        key = np.zeros(len(parts[0][0]), dtype=np.int64)
+        for values, size in parts:
+            key = key * size + values
+        return key
+
+    def _pair_key(self, src: np.ndarray, dst: np.ndarray, mode: np.ndarray) -> np.ndarray:
+        return self._pack((src, self._n_calls), (dst, self._n_calls), (mode, self._n_modes))
+
+    # --- Matching passes ---
+
+    def _asof(self, left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+        """Nearest-in-time join on 'key' within the tolerance; both sides carry 'time' and 'idx'."""
+        joined = pd.merge_asof(
+            left[['time', 'key', 'idx']].sort_values('time', kind='stable'),
+            right[['time', 'key', 'idx']].rename(columns={'idx': 'idx_r'}).assign(time_r=right['time'].to_numpy())
+                 .sort_values('time', kind='stable'),
+            on='time', by='key', direction='nearest', tolerance=self.time_tolerance_s)
+        return joined.dropna(subset=['idx_r'])
+
+    def _match_exact(self, qsos: pd.DataFrame, status: np.ndarray, partner: np.ndarray) -> None:
+        """One-to-one matches on (call pair, band, mode), one band partition at a time."""
+        me, other = qsos['me'].to_numpy(), qsos['other'].to_numpy()
+        lo, hi = np.minimum(me, other), np.maximum(me, other)
+        qsos = qsos.assign(idx=np.arange(len(qsos)),
+                           key=self._pair_key(lo, hi, qsos['mode_code'].to_numpy()))
+        checkable = qsos['has_log'].to_numpy() & (me != other)
+        side_a = checkable & (me < other)
+        side_b = checkable & (me > other)
+
+        band_codes = qsos['band_code'].to_numpy()
+        for band in np.unique(band_codes[checkable]):
+            in_band = band_codes == band
+            a = qsos[side_a & in_band]
+            b = qsos[side_b & in_band]
+            for _ in range(_MAX_MATCH_ROUNDS):
+                if a.empty or b.empty:
+                    break
+                joined = self._asof(a, b)
+                if joined.empty:
+                    break
+                # Resolve contention: each counterpart goes to its closest claimant
+                joined['dt'] = (joined['time'] - joined['time_r']).abs()
+                joined = joined.sort_values('dt', kind='stable').drop_duplicates('idx_r')
+                ia = joined['idx'].to_numpy()
+                ib = joined['idx_r'].to_numpy(np.int64)
+                status[ia] = status[ib] = _CODE[STATUS_MATCHED]
+                partner[ia], partner[ib] = ib, ia
+                a = a[~a['idx'].isin(ia)]
+                b = b[~b['idx'].isin(ib)]
+
+    def _flag_band_mismatch(self, qsos: pd.DataFrame, status: np.ndarray, partner: np.ndarray) -> None:
+        """Unmatched QSOs whose counterpart was logged on another band within the tolerance."""
+        open_rows = (status == _CODE[STATUS_UNVERIFIED]) & qsos['has_log'].to_numpy()
+        if not open_rows.any():
+            return
+        me, other, mode = qsos['me'].to_numpy(), qsos['other'].to_numpy(), qsos['mode_code'].to_numpy()
+        idx = np.flatnonzero(open_rows)
+        left = pd.DataFrame({'time': qsos['time'].to_numpy()[idx], 'idx': idx,
+                             'key': self._pair_key(other[idx], me[idx], mode[idx])})
+        right = pd.DataFrame({'time': qsos['time'].to_numpy()[idx], 'idx': idx,
+                              'key': self._pair_key(me[idx], other[idx], mode[idx])})
+        joined = self._asof(left, right)
+        il, ir = joined['idx'].to_numpy(), joined['idx_r'].to_numpy(np.int64)
+        differs = qsos['band_code'].to_numpy()[il] != qsos['band_code'].to_numpy()[ir]
+        status[il[differs]] = _CODE[STATUS_BAND_MISMATCH]
+        partner[il[differs]] = ir[differs]
+
+    def _flag_busted_calls(self, qsos: pd.DataFrame, status: np.ndarray, partner: np.ndarray) -> None:
+        """
+        Unmatched QSOs where another log shows a QSO with this station at the
+        same time, band and mode, and the call logged here is a miscopy of
+        that log's callsign.
+        """
+        unmatched = (status == _CODE[STATUS_UNVERIFIED]) | (status == _CODE[STATUS_NOT_IN_LOG])
+        if not unmatched.any():
+            return
+        me, other = qsos['me'].to_numpy(), qsos['other'].to_numpy()
+        band, mode = qsos['band_code'].to_numpy(), qsos['mode_code'].to_numpy()
+        # Left: this station's unmatched QSOs keyed by (me, band, mode);
+        # right: other logs' unmatched QSOs with this station keyed by (other, band, mode).
+        idx = np.flatnonzero(unmatched)
+        n_bands = len(self._bands)
+        left = pd.DataFrame({'time': qsos['time'].to_numpy()[idx], 'idx': idx,
+                             'key': self._pack((me[idx], self._n_calls), (mode[idx], self._n_modes),
+                                               (band[idx], n_bands))})
+        right = pd.DataFrame({'time': qsos['time'].to_numpy()[idx], 'idx': idx,
+                              'key': self._pack((other[idx], self._n_calls), (mode[idx], self._n_modes),
+                                                (band[idx], n_bands))})
+        joined = self._asof(left, right)
+        if joined.empty:
+            return
+        il, ir = joined['idx'].to_numpy(), joined['idx_r'].to_numpy(np.int64)
+        logged = other[il]
+        actual = me[ir]
+        keep = logged != actual
+        il, ir, logged, actual = il[keep], ir[keep], logged[keep], actual[keep]
+
+        # String comparison only on the distinct (logged, actual) candidate pairs
+        calls = self._calls
+        pairs = pd.DataFrame({'logged': logged, 'actual': actual}).drop_duplicates()
+        similar = {(l, a) for l, a in zip(pairs['logged'], pairs['actual'])
+                   if is_similar_call(calls[l], calls[a])}
+        if not similar:
+            return
+        busted = np.fromiter(((l, a) in similar for l, a in zip(logged, actual)), dtype=bool, count=len(logged))
+        status[il[busted]] = _CODE[STATUS_BUSTED_CALL]
+        partner[il[busted]] = ir[busted]
+
+    # --- Public API ---
+
+    def match(self) -> pd.DataFrame:
+        """
+        Returns one row per valid QSO: 'log' (index into logs), 'row' (index in
+        that log's DataFrame), 'status', and the counterpart 'partner_log' /
+        'partner_row' (-1 when there is none).
+        """
+        if self._result is not None:
+            return self._result
+
+        qsos = self._build_qso_table()
+        if qsos.empty:
+            self._result = pd.DataFrame(columns=['log', 'row', 'status', 'partner_log', 'partner_row'])
+            return self._result
+
+        status = np.full(len(qsos), _CODE[STATUS_UNVERIFIED], dtype=np.int8)
+        partner = np.full(len(qsos), -1, dtype=np.int64)
+
+        self._match_exact(qsos, status, partner)
+        self._flag_band_mismatch(qsos, status, partner)
+        # Worked stations with a log that neither match nor explain the QSO
+        nil = (status == _CODE[STATUS_UNVERIFIED]) & qsos['has_log'].to_numpy()
+        status[nil] = _CODE[STATUS_NOT_IN_LOG]
+        self._flag_busted_calls(qsos, status, partner)
+
+        has_partner = partner >= 0
+        partner_log = np.full(len(qsos), -1, dtype=np.int64)
+        partner_row = np.full(len(qsos), -1, dtype=np.int64)
+        partner_log[has_partner] = qsos['log'].to_numpy()[partner[has_partner]]
+        partner_row[has_partner] = qsos['row'].to_numpy()[partner[has_partner]]
+
+        self._result = pd.DataFrame({
+            'log': qsos['log'].to_numpy(),
+            'row': qsos['row'].to_numpy(),
+            'status': pd.Categorical.from_codes(status, categories=STATUSES),
+            'partner_log': partner_log,
+            'partner_row': partner_row,
+        })
+        return self._result
+
+    def get_match_summary(self, max_exceptions: int = 500) -> Dict[str, Any]:
+        """
+        Summarizes the match result per log.
+
+        Structure:
+        logs -> Callsign -> {scalars: {qsos, checkable, match_rate, <status>: count},
+                             by_band: {Band: {<status>: count}},
+                             exceptions: [{datetime, band, mode, call, status, counterpart}, ...]}
+
+        'checkable' counts QSOs with stations that submitted a log; 'match_rate'
+        is matched / checkable in percent.
+        """
+        data = {
+            "params": {"time_tolerance_s": self.time_tolerance_s, "statuses": list(STATUSES)},
+            "logs": {}
+        }
+        result = self.match()
+        if result.empty:
+            return data
+
+        calls = [str(log.get_metadata().get('MyCall', 'UnknownCall')) for log in self.logs]
+        for log_idx, group in result.groupby('log', sort=True):
+            log = self.logs[log_idx]
+            df = log.get_processed_data()
+            counts = group['status'].value_counts()
+            checkable = int(len(group) - counts.get(STATUS_UNVERIFIED, 0))
+            matched = int(counts.get(STATUS_MATCHED, 0))
+
+            scalars = {"qsos": int(len(group)), "checkable": checkable,
+                       "match_rate": round(matched / checkable * 100, 1) if checkable else 0.0}
+            scalars.update({s: int(counts.get(s, 0)) for s in STATUSES})
+
+            bands = df.loc[group['row'].to_numpy(), 'Band'].to_numpy()
+            by_band = pd.crosstab(bands, group['status'].to_numpy())
+            by_band_dict = {str(b): {s: int(by_band.at[b, s]) if s in by_band.columns else 0 for s in STATUSES}
+                            for b in by_band.index}
+
+            problems = group[group['status'].isin([STATUS_NOT_IN_LOG, STATUS_BUSTED_CALL, STATUS_BAND_MISMATCH])]
+            exceptions = []
+            for row, status, p_log in zip(problems['row'].to_numpy()[:max_exceptions],
+                                          problems['status'].astype(str).to_numpy()[:max_exceptions],
+                                          problems['partner_log'].to_numpy()[:max_exceptions]):
+                qso = df.loc[row]
+                exceptions.append({
+                    "datetime": qso['Datetime'].isoformat(),
+                    "band": str(qso['Band']),
+                    "mode": str(qso.get('Mode', '')),
+                    "call": str(qso['Call']),
+                    "status": status,
+                    "counterpart": calls[p_log] if p_log >= 0 else None,
+                })
+
+            data["logs"][calls[log_idx]] = {
+                "scalars": scalars,
+                "by_band": by_band_dict,
+                "exceptions": exceptions,
+            }
+        return data
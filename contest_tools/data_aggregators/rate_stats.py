@@ -0,0 +1,184 @@
+# contest_tools/data_aggregators/rate_stats.py
+#
+# Purpose: Rolling-window rate statistics (best N-minute rates and a
+#          continuous rate meter) computed from sorted int64 QSO timestamps
+#          with binary search, into a JSON-compatible structure (Pure Python
+#          Primitives).
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import logging
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from contest_tools.utils.report_utils import get_valid_dataframe
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS_MINUTES = (10, 30, 60)
+
+
+def _prefix_sums(times: np.ndarray, weights: Optional[np.ndarray]) -> np.ndarray:
+    """Cumulative totals with a leading zero, so total(i, j) = c[j] - c[i]."""
+    values = np.ones(len(times), dtype=np.float64) if weights is None else weights.astype(np.float64)
+    return np.concatenate(([0.0], np.cumsum(values)))
+
+
+def window_totals(times: np.ndarray, window_s: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Total (QSO count, or sum of weights) in [t_i, t_i + window) for each QSO i.
+    'times' must be sorted epoch seconds.
+    """
+    ends = np.searchsorted(times, times + window_s, side='left')
+    csum = _prefix_sums(times, weights)
+    return csum[ends] - csum[np.arange(len(times))]
+
+
+def best_window(times: np.ndarray, window_s: int, weights: Optional[np.ndarray] = None) -> Tuple[float, Optional[int]]:
+    """
+    Highest total in any window of window_s seconds and the window's start.
+    A best window can always be taken to start at a QSO, so only those are tried.
+    """
+    if len(times) == 0:
+        return 0.0, None
+    totals = window_totals(times, window_s, weights)
+    best = int(np.argmax(totals))
+    return float(totals[best]), int(times[best])
+
+
+def trailing_totals(times: np.ndarray, grid: np.ndarray, window_s: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Total in (g - window, g] for each grid time g; a rate meter sampled on the grid."""
+    csum = _prefix_sums(times, weights)
+    hi = np.searchsorted(times, grid, side='right')
+    lo = np.searchsorted(times, grid - window_s, side='right')
+    return csum[hi] - csum[lo]
+
+
+class RateStatsAggregator:
+    """
+    Best N-minute rates and rate meters for each log, optionally filtered by
+    band, mode and Run status. Sorted timestamps per log and filter are
+    cached, so every window size and report reuses them.
+    Returns pure Python primitives (dict, list, int, str) suitable for JSON serialization.
+    """
+    def __init__(self, logs: List[Any]):
+        self.logs = logs
+        self._columns: Dict[Tuple[int, bool], Dict[str, np.ndarray]] = {}
+        self._series: Dict[Tuple, Tuple[np.ndarray, Optional[np.ndarray]]] = {}
+
+    def _log_columns(self, log: Any, include_dupes: bool) -> Dict[str, np.ndarray]:
+        key = (id(log), include_dupes)
+        columns = self._columns.get(key)
+        if columns is None:
+            df = get_valid_dataframe(log, include_dupes=include_dupes)
+            df = df[df['Datetime'].notna()] if 'Datetime' in df.columns else df.iloc[0:0]
+            times = df['Datetime'].to_numpy('datetime64[s]').astype(np.int64) if not df.empty else np.empty(0, np.int64)
+            order = np.argsort(times, kind='stable')
+
+            columns = {'times': times[order]}
+            for name in ('Band', 'Mode', 'Run'):
+                values = df[name].to_numpy(dtype=object) if name in df.columns else np.full(len(df), None, dtype=object)
+                columns[name] = values[order]
+            points = df['QSOPoints'] if 'QSOPoints' in df.columns else pd.Series(0, index=df.index)
+            columns['QSOPoints'] = pd.to_numeric(points, errors='coerce').fillna(0).to_numpy(np.float64)[order]
+            self._columns[key] = columns
+        return columns
+
+    def get_series(self, log: Any, band_filter: str = None, mode_filter: str = None, run_filter: str = None,
+                   include_dupes: bool = False, metric: str = 'qsos') -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Sorted epoch-second QSO times for one log and filter, with per-QSO
+        weights for metric='points' (None for 'qsos').
+        """
+        key = (id(log), include_dupes, band_filter, mode_filter, run_filter, metric)
+        series = self._series.get(key)
+        if series is None:
+            columns = self._log_columns(log, include_dupes)
+            mask = np.ones(len(columns['times']), dtype=bool)
+            for name, value in (('Band', band_filter), ('Mode', mode_filter), ('Run', run_filter)):
+                if value:
+                    mask &= columns[name] == value
+            times = columns['times'][mask]
+            weights = columns['QSOPoints'][mask] if metric == 'points' else None
+            series = (times, weights)
+            self._series[key] = series
+        return series
+
+    def get_best_rates(self, windows_minutes: Sequence[int] = DEFAULT_WINDOWS_MINUTES, band_filter: str = None,
+                       mode_filter: str = None, run_filter: str = None, include_dupes: bool = False,
+                       metric: str = 'qsos') -> Dict[str, Any]:
+        """
+        Best rate for each window length.
+
+        Structure:
+        {windows: [10, 30, 60], metric,
+         logs: {Callsign: {total, best: {"10": {total, per_hour, start, end}}}}}
+        """
+        data = {"windows": list(windows_minutes), "metric": metric, "logs": {}}
+        for log in self.logs:
+            callsign = log.get_metadata().get('MyCall', 'Unknown')
+            times, weights = self.get_series(log, band_filter, mode_filter, run_filter, include_dupes, metric)
+            best = {}
+            for minutes in windows_minutes:
+                total, start = best_window(times, minutes * 60, weights)
+                best[str(minutes)] = {
+                    "total": int(round(total)),
+                    "per_hour": round(total * 60.0 / minutes, 1),
+                    "start": pd.Timestamp(start, unit='s', tz='UTC').isoformat() if start is not None else None,
+                    "end": pd.Timestamp(start + minutes * 60, unit='s', tz='UTC').isoformat() if start is not None else None,
+                }
+            data["logs"][callsign] = {
+                "total": int(round(weights.sum())) if weights is not None else int(len(times)),
+                "best": best,
+            }
+        return data
+
+    def _grid(self, step_s: int) -> np.ndarray:
+        """Sample times covering the master time index (or all QSOs), every step_s seconds."""
+        log_manager = getattr(self.logs[0], '_log_manager_ref', None) if self.logs else None
+        master_index = getattr(log_manager, 'master_time_index', None)
+        if master_index is not None and len(master_index):
+            start = int(master_index[0].timestamp())
+            end = int(master_index[-1].timestamp()) + 3600
+        else:
+            all_times = [self._log_columns(log, False)['times'] for log in self.logs]
+            all_times = np.concatenate(all_times) if all_times else np.empty(0, np.int64)
+            if len(all_times) == 0:
+                return np.empty(0, np.int64)
+            start = int(all_times.min()) // 3600 * 3600
+            end = int(all_times.max()) // 3600 * 3600 + 3600
+        return np.arange(start + step_s, end + 1, step_s, dtype=np.int64)
+
+    def get_rate_meter(self, window_minutes: int = 60, step_minutes: int = 1, band_filter: str = None,
+                       mode_filter: str = None, run_filter: str = None, include_dupes: bool = False,
+                       metric: str = 'qsos') -> Dict[str, Any]:
+        """
+        Instantaneous rate (per hour, over the trailing window) sampled every step.
+
+        Structure:
+        {time_bins: [...], window_minutes, metric, logs: {Callsign: [per-hour rate per bin]}}
+        """
+        grid = self._grid(step_minutes * 60)
+        data = {
+            "time_bins": [pd.Timestamp(t, unit='s', tz='UTC').isoformat() for t in grid],
+            "window_minutes": window_minutes,
+            "metric": metric,
+            "logs": {},
+        }
+        scale = 60.0 / window_minutes
+        for log in self.logs:
+            callsign = log.get_metadata().get('MyCall', 'Unknown')
+            times, weights = self.get_series(log, band_filter, mode_filter, run_filter, include_dupes, metric)
+            totals = trailing_totals(times, grid, window_minutes * 60, weights)
+            data["logs"][callsign] = np.round(totals * scale, 1).tolist()
+        return data
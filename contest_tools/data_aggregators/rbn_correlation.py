@@ -0,0 +1,241 @@
+# contest_tools/data_aggregators/rbn_correlation.py
+#
+# Purpose: Correlates a log's Run QSOs with Reverse Beacon Network spots of
+#          the logging station. Spots are read from the columnar RBN store
+#          and joined to Run QSOs with a sorted as-of join on (band, time)
+#          plus a frequency tolerance, then binned onto the master time index
+#          as per-hour spot counts, skimmer continent coverage and SNR
+#          quantiles (Pure Python Primitives).
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import logging
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..contest_log import ContestLog
+from ..utils.report_utils import get_valid_dataframe
+from ..utils.rbn_store import RbnSpotStore, get_default_store_root
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIME_TOLERANCE_S = 600      # A spot counts for a Run QSO logged within 10 minutes
+DEFAULT_FREQ_TOLERANCE_KHZ = 1.0    # ...on the same band, within 1 kHz of the logged frequency
+DEFAULT_SNR_QUANTILES = (0.1, 0.5, 0.9)
+
+_SPOT_COLUMNS = ['time', 'freq', 'snr', 'skimmer', 'de_cont', 'band']
+_EPOCH = pd.Timestamp(0, tz='UTC')
+
+
+def correlate_run_spots(run_qsos: pd.DataFrame, spots: pd.DataFrame,
+                        time_tolerance_s: int = DEFAULT_TIME_TOLERANCE_S,
+                        freq_tolerance_khz: float = DEFAULT_FREQ_TOLERANCE_KHZ) -> np.ndarray:
+    """
+    Flags the spots heard while the station was running.
+
+    Each spot is matched to the nearest Run QSO in time on the same band
+    (pandas.merge_asof, both sides sorted by time) and kept only if the QSO
+    lies within the time tolerance and its logged frequency within the
+    frequency tolerance of the spotted frequency.
+
+    Args:
+        run_qsos: Columns 'time' (int64 epoch seconds), 'band' (lower case), 'freq' (kHz).
+        spots: Store query result with 'time', 'band' and 'freq', sorted by time.
+
+    Returns:
+        Boolean array aligned to the rows of 'spots'.
+    """
+    if spots.empty or run_qsos.empty:
+        return np.zeros(len(spots), dtype=bool)
+
+    left = pd.DataFrame({'time': spots['time'].to_numpy(np.int64),
+                         'band': spots['band'].astype(str).to_numpy(),
+                         'row': np.arange(len(spots))})
+    right = pd.DataFrame({'time': run_qsos['time'].to_numpy(np.int64),
+                          'band': run_qsos['band'].to_numpy(),
+                          'qso_freq': run_qsos['freq'].to_numpy(np.float64)}).sort_values('time', kind='stable')
+
+    joined = pd.merge_asof(left, right, on='time', by='band', direction='nearest',
+                           tolerance=int(time_tolerance_s))
+    qso_freq = joined['qso_freq'].to_numpy()
+    spot_freq = spots['freq'].to_numpy(np.float64)[joined['row'].to_numpy()]
+
+    matched = np.zeros(len(spots), dtype=bool)
+    with np.errstate(invalid='ignore'):
+        matched[joined['row'].to_numpy()] = np.abs(spot_freq - qso_freq) <= freq_tolerance_khz
+    return matched
+
+
+class RbnCorrelationAggregator:
+    """
+    Relates each log's Run QSOs to the RBN spots of its own callsign.
+    Returns pure Python primitives (dict, list, int, float, str) suitable for JSON serialization.
+    """
+    def __init__(self, logs: List[ContestLog], store: Optional[RbnSpotStore] = None):
+        self.logs = logs
+        self.store = store
+
+    def _get_store(self) -> Optional[RbnSpotStore]:
+        if self.store is not None:
+            return self.store
+        root = get_default_store_root()
+        if not root:
+            return None
+        try:
+            self.store = RbnSpotStore(root)
+        except ImportError as e:
+            logger.warning(f"RBN correlation unavailable: {e}")
+            return None
+        return self.store
+
+    def _get_master_index(self) -> Optional[pd.DatetimeIndex]:
+        log_manager = getattr(self.logs[0], '_log_manager_ref', None)
+        master_index = getattr(log_manager, 'master_time_index', None)
+        if master_index is not None and len(master_index) > 0:
+            return master_index
+        # Fallback: hours spanned by the logs themselves
+        all_times = pd.concat([log.get_processed_data()['Datetime'] for log in self.logs]).dropna()
+        if all_times.empty:
+            return None
+        return pd.date_range(all_times.min().floor('h'), all_times.max().floor('h'), freq='h', tz='UTC')
+
+    def get_correlation_data(self, time_tolerance_s: int = DEFAULT_TIME_TOLERANCE_S,
+                             freq_tolerance_khz: float = DEFAULT_FREQ_TOLERANCE_KHZ,
+                             snr_quantiles: Sequence[float] = DEFAULT_SNR_QUANTILES) -> Dict[str, Any]:
+        """
+        Generates per-hour RBN correlation data for every log.
+
+        Structure:
+        logs -> Callsign -> {scalars, hourly: {spots, run_spots, run_qsos, skimmers,
+                                               continents: {Continent: [...]},
+                                               snr: {'p50': [...], ...}}}
+
+        All hourly lists are aligned to 'time_bins'. Continent coverage and SNR
+        quantiles are computed over the spots correlated with Run QSOs.
+        """
+        data = {
+            "time_bins": [],
+            "params": {
+                "time_tolerance_s": int(time_tolerance_s),
+                "freq_tolerance_khz": float(freq_tolerance_khz),
+                "snr_quantiles": [float(q) for q in snr_quantiles],
+            },
+            "logs": {}
+        }
+        if not self.logs:
+            return data
+
+        master_index = self._get_master_index()
+        if master_index is None:
+            return data
+        data["time_bins"] = [t.isoformat() for t in master_index]
+
+        store = self._get_store()
+        if store is None or not store.dates():
+            logger.warning("RBN correlation skipped: no RBN spot store available.")
+            return data
+
+        t0 = int(master_index[0].timestamp())
+        n_bins = len(master_index)
+        t_end = t0 + n_bins * 3600 - 1
+
+        for log in self.logs:
+            callsign = log.get_metadata().get('MyCall', 'UnknownCall')
+            try:
+                spots = store.query(dx=callsign, start=t0, end=t_end, columns=_SPOT_COLUMNS)
+            except Exception as e:
+                logger.error(f"RBN query failed for {callsign}: {e}")
+                continue
+            run_qsos = self._get_run_qsos(log)
+            data["logs"][callsign] = self._aggregate_log(
+                spots, run_qsos, t0, n_bins, time_tolerance_s, freq_tolerance_khz, snr_quantiles)
+
+        return data
+
+    @staticmethod
+    def _get_run_qsos(log: ContestLog) -> pd.DataFrame:
+        df = get_valid_dataframe(log, include_dupes=False)
+        if df.empty or 'Run' not in df.columns:
+            return pd.DataFrame(columns=['time', 'band', 'freq'])
+        df = df[(df['Run'] == 'Run') & df['Datetime'].notna() & df['Frequency'].notna()]
+        return pd.DataFrame({
+            'time': ((df['Datetime'] - _EPOCH) // pd.Timedelta(seconds=1)).to_numpy(np.int64),
+            'band': df['Band'].astype(str).str.lower().to_numpy(),
+            'freq': df['Frequency'].astype('float64').to_numpy(),
+        })
+
+    @staticmethod
+    def _aggregate_log(spots: pd.DataFrame, run_qsos: pd.DataFrame, t0: int, n_bins: int,
+                       time_tolerance_s: int, freq_tolerance_khz: float,
+                       snr_quantiles: Sequence[float]) -> Dict[str, Any]:
+        q_keys = [f"p{int(round(q * 100))}" for q in snr_quantiles]
+        qso_hours = (run_qsos['time'].to_numpy(np.int64) - t0) // 3600
+        qso_hours = qso_hours[(qso_hours >= 0) & (qso_hours < n_bins)]
+
+        matched = correlate_run_spots(run_qsos, spots, time_tolerance_s, freq_tolerance_khz)
+        hours = (spots['time'].to_numpy(np.int64) - t0) // 3600
+        in_range = (hours >= 0) & (hours < n_bins)
+        hours, matched = hours[in_range], matched[in_range]
+        spots = spots[in_range]
+
+        run_hours = hours[matched]
+        run_spots = spots[matched]
+
+        # Unique skimmers per hour: distinct (hour, skimmer code) pairs
+        skimmer_codes = run_spots['skimmer'].cat.codes.to_numpy(np.int64) if len(run_spots) else np.empty(0, np.int64)
+        known = skimmer_codes >= 0
+        n_skimmers = int(skimmer_codes.max()) + 1 if known.any() else 1
+        pairs = np.unique(run_hours[known] * n_skimmers + skimmer_codes[known])
+        skimmers_per_hour = np.bincount(pairs // n_skimmers, minlength=n_bins)
+
+        # Continent coverage: one bincount over (continent, hour)
+        continents = {}
+        if len(run_spots):
+            cont = run_spots['de_cont'].cat.remove_unused_categories()
+            codes = cont.cat.codes.to_numpy(np.int64)
+            known = codes >= 0
+            grid = np.bincount(codes[known] * n_bins + run_hours[known],
+                               minlength=len(cont.cat.categories) * n_bins)
+            grid = grid.reshape(len(cont.cat.categories), n_bins)
+            for i, name in enumerate(cont.cat.categories):
+                continents[str(name)] = grid[i].tolist()
+
+        # SNR quantiles per hour; hours without correlated spots are None
+        snr = {k: [None] * n_bins for k in q_keys}
+        if len(run_spots):
+            quant = (pd.Series(run_spots['snr'].to_numpy(np.float64), index=run_hours)
+                     .groupby(level=0).quantile(list(snr_quantiles)).unstack())
+            for q, key in zip(snr_quantiles, q_keys):
+                col = snr[key]
+                for hour, value in quant[q].items():
+                    if pd.notna(value):
+                        col[int(hour)] = round(float(value), 1)
+
+        total_skimmers = int(run_spots['skimmer'].nunique()) if len(run_spots) else 0
+        return {
+            "scalars": {
+                "spots": int(len(spots)),
+                "run_spots": int(len(run_spots)),
+                "run_qsos": int(len(qso_hours)),
+                "skimmers": total_skimmers,
+                "continents": sorted(continents),
+            },
+            "hourly": {
+                "spots": np.bincount(hours, minlength=n_bins).tolist(),
+                "run_spots": np.bincount(run_hours, minlength=n_bins).tolist(),
+                "run_qsos": np.bincount(qso_hours, minlength=n_bins).tolist(),
+                "skimmers": skimmers_per_hour.tolist(),
+                "continents": continents,
+                "snr": snr,
+            }
+        }
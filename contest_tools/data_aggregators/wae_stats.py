@@ -55,64 +55,44 @@ class WaeStatsAggregator:
                 continue
 
             # 2. Calculate Breakdowns (Band/Mode)
-            breakdown_list = []
+            # One groupby per statistic instead of re-filtering the frame per group.
+            # QSO Pts per row is the QSO count, as in the original text report;
+            # the total below uses the 'QSOPoints' sum.
+            mult_cols = [col for col in ['Mult1', 'Mult2'] if col in qsos_df.columns]
             band_mode_groups = qsos_df.groupby(['Band', 'Mode'])
-            
-            # Helper for sorting
+            qso_counts = band_mode_groups.size()
+            weighted_mults_by_group = pd.Series(0, index=qso_counts.index)
+            for col in mult_cols:
+                weighted_mults_by_group = weighted_mults_by_group + band_mode_groups[col].nunique()
+
             # We sort primarily by Band Index in _HAM_BANDS, then by Mode
-            sorted_groups = sorted(
-                band_mode_groups, 
-                key=lambda x: (
-                    self._CANONICAL_BAND_ORDER.index(x[0][0]) if x[0][0] in self._CANONICAL_BAND_ORDER else 99, 
-                    x[0][1]
+            sorted_keys = sorted(
+                qso_counts.index,
+                key=lambda key: (
+                    self._CANONICAL_BAND_ORDER.index(key[0]) if key[0] in self._CANONICAL_BAND_ORDER else 99,
+                    key[1]
                 )
             )
 
-            for (band, mode), group_df in sorted_groups:
-                qso_pts = len(group_df) # WAE: 1 point per QSO (usually), but verify against original logic 
-                # Original logic: qso_pts = len(group_df) in the loop, BUT total points used 'QSOPoints'.sum().
-                # In WAE text report (original):
-                #   Loop: qso_pts = len(group_df)  <-- This is purely count for the row
-                #   Total: total_qso_pts = qsos_df['QSOPoints'].sum() <-- This is the score
-                # Wait, strictly following original implementation:
-                
-                # The original `text_wae_score_report.py` line 10-11: `qso_pts = len(group_df)`
-                # The original `text_wae_score_report.py` line 13: `total_qso_pts = qsos_df['QSOPoints'].sum()`
-                # There is a divergence in the original code between the row-level "QSO Pts" (Count) and Total (Sum).
-                # However, usually in WAE 1 QSO = 1 Point.
-                # To be perfectly safe and match "QSO Pts" column of original report, I will use len(group_df).
-                # Weighted Multipliers
-                weighted_mults = 0
-                mult_cols = ['Mult1', 'Mult2']
-                df_mults = group_df[group_df[mult_cols].notna().any(axis=1)]
-                
-                for col in mult_cols:
-                    if col in df_mults.columns:
-                        unique_mults_on_band = df_mults[col].nunique()
-                        weighted_mults += unique_mults_on_band * self._BAND_WEIGHTS.get(band, 1)
-
+            breakdown_list = []
+            for band, mode in sorted_keys:
                 breakdown_list.append({
                     "band": band,
                     "mode": mode,
-                    "qso_points": len(group_df), # Matches original row logic
-                    "weighted_mults": weighted_mults
+                    "qso_points": int(qso_counts[(band, mode)]),
+                    "weighted_mults": int(weighted_mults_by_group[(band, mode)]) * self._BAND_WEIGHTS.get(band, 1)
                 })
 
             # 3. Calculate Totals
             total_qso_pts = qsos_df['QSOPoints'].sum() # Matches original total logic
             total_qtc_pts = len(qtcs_df)
             
+            # Total weighted mults are counted per Band (not Band/Mode)
             total_weighted_mults = 0
-            mult_cols = ['Mult1', 'Mult2']
-            df_mults_all = qsos_df[qsos_df[mult_cols].notna().any(axis=1)]
-            
-            # Recalculate total weighted mults based on Band aggregation (not Band/Mode)
-            # This logic mimics line 14-15 of original text_wae_score_report.py
             for col in mult_cols:
-                if col in df_mults_all.columns:
-                    band_mult_counts = df_mults_all.groupby('Band')[col].nunique()
-                    for band, count in band_mult_counts.items():
-                        total_weighted_mults += count * self._BAND_WEIGHTS.get(band, 1)
+                band_mult_counts = qsos_df.groupby('Band')[col].nunique()
+                for band, count in band_mult_counts.items():
+                    total_weighted_mults += count * self._BAND_WEIGHTS.get(band, 1)
 
             final_score = (total_qso_pts + total_qtc_pts) * total_weighted_mults
 
@@ -0,0 +1,130 @@
+# contest_tools/exchange_compiler.py
+#
+# Purpose: Compiles a contest's JSON exchange parsing rules into a single
+#          precompiled regex that is applied to a whole block of QSO
+#          exchanges. The rules are alternatives of one pattern, tried in
+#          order by the regex engine, so each exchange is matched once
+#          instead of once per rule.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MISSING = float('nan')
+
+
+class ExchangePlan:
+    """
+    A list of exchange parsing rules ({'regex': ..., 'groups': [...]})
+    compiled into one pattern:
+
+        (?P<_r0>(?:rule_0))|(?P<_r1>(?:rule_1))|...
+
+    Python tries the alternatives in order and stops at the first that
+    matches, exactly like calling re.match() with each rule in turn. The
+    named group around each rule closes last, so match.lastgroup tells
+    which rule matched.
+    """
+    def __init__(self, rules: Sequence[Dict[str, Any]]):
+        self.rules: List[Dict[str, Any]] = [
+            {'regex': rule['regex'], 'groups': list(rule.get('groups', []))} for rule in rules
+        ]
+        self.group_names: List[str] = list(dict.fromkeys(
+            name for rule in self.rules for name in rule['groups']
+        ))
+        positions = {name: i for i, name in enumerate(self.group_names)}
+
+        # Per rule: (rule index, target positions in group_names, slice of match.groups())
+        self._layout: Dict[str, Tuple[int, Optional[Tuple[int, ...]], slice]] = {}
+        branches = []
+        column = 0
+        for index, rule in enumerate(self.rules):
+            try:
+                group_count = re.compile(rule['regex']).groups
+            except re.error as e:
+                raise ValueError(f"Exchange rule {index} has an invalid regex: {e}") from e
+            if group_count != len(rule['groups']):
+                raise ValueError(
+                    f"Exchange rule {index} regex has {group_count} groups but lists {len(rule['groups'])} group names"
+                )
+            name = f"_r{index}"
+            targets = tuple(positions[group] for group in rule['groups'])
+            # A rule that fills every column in order needs no remapping
+            if targets == tuple(range(len(self.group_names))):
+                targets = None
+            self._layout[name] = (index, targets, slice(column + 1, column + 1 + group_count))
+            branches.append(f"(?P<{name}>(?:{rule['regex']}))")
+            column += 1 + group_count
+        try:
+            self.pattern = re.compile('|'.join(branches)) if branches else None
+        except re.error as e:
+            raise ValueError(f"Exchange rules cannot be combined into one pattern: {e}") from e
+
+    def parse(self, exchanges: Iterable[str]) -> Tuple[List[int], List[Tuple[Any, ...]]]:
+        """
+        Matches every exchange against the combined pattern.
+
+        Returns (rule_index, values): rule_index is the position of the
+        matching rule in self.rules, or -1; values holds one tuple per
+        exchange, aligned to group_names. Groups of the matching rule that
+        did not participate are None; all other positions are MISSING (NaN).
+        """
+        blank = [MISSING] * len(self.group_names)
+        rule_index: List[int] = []
+        values: List[Tuple[Any, ...]] = []
+        if self.pattern is None:
+            for _ in exchanges:
+                rule_index.append(-1)
+                values.append(tuple(blank))
+            return rule_index, values
+
+        match = self.pattern.match
+        layout = self._layout
+        for exchange in exchanges:
+            m = match(exchange)
+            if m is None:
+                rule_index.append(-1)
+                values.append(tuple(blank))
+                continue
+            index, targets, groups = layout[m.lastgroup]
+            if targets is None:
+                values.append(m.groups()[groups])
+            else:
+                row = blank.copy()
+                for target, value in zip(targets, m.groups()[groups]):
+                    row[target] = value
+                values.append(tuple(row))
+            rule_index.append(index)
+        return rule_index, values
+
+
+_PLAN_CACHE: Dict[Tuple[Tuple[str, Tuple[str, ...]], ...], ExchangePlan] = {}
+_PLAN_LOCK = threading.Lock()
+
+
+def compile_exchange_rules(rules: Any) -> ExchangePlan:
+    """
+    Returns the ExchangePlan for a rule or list of rules from a contest
+    definition's exchange_parsing_rules. Plans are cached process-wide.
+    """
+    if isinstance(rules, dict):
+        rules = [rules]
+    key = tuple((rule['regex'], tuple(rule.get('groups', []))) for rule in (rules or []))
+    plan = _PLAN_CACHE.get(key)
+    if plan is None:
+        with _PLAN_LOCK:
+            plan = _PLAN_CACHE.get(key)
+            if plan is None:
+                plan = ExchangePlan(rules or [])
+                _PLAN_CACHE[key] = plan
+    return plan
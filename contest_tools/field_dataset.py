@@ -0,0 +1,301 @@
+# contest_tools/field_dataset.py
+#
+# Purpose: Defines the FieldDataset class, an on-disk columnar dataset of every
+#          QSO from a whole contest field (hundreds to thousands of Cabrillo
+#          logs). Each log is streamed through parse -> annotate one at a time
+#          and written as its own Parquet part with a 'MyCall' column, so
+#          memory stays bounded by the largest single log and a failing file
+#          only costs that file. Aggregate queries live in
+#          data_aggregators/field_stats.py.
+#
+#          Requires the optional 'pyarrow' package.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import json
+import glob
+import logging
+from typing import List, Dict, Any, Iterator, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from .contest_log import ContestLog
+from .log_manager import LogManager
+from .core_annotations import CtyLookup, BandAllocator
+from .utils.profiler import profile_section, ProfileContext
+from .utils.callsign_utils import callsign_to_filename_part
+
+logger = logging.getLogger(__name__)
+
+# Columns kept for every QSO (when the contest produces them); multiplier value
+# columns named by the contest definition are appended.
+CORE_COLUMNS = ['Datetime', 'MyCall', 'Call', 'Band', 'Mode', 'Frequency', 'Run',
+                'QSOPoints', 'Continent', 'DXCCName', 'CQZone', 'ITUZone']
+_NUMERIC_COLUMNS = {'Frequency', 'QSOPoints'}
+_LOG_EXTENSIONS = ('.log', '.cbr', '.txt')
+_INDEX_FLUSH_EVERY = 50
+_LOGS_PER_BATCH = 64
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("The field dataset requires 'pyarrow'. Install it with: pip install pyarrow")
+
+
+def find_log_files(log_dir: str) -> List[str]:
+    """Returns the Cabrillo files in a directory (non-recursive), sorted by name."""
+    files = [p for p in glob.glob(os.path.join(log_dir, '*'))
+             if os.path.isfile(p) and p.lower().endswith(_LOG_EXTENSIONS)]
+    return sorted(files)
+
+
+class FieldDataset:
+    """
+    A directory of per-log Parquet parts plus a JSON index:
+
+        <root_dir>/field_index.json
+        <root_dir>/parts/<call>.parquet
+
+    Dupes are excluded at ingest, matching get_valid_dataframe().
+    """
+    INDEX_FILENAME = 'field_index.json'
+    PARTS_DIRNAME = 'parts'
+
+    def __init__(self, root_dir: str):
+        _require_pyarrow()
+        self.root_dir = root_dir
+        self.parts_dir = os.path.join(root_dir, self.PARTS_DIRNAME)
+        self.index = self._load_index()
+
+    # --- Index ---
+
+    def _index_path(self) -> str:
+        return os.path.join(self.root_dir, self.INDEX_FILENAME)
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Field index unreadable, starting a new one: {e}")
+        return {'contest': None, 'event_id': None, 'year': None, 'columns': [], 'mult_columns': [],
+                'logs': {}, 'failures': {}}
+
+    def _save_index(self) -> None:
+        os.makedirs(self.root_dir, exist_ok=True)
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp_path, self._index_path())
+
+    @property
+    def logs(self) -> Dict[str, Dict[str, Any]]:
+        """Index entries of the ingested logs, keyed by source filename."""
+        return self.index['logs']
+
+    @property
+    def failures(self) -> Dict[str, str]:
+        """Source filename -> error message for files that could not be ingested."""
+        return self.index['failures']
+
+    def get_time_range(self) -> Optional[tuple]:
+        """(first, last) QSO timestamps across the field, or None if empty."""
+        entries = [e for e in self.logs.values() if e.get('first_qso')]
+        if not entries:
+            return None
+        first = min(pd.Timestamp(e['first_qso']) for e in entries)
+        last = max(pd.Timestamp(e['last_qso']) for e in entries)
+        return first, last
+
+    def get_master_time_index(self) -> Optional[pd.DatetimeIndex]:
+        """Hourly bins covering the whole field, built like LogManager.master_time_index."""
+        time_range = self.get_time_range()
+        if time_range is None:
+            return None
+        start, end = time_range[0].floor('h'), time_range[1].floor('h')
+        periods = int((end - start).total_seconds() // 3600) + 1
+        return pd.date_range(start=start, periods=periods, freq='h', tz='UTC')
+
+    # --- Ingest ---
+
+    def _is_current(self, path: str) -> bool:
+        entry = self.logs.get(os.path.basename(path))
+        if not entry:
+            return False
+        stat = os.stat(path)
+        return (entry.get('size') == stat.st_size and entry.get('mtime') == int(stat.st_mtime)
+                and os.path.exists(os.path.join(self.root_dir, entry['part'])))
+
+    def _to_table(self, df: pd.DataFrame) -> "pa.Table":
+        """Coerces a QSO frame to the dataset's fixed column set and types."""
+        columns = {}
+        for col in self.index['columns']:
+            series = df[col] if col in df.columns else pd.Series([None] * len(df), index=df.index)
+            if col == 'Datetime':
+                columns[col] = pa.array(pd.to_datetime(series, utc=True), type=pa.timestamp('s', tz='UTC'))
+            elif col in _NUMERIC_COLUMNS:
+                columns[col] = pa.array(pd.to_numeric(series, errors='coerce'), type=pa.float64(), from_pandas=True)
+            else:
+                columns[col] = pa.array(series.astype('string'), type=pa.string(), from_pandas=True)
+        return pa.table(columns)
+
+    def add_log_frame(self, df: pd.DataFrame, my_call: str, source: str, extra: Dict[str, Any] = None) -> str:
+        """
+        Writes one log's (non-dupe) QSOs as a Parquet part and records it in the index.
+
+        Returns:
+            The part path relative to the dataset root.
+        """
+        df = df[df['Dupe'] == False] if 'Dupe' in df.columns else df
+        df = df.assign(MyCall=my_call)
+        os.makedirs(self.parts_dir, exist_ok=True)
+
+        part = os.path.join(self.PARTS_DIRNAME, f"{callsign_to_filename_part(my_call)}.parquet")
+        # Re-ingesting a renamed file replaces the old entry for the same station
+        for other_source in [s for s, e in self.logs.items() if e['part'] == part and s != source]:
+            del self.logs[other_source]
+        part_path = os.path.join(self.root_dir, part)
+        tmp_path = part_path + '.tmp'
+        pq.write_table(self._to_table(df), tmp_path, compression='zstd')
+        os.replace(tmp_path, part_path)
+
+        datetimes = df['Datetime'].dropna()
+        entry = {
+            'call': my_call,
+            'part': part,
+            'qsos': int(len(df)),
+            'first_qso': datetimes.min().isoformat() if not datetimes.empty else None,
+            'last_qso': datetimes.max().isoformat() if not datetimes.empty else None,
+        }
+        entry.update(extra or {})
+        self.logs[source] = entry
+        self.failures.pop(source, None)
+        return part
+
+    def _set_schema(self, log: ContestLog) -> None:
+        mult_columns = []
+        for rule in log.contest_definition.multiplier_rules:
+            col = rule.get('value_column')
+            if col and col not in mult_columns and col not in CORE_COLUMNS:
+                mult_columns.append(col)
+        self.index['columns'] = CORE_COLUMNS + mult_columns
+        self.index['mult_columns'] = list(dict.fromkeys(
+            rule.get('value_column') for rule in log.contest_definition.multiplier_rules if rule.get('value_column')))
+
+    @profile_section("Field Dataset Build (Total)")
+    def build(self, log_filepaths: List[str], root_input_dir: str, cty_specifier: str = 'after',
+              custom_cty_path: str = None, overwrite: bool = False) -> Dict[str, int]:
+        """
+        Streams every log through parse -> annotate -> Parquet part, one at a time.
+
+        Unlike LogManager.load_log_batch, a file that fails to parse, or that
+        belongs to a different contest, event or year than the first ingested
+        log, is recorded under 'failures' and skipped. Files already ingested
+        with the same size and mtime are skipped unless overwrite is set.
+
+        Returns:
+            Counts: {'ingested', 'skipped', 'failed'}.
+        """
+        counts = {'ingested': 0, 'skipped': 0, 'failed': 0}
+        if not log_filepaths:
+            return counts
+
+        helper = LogManager()
+        with ProfileContext("CTY File Resolution"):
+            cty_dat_path = helper.resolve_cty_file(log_filepaths, root_input_dir, cty_specifier, custom_cty_path)
+        shared_cty_lookup = CtyLookup(cty_dat_path=cty_dat_path)
+        shared_band_allocator = BandAllocator(root_input_dir)
+
+        try:
+            for i, path in enumerate(log_filepaths, 1):
+                source = os.path.basename(path)
+                if not overwrite and self._is_current(path):
+                    counts['skipped'] += 1
+                    continue
+                try:
+                    self._ingest_file(path, helper, root_input_dir, cty_dat_path,
+                                      shared_cty_lookup, shared_band_allocator)
+                    counts['ingested'] += 1
+                except Exception as e:
+                    logger.error(f"Field dataset: skipping {source}: {e}")
+                    self.failures[source] = str(e)
+                    counts['failed'] += 1
+                if i % _INDEX_FLUSH_EVERY == 0:
+                    logger.info(f"Field dataset: {i}/{len(log_filepaths)} files processed")
+                    self._save_index()
+        finally:
+            self._save_index()
+
+        logger.info(f"Field dataset built at {self.root_dir}: {counts}")
+        return counts
+
+    def _ingest_file(self, path: str, helper: LogManager, root_input_dir: str, cty_dat_path: str,
+                     shared_cty_lookup: CtyLookup, shared_band_allocator: BandAllocator) -> None:
+        contest_name = helper._get_contest_name_from_header(path)
+        if not contest_name:
+            raise ValueError("No CONTEST: header")
+        if self.index['contest'] and contest_name != self.index['contest']:
+            raise ValueError(f"Contest mismatch: '{contest_name}' (dataset is '{self.index['contest']}')")
+
+        log = ContestLog(contest_name=contest_name, cabrillo_filepath=path, root_input_dir=root_input_dir,
+                         cty_dat_path=cty_dat_path, shared_cty_lookup=shared_cty_lookup,
+                         shared_band_allocator=shared_band_allocator)
+        log.apply_annotations()
+        df = log.get_processed_data()
+        if df.empty or df['Datetime'].dropna().empty:
+            raise ValueError("No valid QSO records")
+
+        event_id = helper._get_event_id(log)
+        year = str(df['Datetime'].dropna().iloc[0].year)
+        if self.index['contest'] is None:
+            self.index.update({'contest': contest_name, 'event_id': event_id, 'year': year})
+            self._set_schema(log)
+        elif event_id != self.index['event_id'] or year != self.index['year']:
+            raise ValueError(f"Event mismatch: {year} '{event_id}' "
+                             f"(dataset is {self.index['year']} '{self.index['event_id']}')")
+
+        stat = os.stat(path)
+        my_call = str(log.get_metadata().get('MyCall', 'Unknown')).upper()
+        self.add_log_frame(df, my_call, os.path.basename(path),
+                           extra={'size': stat.st_size, 'mtime': int(stat.st_mtime)})
+
+    # --- Reading ---
+
+    def iter_frames(self, columns: Optional[List[str]] = None,
+                    logs_per_batch: int = _LOGS_PER_BATCH) -> Iterator[pd.DataFrame]:
+        """
+        Yields the QSOs of up to 'logs_per_batch' logs at a time, reading only the
+        requested columns (plus 'MyCall' to tell the stations apart). Aggregations
+        consume these one batch at a time to keep memory bounded.
+        """
+        if columns is not None and 'MyCall' not in columns:
+            columns = list(columns) + ['MyCall']
+        entries = list(self.logs.values())
+        for start in range(0, len(entries), logs_per_batch):
+            tables = []
+            for entry in entries[start:start + logs_per_batch]:
+                part_path = os.path.join(self.root_dir, entry['part'])
+                try:
+                    tables.append(pq.read_table(part_path, columns=columns))
+                except (OSError, pa.ArrowInvalid) as e:
+                    logger.warning(f"Field dataset: cannot read {entry['part']}: {e}")
+            if tables:
+                yield pa.concat_tables(tables).to_pandas()
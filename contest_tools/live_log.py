@@ -0,0 +1,586 @@
+# contest_tools/live_log.py
+#
+# Purpose: Live-contest mode. A LiveLog is a ContestLog that grows while the
+#          contest is running: QSOs arrive in small batches from a tailed
+#          Cabrillo or ADIF file or from N1MM-style UDP contact broadcasts,
+#          and only the new QSOs are annotated. Dupe and multiplier checks
+#          use maintained sets, Run/S&P uses an incremental per-stream state
+#          machine, and score/rate counters are updated per QSO, so a
+#          dashboard can be refreshed from memory at any time.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import re
+import bisect
+import socket
+import logging
+import importlib
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+from .contest_log import ContestLog
+from .contest_definitions import ContestDefinition
+from .cabrillo_parser import _parse_qso_line
+from .core_annotations import CtyLookup, process_dataframe_for_cty_data, IncrementalRunSPClassifier
+
+logger = logging.getLogger(__name__)
+
+# Cabrillo mode codes for the mode names used by ADIF and N1MM
+_MODE_MAP = {
+    'CW': 'CW', 'SSB': 'PH', 'USB': 'PH', 'LSB': 'PH', 'AM': 'PH', 'PH': 'PH',
+    'FM': 'FM', 'RTTY': 'RY', 'RY': 'RY', 'PSK': 'DG', 'PSK31': 'DG', 'FT8': 'DG', 'FT4': 'DG', 'DG': 'DG',
+}
+
+
+def _normalize_mode(mode: Any) -> str:
+    mode = str(mode or '').strip().upper()
+    return _MODE_MAP.get(mode, mode)
+
+
+def _base_call(call: str) -> str:
+    """Callsign without partition marker or portable suffix, for self-QSO checks."""
+    call = str(call or '').upper().strip().partition('-')[0]
+    for suffix in ["/P", "/B", "/M", "/QRP"]:
+        if call.endswith(suffix):
+            return call[:-len(suffix)]
+    return call
+
+
+class LiveLog(ContestLog):
+    """
+    A ContestLog fed incrementally while the contest is running.
+
+    QSOs must arrive roughly in time order. The annotated frame returned by
+    get_processed_data() is rebuilt lazily from the appended batches; live
+    counters (score, multipliers, rates) never rescan it.
+
+    Resolver columns that flag the first QSO of a multiplier (e.g. WPX Mult1,
+    ARRL DX *_IsNewMult) are computed per batch. The live multiplier count
+    uses its own worked sets and is exact.
+    """
+    def __init__(self, contest_name: str, root_input_dir: str, cty_dat_path: str, my_call: str,
+                 metadata: Optional[Dict[str, Any]] = None, shared_cty_lookup=None, shared_band_allocator=None):
+        super().__init__(contest_name, None, root_input_dir, cty_dat_path,
+                         shared_cty_lookup=shared_cty_lookup or CtyLookup(cty_dat_path=cty_dat_path),
+                         shared_band_allocator=shared_band_allocator)
+        self.metadata.update(metadata or {})
+        self.metadata['MyCall'] = my_call.strip().upper()
+        self._resolve_own_location_type()
+
+        self._batches: List[pd.DataFrame] = []
+        self._run_classifier = IncrementalRunSPClassifier()
+        self._all_bands_dupes: set = set()
+        self._is_dupe: List[bool] = []
+        self._new_mult: List[bool] = []
+
+        location = self._my_location_type
+        self._mult_rules = [
+            rule for rule in self.contest_definition.multiplier_rules
+            if rule.get('value_column') and not (rule.get('applies_to') and location and rule.get('applies_to') != location)
+        ]
+        self._mult_columns = sorted({rule['value_column'] for rule in self.contest_definition.multiplier_rules})
+        self._worked_mults: set = set()
+
+        self.qso_count = 0
+        self.dupe_count = 0
+        self.points = 0
+        self._band_counts: Counter = Counter()
+        self._hourly_counts: Counter = Counter()
+        self._qso_times: List[float] = []   # non-dupe QSO times (epoch seconds), sorted
+
+    # --- Ingest ---
+
+    def add_records(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Annotates and appends new QSO records; returns the number accepted.
+
+        Records use the QSO column names (Call, Mode, Frequency in kHz, Band,
+        exchange columns) with either 'Datetime' or Cabrillo DateRaw/TimeRaw.
+        """
+        if not records:
+            return 0
+        df = self._prepare_batch(pd.DataFrame(records))
+        if df.empty:
+            return 0
+
+        df['Dupe'] = [self._check_dupe(call, band, mode) for call, band, mode in zip(df['Call'], df['Band'], df['Mode'])]
+        # As in ContestLog: band-only QSOs (VHF lines such as 'QSO: 50 DI ...') take part
+        # in dupe checking at ingest, then the Run/S&P pass drops QSOs without a frequency.
+        df = df[df['Frequency'].notna()]
+        if df.empty:
+            return 0
+        rows = [self._run_classifier.add(band, mode, qso_time, freq)
+                for band, mode, qso_time, freq in zip(df['Band'], df['Mode'], df['Datetime'], df['Frequency'])]
+        df.index = pd.RangeIndex(rows[0], rows[-1] + 1)
+
+        try:
+            df = process_dataframe_for_cty_data(df, self.cty_dat_path, shared_cty_lookup=self._shared_cty_lookup)
+        except Exception as e:
+            logger.error(f"Error during live DXCC/Zone lookup: {e}. Skipping.")
+
+        for col in ['Mult1', 'Mult1Name', 'Mult2', 'Mult2Name']:
+            if col in df.columns:
+                df[col] = df[col].astype('object')
+        df = self._annotate_contest_specific(df)
+
+        self._update_counters(df)
+        self._batches.append(df)
+        self.qsos_df = pd.DataFrame()
+        return len(df)
+
+    def _prepare_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Applies the parts of ContestLog ingest that work on single QSOs."""
+        for col in ['Datetime', 'Frequency', 'Band']:
+            if col not in df.columns:
+                df[col] = pd.NA
+        df['Datetime'] = pd.to_datetime(df['Datetime'], errors='coerce', utc=True)
+        if 'DateRaw' in df.columns and 'TimeRaw' in df.columns:
+            cabrillo_times = pd.to_datetime(df['DateRaw'] + ' ' + df['TimeRaw'], format='%Y-%m-%d %H%M',
+                                            errors='coerce').dt.tz_localize('UTC')
+            df['Datetime'] = df['Datetime'].fillna(cabrillo_times)
+        df['Frequency'] = pd.to_numeric(df['Frequency'], errors='coerce')
+        if 'FrequencyRaw' in df.columns:
+            df['Frequency'] = df['Frequency'].fillna(pd.to_numeric(df['FrequencyRaw'], errors='coerce'))
+        df['Band'] = df['Band'].combine_first(df['Frequency'].apply(self._derive_band_from_frequency))
+
+        valid = df['Datetime'].notna() & (
+            df['Frequency'].apply(lambda f: pd.notna(f) and self.band_allocator.is_frequency_valid(f)) |
+            (df['Frequency'].isna() & df['Band'].notna())
+        )
+        df = df[valid].copy()
+
+        for key, value in self.metadata.items():
+            if key not in df.columns or df[key].isna().all():
+                df[key] = value
+        df['MyCall'] = self.metadata['MyCall']
+        for col in ['Call', 'Mode']:
+            df[col] = df[col].fillna('').astype(str).str.upper()
+        df['Mode'] = df['Mode'].map(_normalize_mode)
+
+        my_call = _base_call(self.metadata['MyCall'])
+        df = df[df['Call'].map(_base_call) != my_call]
+
+        df = df.sort_values('Datetime', kind='stable')
+        df['Date'] = df['Datetime'].dt.strftime('%Y-%m-%d')
+        df['Hour'] = df['Datetime'].dt.strftime('%H')
+        return df.reindex(columns=self.contest_definition.default_qso_columns)
+
+    def _check_dupe(self, call: str, band: str, mode: str) -> bool:
+        """Same rules as ContestLog._check_dupes, one QSO at a time."""
+        if not call:
+            return False
+        if self.contest_definition.dupe_check_scope == 'all_bands':
+            if call in self._all_bands_dupes:
+                return True
+            self._all_bands_dupes.add(call)
+            return False
+        if band == 'Invalid' or not band or not mode:
+            return False
+        seen = self.dupe_sets.setdefault(band, set())
+        if (call, mode) in seen:
+            return True
+        seen.add((call, mode))
+        return False
+
+    def _mult_keys(self, row: Dict[str, Any]) -> List[Tuple]:
+        """Worked-set keys for one QSO, using StandardCalculator's totaling methods."""
+        if not self.contest_definition.mults_from_zero_point_qsos and not (row.get('QSOPoints', 0) > 0):
+            return []
+        if any(row.get(col) == 'Unknown' for col in self._mult_columns):
+            return []
+        keys = []
+        for rule in self._mult_rules:
+            col = rule['value_column']
+            value = row.get(col)
+            if value is None or pd.isna(value):
+                continue
+            method = rule.get('totaling_method', 'sum_by_band')
+            if method == 'once_per_log':
+                keys.append((col, value))
+            elif method == 'once_per_mode':
+                keys.append((col, row.get('Mode'), value))
+            else:
+                keys.append((col, row.get('Band'), value))
+        return keys
+
+    def _update_counters(self, df: pd.DataFrame):
+        columns = ['Datetime', 'Band', 'Mode', 'Dupe', 'QSOPoints'] + [c for c in self._mult_columns if c in df.columns]
+        for row in df[columns].to_dict('records'):
+            self.qso_count += 1
+            is_new_mult = False
+            if row['Dupe']:
+                self.dupe_count += 1
+            else:
+                points = row.get('QSOPoints')
+                self.points += int(points) if pd.notna(points) else 0
+                self._band_counts[row['Band']] += 1
+                self._hourly_counts[row['Datetime'].floor('h')] += 1
+                bisect.insort(self._qso_times, row['Datetime'].timestamp())
+                for key in self._mult_keys(row):
+                    if key not in self._worked_mults:
+                        self._worked_mults.add(key)
+                        is_new_mult = True
+            self._is_dupe.append(bool(row['Dupe']))
+            self._new_mult.append(is_new_mult)
+
+    # --- In-memory state ---
+
+    def get_processed_data(self) -> pd.DataFrame:
+        if self.qsos_df.empty and self._batches:
+            df = pd.concat(self._batches)
+            df['Run'] = self._run_classifier.statuses()
+            self.qsos_df = df
+        return self.qsos_df
+
+    @property
+    def mult_count(self) -> int:
+        return len(self._worked_mults)
+
+    @property
+    def score(self) -> int:
+        formula = self.contest_definition.score_formula
+        if formula == 'total_points':
+            return self.points
+        if formula == 'qsos_times_mults':
+            return (self.qso_count - self.dupe_count) * self.mult_count
+        return self.points * self.mult_count
+
+    def _count_since(self, seconds: float) -> int:
+        if not self._qso_times:
+            return 0
+        return len(self._qso_times) - bisect.bisect_left(self._qso_times, self._qso_times[-1] - seconds)
+
+    def get_live_summary(self, recent: int = 20) -> Dict[str, Any]:
+        """
+        Current state as primitives for a live dashboard.
+
+        Rates are QSOs per hour over the last 10 and 60 minutes of the log,
+        so a replayed log shows the rates it had at the time.
+
+        Structure:
+        {call, contest, last_qso, qsos, dupes, points, mults, score,
+         rates: {last_10_min, last_60_min}, bands: {Band: qsos},
+         run: {run, sp, unk}, hourly: {time_bin: qsos}, recent_qsos: [...]}
+        """
+        statuses = self._run_classifier.statuses()
+        run_counts = Counter(s for s, dupe in zip(statuses, self._is_dupe) if not dupe)
+        last_qso = pd.Timestamp(self._qso_times[-1], unit='s', tz='UTC').isoformat() if self._qso_times else None
+
+        recent_qsos = []
+        if self._batches and recent:
+            tail_rows = []
+            for batch in reversed(self._batches):
+                tail_rows.insert(0, batch.tail(recent - len(tail_rows)))
+                if sum(len(t) for t in tail_rows) >= recent:
+                    break
+            for row_id, row in pd.concat(tail_rows).iterrows():
+                points = row.get('QSOPoints')
+                recent_qsos.append({
+                    "time": row['Datetime'].isoformat(), "call": row['Call'], "band": row['Band'],
+                    "mode": row['Mode'], "run": statuses[row_id], "dupe": bool(row['Dupe']),
+                    "points": int(points) if pd.notna(points) else 0, "new_mult": self._new_mult[row_id],
+                })
+
+        return {
+            "call": self.metadata.get('MyCall'),
+            "contest": self.contest_name,
+            "last_qso": last_qso,
+            "qsos": self.qso_count - self.dupe_count,
+            "dupes": self.dupe_count,
+            "points": self.points,
+            "mults": self.mult_count,
+            "score": self.score,
+            "rates": {"last_10_min": self._count_since(600) * 6, "last_60_min": self._count_since(3600)},
+            "bands": {str(band): count for band, count in self._band_counts.items()},
+            "run": {"run": run_counts.get('Run', 0), "sp": run_counts.get('S&P', 0), "unk": run_counts.get('Unknown', 0)},
+            "hourly": {hour.isoformat(): count for hour, count in sorted(self._hourly_counts.items())},
+            "recent_qsos": recent_qsos,
+        }
+
+    def compare_to(self, benchmark_log: ContestLog) -> Dict[str, Any]:
+        """
+        Progress against a finished log (e.g. last year's) at the same
+        elapsed time, measured from the hour of each log's first QSO.
+        """
+        result = {"elapsed_minutes": 0, "live": {"qsos": 0, "points": 0},
+                  "benchmark": {"qsos": 0, "points": 0}}
+        df = benchmark_log.get_processed_data()
+        if not self._qso_times or df.empty:
+            return result
+        df = df[df['Dupe'] == False].dropna(subset=['Datetime'])
+
+        live_start = pd.Timestamp(self._qso_times[0], unit='s', tz='UTC').floor('h')
+        elapsed = pd.Timestamp(self._qso_times[-1], unit='s', tz='UTC') - live_start
+        bench = df[df['Datetime'] <= df['Datetime'].min().floor('h') + elapsed]
+
+        result["elapsed_minutes"] = int(elapsed.total_seconds() // 60)
+        result["live"] = {"qsos": self.qso_count - self.dupe_count, "points": self.points}
+        result["benchmark"] = {"qsos": int(len(bench)), "points": int(bench['QSOPoints'].fillna(0).sum())}
+        return result
+
+
+class _FileTailer:
+    """
+    Reads text appended to a file since the last poll, one complete line or
+    record at a time.
+
+    Logging programs often rewrite the whole file on export, usually to the
+    same size or larger. A file counts as rewritten, and is read again from
+    the start, when it was replaced (new inode), shrank, or when the bytes
+    already read at its start or just before the read offset changed.
+    """
+    # Bytes compared at the start of the file and before the read offset
+    _FINGERPRINT_BYTES = 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+        self._pending = ''
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._head = b''
+        self._tail = b''
+
+    def _consumed_bytes_unchanged(self, f) -> bool:
+        f.seek(0)
+        if f.read(len(self._head)) != self._head:
+            return False
+        f.seek(self._offset - len(self._tail))
+        return f.read(len(self._tail)) == self._tail
+
+    def _read_new_text(self) -> Tuple[str, bool]:
+        """Returns (new complete lines, rewritten)."""
+        try:
+            with open(self.path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                file_id = (st.st_dev, st.st_ino)
+                rewritten = self._offset > 0 and (file_id != self._file_id or st.st_size < self._offset
+                                                  or not self._consumed_bytes_unchanged(f))
+                if rewritten:
+                    self._offset, self._pending, self._head, self._tail = 0, '', b'', b''
+                self._file_id = file_id
+                if st.st_size == self._offset:
+                    return '', rewritten
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return '', False
+        # Only whole lines are consumed; a partly written last line is read again next poll
+        end = data.rfind(b'\n') + 1
+        data = data[:end]
+        self._offset += end
+        if len(self._head) < self._FINGERPRINT_BYTES:
+            self._head = (self._head + data)[:self._FINGERPRINT_BYTES]
+        self._tail = (self._tail + data)[-self._FINGERPRINT_BYTES:]
+        return data.decode('utf-8', errors='ignore'), rewritten
+
+
+class CabrilloTailer(_FileTailer):
+    """
+    Tails a Cabrillo file as the logging program writes it.
+
+    Loggers that rewrite the whole file on export are handled by skipping
+    the QSO lines already delivered. Contests with a custom parser module
+    are re-parsed in full on change and only the new rows are returned.
+    """
+    def __init__(self, path: str, contest_definition: ContestDefinition, shared_cty_lookup=None):
+        super().__init__(path)
+        self.contest_definition = contest_definition
+        # Passed to custom parsers so a re-parse does not reload CTY data
+        self._shared_cty_lookup = shared_cty_lookup
+        self.metadata: Dict[str, Any] = {'ContestName': contest_definition.contest_name}
+        self._qsos_seen = 0
+        self._qsos_in_pass = 0
+
+    def poll(self, root_input_dir: str = None, cty_dat_path: str = None) -> List[Dict[str, Any]]:
+        if self.contest_definition.custom_parser_module:
+            return self._poll_custom_parser(root_input_dir, cty_dat_path)
+
+        text, rewritten = self._read_new_text()
+        if rewritten:
+            self._qsos_in_pass = 0
+        lines = (self._pending + text).split('\n')
+        self._pending = lines.pop()
+
+        records = []
+        for line in lines:
+            cleaned_line = line.replace('\u00a0', ' ').strip()
+            upper = cleaned_line.upper()
+            if upper.startswith('QSO:'):
+                self._qsos_in_pass += 1
+                if self._qsos_in_pass <= self._qsos_seen:
+                    continue
+                record = _parse_qso_line(upper, self.contest_definition, self.metadata, cleaned_line, self.path)
+                self._qsos_seen += 1
+                if record:
+                    record.pop('RawQSO', None)
+                    records.append(record)
+            elif ':' in cleaned_line:
+                tag, value = cleaned_line.split(':', 1)
+                df_key = self.contest_definition.header_field_map.get(tag.strip().upper())
+                if df_key:
+                    self.metadata[df_key] = value.strip()
+        return records
+
+    def _poll_custom_parser(self, root_input_dir: str, cty_dat_path: str) -> List[Dict[str, Any]]:
+        text, rewritten = self._read_new_text()
+        if not text and not rewritten:
+            return []
+        parser_module = importlib.import_module(f"contest_tools.contest_specific_annotations.{self.contest_definition.custom_parser_module}")
+        try:
+            parser_output = parser_module.parse_log(self.path, self.contest_definition, root_input_dir, cty_dat_path,
+                                                    shared_cty_lookup=self._shared_cty_lookup)
+        except (OSError, ValueError) as e:
+            # The file may be mid-write; it is parsed again on the next change
+            logger.warning(f"Could not re-parse '{os.path.basename(self.path)}': {e}")
+            return []
+        raw_df, metadata = parser_output[0], parser_output[-1]
+        self.metadata.update(metadata)
+        new_rows = raw_df.iloc[self._qsos_seen:]
+        self._qsos_seen = len(raw_df)
+        return new_rows.drop(columns=['RawQSO'], errors='ignore').to_dict('records')
+
+
+class AdifTailer(_FileTailer):
+    """
+    Tails an ADIF file, returning each complete <EOR>-terminated record.
+
+    field_map maps ADIF field names to QSO columns, extending the defaults.
+    """
+    _FIELD_RE = re.compile(r'<([A-Za-z0-9_]+):(\d+)(?::[A-Za-z])?>')
+    DEFAULT_FIELD_MAP = {
+        'CALL': 'Call', 'STATION_CALLSIGN': 'MyCall', 'BAND': 'Band', 'MODE': 'Mode',
+        'RST_RCVD': 'RST', 'RST_SENT': 'SentRST', 'SRX': 'NR', 'STX': 'SentNR', 'CQZ': 'Zone',
+    }
+
+    def __init__(self, path: str, field_map: Optional[Dict[str, str]] = None):
+        super().__init__(path)
+        self.field_map = {**self.DEFAULT_FIELD_MAP, **{k.upper(): v for k, v in (field_map or {}).items()}}
+        self._records_seen = 0
+        self._records_in_pass = 0
+        self._header_done = False
+
+    def poll(self) -> List[Dict[str, Any]]:
+        text, rewritten = self._read_new_text()
+        if rewritten:
+            self._records_in_pass, self._header_done = 0, False
+        buffer = self._pending + text
+        if not self._header_done:
+            eoh = re.search(r'<EOH>', buffer, re.IGNORECASE)
+            if eoh:
+                buffer, self._header_done = buffer[eoh.end():], True
+            elif buffer.lstrip().startswith('<'):
+                self._header_done = True
+            else:
+                self._pending = buffer
+                return []
+
+        chunks = re.split(r'<EOR>', buffer, flags=re.IGNORECASE)
+        self._pending = chunks.pop()
+        records = []
+        for chunk in chunks:
+            self._records_in_pass += 1
+            if self._records_in_pass <= self._records_seen:
+                continue
+            self._records_seen += 1
+            record = self._parse_record(chunk)
+            if record:
+                records.append(record)
+        return records
+
+    def _parse_record(self, chunk: str) -> Optional[Dict[str, Any]]:
+        fields = {}
+        for match in self._FIELD_RE.finditer(chunk):
+            fields[match.group(1).upper()] = chunk[match.end():match.end() + int(match.group(2))].strip()
+        if not fields.get('CALL') or not fields.get('QSO_DATE'):
+            return None
+
+        record = {column: fields[tag] for tag, column in self.field_map.items() if fields.get(tag)}
+        record['Datetime'] = pd.to_datetime(fields['QSO_DATE'] + fields.get('TIME_ON', '0000')[:4],
+                                            format='%Y%m%d%H%M', errors='coerce', utc=True)
+        try:
+            record['Frequency'] = float(fields['FREQ']) * 1000.0
+        except (KeyError, ValueError):
+            pass
+        if 'Band' in record:
+            record['Band'] = record['Band'].upper()
+        return record
+
+
+class N1mmContactListener:
+    """
+    Receives N1MM Logger+ style <contactinfo> UDP broadcasts.
+
+    Only contacts logged at the broadcasting station (IsOriginal) are kept,
+    and each contact ID once. Edits and deletes (<contactreplace>,
+    <contactdelete>) are counted but not applied: live annotation is append-only.
+    """
+    DEFAULT_FIELD_MAP = {
+        'call': 'Call', 'mycall': 'MyCall', 'mode': 'Mode', 'snt': 'SentRST', 'rcv': 'RST',
+        'sntnr': 'SentNR', 'rcvnr': 'NR', 'zone': 'Zone',
+    }
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 12060, field_map: Optional[Dict[str, str]] = None):
+        self.field_map = {**self.DEFAULT_FIELD_MAP, **{k.lower(): v for k, v in (field_map or {}).items()}}
+        self.ignored_updates = 0
+        self._seen_ids: set = set()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.setblocking(False)
+
+    def close(self):
+        self._sock.close()
+
+    def poll(self) -> List[Dict[str, Any]]:
+        records = []
+        while True:
+            try:
+                payload, _ = self._sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            record = self.parse_datagram(payload)
+            if record:
+                records.append(record)
+        return records
+
+    def parse_datagram(self, payload: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            root = ET.fromstring(payload.decode('utf-8', errors='ignore').strip())
+        except ET.ParseError as e:
+            logger.debug(f"Ignoring malformed UDP datagram: {e}")
+            return None
+        if root.tag in ('contactreplace', 'contactdelete'):
+            self.ignored_updates += 1
+            return None
+        if root.tag != 'contactinfo':
+            return None
+
+        fields = {child.tag.lower(): (child.text or '').strip() for child in root}
+        if fields.get('isoriginal', 'True').lower() == 'false':
+            return None
+        contact_id = fields.get('id')
+        if contact_id:
+            if contact_id in self._seen_ids:
+                return None
+            self._seen_ids.add(contact_id)
+
+        record = {column: fields[tag] for tag, column in self.field_map.items() if fields.get(tag)}
+        record['Datetime'] = pd.to_datetime(fields.get('timestamp'), errors='coerce', utc=True)
+        try:
+            # N1MM frequencies are in units of 10 Hz
+            record['Frequency'] = float(fields.get('rxfreq') or fields.get('txfreq')) / 100.0
+        except (TypeError, ValueError):
+            pass
+        return record
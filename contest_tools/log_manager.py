@@ -38,7 +38,7 @@ class LogManager:
         self.logs = []
         self.master_time_index = None
 
-    @profile_section("Log Batch Loading (Total)")
+    @profile_section("Log Batch Loading (Total)", 'batch')
     def load_log_batch(self, log_filepaths: List[str], root_input_dir: str, cty_specifier: str, custom_cty_path: str = None):
         """
         Performs validation on log files (duplicates, consistency, empty checks), selects a single
@@ -97,44 +97,7 @@ class LogManager:
 
         # --- 2. Single CTY File Selection ---
         with ProfileContext("CTY File Resolution"):
-            if custom_cty_path:
-                # Use custom CTY file directly (user-uploaded)
-                if not os.path.exists(custom_cty_path):
-                    raise FileNotFoundError(f"Custom CTY file not found: {custom_cty_path}")
-                cty_dat_path = custom_cty_path
-                # For custom files, we create a minimal file_info dict
-                cty_file_info = {'filename': os.path.basename(custom_cty_path), 'date': None, 'custom': True}
-                logging.info(f"Using custom CTY file: {os.path.basename(cty_dat_path)}")
-            else:
-                # Use default CTY selection logic
-                logging.info("Resolving CTY file for batch...")
-                cty_manager = CtyManager(root_input_dir)
-                
-                if cty_specifier in ['before', 'after']:
-                    all_dates = [self._get_first_qso_date_from_log(path) for path in log_filepaths]
-                    # Filter None to be safe (though validation guarantees validity)
-                    valid_dates = [d for d in all_dates if d is not None]
-                    
-                    if not valid_dates:
-                        target_date = pd.Timestamp.now(tz='UTC')
-                    else:
-                        target_date = min(valid_dates) if cty_specifier == 'before' else max(valid_dates)
-                else:
-                    # If a specific filename is given, we need a date for the sync check.
-                    # We'll just use the first log's date as it's a reasonable proxy.
-                    target_date = self._get_first_qso_date_from_log(log_filepaths[0]) or pd.Timestamp.now(tz='UTC')
-
-                # Conditionally update the index based on the determined target date
-                cty_manager.sync_index(contest_date=target_date)
-
-                if cty_specifier in ['before', 'after']:
-                    cty_dat_path, cty_file_info = cty_manager.find_cty_file_by_date(target_date, cty_specifier)
-                else:
-                    cty_dat_path, cty_file_info = cty_manager.find_cty_file_by_name(cty_specifier)
-                
-                if not cty_dat_path:
-                    raise FileNotFoundError(f"Could not find a suitable CTY.DAT file for specifier '{cty_specifier}'.")
-                logging.info(f"Using CTY file for all logs: {os.path.basename(cty_dat_path)} (Date: {cty_file_info.get('date')})")
+            cty_dat_path = self.resolve_cty_file(log_filepaths, root_input_dir, cty_specifier, custom_cty_path)
 
         # --- 2.5. Create Shared Instances (Performance Optimization) ---
         # Create shared CTY lookup and BandAllocator instances to avoid reloading from disk for each log
@@ -144,7 +107,7 @@ class LogManager:
         # --- 3. Full Log Loading Phase ---
         for path in log_filepaths:
             try:
-                with ProfileContext(f"Individual Log Loading - {os.path.basename(path)}"):
+                with ProfileContext(f"Individual Log Loading - {os.path.basename(path)}", 'log', file=os.path.basename(path)):
                     logging.info(f"Loading log: {path}...")
                     contest_name = self._get_contest_name_from_header(path)
                     if not contest_name:
@@ -167,7 +130,55 @@ class LogManager:
         # This ensures that Log 1, Log 2, etc. are consistent regardless of upload order.
         self.logs.sort(key=lambda x: str(x.get_metadata().get('MyCall', 'Unknown')).upper())
 
-    @profile_section("Finalize Loading (Total)")
+    def resolve_cty_file(self, log_filepaths: List[str], root_input_dir: str, cty_specifier: str,
+                         custom_cty_path: str = None) -> str:
+        """
+        Selects the single CTY.DAT file used for every log in a batch.
+
+        Args:
+            custom_cty_path: Optional direct path to custom CTY file. If provided, this takes precedence over cty_specifier.
+        """
+        if custom_cty_path:
+            # Use custom CTY file directly (user-uploaded)
+            if not os.path.exists(custom_cty_path):
+                raise FileNotFoundError(f"Custom CTY file not found: {custom_cty_path}")
+            cty_dat_path = custom_cty_path
+            # For custom files, we create a minimal file_info dict
+            cty_file_info = {'filename': os.path.basename(custom_cty_path), 'date': None, 'custom': True}
+            logging.info(f"Using custom CTY file: {os.path.basename(cty_dat_path)}")
+        else:
+            # Use default CTY selection logic
+            logging.info("Resolving CTY file for batch...")
+            cty_manager = CtyManager(root_input_dir)
+            
+            if cty_specifier in ['before', 'after']:
+                all_dates = [self._get_first_qso_date_from_log(path) for path in log_filepaths]
+                # Filter None to be safe (though validation guarantees validity)
+                valid_dates = [d for d in all_dates if d is not None]
+                
+                if not valid_dates:
+                    target_date = pd.Timestamp.now(tz='UTC')
+                else:
+                    target_date = min(valid_dates) if cty_specifier == 'before' else max(valid_dates)
+            else:
+                # If a specific filename is given, we need a date for the sync check.
+                # We'll just use the first log's date as it's a reasonable proxy.
+                target_date = (self._get_first_qso_date_from_log(log_filepaths[0]) if log_filepaths else None) or pd.Timestamp.now(tz='UTC')
+
+            # Conditionally update the index based on the determined target date
+            cty_manager.sync_index(contest_date=target_date)
+
+            if cty_specifier in ['before', 'after']:
+                cty_dat_path, cty_file_info = cty_manager.find_cty_file_by_date(target_date, cty_specifier)
+            else:
+                cty_dat_path, cty_file_info = cty_manager.find_cty_file_by_name(cty_specifier)
+            
+            if not cty_dat_path:
+                raise FileNotFoundError(f"Could not find a suitable CTY.DAT file for specifier '{cty_specifier}'.")
+            logging.info(f"Using CTY file for all logs: {os.path.basename(cty_dat_path)} (Date: {cty_file_info.get('date')})")
+        return cty_dat_path
+
+    @profile_section("Finalize Loading (Total)", 'batch')
     def finalize_loading(self, root_reports_dir: str, debug_data: bool = False):
         """
         Should be called after all logs are loaded to perform final,
@@ -2,6 +2,10 @@
 #
 # Purpose: This class manages the session-scoped manifest of generated artifacts.
 #          It decouples the generation of reports from their discovery by the UI.
+#          Readers locate the manifest through a fixed-location locator file and
+#          query artifacts through a keyed ArtifactIndex held in a process-wide LRU.
+#          Registered artifacts get a content hash and compressed siblings for
+#          HTTP serving.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -15,9 +19,15 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import os
+import re
 import json
 import logging
 import datetime
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Iterable, FrozenSet
+
+from contest_tools.utils.precompress import content_hash, precompress_file
 
 class ManifestManager:
     """
@@ -25,23 +35,51 @@ class ManifestManager:
     Allows decoupling of file generation logic from file discovery logic.
     """
     MANIFEST_FILENAME = "session_manifest.json"
+    # Written at the session root so readers find the manifest without a tree walk.
+    LOCATOR_FILENAME = "manifest_location.json"
 
-    def __init__(self, root_dir):
+    def __init__(self, root_dir, session_root=None):
         """
         Initialize the manager.
         
         Args:
             root_dir (str): The root directory where 
             the manifest file will be stored.
+            session_root (str, optional): The session directory. When given,
+            save() also writes a locator file there pointing at root_dir.
         """
         self.root_dir = root_dir
+        self.session_root = session_root
         self.manifest_path = os.path.join(self.root_dir, self.MANIFEST_FILENAME)
         self.artifacts = []
+        self._paths = set()
         
         # Load existing if available (to support incremental updates)
         if os.path.exists(self.manifest_path):
             self.load()
 
+    @classmethod
+    def locate(cls, session_path: str) -> Optional[str]:
+        """
+        Returns the directory holding the session manifest, or None.
+
+        Reads the locator written at the session root. Sessions generated
+        before the locator existed fall back to a directory walk.
+        """
+        locator_path = os.path.join(session_path, cls.LOCATOR_FILENAME)
+        try:
+            with open(locator_path, 'r') as f:
+                manifest_dir = os.path.join(session_path, json.load(f)['manifest_dir'])
+            if os.path.exists(os.path.join(manifest_dir, cls.MANIFEST_FILENAME)):
+                return manifest_dir
+        except (OSError, ValueError, KeyError):
+            pass
+
+        for root, dirs, files in os.walk(session_path):
+            if cls.MANIFEST_FILENAME in files:
+                return root
+        return None
+
     def add_artifact(self, report_id, relative_path, report_type):
         """
         Registers an artifact.
@@ -52,9 +90,9 @@ class ManifestManager:
             report_type (str): 'text', 'plot', 'chart', 'animation', etc.
         """
         # Prevent duplicates
-        for art in self.artifacts:
-            if art['path'] == relative_path:
-                return
+        if relative_path in self._paths:
+            return
+        self._paths.add(relative_path)
 
         artifact = {
             'report_id': report_id,
@@ -62,6 +100,19 @@ class ManifestManager:
             'type': report_type,
             'timestamp': datetime.datetime.now().isoformat()
         }
+
+        # Artifacts are write-once, so the content hash (the HTTP ETag) and the
+        # compressed siblings served by the web app are produced here, once.
+        abs_path = os.path.join(self.root_dir, relative_path)
+        try:
+            artifact['size'] = os.path.getsize(abs_path)
+            artifact['sha256'] = content_hash(abs_path)
+        except OSError as e:
+            logging.warning(f"Could not hash artifact {abs_path}: {e}")
+        else:
+            encodings = precompress_file(abs_path)
+            if encodings:
+                artifact['encodings'] = encodings
         self.artifacts.append(artifact)
 
     def save(self):
@@ -73,6 +124,16 @@ class ManifestManager:
                 json.dump(self.artifacts, f, indent=4)
         except Exception as e:
             logging.error(f"Failed to save manifest to {self.manifest_path}: {e}")
+            return
+
+        if self.session_root:
+            locator_path = os.path.join(self.session_root, self.LOCATOR_FILENAME)
+            try:
+                rel_dir = os.path.relpath(self.root_dir, self.session_root).replace("\\", "/")
+                with open(locator_path, 'w') as f:
+                    json.dump({'manifest_dir': rel_dir}, f)
+            except Exception as e:
+                logging.error(f"Failed to save manifest locator to {locator_path}: {e}")
 
     def load(self):
         """Loads artifacts from the JSON file."""
@@ -80,7 +141,166 @@ class ManifestManager:
             if os.path.exists(self.manifest_path):
                 with open(self.manifest_path, 'r') as f:
                     self.artifacts = json.load(f)
+                self._paths = {art['path'] for art in self.artifacts}
             return self.artifacts
         except Exception as e:
             logging.error(f"Failed to load manifest from {self.manifest_path}: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+# --- Artifact Index ---
+
+_BAND_TOKEN = re.compile(r'^(all|\d+)m?$')
+_MODE_TOKENS = {'CW', 'PH', 'SSB', 'RY', 'RTTY', 'DG', 'FM', 'MIXED'}
+
+
+def parse_artifact_key(report_id: str, path: str) -> Tuple[Optional[FrozenSet[str]], Optional[str], Optional[str], str, str]:
+    """
+    Splits an artifact path into its structured key parts.
+
+    Standard filenames follow build_filename(): {report_id}_{variant}--{callsigns}.{ext},
+    where variant holds metric/band/mode tokens. Legacy names without the
+    '--' delimiter end in the callsigns (e.g. qso_breakdown_chart_k1lz_k3lr),
+    so their tokens other than band and mode are taken as the callsign set.
+
+    Returns:
+        (callsign_set, band, mode, variant, ext). callsign_set is a frozenset of
+        filename-safe callsigns (e.g., {'k1lz', 'k3lr'}); band is 'all' or
+        the band number ('20'); mode is upper-case ('CW'); variant is the
+        remaining name tokens ('qsos', 'qso_band_distribution', or '');
+        ext is lower-case without the dot ('html').
+    """
+    stem, ext = os.path.splitext(os.path.basename(path))
+    is_legacy = '--' not in stem
+    callsign_set = None
+    if not is_legacy:
+        meta, calls_part = stem.rsplit('--', 1)
+        callsign_set = frozenset(p for p in calls_part.lower().split('_') if p)
+    else:
+        meta = stem
+
+    if meta.startswith(report_id + '_'):
+        variant = meta[len(report_id) + 1:]
+    elif meta == report_id:
+        variant = ''
+    else:
+        variant = meta
+
+    band = None
+    mode = None
+    rest = []
+    for token in variant.lower().split('_'):
+        band_match = _BAND_TOKEN.match(token)
+        if band is None and band_match:
+            band = band_match.group(1)
+        elif mode is None and token.upper() in _MODE_TOKENS:
+            mode = token.upper()
+        elif token:
+            rest.append(token)
+    if is_legacy:
+        callsign_set = frozenset(rest) or None
+        rest = []
+    return callsign_set, band, mode, '_'.join(rest), ext.lstrip('.').lower()
+
+
+class ArtifactIndex:
+    """
+    Read-only, keyed view over a loaded session manifest.
+
+    Artifacts are indexed by report_id, by (report_id, filename) and by
+    (report_id, callsign set, file type) so dashboard views can look up
+    charts by key instead of scanning the full artifact list.
+    """
+    def __init__(self, manifest_dir: str, artifacts: List[dict]):
+        self.manifest_dir = manifest_dir
+        self.artifacts = artifacts
+        self._by_report_id: Dict[str, List[dict]] = {}
+        self._by_name: Dict[Tuple[str, str], dict] = {}
+        self._by_key: Dict[Tuple[str, Optional[FrozenSet[str]], str], List[Tuple[dict, Optional[str], Optional[str], str]]] = {}
+        self._by_path: Dict[str, dict] = {}
+        # Per-index memo for derived, session-constant view data (e.g., the report drawer tree)
+        self.memo: Dict[str, object] = {}
+
+        for art in artifacts:
+            report_id = art.get('report_id') or ''
+            path = art.get('path') or ''
+            self._by_report_id.setdefault(report_id, []).append(art)
+            self._by_name.setdefault((report_id, os.path.basename(path)), art)
+            self._by_path.setdefault(path.replace('\\', '/'), art)
+            callsign_set, band, mode, variant, ext = parse_artifact_key(report_id, path)
+            self._by_key.setdefault((report_id, callsign_set, ext), []).append((art, band, mode, variant))
+
+    def by_report_id(self, report_id: str) -> List[dict]:
+        """Returns all artifacts registered under report_id."""
+        return self._by_report_id.get(report_id, [])
+
+    def get_by_name(self, report_id: str, filename: str) -> Optional[dict]:
+        """Returns the artifact of report_id whose file name is exactly filename."""
+        return self._by_name.get((report_id, filename))
+
+    def get_by_path(self, relative_path: str) -> Optional[dict]:
+        """Returns the artifact at relative_path (relative to the manifest directory)."""
+        return self._by_path.get(relative_path.replace('\\', '/'))
+
+    def find(self, report_id: str, callsigns: Iterable[str], ext: str,
+             band: Optional[str] = None, mode: Optional[str] = None,
+             variant: Optional[str] = None) -> List[dict]:
+        """
+        Returns artifacts of report_id for exactly this callsign set and file type,
+        optionally narrowed by band ('all', '20'), mode ('CW') and variant
+        ('qsos'). None matches anything; '' matches only artifacts without
+        that part (e.g. mode='' skips the per-mode variants).
+
+        Args:
+            callsigns: Filename-safe callsigns (e.g., ['k1lz', 'k3lr']); order is ignored.
+            ext: File type without the dot (e.g., 'html', 'json', 'txt').
+        """
+        key = (report_id, frozenset(c.lower() for c in callsigns), ext.lower())
+        band = band.lower() if band else band
+        mode = mode.upper() if mode else mode
+        return [art for art, art_band, art_mode, art_variant in self._by_key.get(key, [])
+                if (band is None or art_band == (band or None))
+                and (mode is None or art_mode == (mode or None))
+                and (variant is None or art_variant == variant)]
+
+    def find_first(self, report_id: str, callsigns: Iterable[str], ext: str,
+                   band: Optional[str] = None, mode: Optional[str] = None,
+                   variant: Optional[str] = None) -> Optional[dict]:
+        """Returns the first artifact find() returns, or None."""
+        matches = self.find(report_id, callsigns, ext, band=band, mode=mode, variant=variant)
+        return matches[0] if matches else None
+
+
+_INDEX_CACHE_SIZE = 32
+_index_cache: "OrderedDict[str, Tuple[int, ArtifactIndex]]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_artifact_index(manifest_dir: str) -> ArtifactIndex:
+    """
+    Returns the ArtifactIndex for a manifest directory.
+
+    Indexes are held in a process-wide LRU keyed by manifest path and are
+    rebuilt only when the manifest file's mtime changes, so each session's
+    manifest is parsed once per worker process rather than once per view.
+    """
+    manifest_path = os.path.join(manifest_dir, ManifestManager.MANIFEST_FILENAME)
+    try:
+        mtime = os.stat(manifest_path).st_mtime_ns
+    except OSError:
+        mtime = -1
+
+    with _index_cache_lock:
+        cached = _index_cache.get(manifest_path)
+        if cached and cached[0] == mtime:
+            _index_cache.move_to_end(manifest_path)
+            return cached[1]
+
+    index = ArtifactIndex(manifest_dir, ManifestManager(manifest_dir).artifacts)
+
+    with _index_cache_lock:
+        _index_cache[manifest_path] = (mtime, index)
+        _index_cache.move_to_end(manifest_path)
+        while len(_index_cache) > _INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
@@ -24,11 +24,14 @@ import pandas as pd
 from typing import Dict, Any, Optional, List, Tuple
 from .reports import AVAILABLE_REPORTS
 from .manifest_manager import ManifestManager
+from .styles.plotly_style_manager import PlotlyStyleManager
 from .utils.report_utils import _sanitize_filename_part
 from .utils.callsign_utils import build_callsigns_filename_part
-from .utils.profiler import profile_section, ProfileContext
+from .utils.precompress import is_precompressed_sibling
+from .utils.profiler import profile_section, ProfileContext, add_counter
 from .data_aggregators.time_series import TimeSeriesAggregator
 from .data_aggregators.matrix_stats import MatrixAggregator
+from .data_aggregators.rate_stats import RateStatsAggregator
 from .utils.architecture_validator import ArchitectureValidator
 
 class ReportGenerator:
@@ -78,13 +81,15 @@ class ReportGenerator:
         self.charts_output_dir = os.path.join(self.base_output_dir, "charts")
         self.animations_output_dir = os.path.join(self.base_output_dir, "animations")
         
-        self.manifest = ManifestManager(self.base_output_dir)
+        self.manifest = ManifestManager(self.base_output_dir, session_root=root_output_dir)
         
         # --- Phase 1 Performance Optimization: Shared Aggregators and Caching ---
         # Create shared aggregator instances once to avoid recreating for each report
         with ProfileContext("ReportGenerator - Aggregator Initialization"):
             self._ts_aggregator = TimeSeriesAggregator(self.logs)
             self._matrix_aggregator = MatrixAggregator(self.logs)
+            # Caches sorted QSO timestamps per log/filter for all rolling-window rate queries
+            self._rate_aggregator = RateStatsAggregator(self.logs)
             
             # Cache for time series data (key: (band_filter, mode_filter))
             self._ts_data_cache: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]] = {}
@@ -105,6 +110,7 @@ class ReportGenerator:
             Cached or newly computed time series data
         """
         cache_key = (band_filter, mode_filter)
+        add_counter('ts_cache_hits' if cache_key in self._ts_data_cache else 'ts_cache_misses')
         if cache_key not in self._ts_data_cache:
             self._ts_data_cache[cache_key] = self._ts_aggregator.get_time_series_data(
                 band_filter=band_filter, mode_filter=mode_filter
@@ -132,6 +138,7 @@ class ReportGenerator:
             time_index_hash = f"{time_index[0]}_{time_index[-1]}_{len(time_index)}"
         
         cache_key = (bin_size, mode_filter, time_index_hash)
+        add_counter('matrix_cache_hits' if cache_key in self._matrix_data_cache else 'matrix_cache_misses')
         if cache_key not in self._matrix_data_cache:
             self._matrix_data_cache[cache_key] = self._matrix_aggregator.get_matrix_data(
                 bin_size=bin_size, mode_filter=mode_filter, time_index=time_index
@@ -158,6 +165,7 @@ class ReportGenerator:
             time_index_hash = f"{time_index[0]}_{time_index[-1]}_{len(time_index)}"
         
         cache_key = (bin_size, mode_filter, time_index_hash)
+        add_counter('stacked_matrix_cache_hits' if cache_key in self._stacked_matrix_data_cache else 'stacked_matrix_cache_misses')
         if cache_key not in self._stacked_matrix_data_cache:
             self._stacked_matrix_data_cache[cache_key] = self._matrix_aggregator.get_stacked_matrix_data(
                 bin_size=bin_size, mode_filter=mode_filter, time_index=time_index
@@ -180,6 +188,7 @@ class ReportGenerator:
         # Add cached aggregators (reports can use these instead of creating new ones)
         kwargs['_cached_ts_aggregator'] = self._ts_aggregator
         kwargs['_cached_matrix_aggregator'] = self._matrix_aggregator
+        kwargs['_cached_rate_aggregator'] = self._rate_aggregator
         
         # Add helper methods to get cached data
         kwargs['_get_cached_ts_data'] = self._get_cached_ts_data
@@ -188,23 +197,33 @@ class ReportGenerator:
         
         return kwargs
 
-    @profile_section("Report Generation (All Reports)")
+    def _generate_instance(self, r_id: str, instance: Any, output_path: str, kwargs: Dict[str, Any]) -> Any:
+        """Generates one report instance inside a profiling span named for its logs and variant."""
+        calls = [log.get_metadata().get('MyCall', 'Unknown') for log in instance.logs]
+        variant = ' '.join(str(kwargs[k]) for k in ('mult_name', 'mode_filter') if kwargs.get(k))
+        label = f"{r_id} [{', '.join(calls)}]" + (f" {variant}" if variant else "")
+        with ProfileContext(label, 'report_instance', report_id=r_id, logs=', '.join(calls)):
+            return instance.generate(output_path=output_path, **kwargs)
+
+    @profile_section("Report Generation (All Reports)", 'batch')
     def run_reports(self, report_id, **report_kwargs):
         """
         Executes the requested reports based on the report_id and options.
         """
+        # Selection and filtering use the registry's manifest metadata, so only
+        # the report modules that actually run are imported.
         reports_to_run = []
         report_id_lower = report_id.lower()
 
         if report_id_lower == 'all':
-            reports_to_run = list(AVAILABLE_REPORTS.items())
+            reports_to_run = AVAILABLE_REPORTS.specs()
         elif report_id_lower in ['chart', 'text', 'plot', 'animation', 'html']:
             reports_to_run = [
-                (r_id, RClass) for r_id, RClass in AVAILABLE_REPORTS.items()
-                if RClass.report_type == report_id_lower
+                spec for spec in AVAILABLE_REPORTS.specs()
+                if spec.report_type == report_id_lower
             ]
         elif report_id in AVAILABLE_REPORTS:
-            reports_to_run = [(report_id, AVAILABLE_REPORTS[report_id])]
+            reports_to_run = [AVAILABLE_REPORTS.spec(report_id)]
         else:
             logging.error(f"Report '{report_id}' not found.")
             return
@@ -219,10 +238,10 @@ class ReportGenerator:
 
         # Filter out excluded reports before iterating
         final_reports_to_run = [
-            (r_id, RClass) for r_id, RClass in reports_to_run
+            spec.report_id for spec in reports_to_run
             if (
-                r_id not in contest_def.excluded_reports and
-                (not RClass.is_specialized or r_id in included_reports)
+                spec.report_id not in contest_def.excluded_reports and
+                (not spec.is_specialized or spec.report_id in included_reports)
             )
         ]
 
@@ -232,7 +251,12 @@ class ReportGenerator:
             if not os.path.exists(directory):
                 return file_set
             for root, dirs, files in os.walk(directory):
+                # The shared plotly.js bundle is a support file, not a report artifact
+                dirs[:] = [d for d in dirs if d != PlotlyStyleManager.PLOTLYJS_BUNDLE_DIRNAME]
                 for file in files:
+                    # Compressed siblings belong to the artifact they were made from
+                    if is_precompressed_sibling(os.path.join(root, file)):
+                        continue
                     # Store path relative to the base output dir
                     rel_path = os.path.relpath(os.path.join(root, file), self.base_output_dir)
                     file_set.add(rel_path)
@@ -241,120 +265,137 @@ class ReportGenerator:
         # Initial snapshot
         files_before = get_all_files(self.base_output_dir)
 
-        for r_id, ReportClass in final_reports_to_run:
-            report_type = ReportClass.report_type
-            if report_type == 'text': output_path = self.text_output_dir
-            elif report_type == 'plot': output_path = self.plots_output_dir
-            elif report_type == 'chart': output_path = self.charts_output_dir
-            elif report_type == 'animation': output_path = self.animations_output_dir
-            else: output_path = self.base_output_dir
+        # Every HTML chart references one plotly.js bundle under the report root
+        with PlotlyStyleManager.plotlyjs_bundle_root(self.base_output_dir):
+            self._run_selected_reports(final_reports_to_run, report_kwargs, files_before, get_all_files)
+
+        self.manifest.save()
+
+    def _run_selected_reports(self, final_reports_to_run, report_kwargs, files_before, get_all_files):
+        """Generates each selected report and registers the files it wrote in the manifest."""
+        first_log = self.logs[0]
+        contest_def = first_log.contest_definition
 
-            # --- SYSTEMIC FIX: Scaffold Output Directory ---
-            # Ensures the specific report type sub-directory (e.g., /plots) exists
-            # before passing it to the plugin. Required for dynamic sessions.
-            os.makedirs(output_path, exist_ok=True)
+        for r_id in final_reports_to_run:
+            with ProfileContext(f"Report - {r_id}", 'report', report_id=r_id):
+                try:
+                    ReportClass = AVAILABLE_REPORTS[r_id]
+                except KeyError:
+                    logging.warning(f"Report '{r_id}' could not be loaded; skipping.")
+                    continue
+                report_type = ReportClass.report_type
+                if report_type == 'text': output_path = self.text_output_dir
+                elif report_type == 'plot': output_path = self.plots_output_dir
+                elif report_type == 'chart': output_path = self.charts_output_dir
+                elif report_type == 'animation': output_path = self.animations_output_dir
+                else: output_path = self.base_output_dir
 
-            is_multiplier_report = r_id in ['missed_multipliers', 'multiplier_summary', 'multipliers_by_hour', 'enhanced_missed_multipliers']
+                # --- SYSTEMIC FIX: Scaffold Output Directory ---
+                # Ensures the specific report type sub-directory (e.g., /plots) exists
+                # before passing it to the plugin. Required for dynamic sessions.
+                os.makedirs(output_path, exist_ok=True)
 
-            # --- MUTUALLY EXCLUSIVE LOGIC PATHS ---
-            if is_multiplier_report:
-                # --- Path 1: Multiplier Reports ---
-                log_location_type = first_log._my_location_type
-                all_rules = contest_def.multiplier_rules
-                applicable_rules = [r for r in all_rules if r.get('applies_to') is None or r.get('applies_to') == log_location_type]
+                is_multiplier_report = r_id in ['missed_multipliers', 'multiplier_summary', 'multipliers_by_hour', 'enhanced_missed_multipliers']
+
+                # --- MUTUALLY EXCLUSIVE LOGIC PATHS ---
+                if is_multiplier_report:
+                    # --- Path 1: Multiplier Reports ---
+                    log_location_type = first_log._my_location_type
+                    all_rules = contest_def.multiplier_rules
+                    applicable_rules = [r for r in all_rules if r.get('applies_to') is None or r.get('applies_to') == log_location_type]
                 
-                mult_rules_to_run = []
-                user_spec_mult = report_kwargs.get('mult_name')
-                if user_spec_mult:
-                    rule = next((r for r in applicable_rules if r.get('name', '').lower() == user_spec_mult.lower()), None)
-                    if rule:
-                        mult_rules_to_run.append(rule)
-                else:
-                    mult_rules_to_run = applicable_rules
+                    mult_rules_to_run = []
+                    user_spec_mult = report_kwargs.get('mult_name')
+                    if user_spec_mult:
+                        rule = next((r for r in applicable_rules if r.get('name', '').lower() == user_spec_mult.lower()), None)
+                        if rule:
+                            mult_rules_to_run.append(rule)
+                    else:
+                        mult_rules_to_run = applicable_rules
 
-                modes_to_run = [None] # Default for non-per-mode contests
-                if contest_def.multiplier_report_scope == 'per_mode':
-                    modes_to_run = pd.concat([log.get_processed_data()['Mode'] for log in self.logs]).dropna().unique()
+                    modes_to_run = [None] # Default for non-per-mode contests
+                    if contest_def.multiplier_report_scope == 'per_mode':
+                        modes_to_run = pd.concat([log.get_processed_data()['Mode'] for log in self.logs]).dropna().unique()
 
-                logging.info(f"\nGenerating report: '{ReportClass.report_name}'...")
-                for mode in modes_to_run:
-                    if mode:
-                        logging.info(f"--- Analyzing Mode: {mode} ---")
+                    logging.info(f"\nGenerating report: '{ReportClass.report_name}'...")
+                    for mode in modes_to_run:
+                        if mode:
+                            logging.info(f"--- Analyzing Mode: {mode} ---")
                     
-                    for mult_rule in mult_rules_to_run:
-                        mult_name = mult_rule.get('name')
-                        if not mult_name:
-                            continue
+                        for mult_rule in mult_rules_to_run:
+                            mult_name = mult_rule.get('name')
+                            if not mult_name:
+                                continue
 
-                        logging.info(f"  - Generating for: {mult_name}")
-                        current_kwargs = report_kwargs.copy()
-                        current_kwargs['mult_name'] = mult_name
-                        if mode:
-                            current_kwargs['mode_filter'] = mode
+                            logging.info(f"  - Generating for: {mult_name}")
+                            current_kwargs = report_kwargs.copy()
+                            current_kwargs['mult_name'] = mult_name
+                            if mode:
+                                current_kwargs['mode_filter'] = mode
                         
-                        if ReportClass.supports_single:
-                            for log in self.logs:
-                                instance = ReportClass([log])
+                            if ReportClass.supports_single:
+                                for log in self.logs:
+                                    instance = ReportClass([log])
+                                    try:
+                                        enhanced_kwargs = self._prepare_report_kwargs([log], **current_kwargs)
+                                        result = self._generate_instance(r_id, instance, output_path, enhanced_kwargs)
+                                        logging.info(result)
+                                    except Exception as e:
+                                        logging.error(f"Error generating '{r_id}': {e}")
+                        
+                            if ReportClass.supports_multi and len(self.logs) >= 2:
+                                # 1. Generate Session Summary (All Logs)
+                                instance = ReportClass(self.logs)
                                 try:
-                                    enhanced_kwargs = self._prepare_report_kwargs([log], **current_kwargs)
-                                    result = instance.generate(output_path=output_path, **enhanced_kwargs)
+                                    enhanced_kwargs = self._prepare_report_kwargs(self.logs, **current_kwargs)
+                                    result = self._generate_instance(r_id, instance, output_path, enhanced_kwargs)
                                     logging.info(result)
                                 except Exception as e:
-                                    logging.error(f"Error generating '{r_id}': {e}")
-                        
-                        if ReportClass.supports_multi and len(self.logs) >= 2:
-                            # 1. Generate Session Summary (All Logs)
-                            instance = ReportClass(self.logs)
-                            try:
-                                enhanced_kwargs = self._prepare_report_kwargs(self.logs, **current_kwargs)
-                                result = instance.generate(output_path=output_path, **enhanced_kwargs)
-                                logging.info(result)
-                            except Exception as e:
-                                logging.error(f"Error generating '{r_id}' (Session): {e}")
+                                    logging.error(f"Error generating '{r_id}' (Session): {e}")
 
-                        # 2. Generate Pairwise Comparisons (if > 2 logs)
-                        if ReportClass.supports_pairwise and len(self.logs) > 2:
-                                for log_pair in itertools.combinations(self.logs, 2):
-                                    instance = ReportClass(list(log_pair))
-                                    try:
-                                        enhanced_kwargs = self._prepare_report_kwargs(list(log_pair), **current_kwargs)
-                                        result = instance.generate(output_path=output_path, **enhanced_kwargs)
-                                        logging.info(result)
-                                    except Exception as e:
-                                        logging.error(f"Error generating '{r_id}' (Pair): {e}")
+                            # 2. Generate Pairwise Comparisons (if > 2 logs)
+                            if ReportClass.supports_pairwise and len(self.logs) > 2:
+                                    for log_pair in itertools.combinations(self.logs, 2):
+                                        instance = ReportClass(list(log_pair))
+                                        try:
+                                            enhanced_kwargs = self._prepare_report_kwargs(list(log_pair), **current_kwargs)
+                                            result = self._generate_instance(r_id, instance, output_path, enhanced_kwargs)
+                                            logging.info(result)
+                                        except Exception as e:
+                                            logging.error(f"Error generating '{r_id}' (Pair): {e}")
             
-            else:
-                # --- Path 2: Non-Multiplier Reports ---
-                logging.info(f"\nGenerating report: '{ReportClass.report_name}'...")
+                else:
+                    # --- Path 2: Non-Multiplier Reports ---
+                    logging.info(f"\nGenerating report: '{ReportClass.report_name}'...")
                 
-                if ReportClass.supports_multi and len(self.logs) >= 2:
-                    instance = ReportClass(self.logs)
-                    try:
-                        enhanced_kwargs = self._prepare_report_kwargs(self.logs, **report_kwargs)
-                        result = instance.generate(output_path=output_path, **enhanced_kwargs)
-                        logging.info(result)
-                    except Exception as e:
-                        logging.error(f"Error generating '{r_id}': {e}")
-
-                if ReportClass.supports_pairwise and len(self.logs) >= 2:
-                    for log_pair in itertools.combinations(self.logs, 2):
-                        instance = ReportClass(list(log_pair))
+                    if ReportClass.supports_multi and len(self.logs) >= 2:
+                        instance = ReportClass(self.logs)
                         try:
-                            enhanced_kwargs = self._prepare_report_kwargs(list(log_pair), **report_kwargs)
-                            result = instance.generate(output_path=output_path, **enhanced_kwargs)
+                            enhanced_kwargs = self._prepare_report_kwargs(self.logs, **report_kwargs)
+                            result = self._generate_instance(r_id, instance, output_path, enhanced_kwargs)
                             logging.info(result)
                         except Exception as e:
                             logging.error(f"Error generating '{r_id}': {e}")
 
-                if ReportClass.supports_single:
-                    for log in self.logs:
-                        instance = ReportClass([log])
-                        try:
-                            enhanced_kwargs = self._prepare_report_kwargs([log], **report_kwargs)
-                            result = instance.generate(output_path=output_path, **enhanced_kwargs)
-                            logging.info(result)
-                        except Exception as e:
-                            logging.error(f"Error generating '{r_id}': {e}")
+                    if ReportClass.supports_pairwise and len(self.logs) >= 2:
+                        for log_pair in itertools.combinations(self.logs, 2):
+                            instance = ReportClass(list(log_pair))
+                            try:
+                                enhanced_kwargs = self._prepare_report_kwargs(list(log_pair), **report_kwargs)
+                                result = self._generate_instance(r_id, instance, output_path, enhanced_kwargs)
+                                logging.info(result)
+                            except Exception as e:
+                                logging.error(f"Error generating '{r_id}': {e}")
+
+                    if ReportClass.supports_single:
+                        for log in self.logs:
+                            instance = ReportClass([log])
+                            try:
+                                enhanced_kwargs = self._prepare_report_kwargs([log], **report_kwargs)
+                                result = self._generate_instance(r_id, instance, output_path, enhanced_kwargs)
+                                logging.info(result)
+                            except Exception as e:
+                                logging.error(f"Error generating '{r_id}': {e}")
 
             # --- Post-Execution Snapshot ---
             # Detect new files generated by this specific report ID
@@ -362,6 +403,4 @@ class ReportGenerator:
             new_files = files_now - files_before
             for new_file in new_files:
                 self.manifest.add_artifact(r_id, new_file, report_type)
-            files_before = files_now # Update baseline
-        
-        self.manifest.save()
\ No newline at end of file
+            files_before = files_now # Update baseline
\ No newline at end of file
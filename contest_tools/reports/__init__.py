@@ -1,9 +1,12 @@
 # contest_tools/reports/__init__.py
 #
-# Purpose: This module dynamically discovers and imports all available report
-#          generator classes from the other Python files in this directory.
-#          It creates the AVAILABLE_REPORTS dictionary, which is used by the main
-#          CLI and ReportGenerator to access and run reports.
+# Purpose: This module provides the AVAILABLE_REPORTS registry, which is used
+#          by the main CLI and ReportGenerator to find and run reports. Report
+#          metadata is read from a generated manifest (report_manifest.json),
+#          and a report's module is only imported when its class is first
+#          requested. Modules missing from the manifest are discovered by
+#          importing them, as before. Reports that import Django are only
+#          listed when Django is configured (as in the web app).
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -17,45 +20,277 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import os
+import sys
+import ast
+import json
 import importlib
-import inspect
 import logging
-from django.core.exceptions import AppRegistryNotReady, ImproperlyConfigured
-
-# Dynamically discover and load all available report classes
-AVAILABLE_REPORTS = {}
-
-# Get the directory of the current module
-current_dir = os.path.dirname(os.path.abspath(__file__))
-
-# Iterate over all files in the directory
-for filename in os.listdir(current_dir):
-    # Process only Python files that are not __init__.py itself
-    if filename.endswith('.py') and not filename.startswith('__'):
-        module_name = filename[:-3]
-        
-        try:
-            # Import the module dynamically
-            module = importlib.import_module(f".{module_name}", package='contest_tools.reports')
-            
-            # Find the 'Report' class within the imported module
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if name == 'Report':
-                    # Check if the class has the required 'report_id' attribute
-                    if hasattr(obj, 'report_id'):
-                        report_id = obj.report_id
-                        AVAILABLE_REPORTS[report_id] = obj
-                    else:
-                        logging.warning(f"Report class in {filename} is missing 'report_id' attribute.")
-        except ImportError as e:
-            if 'matplotlib' in str(e) or 'jinja2' in str(e):
-                logging.warning(f"DEBUG TRACE: Skipping legacy report '{filename}': Missing dependency ({e}).")
-            else:
-                logging.exception(f"Failed to load report from {filename}: {e}")
-        except Exception as e:
-            # Suppress Django-specific errors when running in non-Django context (e.g., __main__ debugging)
-            if "settings are not configured" in str(e) or "Apps aren't loaded yet" in str(e):
-                # Only log as warning, do not dump stack
-                pass 
-            else:
-                logging.exception(f"Failed to load report from {filename}: {e}")
\ No newline at end of file
+from collections.abc import ItemsView, Mapping, ValuesView
+from typing import Any, Dict, Iterator, List, Optional
+
+MANIFEST_FILENAME = "report_manifest.json"
+MANIFEST_VERSION = 2
+
+# Class attributes copied into the manifest; ReportGenerator can select and
+# filter reports on these without importing the report modules.
+SPEC_FIELDS = ('report_id', 'report_name', 'report_type', 'is_specialized',
+               'supports_single', 'supports_pairwise', 'supports_multi')
+
+_REPORTS_DIR = os.path.dirname(os.path.abspath(__file__))
+_MANIFEST_PATH = os.path.join(_REPORTS_DIR, MANIFEST_FILENAME)
+
+
+class ReportSpec:
+    """
+    Manifest metadata for one report. Exposes the same metadata attributes as
+    the report class, plus the module that defines it and whether that module
+    needs Django.
+    """
+    def __init__(self, module: str, requires_django: bool = False, **fields: Any):
+        self.module = module
+        self.requires_django = requires_django
+        for field in SPEC_FIELDS:
+            setattr(self, field, fields.get(field))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'module': self.module, 'requires_django': self.requires_django,
+                **{field: getattr(self, field) for field in SPEC_FIELDS}}
+
+    @classmethod
+    def from_class(cls, module: str, report_class: type) -> 'ReportSpec':
+        return cls(module, requires_django=_module_requires_django(module),
+                   **{field: getattr(report_class, field) for field in SPEC_FIELDS})
+
+
+def _report_module_names() -> List[str]:
+    """Names of the candidate report modules in this package."""
+    return sorted(
+        filename[:-3] for filename in os.listdir(_REPORTS_DIR)
+        if filename.endswith('.py') and not filename.startswith('__')
+    )
+
+
+def _module_requires_django(module_name: str) -> bool:
+    """True if the module imports Django (read from its source, without importing it)."""
+    try:
+        with open(os.path.join(_REPORTS_DIR, f"{module_name}.py"), 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError):
+        return False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        if any(name.split('.')[0] == 'django' for name in names):
+            return True
+    return False
+
+
+def _django_configured() -> bool:
+    """True when Django settings are available, so reports that render Django templates can run."""
+    if os.environ.get('DJANGO_SETTINGS_MODULE'):
+        return True
+    django_conf = sys.modules.get('django.conf')
+    return django_conf is not None and django_conf.settings.configured
+
+
+def _import_report_class(module_name: str) -> Optional[type]:
+    """Imports one module and returns its 'Report' class, or None if it has none or fails to load."""
+    filename = f"{module_name}.py"
+    try:
+        # Import the module dynamically
+        module = importlib.import_module(f".{module_name}", package='contest_tools.reports')
+
+        # Look the class up by name; scanning all module members would touch
+        # lazy objects such as Django's settings.
+        obj = getattr(module, 'Report', None)
+        if isinstance(obj, type):
+            # Check if the class has the required 'report_id' attribute
+            if hasattr(obj, 'report_id'):
+                return obj
+            logging.warning(f"Report class in {filename} is missing 'report_id' attribute.")
+    except ImportError as e:
+        if 'matplotlib' in str(e) or 'jinja2' in str(e):
+            logging.warning(f"DEBUG TRACE: Skipping legacy report '{filename}': Missing dependency ({e}).")
+        else:
+            logging.exception(f"Failed to load report from {filename}: {e}")
+    except Exception as e:
+        # Suppress Django-specific errors when running in non-Django context (e.g., __main__ debugging)
+        if "settings are not configured" in str(e) or "Apps aren't loaded yet" in str(e):
+            # Only log as warning, do not dump stack
+            pass
+        else:
+            logging.exception(f"Failed to load report from {filename}: {e}")
+    return None
+
+
+def _load_manifest() -> Dict[str, Any]:
+    """Reads the manifest, returning an empty one if it is missing or unreadable."""
+    try:
+        with open(_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            logging.warning(f"Report manifest version {manifest.get('version')} is not {MANIFEST_VERSION}; ignoring it.")
+            return {'modules': [], 'reports': []}
+        return manifest
+    except FileNotFoundError:
+        logging.warning(f"Report manifest '{MANIFEST_FILENAME}' not found; importing all report modules.")
+    except (OSError, ValueError) as e:
+        logging.error(f"Could not read report manifest '{MANIFEST_FILENAME}': {e}")
+    return {'modules': [], 'reports': []}
+
+
+class _LoadedItemsView(ItemsView):
+    def __iter__(self):
+        for report_id in list(self._mapping):
+            try:
+                yield report_id, self._mapping[report_id]
+            except KeyError:
+                continue
+
+
+class _LoadedValuesView(ValuesView):
+    def __iter__(self):
+        for report_id, report_class in _LoadedItemsView(self._mapping):
+            yield report_class
+
+
+class ReportRegistry(Mapping):
+    """
+    Maps report_id to its report class, importing each report module on first
+    access. Iteration, len() and membership tests only use the manifest;
+    spec() and specs() return the manifest metadata without importing anything.
+
+    Reports whose module needs Django are left out unless Django is
+    configured. A report whose module fails to import is dropped from the
+    registry, so items() and values() skip it instead of raising.
+    """
+    def __init__(self):
+        self._specs: Dict[str, ReportSpec] = {}
+        self._classes: Dict[str, type] = {}
+
+        manifest = _load_manifest()
+        for entry in manifest.get('reports', []):
+            spec = ReportSpec(**entry)
+            self._specs[spec.report_id] = spec
+
+        # Modules added since the manifest was generated are imported now, so a
+        # stale manifest costs startup time but never hides a report.
+        known_modules = set(manifest.get('modules', [])) | {s.module for s in self._specs.values()}
+        for module_name in _report_module_names():
+            if module_name in known_modules:
+                continue
+            report_class = _import_report_class(module_name)
+            if report_class is not None:
+                if manifest.get('reports'):
+                    logging.warning(f"Report module '{module_name}' is not in {MANIFEST_FILENAME}; "
+                                    f"run scripts/build_report_manifest.py to update it.")
+                self._specs[report_class.report_id] = ReportSpec.from_class(module_name, report_class)
+                self._classes[report_class.report_id] = report_class
+
+    def _available_specs(self) -> List[ReportSpec]:
+        django_configured = _django_configured()
+        return [spec for spec in self._specs.values() if django_configured or not spec.requires_django]
+
+    def __getitem__(self, report_id: str) -> type:
+        report_class = self._classes.get(report_id)
+        if report_class is None:
+            spec = self.spec(report_id)
+            report_class = _import_report_class(spec.module)
+            if report_class is None or report_class.report_id != report_id:
+                del self._specs[report_id]
+                raise KeyError(report_id)
+            self._classes[report_id] = report_class
+        return report_class
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([spec.report_id for spec in self._available_specs()])
+
+    def __len__(self) -> int:
+        return len(self._available_specs())
+
+    def __contains__(self, report_id: object) -> bool:
+        spec = self._specs.get(report_id)
+        return spec is not None and (not spec.requires_django or _django_configured())
+
+    def items(self) -> ItemsView:
+        return _LoadedItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _LoadedValuesView(self)
+
+    def spec(self, report_id: str) -> ReportSpec:
+        if report_id not in self:
+            raise KeyError(report_id)
+        return self._specs[report_id]
+
+    def specs(self) -> List[ReportSpec]:
+        return self._available_specs()
+
+
+def build_manifest() -> Dict[str, Any]:
+    """
+    Imports every report module and returns the manifest describing them.
+    'modules' lists every module scanned, including helpers with no Report
+    class, so the registry does not re-import them at startup.
+    """
+    modules = _report_module_names()
+    reports = []
+    for module_name in modules:
+        report_class = _import_report_class(module_name)
+        if report_class is not None:
+            reports.append(ReportSpec.from_class(module_name, report_class).to_dict())
+    return {'version': MANIFEST_VERSION, 'modules': modules, 'reports': reports}
+
+
+def write_manifest(path: str = _MANIFEST_PATH) -> Dict[str, Any]:
+    """Regenerates the manifest file from the report classes."""
+    manifest = build_manifest()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+
+def validate_manifest() -> List[str]:
+    """
+    Compares the manifest on disk with the report classes and checks that
+    every report the registry lists in the current environment loads.
+    Returns a list of problems (empty when the manifest is current).
+    """
+    expected = build_manifest()
+    actual = _load_manifest()
+    problems = []
+
+    if sorted(actual.get('modules', [])) != expected['modules']:
+        missing = set(expected['modules']) - set(actual.get('modules', []))
+        extra = set(actual.get('modules', [])) - set(expected['modules'])
+        if missing:
+            problems.append(f"Modules missing from manifest: {', '.join(sorted(missing))}")
+        if extra:
+            problems.append(f"Manifest lists modules that no longer exist: {', '.join(sorted(extra))}")
+
+    expected_reports = {r['report_id']: r for r in expected['reports']}
+    actual_reports = {r.get('report_id'): r for r in actual.get('reports', [])}
+    for report_id in sorted(set(expected_reports) | set(actual_reports)):
+        if report_id not in actual_reports:
+            problems.append(f"Report '{report_id}' is missing from manifest")
+        elif report_id not in expected_reports:
+            problems.append(f"Manifest lists unknown report '{report_id}'")
+        elif actual_reports[report_id] != expected_reports[report_id]:
+            problems.append(f"Manifest entry for '{report_id}' does not match its class")
+
+    # Every report the registry lists in this environment must load.
+    registry = ReportRegistry()
+    listed = list(registry)
+    loaded = dict(registry.items())
+    for report_id in listed:
+        if report_id not in loaded:
+            problems.append(f"Report '{report_id}' is listed but could not be loaded")
+    return problems
+
+
+AVAILABLE_REPORTS = ReportRegistry()
@@ -23,7 +23,7 @@ from plotly.subplots import make_subplots
 
 from ..contest_log import ContestLog
 from .report_interface import ContestReport
-from contest_tools.utils.report_utils import create_output_directory, get_valid_dataframe, save_debug_data, get_standard_footer, get_standard_title_lines, build_filename, write_json_ascii
+from contest_tools.utils.report_utils import create_output_directory, get_valid_dataframe, save_debug_data, get_standard_footer, get_standard_title_lines, build_filename, write_chart_artifacts
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from ..styles.plotly_style_manager import PlotlyStyleManager
 
@@ -328,22 +328,16 @@ class BaseRateReport(ContestReport):
         
         # --- Save Outputs ---
         
-        # 1. JSON (New Artifact)
+        # JSON (Web App) and HTML (Interactive) from one serialization; responsive layout, 7-bit ASCII
         json_path = os.path.join(output_path, f"{base_filename}.json")
-        try:
-             # Ensure responsive layout in JSON for Web App; write 7-bit ASCII only
-             fig.update_layout(autosize=True, width=None, height=None)
-             write_json_ascii(fig.to_json(), json_path)
-             # Revert for PNG (Disabled for Web Architecture)
-             # fig.update_layout(autosize=False, width=1200, height=900)
-        except Exception as e:
-             logging.warning(f"JSON artifact generation failed: {e}")
-
-        # 2. HTML (Interactive)
         html_path = os.path.join(output_path, f"{base_filename}.html")
         fig.update_layout(autosize=True, width=None, height=None)
         config = {'toImageButtonOptions': {'filename': base_filename, 'format': 'png'}}
-        fig.write_html(html_path, include_plotlyjs='cdn', config=config)
+        try:
+             write_chart_artifacts(fig, html_path, json_path, config=config)
+        except Exception as e:
+             logging.warning(f"JSON artifact generation failed: {e}")
+             PlotlyStyleManager.write_html(fig, html_path, config=config)
         
         # PNG Generation (Kaleido) disabled for Web Architecture
         # fig.write_image(png_file)
@@ -25,7 +25,7 @@ from plotly.subplots import make_subplots
 from ..contest_log import ContestLog
 from .report_interface import ContestReport
 from ..data_aggregators.matrix_stats import MatrixAggregator
-from contest_tools.utils.report_utils import create_output_directory, _sanitize_filename_part, get_standard_footer, get_standard_title_lines, get_valid_dataframe, write_json_ascii
+from contest_tools.utils.report_utils import create_output_directory, _sanitize_filename_part, get_standard_footer, get_standard_title_lines, get_valid_dataframe, write_chart_artifacts
 from ..styles.plotly_style_manager import PlotlyStyleManager
 
 class Report(ContestReport):
@@ -122,18 +122,14 @@ class Report(ContestReport):
             
             generated_files = []
 
-            # 1. Save JSON (Web Component Artifact) - 7-bit ASCII only
+            # Save JSON (Web Component Artifact, 7-bit ASCII) and HTML (Interactive) from one serialization
             json_filename = f"{filename_base}.json"
             json_path = os.path.join(charts_dir, json_filename)
-            write_json_ascii(fig.to_json(), json_path)
-            generated_files.append(json_filename)
-
-            # Save HTML (Interactive)
             html_filename = f"{filename_base}.html"
             html_path = os.path.join(charts_dir, html_filename)
             config = {'toImageButtonOptions': {'filename': filename_base, 'format': 'png'}}
-            fig.write_html(html_path, config=config)
-            generated_files.append(html_filename)
+            written = write_chart_artifacts(fig, html_path, json_path, config=config)
+            generated_files.extend(os.path.basename(p) for p in written)
 
             # PNG Generation disabled for Web Architecture (Phase 3)
 
@@ -163,6 +163,6 @@ class Report(ContestReport):
         # fig.write_image(png_file)
         
         config = {'toImageButtonOptions': {'filename': base_filename, 'format': 'png'}}
-        fig.write_html(html_file, config=config)
+        PlotlyStyleManager.write_html(fig, html_file, config=config)
 
         return [png_file, html_file]
\ No newline at end of file
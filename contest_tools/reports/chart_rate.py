@@ -33,7 +33,7 @@ from contest_tools.utils.report_utils import (
     get_standard_footer,
     get_standard_title_lines,
     build_filename,
-    write_json_ascii,
+    write_chart_artifacts,
 )
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from ..styles.plotly_style_manager import PlotlyStyleManager
@@ -254,15 +254,9 @@ class Report(ContestReport):
             json_path = os.path.join(output_path, f"{base_filename}.json")
             try:
                 config = {"toImageButtonOptions": {"filename": base_filename, "format": "png"}}
-                fig.write_html(html_path, include_plotlyjs="cdn", config=config)
-                generated.append(html_path)
+                generated.extend(write_chart_artifacts(fig, html_path, json_path, config=config))
             except Exception as e:
-                logging.error("Failed to save Rate Chart HTML: %s", e)
-            try:
-                write_json_ascii(fig.to_json(), json_path)
-                generated.append(json_path)
-            except Exception as e:
-                logging.error("Failed to save Rate Chart JSON: %s", e)
+                logging.error("Failed to save Rate Chart artifacts: %s", e)
 
         if not generated:
             return "No Rate Chart files generated."
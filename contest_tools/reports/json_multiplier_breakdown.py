@@ -1,7 +1,8 @@
 # contest_tools/reports/json_multiplier_breakdown.py
 #
 # Purpose: Generates a machine-readable JSON artifact of the Multiplier Breakdown.
-#          This serves as a high-speed cache for the web dashboard.
+#          The web dashboard renders from the dashboard aggregate bundle
+#          (utils/dashboard_aggregates.py); this artifact is for downloads.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -28,7 +29,6 @@ logger = logging.getLogger(__name__)
 class Report(ContestReport):
     """
     Generates a machine-readable JSON artifact of the Multiplier Breakdown.
-    This serves as a high-speed cache for the web dashboard.
     """
     report_id = 'json_multiplier_breakdown'
     report_name = 'JSON Multiplier Breakdown Artifact'
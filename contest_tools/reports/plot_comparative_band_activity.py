@@ -194,7 +194,7 @@ class Report(ContestReport):
             )
             # Save HTML
             config = {'toImageButtonOptions': {'filename': filename_base, 'format': 'png'}}
-            fig.write_html(filepath_html, include_plotlyjs='cdn', config=config)
+            PlotlyStyleManager.write_html(fig, filepath_html, config=config)
             results.append(f"Interactive plot saved: {filepath_html}")
             
             return "\n".join(results)
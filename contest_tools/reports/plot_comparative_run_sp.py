@@ -192,7 +192,7 @@ class Report(ContestReport):
         save_debug_data(debug_data_flag, output_path, plot_data_for_debug, custom_filename=debug_filename)
         
         config = {'toImageButtonOptions': {'filename': base_filename, 'format': 'png'}}
-        fig.write_html(html_path, config=config)
+        PlotlyStyleManager.write_html(fig, html_path, config=config)
         # PNG Generation disabled for Web Architecture
         # fig.write_image(png_path)
         
@@ -24,7 +24,7 @@ import logging
 
 from ..contest_log import ContestLog
 from .report_interface import ContestReport
-from contest_tools.utils.report_utils import create_output_directory, get_valid_dataframe, save_debug_data, _sanitize_filename_part, get_standard_footer, get_standard_title_lines, build_filename, write_json_ascii
+from contest_tools.utils.report_utils import create_output_directory, get_valid_dataframe, save_debug_data, _sanitize_filename_part, get_standard_footer, get_standard_title_lines, build_filename, write_chart_artifacts
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from ..styles.plotly_style_manager import PlotlyStyleManager
 
@@ -684,7 +684,8 @@ class Report(ContestReport):
         
         generated_files = []
         
-        # Save HTML
+        # Save HTML and JSON (Web Component) from one serialization - 7-bit ASCII only
+        json_path = os.path.join(output_path, json_filename)
         try:
             # Fixed Height with responsive width (Hard Deck Strategy)
             fig.update_layout(
@@ -712,19 +713,10 @@ class Report(ContestReport):
             )
 
             config = {'toImageButtonOptions': {'filename': base_filename, 'format': 'png'}}
-            fig.write_html(html_path, include_plotlyjs='cdn', config=config)
-            generated_files.append(html_path)
+            generated_files.extend(write_chart_artifacts(fig, html_path, json_path, config=config))
         
         except Exception as e:
-            logging.error(f"Failed to save HTML report: {e}")
-
-        # Save JSON (Web Component) - 7-bit ASCII only
-        json_path = os.path.join(output_path, json_filename)
-        try:
-            write_json_ascii(fig.to_json(), json_path)
-            generated_files.append(json_path)
-        except Exception as e:
-            logging.error(f"Failed to save JSON data: {e}")
+            logging.error(f"Failed to save HTML/JSON report: {e}")
 
         # Save PNG (Requires Kaleido)
         # Disabled for Web Architecture
@@ -1,6 +1,9 @@
 # contest_tools/reports/plot_interactive_animation.py
 #
 # Purpose: Generates an interactive HTML animation dashboard.
+#          By default the per-hour data is shipped once as compact columnar
+#          typed arrays and animated by a small client-side JS driver; the
+#          legacy one-Plotly-frame-per-hour encoding remains available.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -14,22 +17,55 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 #
 import os
+import json
+import base64
 import logging
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
 
 from .report_interface import ContestReport
-from contest_tools.utils.report_utils import create_output_directory, _sanitize_filename_part, get_standard_footer, get_standard_title_lines, get_valid_dataframe
+from contest_tools.utils.report_utils import create_output_directory, _sanitize_filename_part, get_standard_footer, get_standard_title_lines, get_valid_dataframe, normalize_json_to_ascii
 from contest_tools.utils.callsign_utils import build_callsigns_filename_part
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from ..data_aggregators.matrix_stats import MatrixAggregator
 from ..styles.plotly_style_manager import PlotlyStyleManager
 
+_DRIVER_SCRIPT_PATH = Path(__file__).resolve().parent.parent / 'templates' / 'partials' / 'interactive_animation_driver.js'
+
+
+def _load_driver_script() -> str:
+    """Returns the client-side driver for the compact animation encoding."""
+    return _DRIVER_SCRIPT_PATH.read_text(encoding='utf-8')
+
+
+def _encode_typed_array(arr: np.ndarray, dtype: str) -> Dict[str, Any]:
+    """Encodes an array as a base64 little-endian typed array descriptor for the JS driver."""
+    np_dtype = {'uint16': '<u2', 'int32': '<i4', 'float64': '<f8'}[dtype]
+    raw = np.ascontiguousarray(arr, dtype=np_dtype).tobytes()
+    return {'dtype': dtype, 'data': base64.b64encode(raw).decode('ascii')}
+
+
+def _time_annotation(full_format: str) -> Dict[str, Any]:
+    """The 'Current Time' annotation shown above the racing bars."""
+    return {
+        "text": f"<b>Current Time: {full_format}</b>",
+        "x": 0.5,
+        "y": 1.02,
+        "xref": "paper",
+        "yref": "paper",
+        "showarrow": False,
+        "font": {"size": 16, "color": "#2c3e50"},
+        "xanchor": "center",
+        "yanchor": "bottom"
+    }
+
+
 class Report(ContestReport):
     """
     Generates an interactive HTML animation dashboard.
@@ -47,6 +83,10 @@ class Report(ContestReport):
     supports_multi: bool = True
     supports_single: bool = True  # Generate single-log files for individual analysis
 
+    # 'compact': columnar typed arrays + JS driver (small, fast). 'frames': one go.Frame per hour.
+    # Override per run with the 'animation_encoding' kwarg.
+    DEFAULT_ENCODING: str = "compact"
+
     def _get_mode_color(self, base_hex: str, mode: str) -> str:
         """Calculates color based on mode: Run=Solid, S&P=50% Opacity, Unknown=Light Gray."""
         if mode == 'Unknown':
@@ -270,12 +310,10 @@ class Report(ContestReport):
                 row=1, col=1 # Assign to any subplot, it won't render data
             )
 
-        # 4. Generate Frames with Time Formatting
-        frames = []
-        time_formats = {}  # Cache formatted times
+        # 4. Time Labels and Frame Encoding
+        time_formats = {t_label: self._format_time_display(t_label) for t_label in time_bins}
         
         # Prepare footer text for frame annotations (needed since frame layouts replace all annotations)
-        # Define footer_text early so it can be used in frames
         footer_text = get_standard_footer(self.logs)
         footer_annotation = {
             "x": 0.5,
@@ -288,92 +326,29 @@ class Report(ContestReport):
             "align": "center",
             "valign": "top"
         }
-        
-        for t_idx, t_label in enumerate(time_bins):
-            frame_data = []
-            
-            # Format time for this frame
-            full_format, compact_format = self._format_time_display(t_label)
-            time_formats[t_label] = (full_format, compact_format)
-            
-            # Update Pane 1: Racing Bars
-            scores = [data['ts_data'][call]['score'][t_idx] for call in callsigns]
-            # Plotly expects data in order of traces added
-            frame_data.append(go.Bar(x=scores, text=scores))
-            
-            # Update Pane 2 & 3
-            x_axis_items = data['bands'] if dimension == 'band' else data['modes']
-            frame_bars_count = 0
-            
-            # Track trace index for positioning (skip index 0 which is racing bar)
-            trace_idx = 1
-            
-            for i, call in enumerate(callsigns):
-                base_color = base_palette[i % len(base_palette)]
-                
-                for run_status in run_statuses:
-                    color = self._get_mode_color(base_color, run_status)
-                    
-                    # Hourly Data (row=2, col=1)
-                    if dimension == 'band':
-                        y_hourly = [data['matrix_hourly'][call][band][run_status][t_idx] for band in x_axis_items]
-                    else:
-                        y_hourly = [data['matrix_hourly'][call][mode][run_status][t_idx] for mode in x_axis_items]
-                    
-                    # CRITICAL: Explicitly set offsetgroup, legendgroup, and color to match initial traces
-                    frame_data.append(go.Bar(
-                        x=x_axis_items,
-                        y=y_hourly,
-                        name=call,
-                        offsetgroup=call,  # Group by Call for side-by-side positioning
-                        legendgroup=call,
-                        marker_color=color,
-                        textposition='none'
-                    ))
-                    trace_idx += 1
-                    frame_bars_count += 1
-                    
-                    # Cumulative Data (row=2, col=2)
-                    if dimension == 'band':
-                        y_cumul = [data['matrix_cumulative'][call][band][run_status][t_idx] for band in x_axis_items]
-                    else:
-                        y_cumul = [data['matrix_cumulative'][call][mode][run_status][t_idx] for mode in x_axis_items]
-                    
-                    # CRITICAL: Explicitly set offsetgroup, legendgroup, and color to match initial traces
-                    frame_data.append(go.Bar(
-                        x=x_axis_items,
-                        y=y_cumul,
-                        name=call,
-                        offsetgroup=call,  # Group by Call for side-by-side positioning
-                        legendgroup=call,
-                        marker_color=color,
-                        textposition='none'
-                    ))
-                    trace_idx += 1
-                    frame_bars_count += 1
-
-            # Include layout update for annotations in frame
-            # Note: Frame layout annotations replace ALL annotations, so we must include both
-            frame_layout = {
-                "annotations": [
-                    {
-                        "text": f"<b>Current Time: {full_format}</b>",
-                        "x": 0.5,
-                        "y": 1.02,
-                        "xref": "paper",
-                        "yref": "paper",
-                        "showarrow": False,
-                        "font": {"size": 16, "color": "#2c3e50"},
-                        "xanchor": "center",
-                        "yanchor": "bottom"
-                    },
-                    footer_annotation.copy()  # Include footer in each frame
-                ]
-            }
-            
-            frames.append(go.Frame(data=frame_data, name=t_label, layout=frame_layout))
 
-        fig.frames = frames
+        encoding = kwargs.get('animation_encoding') or self.DEFAULT_ENCODING
+        if encoding not in ('compact', 'frames'):
+            logging.warning(f"Unknown animation_encoding '{encoding}'. Using '{self.DEFAULT_ENCODING}'.")
+            encoding = self.DEFAULT_ENCODING
+
+        if encoding == 'frames':
+            frames = self._build_frames(data, dimension, callsigns, run_statuses, time_formats, footer_annotation)
+            fig.frames = frames
+            # Plotly-driven controls: each step/button animates named frames
+            step_method = "animate"
+            steps_args = [[[f.name], {"frame": {"duration": 0, "redraw": True}, "mode": "immediate"}] for f in frames]
+            play_args = [None, {"frame": {"duration": 1000, "redraw": True}, "fromcurrent": True}]
+            pause_args = [[None], {"frame": {"duration": 0, "redraw": False}, "mode": "immediate", "transition": {"duration": 0}}]
+            speed_args = [[None, {"frame": {"duration": ms, "redraw": True}, "mode": "immediate", "transition": {"duration": ms}}]
+                          for ms in (2000, 1000, 500, 200)]
+        else:
+            # Controls are inert ('skip'); the embedded JS driver reacts to their events
+            step_method = "skip"
+            steps_args = [[t_idx] for t_idx in range(len(time_bins))]
+            play_args = ["play"]
+            pause_args = ["pause"]
+            speed_args = [["speed", ms] for ms in (2000, 1000, 500, 200)]
 
         # 5. Configure Axes and Layout
         
@@ -426,12 +401,12 @@ class Report(ContestReport):
                 "yanchor": "bottom",
                 "buttons": [{
                     "label": "Play",
-                    "method": "animate",
-                    "args": [None, {"frame": {"duration": 1000, "redraw": True}, "fromcurrent": True}]
+                    "method": step_method,
+                    "args": play_args
                 }, {
                     "label": "Pause",
-                    "method": "animate",
-                    "args": [[None], {"frame": {"duration": 0, "redraw": False}, "mode": "immediate", "transition": {"duration": 0}}]
+                    "method": step_method,
+                    "args": pause_args
                 }]
             }, {
                 "type": "dropdown",
@@ -443,10 +418,8 @@ class Report(ContestReport):
                 "yanchor": "bottom",
                 "active": 1,
                 "buttons": [
-                    {"label": "FPS: 0.5", "method": "animate", "args": [None, {"frame": {"duration": 2000, "redraw": True}, "mode": "immediate", "transition": {"duration": 2000}}]},
-                    {"label": "FPS: 1",   "method": "animate", "args": [None, {"frame": {"duration": 1000, "redraw": True}, "mode": "immediate", "transition": {"duration": 1000}}]},
-                    {"label": "FPS: 2",   "method": "animate", "args": [None, {"frame": {"duration": 500, "redraw": True}, "mode": "immediate", "transition": {"duration": 500}}]},
-                    {"label": "FPS: 5",   "method": "animate", "args": [None, {"frame": {"duration": 200, "redraw": True}, "mode": "immediate", "transition": {"duration": 200}}]}
+                    {"label": label, "method": step_method, "args": args}
+                    for label, args in zip(("FPS: 0.5", "FPS: 1", "FPS: 2", "FPS: 5"), speed_args)
                 ]
             }],
             sliders=[{
@@ -459,11 +432,11 @@ class Report(ContestReport):
                 },
                 "steps": [
                     {
-                        "args": [[f.name], {"frame": {"duration": 0, "redraw": True}, "mode": "immediate"}],
-                        "label": time_formats.get(f.name, ("", ""))[1],  # Compact format for slider labels (e.g., "Sep 28, 00:00")
-                        "method": "animate"
+                        "args": args,
+                        "label": time_formats[t_label][1],  # Compact format for slider labels (e.g., "Sep 28, 00:00")
+                        "method": step_method
                     }
-                    for f in frames
+                    for t_label, args in zip(time_bins, steps_args)
                 ],
                 "active": 0
             }]
@@ -475,19 +448,7 @@ class Report(ContestReport):
         # This prevents overlay issues. Base layout only has static footer.
         fig.update_layout(
             title_text=final_title,
-            annotations=[
-                {
-                    "x": 0.5,
-                    "y": -0.25,
-                    "xref": "paper",
-                    "yref": "paper",
-                    "text": footer_text.replace('\n', '<br>'),
-                    "showarrow": False,
-                    "font": {"size": 12, "color": "#7f7f7f"},
-                    "align": "center",
-                    "valign": "top"
-                }
-            ]
+            annotations=[footer_annotation.copy()]
         )
 
         # 6. Save
@@ -499,7 +460,15 @@ class Report(ContestReport):
         download_filename = f"contest_progress_{callsigns_part}"
         config = {'toImageButtonOptions': {'filename': download_filename, 'format': 'png'}}
         
-        fig.write_html(full_path, auto_play=False, config=config)
+        if encoding == 'frames':
+            PlotlyStyleManager.write_html(fig, full_path, config=config, auto_play=False)
+        else:
+            payload = self._build_compact_payload(data, dimension, callsigns, run_statuses, time_formats, footer_annotation)
+            fig_json = normalize_json_to_ascii(pio.to_json(fig, validate=False))
+            post_script = f"var CLA_ANIMATION = {json.dumps(payload)};\n{_load_driver_script()}"
+            html = PlotlyStyleManager.render_html_shell(fig, fig_json, full_path, config=config, post_script=post_script)
+            with open(full_path, 'w', encoding='utf-8') as f:
+                f.write(html)
         
         if not os.path.exists(full_path):
             logging.error(f"ERROR: Animation file was NOT created: {full_path}")
@@ -508,6 +477,110 @@ class Report(ContestReport):
 
         return f"Interactive animation generated: {filename}"
 
+    def _build_frames(self, data: Dict[str, Any], dimension: str, callsigns: List[str], run_statuses: List[str],
+                      time_formats: Dict[str, Tuple[str, str]], footer_annotation: Dict[str, Any]) -> List[go.Frame]:
+        """
+        Builds one Plotly frame per time bin (legacy 'frames' encoding).
+        Every frame repeats all bar traces and the footer annotation.
+        """
+        frames = []
+        base_palette = PlotlyStyleManager._COLOR_PALETTE
+        x_axis_items = data['bands'] if dimension == 'band' else data['modes']
+
+        for t_idx, t_label in enumerate(data['time_bins']):
+            frame_data = []
+            full_format = time_formats[t_label][0]
+            
+            # Update Pane 1: Racing Bars
+            scores = [data['ts_data'][call]['score'][t_idx] for call in callsigns]
+            # Plotly expects data in order of traces added
+            frame_data.append(go.Bar(x=scores, text=scores))
+            
+            # Update Pane 2 & 3
+            for i, call in enumerate(callsigns):
+                base_color = base_palette[i % len(base_palette)]
+                
+                for run_status in run_statuses:
+                    color = self._get_mode_color(base_color, run_status)
+                    
+                    # Hourly Data (row=2, col=1)
+                    y_hourly = [data['matrix_hourly'][call][item][run_status][t_idx] for item in x_axis_items]
+                    
+                    # CRITICAL: Explicitly set offsetgroup, legendgroup, and color to match initial traces
+                    frame_data.append(go.Bar(
+                        x=x_axis_items,
+                        y=y_hourly,
+                        name=call,
+                        offsetgroup=call,  # Group by Call for side-by-side positioning
+                        legendgroup=call,
+                        marker_color=color,
+                        textposition='none'
+                    ))
+                    
+                    # Cumulative Data (row=2, col=2)
+                    y_cumul = [data['matrix_cumulative'][call][item][run_status][t_idx] for item in x_axis_items]
+                    
+                    # CRITICAL: Explicitly set offsetgroup, legendgroup, and color to match initial traces
+                    frame_data.append(go.Bar(
+                        x=x_axis_items,
+                        y=y_cumul,
+                        name=call,
+                        offsetgroup=call,  # Group by Call for side-by-side positioning
+                        legendgroup=call,
+                        marker_color=color,
+                        textposition='none'
+                    ))
+
+            # Include layout update for annotations in frame
+            # Note: Frame layout annotations replace ALL annotations, so we must include both
+            frame_layout = {
+                "annotations": [
+                    _time_annotation(full_format),
+                    footer_annotation.copy()  # Include footer in each frame
+                ]
+            }
+            
+            frames.append(go.Frame(data=frame_data, name=t_label, layout=frame_layout))
+
+        return frames
+
+    def _build_compact_payload(self, data: Dict[str, Any], dimension: str, callsigns: List[str], run_statuses: List[str],
+                               time_formats: Dict[str, Tuple[str, str]], footer_annotation: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Packs the animation data once as columnar typed arrays for the JS driver.
+
+        Arrays are little-endian and base64 encoded:
+        - score:  [time x call]
+        - hourly: [time x call x run_status x band/mode]
+        Cumulative values are the running sum of hourly and are rebuilt client-side.
+        Trace order matches generate(): racing bar, then (hourly, cumulative) per call and run status.
+        """
+        time_bins = data['time_bins']
+        num_bins = len(time_bins)
+        x_axis_items = data['bands'] if dimension == 'band' else data['modes']
+
+        score = np.array([data['ts_data'][call]['score'][:num_bins] for call in callsigns], dtype='<f8').T
+        hourly = np.array(
+            [[[data['matrix_hourly'][call][item][run_status][:num_bins] for item in x_axis_items]
+              for run_status in run_statuses]
+             for call in callsigns],
+            dtype=np.int64
+        ).reshape(len(callsigns), len(run_statuses), len(x_axis_items), num_bins)
+        hourly = np.moveaxis(hourly, -1, 0)  # -> time x call x run_status x item
+
+        hourly_dtype = 'uint16' if hourly.size == 0 or (hourly.min() >= 0 and hourly.max() <= np.iinfo(np.uint16).max) else 'int32'
+        return {
+            'times': [time_formats[t][0] for t in time_bins],
+            'n_calls': len(callsigns),
+            'n_statuses': len(run_statuses),
+            'n_items': len(x_axis_items),
+            'frame_ms': 1000,
+            'score': _encode_typed_array(score, 'float64'),
+            'hourly': _encode_typed_array(hourly, hourly_dtype),
+            'time_annotation': _time_annotation(''),
+            'footer_annotation': footer_annotation,
+        }
+
     def _prepare_data_band(self, **kwargs) -> Dict[str, Any]:
         """
         Aggregates and aligns data for band dimension (band -> RunStatus structure).
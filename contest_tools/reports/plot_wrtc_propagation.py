@@ -28,6 +28,7 @@ from ..contest_log import ContestLog
 from .report_interface import ContestReport
 from contest_tools.utils.report_utils import get_valid_dataframe, create_output_directory, save_debug_data, _sanitize_filename_part
 from ..data_aggregators import propagation_aggregator
+from ..styles.plotly_style_manager import PlotlyStyleManager
 
 class Report(ContestReport):
     report_id: str = "wrtc_propagation"
@@ -225,7 +226,7 @@ class Report(ContestReport):
         html_file = f"{filename_base}.html"
         html_path = os.path.join(output_path, html_file)
         config = {'toImageButtonOptions': {'filename': filename_base, 'format': 'png'}}
-        fig.write_html(html_path, config=config)
+        PlotlyStyleManager.write_html(fig, html_path, config=config)
         generated_files.append(html_file)
 
         # PNG Generation disabled for Web Architecture (Phase 3)
@@ -27,6 +27,7 @@ from ..contest_log import ContestLog
 from .report_interface import ContestReport
 from contest_tools.utils.report_utils import get_valid_dataframe, create_output_directory, save_debug_data, _sanitize_filename_part
 from ..data_aggregators import propagation_aggregator
+from ..styles.plotly_style_manager import PlotlyStyleManager
 
 class Report(ContestReport):
     report_id: str = "wrtc_propagation_animation"
@@ -224,7 +225,7 @@ class Report(ContestReport):
         
         try:
             config = {'toImageButtonOptions': {'filename': filename_base, 'format': 'png'}}
-            fig.write_html(filepath, auto_play=False, config=config)
+            PlotlyStyleManager.write_html(fig, filepath, config=config, auto_play=False)
             return f"Animation saved to: {filepath}"
         except Exception as e:
             logging.error(f"Failed to save animation: {e}")
@@ -15,6 +15,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from typing import List, Dict, Set, Tuple
+import numpy as np
 import pandas as pd
 import os
 import logging
@@ -23,6 +24,7 @@ from .report_interface import ContestReport
 from contest_tools.utils.report_utils import format_text_header, get_standard_footer, get_valid_dataframe
 from contest_tools.data_aggregators.time_series import TimeSeriesAggregator
 from contest_tools.utils.callsign_utils import callsign_to_filename_part
+from contest_tools.utils.text_table import cell_text, format_cells, hourly_values, join_columns
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +151,7 @@ class Report(ContestReport):
         Generates the breakdown report content.
         """
         final_report_messages = []
+        get_cached_ts_data = kwargs.get('_get_cached_ts_data')
 
         for log in self.logs:
             metadata = log.get_metadata()
@@ -183,9 +186,12 @@ class Report(ContestReport):
             else:
                 mult_label = "Mults"
             
-            # Get time series data from DAL
-            ts_agg = TimeSeriesAggregator([log])
-            ts_data = ts_agg.get_time_series_data()
+            # Get time series data from DAL (cached across reports when available)
+            if get_cached_ts_data:
+                ts_data = get_cached_ts_data()
+            else:
+                ts_agg = TimeSeriesAggregator([log])
+                ts_data = ts_agg.get_time_series_data()
             log_entry = ts_data['logs'].get(callsign, {})
             
             if not log_entry:
@@ -285,24 +291,23 @@ class Report(ContestReport):
             """Format QSO/Mult pair with aligned slash."""
             return f"{qsos:>{qso_width}}/{mults:<{mult_width}}"
         
-        # Calculate max widths for QSO and mult parts (to align "/" vertically)
-        max_qso = 0
-        max_mult = 0
-        for dim in valid_dimensions:
-            for q, m in zip(hourly_data.get(dim, []), hourly_new_mults.get(dim, [])):
-                max_qso = max(max_qso, len(str(q)))
-                max_mult = max(max_mult, len(str(m)))
-            # Check totals
-            total_q = sum(hourly_data.get(dim, []))
-            total_m = sum(hourly_new_mults.get(dim, []))
-            max_qso = max(max_qso, len(str(total_q)))
-            max_mult = max(max_mult, len(str(total_m)))
-        
-        # Check overall totals
-        total_qsos_sum = sum(sum(hourly_data.get(dim, [])) for dim in valid_dimensions)
-        total_breakdown_mults = sum(sum(hourly_new_mults.get(dim, [])) for dim in valid_dimensions)
-        max_qso = max(max_qso, len(str(total_qsos_sum)))
-        max_mult = max(max_mult, len(str(total_breakdown_mults)))
+        # Hour x dimension blocks of QSOs and new multipliers
+        n_hours = len(master_index)
+        qso_block = np.zeros((n_hours, len(valid_dimensions)), dtype=np.int64)
+        mult_block = np.zeros((n_hours, len(valid_dimensions)), dtype=np.int64)
+        for j, dim in enumerate(valid_dimensions):
+            qso_block[:, j] = hourly_values(hourly_data.get(dim), n_hours)
+            mult_block[:, j] = hourly_values(hourly_new_mults.get(dim), n_hours)
+        hour_qsos = qso_block.sum(axis=1)
+        hour_mults = mult_block.sum(axis=1)
+
+        def max_len(*arrays) -> int:
+            return max((len(str(v)) for array in arrays for v in np.asarray(array).ravel().tolist()), default=0)
+
+        # Calculate max widths for QSO and mult parts (to align "/" vertically),
+        # including the per-dimension and overall totals
+        max_qso = max_len(qso_block, qso_block.sum(axis=0), [qso_block.sum()])
+        max_mult = max_len(mult_block, mult_block.sum(axis=0), [mult_block.sum()])
         
         # Column width = QSO width + "/" + mult width
         dim_col_width = max(max_qso + 1 + max_mult, 
@@ -310,8 +315,8 @@ class Report(ContestReport):
                            len("Total"), 7)
         
         # Calculate CUMM column widths
-        cumm_qso = max(len(str(c)) for c in cum_qsos) if cum_qsos else 1
-        cumm_mult = max(len(str(c)) for c in hourly_cum_mults) if hourly_cum_mults else 1
+        cumm_qso = max_len(cum_qsos) if cum_qsos else 1
+        cumm_mult = max_len(hourly_cum_mults) if hourly_cum_mults else 1
         cumm_col_width = max(cumm_qso + 1 + cumm_mult, len("Cumm")) + 1
         
         # Calculate Score column width
@@ -319,12 +324,9 @@ class Report(ContestReport):
         score_col_width = max_score_width + 1
         
         # Calculate InactiveTime column width
-        max_inactive_width = len("InactiveTime")  # Minimum width for header
-        for hour_ts in master_index:
-            inactive_minutes = inactive_time_per_hour.get(hour_ts, 0)
-            if inactive_minutes > 0:
-                inactive_str = f"{inactive_minutes} minutes"
-                max_inactive_width = max(max_inactive_width, len(inactive_str))
+        inactive_minutes = np.array([inactive_time_per_hour.get(hour_ts, 0) for hour_ts in master_index], dtype=np.int64)
+        inactive_text = np.array([f"{m} minutes" if m > 0 else '' for m in inactive_minutes.tolist()], dtype=str)
+        max_inactive_width = max([len("InactiveTime")] + [len(t) for t in inactive_text.tolist()])
         inactive_col_width = max_inactive_width + 1
         
         # Build header row
@@ -344,59 +346,31 @@ class Report(ContestReport):
         report_lines.append("")
         report_lines.append(header)
         report_lines.append("")
-        
-        # Data rows
-        for hour_idx, hour_ts in enumerate(master_index):
-            # Format hour label (D{day}-{HHMM}Z)
-            day_num = (hour_ts.date() - master_index[0].date()).days + 1
-            hour_label = f"D{day_num}-{hour_ts.strftime('%H%M')}Z"
-            
-            # Get QSOs and multipliers for each dimension
-            row_parts = [f"{hour_label:<10}"]
-            total_qsos = 0
-            total_mults = 0
-            
-            for dim in valid_dimensions:
-                qsos_list = hourly_data.get(dim, [])
-                mults_list = hourly_new_mults.get(dim, [])
-                qsos = qsos_list[hour_idx] if hour_idx < len(qsos_list) else 0
-                mults = mults_list[hour_idx] if hour_idx < len(mults_list) else 0
-                total_qsos += qsos
-                total_mults += mults
-                
-                if qsos == 0 and mults == 0:
-                    row_parts.append(f"{'  -  ':>{dim_col_width}}")
-                else:
-                    pair_str = format_qso_mult(qsos, mults, max_qso, max_mult)
-                    row_parts.append(f"{pair_str:>{dim_col_width}}")
-            
-            # Total for hour
-            if total_qsos == 0 and total_mults == 0:
-                row_parts.append(f"{'  -  ':>{dim_col_width}}")
-            else:
-                pair_str = format_qso_mult(total_qsos, total_mults, max_qso, max_mult)
-                row_parts.append(f"{pair_str:>{dim_col_width}}")
-            
-            # Cumulative
-            cum_qso = cum_qsos[hour_idx] if hour_idx < len(cum_qsos) else 0
-            cum_mult = hourly_cum_mults[hour_idx] if hour_idx < len(hourly_cum_mults) else 0
-            cum_pair_str = format_qso_mult(cum_qso, cum_mult, cumm_qso, cumm_mult)
-            row_parts.append(f"{cum_pair_str:>{cumm_col_width}}")
-            
-            # Score
-            score = cum_score[hour_idx] if hour_idx < len(cum_score) else 0
-            score_str = f"{score:,}"
-            row_parts.append(f"{score_str:>{score_col_width}}")
-            
-            # InactiveTime
-            inactive_minutes = inactive_time_per_hour.get(hour_ts, 0)
-            if inactive_minutes > 0:
-                inactive_str = f"{inactive_minutes} minutes"
-                row_parts.append(f"{inactive_str:>{inactive_col_width}}")
-            else:
-                row_parts.append(f"{'':>{inactive_col_width}}")
-            
-            report_lines.append("  ".join(row_parts))
+
+        def pair_cells(qsos, mults, qso_width, mult_width, col_width, dash_empty=True):
+            """QSO/Mult cells for whole columns; '  -  ' where both are zero."""
+            cell = f"{{:>{col_width}}}".format
+            pair = f"{{:>{qso_width}}}/{{:<{mult_width}}}".format
+            empty = cell('  -  ')
+            return [
+                empty if dash_empty and q == '0' and m == '0' else cell(pair(q, m))
+                for q, m in zip(cell_text(qsos), cell_text(mults))
+            ]
+
+        # Data rows: hour label (D{day}-{HHMM}Z), one QSO/Mult column per dimension,
+        # hourly total, cumulative QSOs/mults, score and inactive time
+        if n_hours:
+            day_numbers = (master_index.normalize() - master_index[0].normalize()).days + 1
+            hour_labels = [f"D{day}-{hhmm}Z" for day, hhmm in zip(day_numbers, master_index.strftime('%H%M'))]
+            columns = [format_cells(hour_labels, 10, align='<')]
+            for j in range(len(valid_dimensions)):
+                columns.append(pair_cells(qso_block[:, j], mult_block[:, j], max_qso, max_mult, dim_col_width))
+            columns.append(pair_cells(hour_qsos, hour_mults, max_qso, max_mult, dim_col_width))
+            columns.append(pair_cells(hourly_values(cum_qsos, n_hours), hourly_values(hourly_cum_mults, n_hours),
+                                      cumm_qso, cumm_mult, cumm_col_width, dash_empty=False))
+            columns.append(format_cells(hourly_values(cum_score, n_hours), score_col_width, fmt=','))
+            columns.append(format_cells(inactive_text, inactive_col_width))
+            report_lines.extend(join_columns(columns, "  "))
         
         # Footer - Totals by dimension
         report_lines.append("")
@@ -15,11 +15,13 @@
 
 from typing import List, Dict, Any
 import os
+import numpy as np
 from ..contest_log import ContestLog
 from .report_interface import ContestReport
 from contest_tools.utils.report_utils import format_text_header, get_standard_footer, get_standard_title_lines
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from ..utils.callsign_utils import callsign_to_filename_part
+from ..utils.text_table import TextColumn, TOTAL_LAST, TOTAL_SUM, hourly_values, render_text_table
 
 class Report(ContestReport):
     """
@@ -149,117 +151,31 @@ class Report(ContestReport):
     def _build_table_block(self, title, col_defs, time_bins, new_mults_by_band, cumulative_mults, bands):
         """
         Constructs a formatted text table block for multiplier timeline.
+        New multipliers per hour are the sum of the band columns, or the
+        change in the cumulative count when there are no band columns.
         """
-        lines = []
-        
-        # 1. Headers
-        header1_parts = [f"{'Hour':<5}"]
-        
-        for col in col_defs:
-            w = col['width']
-            header1_parts.append(f"{col['header']:>{w}}")
-            
-        header1 = " ".join(header1_parts)
-        
-        # 2. Width Calculation & Title Centering
-        table_width = len(header1)
-        separator = "-" * table_width
-        
-        # Center title relative to table width
-        title_line = title.center(table_width)
-        
-        lines.append(title_line)
-        lines.append("")
-        lines.append(header1)
-        lines.append(separator)
-        
-        # 3. Data Rows
-        cumulative_total = 0
-        
-        # Pre-calculate column totals
-        col_totals = {col['key']: 0 for col in col_defs}
-        
-        for i, time_iso in enumerate(time_bins):
-            hour_str = time_iso[11:13] + time_iso[14:16]
-            
-            # Calculate row values
-            row_vals = {}
-            row_total = 0
-            
-            # Fetch data for this row
-            for col in col_defs:
-                key = col['key']
-                ctype = col['type']
-                val = 0
-                
-                if ctype == 'band':
-                    # key = band_10M
-                    b = key.replace('band_', '')
-                    data_list = new_mults_by_band.get(b, [])
-                    val = data_list[i] if i < len(data_list) else 0
-                    row_vals[key] = val
-                    row_total += val
-            
-            # Get cumulative total for this hour
-            if i < len(cumulative_mults):
-                cumulative_total = cumulative_mults[i]
-            
-            # Calculate row total (sum of all bands)
-            if not row_vals:
-                # Single band case - use cumulative difference
-                if i == 0:
-                    row_total = cumulative_total
-                else:
-                    prev_cumul = cumulative_mults[i-1] if i > 0 and i-1 < len(cumulative_mults) else 0
-                    row_total = cumulative_total - prev_cumul
-            else:
-                # Multi-band case - sum of band values
-                row_total = sum(row_vals.values())
-
-            # Build Line (show every hour; use "-" for empty data; keep hour and cumulative populated)
-            line_parts = [f"{hour_str:<5}"]
-
-            for col in col_defs:
-                key = col['key']
-                w = col['width']
-                ctype = col['type']
-
-                display_val = 0
-
-                if ctype == 'calc':
-                    if key.startswith('hourly_total') or key.startswith('band_total'):
-                        display_val = row_total
-                    elif key.startswith('cumul_total') or key.startswith('band_cumul'):
-                        display_val = cumulative_total
-                else:
-                    display_val = row_vals.get(key, 0)
-
-                col_totals[key] += display_val
-
-                # Empty/zero data: show "-"; cumulative always shows value
-                is_cumul = ctype == 'calc' and ('cumul' in key or 'band_cumul' in key)
-                if not is_cumul and display_val == 0:
-                    line_parts.append(f"{'-':>{w}}")
-                else:
-                    line_parts.append(f"{display_val:>{w}}")
-                
-            lines.append(" ".join(line_parts))
+        n_hours = len(time_bins)
+        band_columns = {col['key']: hourly_values(new_mults_by_band.get(col['key'].replace('band_', '')), n_hours)
+                        for col in col_defs if col['type'] == 'band'}
+
+        # Hours past the end of the cumulative list carry its last value
+        cumulative = hourly_values(cumulative_mults, n_hours)
+        if 0 < len(cumulative_mults) < n_hours:
+            cumulative[len(cumulative_mults):] = cumulative_mults[-1]
+        if band_columns:
+            row_total = sum(band_columns.values(), np.zeros(n_hours, dtype=np.int64))
+        else:
+            row_total = np.diff(cumulative, prepend=0)
 
-        lines.append(separator)
-        
-        # 4. Total Line
-        tot_parts = [f"{'Total':<5}"]
+        # Every hour is shown; empty data is "-" except in the cumulative column
+        columns = [TextColumn('Hour', [t[11:13] + t[14:16] for t in time_bins], 5, align='<', total='Total')]
         for col in col_defs:
             key = col['key']
-            w = col['width']
-            # For cumulative column, show final cumulative value
-            if col['type'] == 'calc' and 'cumul' in key:
-                val = cumulative_total if cumulative_mults else 0
+            if col['type'] == 'band':
+                columns.append(TextColumn(col['header'], band_columns[key], col['width'], zero_as_dash=True, total=TOTAL_SUM))
+            elif 'cumul' in key:
+                columns.append(TextColumn(col['header'], cumulative, col['width'], total=TOTAL_LAST))
             else:
-                val = col_totals[key]
-                
-            tot_parts.append(f"{val:>{w}}")
-            
-        lines.append(" ".join(tot_parts))
-        
-        return "\n".join(lines)
+                columns.append(TextColumn(col['header'], row_total, col['width'], zero_as_dash=True, total=TOTAL_SUM))
+
+        return "\n".join(render_text_table(columns, title=title))
@@ -15,11 +15,13 @@
 
 from typing import List
 import os
+import numpy as np
 from ..contest_log import ContestLog
 from .report_interface import ContestReport
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from contest_tools.utils.report_utils import _sanitize_filename_part, format_text_header, get_standard_footer, get_standard_title_lines
 from contest_tools.utils.callsign_utils import build_callsigns_filename_part
+from contest_tools.utils.text_table import TextColumn, hourly_values, render_text_table
 
 class Report(ContestReport):
     """
@@ -133,145 +135,55 @@ class Report(ContestReport):
         return f"Text report saved to: {filepath}"
 
     def _build_comparison_block(self, title, col_defs, time_bins, ts_data, all_calls, bands, is_single_band, available_modes):
-        lines = []
-        
-        # 1. Header Construction
-        # Header Format:
-        # Time   Call     [Cols...]
-        
-        header1_parts = [f"{'Hour':<5}", f"{'Call':<7}"]
-        for col in col_defs:
-            w = col['width']
-            header1_parts.append(f"{col['header']:>{w}}")
-            
-        header1 = " ".join(header1_parts)
-        table_width = len(header1)
-        separator = "-" * table_width
-        
-        lines.append(title.center(table_width))
-        lines.append("")
-        lines.append(header1)
-        lines.append(separator)
-        
-        # 2. State Tracking
-        # Need cumulative totals per call
-        cumul_trackers = {call: 0 for call in all_calls}
-        grand_totals = {call: {col['key']: 0 for col in col_defs} for call in all_calls}
-
-        # 3. Iterate Time
-        for i, time_iso in enumerate(time_bins):
-            hour_str = time_iso[11:13] + time_iso[14:16]
-            
-            row_data_cache = {}  # Map call -> {col_key: val}
-            row_totals_cache = {}  # Map call -> total
-            cumulative_cache = {}  # Map call -> cumulative
-
-            for call in all_calls:
-                row_vals = {}
-                row_total = 0
-                entry = ts_data['logs'].get(call)
-                
-                if entry:
-                    hourly = entry['hourly']
-                    new_mults_by_band = hourly.get('new_mults_by_band', {})
-                    cumulative_mults = hourly.get('cumulative_mults', [])
-                    
-                    # Get cumulative for this hour
-                    if i < len(cumulative_mults):
-                        cumulative_cache[call] = cumulative_mults[i]
-                    else:
-                        cumulative_cache[call] = 0
-                    
-                    for col in col_defs:
-                        key = col['key']
-                        ctype = col['type']
-                        val = 0
-                        
-                        if ctype == 'band':
-                            b = key.replace('band_', '')
-                            data_list = new_mults_by_band.get(b, [])
-                            val = data_list[i] if i < len(data_list) else 0
-                        elif ctype == 'mode':
-                            # For single-band mode, we don't have mode-specific multiplier data
-                            # Use band data instead (since it's single band)
-                            if bands:
-                                b = bands[0]
-                                data_list = new_mults_by_band.get(b, [])
-                                val = data_list[i] if i < len(data_list) else 0
-                        
-                        if ctype != 'calc':
-                            row_vals[key] = val
-                            row_total += val
-                    
-                    # Calculate row total
-                    if not row_vals:
-                        # Single band case - calculate from cumulative difference
-                        if i == 0:
-                            row_total = cumulative_cache[call]
-                        else:
-                            prev_cumul = cumulative_mults[i-1] if i > 0 and i-1 < len(cumulative_mults) else 0
-                            row_total = cumulative_cache[call] - prev_cumul
-                    else:
-                        # Multi-band case - sum of band values
-                        row_total = sum(row_vals.values())
-                else:
-                    # Missing log
-                    cumulative_cache[call] = 0
-                
-                row_data_cache[call] = row_vals
-                row_totals_cache[call] = row_total
-
-            # Print Rows (One per call) - show every hour; use "-" for empty data; keep hour, call, cumulative populated
-            first_call_line = True
-            for call in all_calls:
-                t_str = hour_str if first_call_line else "     "
-
-                r_total = row_totals_cache[call]
-                cumul_trackers[call] = cumulative_cache[call]
-
-                line_parts = [f"{t_str:<5}", f"{call:<7}"]
-
-                for col in col_defs:
-                    key = col['key']
-                    w = col['width']
-                    ctype = col['type']
-
-                    val = 0
-                    if ctype == 'calc':
-                        if key == 'total':
-                            val = r_total
-                        elif key == 'cumul':
-                            val = cumul_trackers[call]
-                    else:
-                        val = row_data_cache[call].get(key, 0)
-
-                    grand_totals[call][key] += val
-                    if ctype == 'calc' and key == 'cumul':
-                        grand_totals[call][key] = val  # Keep latest
-
-                    # Empty/zero data: show "-"; cumulative always shows value
-                    if ctype == 'calc' and key == 'cumul':
-                        line_parts.append(f"{val:>{w}}")
-                    elif val == 0:
-                        line_parts.append(f"{'-':>{w}}")
-                    else:
-                        line_parts.append(f"{val:>{w}}")
-
-                lines.append(" ".join(line_parts))
-
-                first_call_line = False
+        """
+        Constructs a comparison table block with one row per call per hour,
+        followed by a TOTALS section with one row per call.
+        """
+        n_hours = len(time_bins)
 
-        lines.append(separator)
-        
-        # 4. Totals
-        lines.append("TOTALS")
-        for call in all_calls:
-            line_parts = [f"{'':<5}", f"{call:<7}"]
+        # Per column: an (hours x calls) block of values
+        value_blocks = {col['key']: np.zeros((n_hours, len(all_calls)), dtype=np.int64) for col in col_defs}
+        for j, call in enumerate(all_calls):
+            entry = ts_data['logs'].get(call)
+            if not entry:
+                continue
+            hourly = entry['hourly']
+            new_mults_by_band = hourly.get('new_mults_by_band', {})
+            cumulative = hourly_values(hourly.get('cumulative_mults'), n_hours)
+
+            row_total = np.zeros(n_hours, dtype=np.int64)
+            has_values = False
             for col in col_defs:
                 key = col['key']
-                w = col['width']
-                val = grand_totals[call][key]
-                line_parts.append(f"{val:>{w}}")
-            lines.append(" ".join(line_parts))
-
-        return "\n".join(lines)
+                if col['type'] == 'band':
+                    values = hourly_values(new_mults_by_band.get(key.replace('band_', '')), n_hours)
+                elif col['type'] == 'mode':
+                    # Single band: there is no per-mode multiplier data, so mode columns show the band's
+                    values = hourly_values(new_mults_by_band.get(bands[0]), n_hours) if bands else np.zeros(n_hours, dtype=np.int64)
+                else:
+                    continue
+                value_blocks[key][:, j] = values
+                row_total += values
+                has_values = True
+            if not has_values:
+                row_total = np.diff(cumulative, prepend=0)
+            value_blocks['total'][:, j] = row_total
+            value_blocks['cumul'][:, j] = cumulative
+
+        # Rows run hour by hour, one per call; the hour label is only on the first call's row
+        hour_labels = np.full((n_hours, len(all_calls)), '', dtype=object)
+        hour_labels[:, 0] = [t[11:13] + t[14:16] for t in time_bins]
+        columns = [
+            TextColumn('Hour', hour_labels.ravel(), 5, align='<', total=[''] * len(all_calls)),
+            TextColumn('Call', np.tile(all_calls, n_hours), 7, align='<', total=all_calls),
+        ]
+        for col in col_defs:
+            block = value_blocks[col['key']]
+            if col['key'] == 'cumul':
+                totals = block[-1] if n_hours else np.zeros(len(all_calls), dtype=np.int64)
+                columns.append(TextColumn(col['header'], block.ravel(), col['width'], total=list(totals)))
+            else:
+                columns.append(TextColumn(col['header'], block.ravel(), col['width'], zero_as_dash=True,
+                                          total=list(block.sum(axis=0))))
+
+        return "\n".join(render_text_table(columns, title=title, totals_heading="TOTALS"))
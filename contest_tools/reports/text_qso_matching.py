@@ -0,0 +1,108 @@
+# contest_tools/reports/text_qso_matching.py
+#
+# Purpose: A text report that cross-checks QSOs between the submitted logs,
+#          listing per-log match statistics and the unmatched QSOs
+#          (not-in-log, busted call, band mismatch).
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from typing import List
+import os
+from ..contest_log import ContestLog
+from .report_interface import ContestReport
+from ..data_aggregators.qso_matching import QsoMatchingEngine, DEFAULT_TIME_TOLERANCE_S
+from ..utils.report_utils import get_standard_footer
+from ..utils.callsign_utils import callsign_to_filename_part
+
+class Report(ContestReport):
+    """
+    Generates a cross-log QSO check: matched, not-in-log, busted-call and
+    band-mismatch counts per log, followed by the exceptions.
+    """
+    report_id: str = "text_qso_matching"
+    report_name: str = "Cross-Log QSO Check"
+    report_type: str = "text"
+    supports_multi = True
+
+    _STATUS_LABELS = {
+        'matched': 'Matched',
+        'band_mismatch': 'Band',
+        'busted_call': 'Busted',
+        'not_in_log': 'NIL',
+        'unverified': 'No Log',
+    }
+
+    def generate(self, output_path: str, **kwargs) -> str:
+        """
+        Generates the report content, saves it to a file, and returns a summary.
+        """
+        tolerance = kwargs.get('match_tolerance_s', DEFAULT_TIME_TOLERANCE_S)
+        engine = QsoMatchingEngine(self.logs, time_tolerance_s=tolerance)
+        summary = engine.get_match_summary()
+
+        if not summary['logs']:
+            return f"Report '{self.report_name}' skipped: no valid QSOs."
+
+        statuses = summary['params']['statuses']
+        headers = ["Callsign", "QSOs", "Checkable"] + [self._STATUS_LABELS[s] for s in statuses] + ["Match %"]
+        rows = []
+        for call, entry in summary['logs'].items():
+            scalars = entry['scalars']
+            rows.append([call, scalars['qsos'], scalars['checkable']] +
+                        [scalars[s] for s in statuses] + [f"{scalars['match_rate']:.1f}"])
+
+        col_widths = [max(len(h), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+        table_header = "  ".join(f"{h:>{w}}" if i else f"{h:<{w}}" for i, (h, w) in enumerate(zip(headers, col_widths)))
+        separator = "-" * len(table_header)
+
+        all_calls = list(summary['logs'].keys())
+        dates = self.logs[0].get_processed_data().get('Date')
+        dates = dates.dropna() if dates is not None else []
+        year = dates.iloc[0].split('-')[0] if len(dates) else '----'
+        contest_name = self.logs[0].get_metadata().get('ContestName', 'UnknownContest')
+
+        report_lines = [
+            f"--- {self.report_name} ---",
+            f"{year} {contest_name} - {', '.join(all_calls)}",
+            "",
+            f"Note: QSOs matched by call pair, band and mode within {int(tolerance)} seconds. "
+            "'No Log' QSOs are with stations that did not submit a log.",
+            "",
+            table_header,
+            separator,
+        ]
+        for row in rows:
+            report_lines.append("  ".join(f"{str(v):>{w}}" if i else f"{str(v):<{w}}"
+                                          for i, (v, w) in enumerate(zip(row, col_widths))))
+
+        for call, entry in summary['logs'].items():
+            exceptions = entry['exceptions']
+            if not exceptions:
+                continue
+            report_lines.extend(["", f"{call}: Unmatched QSOs", separator])
+            report_lines.append(f"{'Date/Time (UTC)':<17}  {'Band':<5}  {'Mode':<4}  {'Call':<12}  {'Status':<7}  Counterpart")
+            for exc in exceptions:
+                when = exc['datetime'][:16].replace('T', ' ')
+                report_lines.append(f"{when:<17}  {exc['band']:<5}  {exc['mode']:<4}  {exc['call']:<12}  "
+                                    f"{self._STATUS_LABELS[exc['status']]:<7}  {exc['counterpart'] or ''}")
+
+        standard_footer = get_standard_footer(self.logs)
+        report_content = "\n".join(report_lines) + "\n\n" + standard_footer + "\n"
+        os.makedirs(output_path, exist_ok=True)
+
+        filename_calls = '_'.join([callsign_to_filename_part(call) for call in sorted(all_calls)])
+        filename = f"{self.report_id}--{filename_calls}.txt"
+        filepath = os.path.join(output_path, filename)
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(report_content)
+
+        return f"Text report saved to: {filepath}"
@@ -13,13 +13,16 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
 import os
 from ..contest_log import ContestLog
 from .report_interface import ContestReport
 from contest_tools.utils.report_utils import format_text_header, get_standard_footer, get_standard_title_lines
 from ..data_aggregators.time_series import TimeSeriesAggregator
+from ..data_aggregators.rate_stats import RateStatsAggregator
 from ..utils.callsign_utils import callsign_to_filename_part
+from ..utils.text_table import TextColumn, TOTAL_LAST, TOTAL_SUM, hourly_values, render_text_table
 
 class Report(ContestReport):
     """
@@ -46,6 +49,7 @@ class Report(ContestReport):
             agg = TimeSeriesAggregator(self.logs)
             ts_data = agg.get_time_series_data()
         time_bins = ts_data['time_bins']
+        rate_agg = kwargs.get('_cached_rate_aggregator') or RateStatsAggregator(self.logs)
 
         # Determine metrics: always QSOs; add Points when contest uses points-based scoring
         metrics_to_run = ['qsos']
@@ -150,6 +154,7 @@ class Report(ContestReport):
                     footer = f"Gross QSOs={gross_qsos}     Dupes={dupes}     Net QSOs={display_net}"
                 else:
                     footer = f"Total Points={scalars.get('points_sum', 0):,}"
+                footer += "\n" + self._format_best_rates(rate_agg, log, callsign, include_dupes, metric)
 
                 block1_lines = block1.split('\n')
                 table_width = len(block1_lines[3]) if len(block1_lines) > 3 else 80
@@ -170,142 +175,57 @@ class Report(ContestReport):
 
         return "\n".join(final_report_messages)
 
+    def _format_best_rates(self, rate_agg: RateStatsAggregator, log: ContestLog, callsign: str,
+                           include_dupes: bool, metric: str) -> str:
+        """Best 10/30/60-minute rates from the rolling-window rate engine."""
+        best_rates = rate_agg.get_best_rates(include_dupes=include_dupes, metric=metric)['logs'].get(callsign, {})
+        parts = []
+        for minutes, best in best_rates.get('best', {}).items():
+            if best['start']:
+                start = pd.Timestamp(best['start']).strftime('%H%M')
+                parts.append(f"{minutes} min={best['total']:,} ({best['per_hour']:,.0f}/hr at {start})")
+        return "Best Rates: " + "     ".join(parts) if parts else "Best Rates: n/a"
+
     def _build_table_block(self, title, col_defs, time_bins, data_source, bands, available_modes, force_band_context=None, metric='qsos'):
         """
         Constructs a formatted text table block.
         metric: 'qsos' or 'points' — selects by_band/by_mode/qsos vs by_band_points/by_mode_points/points.
+        In a band detail block (force_band_context) the hourly total is the sum of the band's mode columns.
         """
-        lines = []
-        
-        # 1. Headers
-        header1_parts = [f"{'Hour':<5}"]
-        header2_parts = [f"{'':<5}"]
-        
-        for col in col_defs:
-            w = col['width']
-            header1_parts.append(f"{col['header']:>{w}}")
-            header2_parts.append(f"{'':>{w}}") # Underline spacer or second line if needed
-            
-        header1 = " ".join(header1_parts)
-        header2 = " ".join(header2_parts)
-        
-        # 2. Width Calculation & Title Centering
-        table_width = len(header1)
-        separator = "-" * table_width
-        
-        # Center title relative to table width (Left Anchor 0)
-        title_line = title.center(table_width)
-        
-        lines.append(title_line)
-        lines.append("")
-        lines.append(header1)
-        # lines.append(header2) # Optional, usually redundant if header1 is clear
-        lines.append(separator)
-        
-        # 3. Data Rows
-        cumulative_total = 0
-        
-        # Pre-calculate column totals
-        col_totals = {col['key']: 0 for col in col_defs}
-        
-        for i, time_iso in enumerate(time_bins):
-            hour_str = time_iso[11:13] + time_iso[14:16]
-            
-            # Calculate row values first to determine if we skip (skip empty rows)
-            row_vals = {}
-            row_total = 0
-            
-            # Fetch data for this row
-            for col in col_defs:
-                key = col['key']
-                ctype = col['type']
-                val = 0
-                
-                if ctype == 'band':
-                    b = key.replace('band_', '')
-                    band_key = 'by_band_points' if metric == 'points' else 'by_band'
-                    data_list = data_source.get(band_key, {}).get(b, [])
-                    val = data_list[i] if data_list else 0
-                elif ctype == 'mode':
-                    m = key.replace('mode_', '')
-                    if metric == 'points' and m == 'Pts':
-                        data_list = data_source.get('points', [])
-                        val = data_list[i] if data_list else 0
-                    else:
-                        mode_key = 'by_mode_points' if metric == 'points' else 'by_mode'
-                        data_list = data_source.get(mode_key, {}).get(m, [])
-                        val = data_list[i] if data_list else 0
-
-                if force_band_context: 
-                        # This should theoretically not happen in Summary block, 
-                        # but if mode column used in detail block, it maps to band_mode
-                    pass
-                elif ctype == 'band_mode':
-                    # key = bm_10M_CW
-                    # lookup in by_band_mode
-                    lookup_key = key.replace('bm_', '')
-                    data_list = data_source['by_band_mode'].get(lookup_key, [])
-                    val = data_list[i] if data_list else 0
-                
-                # 'calc' types (Totals) are derived below
-                if ctype not in ['calc']:
-                    row_vals[key] = val
-            
-            # Calculate Row Total
-            total_key = 'points' if metric == 'points' else 'qsos'
-            if force_band_context:
-                row_total = sum(row_vals.values())
-            else:
-                row_total = data_source.get(total_key, [0] * len(time_bins))[i] if i < len(data_source.get(total_key, [])) else 0
-
-            if row_total > 0:
-                cumulative_total += row_total
-
-            # Build Line (show every hour; use "-" for empty/zero data; keep hour and cumulative populated)
-            line_parts = [f"{hour_str:<5}"]
-
-            for col in col_defs:
-                key = col['key']
-                w = col['width']
-                ctype = col['type']
-
-                display_val = 0
+        n_hours = len(time_bins)
+        band_key = 'by_band_points' if metric == 'points' else 'by_band'
+        mode_key = 'by_mode_points' if metric == 'points' else 'by_mode'
+        total_key = 'points' if metric == 'points' else 'qsos'
 
-                if ctype == 'calc':
-                    if key.startswith('hourly_total') or key.startswith('band_total'):
-                        display_val = row_total
-                    elif key.startswith('cumul_total') or key.startswith('band_cumul'):
-                        display_val = cumulative_total
+        value_columns = {}
+        for col in col_defs:
+            key = col['key']
+            ctype = col['type']
+            if ctype == 'band':
+                value_columns[key] = hourly_values(data_source.get(band_key, {}).get(key.replace('band_', '')), n_hours)
+            elif ctype == 'mode':
+                m = key.replace('mode_', '')
+                if metric == 'points' and m == 'Pts':
+                    value_columns[key] = hourly_values(data_source.get('points'), n_hours)
                 else:
-                    display_val = row_vals.get(key, 0)
+                    value_columns[key] = hourly_values(data_source.get(mode_key, {}).get(m), n_hours)
+            elif ctype == 'band_mode':
+                value_columns[key] = hourly_values(data_source.get('by_band_mode', {}).get(key.replace('bm_', '')), n_hours)
 
-                col_totals[key] += display_val
-
-                # Empty/zero data: show "-"; cumulative and structural columns always show value
-                is_cumul = ctype == 'calc' and ('cumul' in key or 'band_cumul' in key)
-                if not is_cumul and display_val == 0:
-                    line_parts.append(f"{'-':>{w}}")
-                else:
-                    line_parts.append(f"{display_val:>{w}}")
-                
-            lines.append(" ".join(line_parts))
+        if force_band_context:
+            row_total = sum(value_columns.values(), np.zeros(n_hours, dtype=np.int64))
+        else:
+            row_total = hourly_values(data_source.get(total_key), n_hours)
 
-        lines.append(separator)
-        
-        # 4. Total Line
-        tot_parts = [f"{'Total':<5}"]
+        # Every hour is shown; empty/zero data is "-" except in the cumulative column
+        columns = [TextColumn('Hour', [t[11:13] + t[14:16] for t in time_bins], 5, align='<', total='Total')]
         for col in col_defs:
             key = col['key']
-            w = col['width']
-            # For cumulative column, show Grand Total or Empty? Usually Grand Total.
-            val = col_totals[key]
-            # Cumulative column total in a 'Total' row is meaningless/redundant usually, 
-            # but legacy often puts the final cumulative there.
-            if col['type'] == 'calc' and 'cumul' in key:
-                 val = cumulative_total
-                 
-            tot_parts.append(f"{val:>{w}}")
-            
-        lines.append(" ".join(tot_parts))
-        
-        return "\n".join(lines)
\ No newline at end of file
+            if col['type'] != 'calc':
+                columns.append(TextColumn(col['header'], value_columns[key], col['width'], zero_as_dash=True, total=TOTAL_SUM))
+            elif 'cumul' in key:
+                columns.append(TextColumn(col['header'], row_total, col['width'], cumulative=True, total=TOTAL_LAST))
+            else:
+                columns.append(TextColumn(col['header'], row_total, col['width'], zero_as_dash=True, total=TOTAL_SUM))
+
+        return "\n".join(render_text_table(columns, title=title))
@@ -13,6 +13,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from typing import List
+import numpy as np
 import pandas as pd
 import os
 from ..contest_log import ContestLog
@@ -20,6 +21,7 @@ from .report_interface import ContestReport
 from ..data_aggregators.time_series import TimeSeriesAggregator
 from contest_tools.utils.report_utils import _sanitize_filename_part, format_text_header, get_standard_footer, get_standard_title_lines
 from contest_tools.utils.callsign_utils import build_callsigns_filename_part
+from contest_tools.utils.text_table import TextColumn, hourly_values, render_text_table
 
 class Report(ContestReport):
     """
@@ -163,118 +165,60 @@ class Report(ContestReport):
         return "\n".join([f"Text report saved to: {fp}" for fp in created])
 
     def _build_comparison_block(self, title, col_defs, time_bins, ts_data, all_calls, force_band_context=None, metric='qsos'):
-        lines = []
+        """
+        Constructs a comparison table block with one row per call per hour,
+        followed by a TOTALS section with one row per call.
+        """
+        n_hours = len(time_bins)
         total_key = 'points' if metric == 'points' else 'qsos'
         band_key = 'by_band_points' if metric == 'points' else 'by_band'
         mode_key = 'by_mode_points' if metric == 'points' else 'by_mode'
 
-        header1_parts = [f"{'Hour':<5}", f"{'Call':<7}"]
-        for col in col_defs:
-            w = col['width']
-            header1_parts.append(f"{col['header']:>{w}}")
-        header1 = " ".join(header1_parts)
-        table_width = len(header1)
-        separator = "-" * table_width
-        lines.append(title.center(table_width))
-        lines.append("")
-        lines.append(header1)
-        lines.append(separator)
-
-        cumul_trackers = {call: 0 for call in all_calls}
-        grand_totals = {call: {col['key']: 0 for col in col_defs} for call in all_calls}
-
-        for i, time_iso in enumerate(time_bins):
-            hour_str = time_iso[11:13] + time_iso[14:16]
-            row_data_cache = {}
-            row_totals_cache = {}
-
-            for call in all_calls:
-                row_vals = {}
-                row_total = 0
-                entry = ts_data['logs'].get(call)
-
-                if entry:
-                    hourly = entry['hourly']
-                    for col in col_defs:
-                        key = col['key']
-                        ctype = col['type']
-                        val = 0
-                        if ctype == 'band':
-                            b = key.replace('band_', '')
-                            data_list = hourly.get(band_key, {}).get(b, [])
-                            val = data_list[i] if data_list else 0
-                        elif ctype == 'mode':
-                            lookup = key.replace('mode_', '')
-                            if metric == 'points' and lookup == 'Pts':
-                                data_list = hourly.get('points', [])
-                                val = data_list[i] if data_list and i < len(data_list) else 0
-                            else:
-                                data_list = hourly.get(mode_key, {}).get(lookup, [])
-                                val = data_list[i] if data_list else 0
-                        elif ctype == 'band_mode':
-                            lookup = key.replace('bm_', '')
-                            data_list = hourly.get('by_band_mode', {}).get(lookup, [])
-                            val = data_list[i] if data_list else 0
-                        if ctype != 'calc':
-                            row_vals[key] = val
-                            row_total += val
-                    if force_band_context is None:
-                        row_total = (hourly.get(total_key) or [0] * len(time_bins))[i] if i < len(hourly.get(total_key) or []) else row_total
-                row_data_cache[call] = row_vals
-                row_totals_cache[call] = row_total
-
-            # Print Rows (One per call) - show every hour; use "-" for empty data; keep hour, call, cumulative populated
-            first_call_line = True
-            for call in all_calls:
-                t_str = hour_str if first_call_line else "     "
-
-                r_total = row_totals_cache[call]
-                cumul_trackers[call] += r_total
-
-                line_parts = [f"{t_str:<5}", f"{call:<7}"]
-
-                for col in col_defs:
-                    key = col['key']
-                    w = col['width']
-                    ctype = col['type']
-
-                    val = 0
-                    if ctype == 'calc':
-                        if key == 'total': val = r_total
-                        elif key == 'cumul': val = cumul_trackers[call]
-                    else:
-                        val = row_data_cache[call].get(key, 0)
-
-                    grand_totals[call][key] += val
-                    if ctype == 'calc' and key == 'cumul':
-                        grand_totals[call][key] = val  # Keep latest
-
-                    # Empty/zero data: show "-"; cumulative always shows value
-                    if ctype == 'calc' and key == 'cumul':
-                        line_parts.append(f"{val:>{w}}")
-                    elif val == 0:
-                        line_parts.append(f"{'-':>{w}}")
-                    else:
-                        line_parts.append(f"{val:>{w}}")
-
-                lines.append(" ".join(line_parts))
-
-                first_call_line = False
-            
-            # Optional spacer between hours?
-            # lines.append("") 
-
-        lines.append(separator)
-        
-        # 4. Totals
-        lines.append("TOTALS")
-        for call in all_calls:
-            line_parts = [f"{'':<5}", f"{call:<7}"]
+        # Per column: an (hours x calls) block of values
+        value_blocks = {col['key']: np.zeros((n_hours, len(all_calls)), dtype=np.int64) for col in col_defs}
+        for j, call in enumerate(all_calls):
+            entry = ts_data['logs'].get(call)
+            if not entry:
+                continue
+            hourly = entry['hourly']
+            row_total = np.zeros(n_hours, dtype=np.int64)
             for col in col_defs:
                 key = col['key']
-                w = col['width']
-                val = grand_totals[call][key]
-                line_parts.append(f"{val:>{w}}")
-            lines.append(" ".join(line_parts))
+                ctype = col['type']
+                if ctype == 'band':
+                    values = hourly_values(hourly.get(band_key, {}).get(key.replace('band_', '')), n_hours)
+                elif ctype == 'mode':
+                    lookup = key.replace('mode_', '')
+                    if metric == 'points' and lookup == 'Pts':
+                        values = hourly_values(hourly.get('points'), n_hours)
+                    else:
+                        values = hourly_values(hourly.get(mode_key, {}).get(lookup), n_hours)
+                elif ctype == 'band_mode':
+                    values = hourly_values(hourly.get('by_band_mode', {}).get(key.replace('bm_', '')), n_hours)
+                else:
+                    continue
+                value_blocks[key][:, j] = values
+                row_total += values
+            if force_band_context is None and hourly.get(total_key):
+                reported = hourly[total_key][:n_hours]
+                row_total[:len(reported)] = reported
+            value_blocks['total'][:, j] = row_total
+        value_blocks['cumul'] = np.cumsum(value_blocks['total'], axis=0)
+
+        # Rows run hour by hour, one per call; the hour label is only on the first call's row
+        hour_labels = np.full((n_hours, len(all_calls)), '', dtype=object)
+        hour_labels[:, 0] = [t[11:13] + t[14:16] for t in time_bins]
+        columns = [
+            TextColumn('Hour', hour_labels.ravel(), 5, align='<', total=[''] * len(all_calls)),
+            TextColumn('Call', np.tile(all_calls, n_hours), 7, align='<', total=all_calls),
+        ]
+        for col in col_defs:
+            block = value_blocks[col['key']]
+            if col['key'] == 'cumul':
+                totals = block[-1] if n_hours else np.zeros(len(all_calls), dtype=np.int64)
+                columns.append(TextColumn(col['header'], block.ravel(), col['width'], total=list(totals)))
+            else:
+                columns.append(TextColumn(col['header'], block.ravel(), col['width'], zero_as_dash=True,
+                                          total=list(block.sum(axis=0))))
 
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(render_text_table(columns, title=title, totals_heading="TOTALS"))
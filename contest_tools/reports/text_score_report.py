@@ -24,6 +24,7 @@ from ..contest_definitions import ContestDefinition
 from .report_interface import ContestReport
 from contest_tools.utils.report_utils import format_text_header, get_standard_footer, get_valid_dataframe
 from contest_tools.utils.callsign_utils import callsign_to_filename_part
+from contest_tools.utils.text_table import cell_text, format_cells, join_columns
 from ..data_aggregators.score_stats import ScoreStatsAggregator
 
 class Report(ContestReport):
@@ -71,17 +72,18 @@ class Report(ContestReport):
                 mult_names = [rule['name'] for rule in log.contest_definition.multiplier_rules]
             
             col_order = ['Band', 'Mode', 'QSOs'] + mult_names + ['Points', 'AVG']
-            col_widths = {key: len(str(key)) for key in col_order}
-
-            all_data_for_width = summary_data + [total_summary]
-            for row in all_data_for_width:
-                for key, value in row.items():
-                    if key in col_widths:
-                        val_len = len(f"{value:,.0f}") if isinstance(value, (int, float)) and key not in ['AVG'] else len(str(value))
-                        if isinstance(value, float) and key == 'AVG':
-                            val_len = len(f"{value:.2f}")
-                        
-                        col_widths[key] = max(col_widths.get(key, 0), val_len)
+
+            # Format each column for all rows at once (last row is the total)
+            all_rows = summary_data + [total_summary]
+            cells = {}
+            for name in col_order:
+                if name in ('Band', 'Mode'):
+                    cells[name] = cell_text([str(row.get(name, '')) for row in all_rows])
+                elif name == 'AVG':
+                    cells[name] = cell_text([row.get(name, 0) for row in all_rows], fmt='.2f')
+                else:
+                    cells[name] = cell_text([row.get(name, 0) for row in all_rows], fmt=',.0f')
+            col_widths = {name: max([len(str(name))] + [len(cell) for cell in cells[name]]) for name in col_order}
 
             year = df_full['Date'].iloc[0].split('-')[0] if not df_full.empty and not df_full['Date'].dropna().empty else "----"
             
@@ -116,34 +118,20 @@ class Report(ContestReport):
             report_lines.append(separator)
 
             # Data is already sorted hierarchically by _calculate_all_scores
+            row_lines = join_columns([
+                format_cells(cells[name], col_widths[name], align='<' if name == 'Band' else '>')
+                for name in col_order
+            ], "  ")
+
+            # Add separator between band groups
+            bands = [item.get('Band') for item in summary_data]
+            for i, line in enumerate(row_lines[:-1]):
+                if i > 0 and bands[i] != bands[i - 1]:
+                    report_lines.append(separator)
+                report_lines.append(line)
 
-            previous_band = None
-            for item in summary_data:
-                # Add separator between band groups
-                current_band = item.get('Band')
-                if previous_band is not None and current_band != previous_band:
-                     report_lines.append(separator)
-                previous_band = current_band
-
-                data_parts = [f"{str(item.get(name, '')):{'>' if name != 'Band' else '<'}{col_widths[name]}}" for name in ['Band', 'Mode']]
-                data_parts.append(f"{item.get('QSOs', 0):>{col_widths['QSOs']},.0f}")
-                data_parts.extend([f"{item.get(name, 0):>{col_widths[name]},.0f}" for name in mult_names])
-                data_parts.extend([
-                    f"{item.get('Points', 0):>{col_widths['Points']},.0f}",
-                    f"{item.get('AVG', 0):>{col_widths['AVG']}.2f}"
-                ])
-                report_lines.append("  ".join(data_parts))
-            
             report_lines.append(separator)
-            
-            total_parts = [f"{str(total_summary.get(name, '')):{'>' if name != 'Band' else '<'}{col_widths[name]}}" for name in ['Band', 'Mode']]
-            total_parts.append(f"{total_summary.get('QSOs', 0):>{col_widths['QSOs']},.0f}")
-            total_parts.extend([f"{total_summary.get(name, 0):>{col_widths[name]},.0f}" for name in mult_names])
-            total_parts.extend([
-                f"{total_summary.get('Points', 0):>{col_widths['Points']},.0f}",
-                f"{total_summary.get('AVG', 0):>{col_widths['AVG']}.2f}"
-            ])
-            report_lines.append("  ".join(total_parts))
+            report_lines.append(row_lines[-1])
             
             report_lines.append("=" * table_width)
             score_text = f"TOTAL SCORE : {final_score:,.0f}"
@@ -23,10 +23,24 @@ from .calculator_interface import TimeSeriesCalculator
 if TYPE_CHECKING:
     from ..contest_log import ContestLog
 
+def _cumulative_by_hour(times: pd.Series, master_index: pd.DatetimeIndex, weights: np.ndarray = None) -> np.ndarray:
+    """
+    Running total of events (or of their weights) per master_index time. An
+    event counts from the start of its hour, matching an hourly resample,
+    cumsum and forward-filled reindex onto master_index.
+    """
+    hours = pd.DatetimeIndex(times.dt.floor('h'))
+    values = np.ones(len(hours)) if weights is None else np.asarray(weights, dtype=float)
+    order = np.argsort(hours.asi8, kind='stable')
+    running = np.concatenate(([0.0], np.cumsum(values[order])))
+    return running[hours[order].searchsorted(master_index, side='right')]
+
+
 class WaeCalculator(TimeSeriesCalculator):
     """
     Calculates the time-series score for the WAE contest, handling QSOs,
     QTCs, and weighted multipliers, and providing a breakdown by operating style.
+    All series are built as running totals over master_index in one per-hour frame.
     """
     _BAND_WEIGHTS = {'80M': 4, '40M': 3, '20M': 2, '15M': 2, '10M': 2}
     
@@ -43,21 +57,22 @@ class WaeCalculator(TimeSeriesCalculator):
             return pd.DataFrame()
 
         # --- Filter out QSOs with "Unknown" multipliers before any calculation ---
-        df_for_scoring = df_non_dupes.copy()
+        df_for_scoring = df_non_dupes
         mult_cols = ['Mult1', 'Mult2']
         for col in mult_cols:
             if col in df_for_scoring.columns:
                 df_for_scoring = df_for_scoring[df_for_scoring[col] != 'Unknown']
 
-        qsos_df_sorted = df_for_scoring.dropna(subset=['Datetime']).sort_values('Datetime')
+        qsos_df_sorted = df_for_scoring.dropna(subset=['Datetime']).sort_values('Datetime', kind='stable')
 
         # --- Create a filtered DataFrame containing only QSOs with valid multipliers ---
         df_mults = qsos_df_sorted[qsos_df_sorted[mult_cols].notna().any(axis=1)]
 
-        # --- 1. Calculate Cumulative Contact Counts (QSOs + QTCs) ---
+        result_df = pd.DataFrame(index=master_index)
+
+        # --- 1. Cumulative Contact Counts (QSOs + QTCs) ---
         # Base the QSO count on the df_mults DF, which only contains QSOs with valid multipliers.
-        ts_qso_count = pd.Series(1, index=df_mults['Datetime']).resample('h').count().cumsum()
-        ts_qso_count = ts_qso_count.reindex(master_index, method='ffill').fillna(0)
+        result_df['ts_qso_count'] = _cumulative_by_hour(df_mults['Datetime'], master_index)
 
         if not qtcs_df.empty:
             logging.info(f"--- WAE QTC Processing ---")
@@ -70,97 +85,62 @@ class WaeCalculator(TimeSeriesCalculator):
             invalid_qtcs = qtcs_df[qtcs_df['Datetime'].isna()]
             if not invalid_qtcs.empty:
                 logging.warning(f"Found {len(invalid_qtcs)} QTC records with malformed timestamps that will be dropped:")
-                for _, row in invalid_qtcs.iterrows():
-                    logging.warning(f"  - Dropped QTC: DATE={row.get('QTC_DATE')} TIME={row.get('QTC_TIME')}")
+                for date, time in zip(invalid_qtcs.get('QTC_DATE', []), invalid_qtcs.get('QTC_TIME', [])):
+                    logging.warning(f"  - Dropped QTC: DATE={date} TIME={time}")
 
             if qtcs_df['Datetime'].dt.tz is None:
                 qtcs_df['Datetime'] = qtcs_df['Datetime'].dt.tz_localize('UTC')
             
-            qtcs_df_sorted = qtcs_df.dropna(subset=['Datetime']).sort_values('Datetime')
-            logging.info(f"Valid QTC records after parsing: {len(qtcs_df_sorted)}")
-            ts_qtc_count = pd.Series(1, index=qtcs_df_sorted['Datetime']).resample('h').count().cumsum()
-            ts_qtc_count = ts_qtc_count.reindex(master_index, method='ffill').fillna(0)
-        else:
-            ts_qtc_count = pd.Series(0, index=master_index)
-        
-        ts_contact_total = ts_qso_count + ts_qtc_count
-
-        # --- 2. Calculate Cumulative Weighted Multipliers ---
-        new_mults_events = []
-        for col in mult_cols:
-            if col in df_mults.columns:
-                # Drop NaNs for the specific column before finding duplicates
-                first_worked = df_mults.dropna(subset=[col]).drop_duplicates(subset=['Band', col], keep='first')
-    
-                weights = first_worked['Band'].map(self._BAND_WEIGHTS)
-                new_mults_ts = pd.Series(weights.values, index=first_worked['Datetime'])
-                new_mults_events.append(new_mults_ts)
-        
-        if new_mults_events:
-            combined_mults_ts = pd.concat(new_mults_events)
-            hourly_weighted_mults = combined_mults_ts.resample('h').sum()
-            ts_weighted_mults = hourly_weighted_mults.cumsum().reindex(master_index, method='ffill').fillna(0)
+            qtc_times = qtcs_df['Datetime'].dropna()
+            logging.info(f"Valid QTC records after parsing: {len(qtc_times)}")
+            result_df['ts_qtc_count'] = _cumulative_by_hour(qtc_times, master_index)
         else:
-            ts_weighted_mults = pd.Series(0, index=master_index)
+            result_df['ts_qtc_count'] = 0.0
+
+        # --- 2. Cumulative Weighted Multipliers ---
+        # Each multiplier counts once per band, weighted by band, from the QSO
+        # that first worked it. Mult1 and Mult2 are stacked into one long frame
+        # so first-seen is a single drop_duplicates on (band, column, value).
+        stacked = pd.concat(
+            [
+                pd.DataFrame({'Datetime': df_mults['Datetime'], 'Band': df_mults['Band'],
+                              'MultCol': col, 'Mult': df_mults[col]}).dropna(subset=['Mult'])
+                for col in mult_cols if col in df_mults.columns
+            ],
+            ignore_index=True
+        )
+        first_worked = stacked.drop_duplicates(subset=['Band', 'MultCol', 'Mult'], keep='first')
+        # Bands without a weight add nothing to the total.
+        weights = first_worked['Band'].map(self._BAND_WEIGHTS).fillna(0).to_numpy()
+        result_df['weighted_mults'] = _cumulative_by_hour(first_worked['Datetime'], master_index, weights)
+
+        # --- 3. Total Score ---
+        result_df['score'] = (result_df['ts_qso_count'] + result_df['ts_qtc_count']) * result_df['weighted_mults']
 
-        # --- 2a. Calculate Cumulative Weighted Multipliers PER BAND ---
-        per_band_mult_ts = {}
-        bands_in_log = df_mults['Band'].unique()
-        
-        for band in self._BAND_WEIGHTS.keys():
-            if band in bands_in_log:
-                df_band_mults = df_mults[df_mults['Band'] == band]
-                band_new_mults_events = []
-                for col in mult_cols:
-                    if col in df_band_mults.columns:
-                        first_worked = df_band_mults.dropna(subset=[col]).drop_duplicates(subset=[col], keep='first')
-                        weights = pd.Series(self._BAND_WEIGHTS.get(band, 1), index=first_worked.index)
-                        band_new_mults_events.append(pd.Series(weights.values, index=first_worked['Datetime']))
-                
-                if band_new_mults_events:
-                    hourly_weighted = pd.concat(band_new_mults_events).resample('h').sum()
-                    per_band_mult_ts[f"weighted_mults_{band}"] = hourly_weighted.cumsum().reindex(master_index, method='ffill').fillna(0)
-
-        # --- 3. Calculate Total Score ---
-        ts_total_score = ts_contact_total * ts_weighted_mults
-        
-        
         # --- 4. Apportion Score by Operating Style (Run vs. S&P) ---
-        is_run = qsos_df_sorted['Run'] == 'Run'
-        is_sp_unk = ~is_run
-        
-        run_qso_count = qsos_df_sorted[is_run].set_index('Datetime')['Call'].resample('h').count().cumsum()
-        sp_unk_qso_count = qsos_df_sorted[is_sp_unk].set_index('Datetime')['Call'].resample('h').count().cumsum()
-
-        run_qso_count = run_qso_count.reindex(master_index, method='ffill').fillna(0)
-        sp_unk_qso_count = sp_unk_qso_count.reindex(master_index, method='ffill').fillna(0)
-        total_qso_count = run_qso_count + sp_unk_qso_count
+        counted = qsos_df_sorted[qsos_df_sorted['Call'].notna()]
+        is_run = counted['Run'] == 'Run'
+        result_df['run_qso_count'] = _cumulative_by_hour(counted.loc[is_run, 'Datetime'], master_index)
+        result_df['sp_unk_qso_count'] = _cumulative_by_hour(counted.loc[~is_run, 'Datetime'], master_index)
+        total_qso_count = result_df['run_qso_count'] + result_df['sp_unk_qso_count']
 
         # Calculate ratios, handling division by zero
-        run_ratio = (run_qso_count / total_qso_count).fillna(0)
-        sp_unk_ratio = (sp_unk_qso_count / total_qso_count).fillna(0)
-
-        # Apportion the total score
-        ts_run_score = ts_total_score * run_ratio
-        ts_sp_unk_score = ts_total_score * sp_unk_ratio
-
-        # --- 5. Assemble Final DataFrame ---
-        result_df = pd.DataFrame({
-            'ts_qso_count': ts_qso_count,
-            'ts_qtc_count': ts_qtc_count,
-            'run_qso_count': run_qso_count,
-            'sp_unk_qso_count': sp_unk_qso_count,
-            'run_score': ts_run_score,
-            'sp_unk_score': ts_sp_unk_score,
-            'score': ts_total_score,
-            'weighted_mults': ts_weighted_mults
-        })
-
-        # Add the per-band multiplier time-series to the final result
-        for col_name, series in per_band_mult_ts.items():
-            result_df[col_name] = series
-
-        # --- Final Diagnostic Logging ("After" Snapshot) ---
-#        logging.info(f"Final WAE time-series DataFrame:\n{result_df.to_string()}")
-
-        return result_df.astype(int)
\ No newline at end of file
+        run_ratio = (result_df['run_qso_count'] / total_qso_count).fillna(0)
+        sp_unk_ratio = (result_df['sp_unk_qso_count'] / total_qso_count).fillna(0)
+        result_df['run_score'] = result_df['score'] * run_ratio
+        result_df['sp_unk_score'] = result_df['score'] * sp_unk_ratio
+
+        # --- 5. Per-Band Weighted Multipliers ---
+        # A band's first-seen multipliers are the subset of first_worked on that band.
+        bands_in_log = set(df_mults['Band'].unique())
+        for band, weight in self._BAND_WEIGHTS.items():
+            if band in bands_in_log:
+                band_first = first_worked[first_worked['Band'] == band]
+                result_df[f"weighted_mults_{band}"] = _cumulative_by_hour(
+                    band_first['Datetime'], master_index, np.full(len(band_first), weight)
+                )
+
+        column_order = ['ts_qso_count', 'ts_qtc_count', 'run_qso_count', 'sp_unk_qso_count',
+                        'run_score', 'sp_unk_score', 'score', 'weighted_mults']
+        column_order += [c for c in result_df.columns if c not in column_order]
+        return result_df[column_order].astype(int)
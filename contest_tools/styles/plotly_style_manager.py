@@ -2,6 +2,8 @@
 #
 # Purpose: Centralized management of Plotly styles and color schemes
 #          to ensure consistency across all interactive visual reports.
+#          Also controls how plotly.js is delivered to HTML artifacts
+#          (shared local bundle, CDN, or inline).
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -14,8 +16,16 @@
 # If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 #
-from typing import Dict, List, Any, Union
+import os
+import json
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Any, Optional, Union
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from ..utils.precompress import precompress_file
 
 class PlotlyStyleManager:
     """
@@ -38,6 +48,21 @@ class PlotlyStyleManager:
         '#17becf'  # Cyan
     ]
 
+    # --- plotly.js Delivery ---
+    # 'local':  One versioned plotly.js under the report root's 'js' directory,
+    #           referenced by relative path.
+    #           Works offline and inside the ZIP download.
+    # 'cdn':    Reference cdn.plot.ly (requires internet access when viewing).
+    # 'inline': Embed the full bundle (~3.5 MB) in every HTML file.
+    PLOTLYJS_MODES = ('local', 'cdn', 'inline')
+    PLOTLYJS_MODE_ENV = 'CLA_PLOTLYJS_MODE'
+    PLOTLYJS_BUNDLE_DIRNAME = 'js'
+
+    _plotlyjs_mode: Optional[str] = None
+    _bundle_lock = threading.Lock()
+    # Report root of the reports being generated on this thread (see plotlyjs_bundle_root)
+    _bundle_root = threading.local()
+
     @staticmethod
     def get_point_color_map(point_values: List[Any]) -> Dict[Any, str]:
         """
@@ -148,4 +173,155 @@ class PlotlyStyleManager:
             else:
                 layout["annotations"] = [footer_ann]
             
-        return layout
\ No newline at end of file
+        return layout
+
+    @classmethod
+    def set_plotlyjs_mode(cls, mode: Optional[str]) -> None:
+        """
+        Selects how plotly.js is delivered to HTML artifacts for this process.
+
+        Args:
+            mode: One of PLOTLYJS_MODES, or None to revert to the
+                  CLA_PLOTLYJS_MODE environment variable (default 'local').
+        """
+        if mode is not None and mode not in cls.PLOTLYJS_MODES:
+            raise ValueError(f"Unknown plotly.js mode '{mode}'. Expected one of {cls.PLOTLYJS_MODES}.")
+        cls._plotlyjs_mode = mode
+
+    @classmethod
+    def get_plotlyjs_mode(cls) -> str:
+        """Returns the active plotly.js delivery mode."""
+        if cls._plotlyjs_mode:
+            return cls._plotlyjs_mode
+        mode = os.environ.get(cls.PLOTLYJS_MODE_ENV, 'local').strip().lower()
+        if mode not in cls.PLOTLYJS_MODES:
+            logging.warning(f"Ignoring invalid {cls.PLOTLYJS_MODE_ENV}='{mode}'. Using 'local'.")
+            return 'local'
+        return mode
+
+    @classmethod
+    @contextmanager
+    def plotlyjs_bundle_root(cls, root_dir: str) -> Iterator[None]:
+        """
+        Places the shared plotly.js bundle in <root_dir>/js for HTML files
+        written on this thread inside the block. ReportGenerator passes its
+        report root, so every chart of a session references one bundle.
+        """
+        previous = getattr(cls._bundle_root, 'path', None)
+        cls._bundle_root.path = os.path.abspath(root_dir)
+        try:
+            yield
+        finally:
+            cls._bundle_root.path = previous
+
+    @classmethod
+    def ensure_plotlyjs_bundle(cls, bundle_dir: str) -> str:
+        """
+        Writes the versioned plotly.js bundle into bundle_dir if it is not
+        already present.
+
+        Returns:
+            The absolute path of the bundle file.
+        """
+        bundle_path = os.path.join(bundle_dir, f"plotly-{get_plotlyjs_version()}.min.js")
+        with cls._bundle_lock:
+            if not os.path.exists(bundle_path):
+                os.makedirs(bundle_dir, exist_ok=True)
+                tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(get_plotlyjs())
+                os.replace(tmp_path, bundle_path)
+                # The bundle is the largest file a report page loads; serve it compressed
+                precompress_file(bundle_path)
+        return bundle_path
+
+    @classmethod
+    def write_html(cls, fig: go.Figure, html_path: str, config: Optional[Dict[str, Any]] = None, **kwargs) -> None:
+        """
+        Writes a figure to HTML using the active plotly.js delivery mode.
+
+        In 'local' mode the bundle is placed in the 'js' directory of the
+        report root set by plotlyjs_bundle_root() (e.g. <combo>/js/ for
+        <combo>/plots/cw/x.html), so every HTML artifact in a session shares
+        a single copy. Without a report root it goes next to the HTML file.
+
+        Args:
+            fig: The Plotly figure.
+            html_path: Destination HTML file.
+            config: Optional Plotly config dictionary.
+            **kwargs: Passed through to fig.write_html (e.g., auto_play).
+        """
+        include_plotlyjs = cls.get_plotlyjs_include(html_path)
+        fig.write_html(html_path, include_plotlyjs=include_plotlyjs, config=config, **kwargs)
+
+    @classmethod
+    def get_plotlyjs_include(cls, html_path: str) -> Union[str, bool]:
+        """
+        Returns the include_plotlyjs value for an HTML file at html_path,
+        writing the shared bundle first when in 'local' mode.
+        """
+        mode = cls.get_plotlyjs_mode()
+        if mode == 'local':
+            html_dir = os.path.dirname(os.path.abspath(html_path))
+            root_dir = getattr(cls._bundle_root, 'path', None) or html_dir
+            bundle_dir = os.path.join(root_dir, cls.PLOTLYJS_BUNDLE_DIRNAME)
+            bundle_path = cls.ensure_plotlyjs_bundle(bundle_dir)
+            return os.path.relpath(bundle_path, html_dir).replace(os.sep, '/')
+        if mode == 'cdn':
+            return 'cdn'
+        return True
+
+    @classmethod
+    def render_html_shell(cls, fig: go.Figure, fig_json: str, html_path: str,
+                          config: Optional[Dict[str, Any]] = None, post_script: Optional[str] = None) -> str:
+        """
+        Builds a standalone HTML page around an already-serialized figure.
+
+        The page matches fig.write_html() output (responsive div, same
+        Plotly.newPlot call) but reuses fig_json instead of serializing the
+        figure a second time.
+
+        Args:
+            fig: The figure (used only for its fixed width/height, if any).
+            fig_json: The figure as returned by plotly.io.to_json().
+            html_path: Destination path (resolves the plotly.js reference).
+            config: Optional Plotly config dictionary.
+            post_script: Optional JavaScript run after the plot is drawn, with
+                         the plot div available as 'gd' and the figure as 'fig'.
+        """
+        include_plotlyjs = cls.get_plotlyjs_include(html_path)
+        if include_plotlyjs is True:
+            script_tag = f'<script type="text/javascript">{get_plotlyjs()}</script>'
+        else:
+            src = (f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+                   if include_plotlyjs == 'cdn' else include_plotlyjs)
+            script_tag = f'<script charset="utf-8" src="{src}"></script>'
+
+        config = dict(config or {})
+        config.setdefault('responsive', True)
+        width = f"{fig.layout.width}px" if fig.layout.width else "100%"
+        height = f"{fig.layout.height}px" if fig.layout.height else "100%"
+        div_id = str(uuid.uuid4())
+
+        return f"""<html>
+<head><meta charset="utf-8" /></head>
+<body>
+    <div>
+        <script type="text/javascript">window.PlotlyConfig = {{MathJaxConfig: 'local'}};</script>
+        {script_tag}
+        <div id="{div_id}" class="plotly-graph-div" style="height:{height}; width:{width};"></div>
+        <script type="text/javascript">
+            window.PLOTLYENV = window.PLOTLYENV || {{}};
+            var fig = {fig_json};
+            if (document.getElementById("{div_id}")) {{
+                Plotly.newPlot("{div_id}", fig.data, fig.layout || {{}}, {json.dumps(config)}).then(function() {{
+                    if (fig.frames) {{ return Plotly.addFrames("{div_id}", fig.frames); }}
+                }}).then(function() {{
+                    var gd = document.getElementById("{div_id}");
+                    {post_script or ''}
+                }});
+            }}
+        </script>
+    </div>
+</body>
+</html>"""
@@ -0,0 +1,110 @@
+// contest_tools/templates/partials/interactive_animation_driver.js
+//
+// Purpose: Client-side driver for the compact encoding of the interactive
+//          animation report. Decodes the columnar typed arrays shipped in
+//          CLA_ANIMATION once and updates the existing traces per time step,
+//          so no per-hour Plotly frames need to be embedded in the HTML.
+//
+//          Expects 'gd' (the plot div) and 'CLA_ANIMATION' (the payload built
+//          by plot_interactive_animation._build_compact_payload) in scope.
+//
+// Copyright (c) 2025 Mark Bailey, KD4D
+// Contact: kd4d@kd4d.org
+//
+// License: Mozilla Public License, v. 2.0
+//          (https://www.mozilla.org/MPL/2.0/)
+//
+// This Source Code Form is subject to the terms of the Mozilla Public
+// License, v. 2.0.
+// If a copy of the MPL was not distributed with this
+// file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+(function (gd, anim) {
+    var TYPED = { uint16: Uint16Array, int32: Int32Array, float64: Float64Array };
+
+    function decode(desc) {
+        var bin = atob(desc.data);
+        var bytes = new Uint8Array(bin.length);
+        for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+        return new TYPED[desc.dtype](bytes.buffer);
+    }
+
+    var T = anim.times.length, C = anim.n_calls, S = anim.n_statuses, X = anim.n_items;
+    var score = decode(anim.score);     // [time x call]
+    var hourly = decode(anim.hourly);   // [time x call x status x item]
+    var stride = C * S * X;
+
+    // Cumulative is the running sum of hourly along the time axis
+    var cumul = new Float64Array(hourly.length);
+    for (var t = 0; t < T; t++) {
+        for (var k = 0; k < stride; k++) {
+            cumul[t * stride + k] = hourly[t * stride + k] + (t > 0 ? cumul[(t - 1) * stride + k] : 0);
+        }
+    }
+
+    // Trace 0 is the racing bar; then (hourly, cumulative) per call and status
+    var traceIndices = [];
+    for (var j = 0; j < 1 + 2 * C * S; j++) traceIndices.push(j);
+
+    var current = 0, timer = null, frameMs = anim.frame_ms;
+
+    function render(t) {
+        current = t;
+        var scores = Array.prototype.slice.call(score, t * C, (t + 1) * C);
+        var xs = [scores], texts = [scores], ys = [undefined];
+        var base = t * stride;
+        for (var c = 0; c < C; c++) {
+            for (var s = 0; s < S; s++) {
+                var off = base + (c * S + s) * X;
+                ys.push(Array.prototype.slice.call(hourly, off, off + X));
+                ys.push(Array.prototype.slice.call(cumul, off, off + X));
+                xs.push(undefined, undefined);
+                texts.push(undefined, undefined);
+            }
+        }
+        var timeAnnotation = Object.assign({}, anim.time_annotation, {
+            text: '<b>Current Time: ' + anim.times[t] + '</b>'
+        });
+        return Plotly.update(gd, { x: xs, y: ys, text: texts }, {
+            annotations: [timeAnnotation, anim.footer_annotation],
+            'sliders[0].active': t
+        }, traceIndices);
+    }
+
+    function pause() {
+        if (timer !== null) {
+            clearInterval(timer);
+            timer = null;
+        }
+    }
+
+    function play() {
+        pause();
+        if (current >= T - 1) render(0);
+        timer = setInterval(function () {
+            if (current >= T - 1) {
+                pause();
+                return;
+            }
+            render(current + 1);
+        }, frameMs);
+    }
+
+    gd.on('plotly_buttonclicked', function (ev) {
+        var args = ev.button.args || [];
+        if (args[0] === 'play') play();
+        else if (args[0] === 'pause') pause();
+        else if (args[0] === 'speed') {
+            frameMs = args[1];
+            play();
+        }
+    });
+
+    gd.on('plotly_sliderchange', function (ev) {
+        if (ev.interaction === false) return;
+        pause();
+        render(ev.step.args[0]);
+    });
+
+    if (T > 0) render(0);
+})(gd, CLA_ANIMATION);
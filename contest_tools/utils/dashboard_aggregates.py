@@ -0,0 +1,190 @@
+# contest_tools/utils/dashboard_aggregates.py
+#
+# Purpose: Builds, writes and loads the precomputed aggregate bundle that the
+#          web multiplier dashboard renders from. The analysis pipeline writes
+#          one compact, versioned JSON bundle per session and callsign combo
+#          (multiplier breakdown by band/mode/station, totals, spectrum maxima,
+#          Sweepstakes extras and report metadata), so the dashboard never
+#          re-parses logs or merges report files inside a request.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import json
+import logging
+import datetime
+from typing import Any, Dict, List, Optional
+
+from contest_tools.data_aggregators.multiplier_stats import MultiplierStatsAggregator
+from contest_tools.manifest_manager import get_artifact_index
+from contest_tools.utils.callsign_utils import build_callsigns_filename_part
+from contest_tools.utils.json_encoders import NpEncoder
+from contest_tools.utils.multiplier_dashboard_utils import (
+    count_applicable_multiplier_rules,
+    compute_spectrum_global_max,
+    determine_breakdown_dimension,
+    extract_multiplier_names,
+    get_sweepstakes_breakdown_extras,
+)
+from contest_tools.utils.report_utils import get_cty_metadata, get_standard_title_lines
+from contest_tools.version import __version__
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the bundle layout changes; older bundles are treated as stale.
+DASHBOARD_AGGREGATES_VERSION = 1
+
+# Bundles live in this directory under the session root.
+DASHBOARD_AGGREGATES_DIRNAME = 'dashboard_aggregates'
+
+
+def combo_id_for_logs(logs: list) -> str:
+    """Callsign combo id of a set of logs (the report directory name)."""
+    all_calls = sorted([log.get_metadata().get('MyCall', f'Log{i+1}') for i, log in enumerate(logs)])
+    return build_callsigns_filename_part(all_calls)
+
+
+def multiplier_dashboard_bundle_path(session_path: str, combo_id: str) -> str:
+    """Path of the multiplier dashboard bundle for a session and callsign combo."""
+    return os.path.join(session_path, DASHBOARD_AGGREGATES_DIRNAME, f"multiplier_dashboard--{combo_id}.json")
+
+
+def find_enhanced_missed_multipliers(manifest_dir: str, callsigns: List[str]) -> Optional[str]:
+    """
+    Returns the path (relative to manifest_dir) of the session-level Enhanced
+    Missed Multipliers report (Sweepstakes only), or None if it is missing,
+    was skipped or is empty.
+    """
+    enhanced_suffix = f"--{build_callsigns_filename_part(sorted(callsigns))}.txt"
+    index = get_artifact_index(manifest_dir)
+    # Check basename of path, not full path (path may include subdirectories like 'text/')
+    enhanced_art = next((a for a in index.by_report_id('enhanced_missed_multipliers')
+                         if os.path.basename(a['path']).endswith(enhanced_suffix)), None)
+    if not enhanced_art:
+        return None
+    try:
+        with open(os.path.join(manifest_dir, enhanced_art['path']), 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError as e:
+        logger.warning(f"Failed to check enhanced missed multipliers report content: {e}")
+        return None
+    # A skipped report contains a "Skipped:" message
+    if 'Skipped:' in content or len(content.strip()) <= 100:
+        return None
+    return enhanced_art['path']
+
+
+def build_multiplier_dashboard_bundle(logs: list, contest_name: Optional[str] = None,
+                                      location_type: Optional[str] = None,
+                                      report_metadata: Optional[Dict[str, str]] = None,
+                                      manifest_dir: Optional[str] = None,
+                                      root_input_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Aggregates everything the multiplier dashboard displays for a set of logs.
+
+    Args:
+        logs: Loaded ContestLog objects of the session.
+        contest_name: Contest name as used by the dashboard (e.g., 'ARRL-SS-CW').
+            Defaults to the first log's ContestName.
+        location_type: 'W/VE' or 'DX' for ARRL DX, None otherwise.
+        report_metadata: {'context_line', 'scope_line', 'footer'} for the
+            dashboard header. Defaults to the standard report title lines.
+        manifest_dir: Report directory of the session; used to locate the
+            Sweepstakes Enhanced Missed Multipliers report.
+        root_input_dir: CONTEST_INPUT_DIR, for the Sweepstakes section list.
+    """
+    contest_def = logs[0].contest_definition
+    if not contest_name:
+        contest_name = logs[0].get_metadata().get('ContestName', '')
+    dimension, is_mode_dimension = determine_breakdown_dimension(contest_def)
+
+    breakdown_data = MultiplierStatsAggregator(logs).get_multiplier_breakdown_data(dimension=dimension)
+    dimension_key = 'modes' if is_mode_dimension else 'bands'
+
+    multiplier_names = extract_multiplier_names(breakdown_data)
+    is_sweepstakes, fixed_multiplier_max, all_logs_same_mult_count = (
+        get_sweepstakes_breakdown_extras(breakdown_data, contest_name, root_input_dir)
+    )
+
+    if report_metadata is None:
+        modes_present = set()
+        for log in logs:
+            df = log.get_processed_data()
+            if 'Mode' in df.columns:
+                modes_present.update(df['Mode'].dropna().unique())
+        scope_label = "All Modes" if is_mode_dimension else "All Bands"
+        title_lines = get_standard_title_lines("Multiplier Breakdown", logs, scope_label, None, modes_present)
+        report_metadata = {
+            'context_line': title_lines[1],
+            'scope_line': title_lines[2],
+            'footer': f"CLA v{__version__}   |   {get_cty_metadata(logs)}",
+        }
+
+    enhanced_missed_path = None
+    if is_sweepstakes and manifest_dir:
+        callsigns = [log.get_metadata().get('MyCall', f'Log{i+1}') for i, log in enumerate(logs)]
+        enhanced_missed_path = find_enhanced_missed_multipliers(manifest_dir, callsigns)
+
+    return {
+        'version': DASHBOARD_AGGREGATES_VERSION,
+        'generated': datetime.datetime.now().isoformat(),
+        'combo_id': combo_id_for_logs(logs),
+        'contest_name': contest_name,
+        'dimension': dimension,
+        'is_mode_dimension': is_mode_dimension,
+        'breakdown': {
+            'totals': breakdown_data.get('totals', []),
+            dimension_key: breakdown_data.get(dimension_key, []),
+        },
+        'multiplier_names': multiplier_names,
+        'multiplier_count': count_applicable_multiplier_rules(contest_def, location_type, breakdown_data),
+        'global_max': compute_spectrum_global_max(breakdown_data, multiplier_names, is_mode_dimension),
+        'is_sweepstakes': is_sweepstakes,
+        'fixed_multiplier_max': fixed_multiplier_max,
+        'all_logs_same_mult_count': all_logs_same_mult_count,
+        'enhanced_missed_multipliers_path': enhanced_missed_path,
+        'report_metadata': report_metadata,
+    }
+
+
+def write_multiplier_dashboard_bundle(session_path: str, bundle: Dict[str, Any]) -> Optional[str]:
+    """Atomically writes a bundle under the session; returns its path, or None on failure."""
+    path = multiplier_dashboard_bundle_path(session_path, bundle['combo_id'])
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(bundle, f, cls=NpEncoder, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Failed to write dashboard aggregates to {path}: {e}")
+        return None
+    return path
+
+
+def load_multiplier_dashboard_bundle(session_path: str, combo_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the multiplier dashboard bundle for a session and combo, or None
+    if it is missing, unreadable or stale (written by an older layout
+    version or for another combo).
+    """
+    path = multiplier_dashboard_bundle_path(session_path, combo_id)
+    try:
+        with open(path, 'r') as f:
+            bundle = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read dashboard aggregates {path}: {e}")
+        return None
+    if bundle.get('version') != DASHBOARD_AGGREGATES_VERSION or bundle.get('combo_id') != combo_id:
+        return None
+    return bundle
@@ -3,6 +3,11 @@
 # Purpose: Scrapes public contest log archives (starting with CQ WW) to provide
 #          a searchable index and on-demand file downloading.
 #
+#          All archive traffic goes through one pooled requests.Session. Scraped
+#          indexes are cached on disk per (archive, year, mode) with a TTL, and
+#          downloaded logs are kept in a local mirror so repeat requests for the
+#          same public log are served from disk.
+#
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
 #
@@ -14,11 +19,17 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import os
+import json
+import time
+import shutil
 import logging
 import re
-from typing import List, Optional, Dict, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple, Callable
 from .callsign_utils import filename_part_to_callsign
 
 logger = logging.getLogger(__name__)
@@ -47,6 +58,287 @@ ARRL_CONTEST_CODES = {
     # Add other ARRL contests as they're implemented
 }
 
+# ============================================================================
+# Shared HTTP Session, Index Cache and Local Log Mirror
+# ============================================================================
+
+_USER_AGENT = "ContestLogAnalyzer-LogFetcher/1.0 (Python)"
+
+# Connection pool size; also the upper bound for concurrent log downloads.
+_MAX_CONCURRENT_DOWNLOADS = 4
+
+# Scraped archive indexes are reused for this long before re-scraping.
+_INDEX_MAX_AGE_HOURS = 6
+
+# Leading bytes of a log that content validation looks at.
+_VALIDATION_PREVIEW_BYTES = 100
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide requests.Session used for all archive traffic.
+
+    The session keeps connections alive between the index scrape and the
+    log downloads that follow it, and its pool is sized for the concurrent
+    download workers.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=_MAX_CONCURRENT_DOWNLOADS,
+                                  pool_maxsize=_MAX_CONCURRENT_DOWNLOADS)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'User-Agent': _USER_AGENT})
+            _session = session
+        return _session
+
+
+def set_http_session(session: Optional[requests.Session]):
+    """
+    Replaces the shared session (e.g., with one pointed at a local stand-in
+    archive server). Passing None discards it so the next call builds a new one.
+    """
+    global _session
+    with _session_lock:
+        _session = session
+
+
+def _get_cache_root() -> Optional[str]:
+    """
+    Returns the root directory for the index cache and the log mirror, or None
+    if caching is disabled.
+
+    Defaults to <CONTEST_INPUT_DIR>/data/PublicLogs (alongside data/CTY).
+    Setting CLA_PUBLIC_LOG_CACHE to an empty string disables caching.
+    """
+    cache_root = os.environ.get('CLA_PUBLIC_LOG_CACHE')
+    if cache_root is None:
+        input_dir = os.environ.get('CONTEST_INPUT_DIR')
+        if not input_dir:
+            return None
+        cache_root = os.path.join(input_dir, 'data', 'PublicLogs')
+    if not cache_root:
+        return None
+    try:
+        os.makedirs(cache_root, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Public log cache disabled; cannot create {cache_root}: {e}")
+        return None
+    return cache_root
+
+
+def _cache_key_part(value: Optional[str]) -> str:
+    """Normalizes one component of a cache key into a filesystem-safe token."""
+    return re.sub(r'[^a-z0-9]+', '-', str(value or 'any').lower()).strip('-') or 'any'
+
+
+def _index_cache_path(archive: str, year: str, mode: Optional[str]) -> Optional[str]:
+    cache_root = _get_cache_root()
+    if not cache_root:
+        return None
+    filename = f"{_cache_key_part(archive)}_{_cache_key_part(year)}_{_cache_key_part(mode)}.json"
+    return os.path.join(cache_root, 'index', filename)
+
+
+def _load_cached_index(archive: str, year: str, mode: Optional[str]) -> Optional[dict]:
+    """Returns the cached index payload if present and younger than the TTL."""
+    path = _index_cache_path(archive, year, mode)
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        if time.time() - os.stat(path).st_mtime > _INDEX_MAX_AGE_HOURS * 3600:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable log index cache {path}: {e}")
+        return None
+
+
+def _save_cached_index(archive: str, year: str, mode: Optional[str], payload: dict):
+    """Writes an index payload to the cache (atomic replace)."""
+    path = _index_cache_path(archive, year, mode)
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write log index cache {path}: {e}")
+
+
+def _cached_index(archive: str, year: str, mode: Optional[str], scrape: Callable[[], dict]) -> dict:
+    """
+    Returns the index payload for (archive, year, mode), scraping only on a
+    cache miss. Empty payloads (failed scrapes) are never cached.
+    """
+    payload = _load_cached_index(archive, year, mode)
+    if payload is not None:
+        logger.info(f"Using cached log index for {archive} {year} {mode or ''}".rstrip())
+        return payload
+    payload = scrape()
+    if payload and any(payload.values()):
+        _save_cached_index(archive, year, mode, payload)
+    return payload
+
+
+def clear_log_index_cache():
+    """Deletes all cached archive indexes (the log mirror is kept)."""
+    cache_root = _get_cache_root()
+    if cache_root:
+        shutil.rmtree(os.path.join(cache_root, 'index'), ignore_errors=True)
+
+
+def _mirror_path(archive: str, year: str, mode: Optional[str], filename: str) -> Optional[str]:
+    cache_root = _get_cache_root()
+    if not cache_root:
+        return None
+    return os.path.join(cache_root, 'logs', _cache_key_part(archive), _cache_key_part(year),
+                        _cache_key_part(mode), filename)
+
+
+def _check_cabrillo_content(content: bytes) -> bool:
+    """True if a public log looks like a Cabrillo log (not e.g. an HTML error page)."""
+    # Verify it's actually a log file (contains CABRILLO or START-OF-LOG)
+    content_preview = content[:_VALIDATION_PREVIEW_BYTES].decode('utf-8', errors='ignore').upper()
+    return 'CABRILLO' in content_preview or 'START-OF-LOG' in content_preview
+
+
+def _mirror_has_valid_log(mirror_path: Optional[str]) -> bool:
+    """
+    True if the mirror holds the log and it passes the Cabrillo check. A
+    mirrored file that fails the check is deleted so it is downloaded again.
+    """
+    if not mirror_path or not os.path.exists(mirror_path):
+        return False
+    try:
+        with open(mirror_path, 'rb') as f:
+            if _check_cabrillo_content(f.read(_VALIDATION_PREVIEW_BYTES)):
+                return True
+        os.remove(mirror_path)
+        logger.warning(f"Removed invalid log from mirror: {mirror_path}")
+    except OSError as e:
+        logger.warning(f"Could not check mirrored log {mirror_path}: {e}")
+    return False
+
+
+def _download_one_log(file_url: str, local_path: str, mirror_path: Optional[str]):
+    """
+    Downloads one public log to local_path and adds it to the mirror.
+    Raises on download failure or when the download is not a Cabrillo log;
+    nothing is written in that case.
+    """
+    response = get_http_session().get(file_url, timeout=15)
+    response.raise_for_status()
+    if not _check_cabrillo_content(response.content):
+        raise ValueError("downloaded file is not a Cabrillo log")
+
+    with open(local_path, 'wb') as f:
+        f.write(response.content)
+
+    if mirror_path:
+        try:
+            os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+            temp_path = f"{mirror_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(temp_path, mirror_path)
+        except OSError as e:
+            logger.warning(f"Could not add {os.path.basename(local_path)} to log mirror: {e}")
+
+
+def _download_concurrently(jobs: List[Tuple[str, Optional[str], str, Optional[str]]], label: str,
+                           resolve_url: Optional[Callable[[str], Optional[str]]] = None) -> List[str]:
+    """
+    Places the log of each (display_name, file_url, local_path, mirror_path)
+    job at local_path, for every archive. A mirrored copy that passes the
+    Cabrillo check is copied; otherwise the log is downloaded on a bounded
+    thread pool, checked and added to the mirror. Each file is checked once.
+
+    A job's file_url may be None when the URL is costly to find (ARRL);
+    resolve_url(display_name) is then called only for logs that are not
+    mirrored, and jobs it returns no URL for are skipped.
+    Returns the local paths that succeeded, in job order.
+    """
+    planned = []
+    for name, file_url, local_path, mirror_path in jobs:
+        if _mirror_has_valid_log(mirror_path):
+            planned.append((name, None, local_path, mirror_path))
+            continue
+        if not file_url and resolve_url:
+            file_url = resolve_url(name)
+        if not file_url:
+            continue
+        planned.append((name, file_url, local_path, mirror_path))
+
+    def run(job):
+        name, file_url, local_path, mirror_path = job
+        try:
+            if file_url:
+                _download_one_log(file_url, local_path, mirror_path)
+                source = ""
+            else:
+                shutil.copyfile(mirror_path, local_path)
+                source = " (from local mirror)"
+            logger.info(f"Downloaded {label}: {name}{source}")
+            return local_path
+        except Exception as e:
+            logger.error(f"Failed to download {label} {name}: {e}")
+            return None
+
+    if not planned:
+        return []
+    workers = min(_MAX_CONCURRENT_DOWNLOADS, len(planned))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run, planned))
+    return [path for path in results if path]
+
+
+def _scrape_log_links(target_url: str) -> List[str]:
+    """
+    Scrapes a directory-style archive page (CQ WW/160/WPX) for links ending
+    in .log and returns the sorted, de-duplicated callsigns.
+    """
+    response = get_http_session().get(target_url, timeout=10)
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+    # Logs are listed as links in a table: <a href='k3lr.log'>K3LR</a>
+    # We look for links ending in .log
+    links = soup.find_all('a', href=True)
+    callsigns = []
+
+    for link in links:
+        href = link['href']
+        if href.endswith('.log'):
+            # Extract callsign from filename (k3lr.log -> k3lr, 5b-yt7aw.log -> 5b-yt7aw)
+            filename_part = href[:-4].lower()
+            # Convert filename part back to callsign format (handles portable callsigns)
+            call = filename_part_to_callsign(filename_part)
+            callsigns.append(call)
+
+    return sorted(list(set(callsigns)))
+
+
+def _directory_archive_jobs(callsigns: List[str], base_url: str, archive: str, year: str,
+                            mode: str, output_dir: str) -> List[Tuple[str, str, str, Optional[str]]]:
+    """Builds download jobs for a directory-style archive ({base_url}{call}.log)."""
+    jobs = []
+    for call in callsigns:
+        filename = f"{call.lower()}.log"
+        jobs.append((filename, f"{base_url}{filename}", os.path.join(output_dir, filename),
+                     _mirror_path(archive, year, mode, filename)))
+    return jobs
+
+
 def fetch_log_index(year: str, mode: str) -> List[str]:
     """
     Scrapes the CQ WW public log page for a specific year and mode.
@@ -60,30 +352,14 @@ def fetch_log_index(year: str, mode: str) -> List[str]:
         mode_suffix = "ph" if mode == "SSB" else "cw"
         target_url = f"{CQ_WW_BASE_URL}{year}{mode_suffix}/"
     
-    try:
-        response = requests.get(target_url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # Logs are listed as links in a table: <a href='k3lr.log'>K3LR</a>
-        # We look for links ending in .log
-        links = soup.find_all('a', href=True)
-        callsigns = []
-        
-        for link in links:
-            href = link['href']
-            if href.endswith('.log'):
-                # Extract callsign from filename (k3lr.log -> k3lr, 5b-yt7aw.log -> 5b-yt7aw)
-                filename_part = href[:-4].lower()
-                # Convert filename part back to callsign format (handles portable callsigns)
-                call = filename_part_to_callsign(filename_part)
-                callsigns.append(call)
-                
-        return sorted(list(set(callsigns)))
+    def scrape():
+        try:
+            return {'callsigns': _scrape_log_links(target_url)}
+        except Exception as e:
+            logger.error(f"Failed to fetch log index from {target_url}: {e}")
+            return {'callsigns': []}
 
-    except Exception as e:
-        logger.error(f"Failed to fetch log index from {target_url}: {e}")
-        return []
+    return _cached_index('cqww', year, mode, scrape)['callsigns']
 
 def download_logs(callsigns: List[str], year: str, mode: str, output_dir: str) -> List[str]:
     """
@@ -96,27 +372,9 @@ def download_logs(callsigns: List[str], year: str, mode: str, output_dir: str) -
     else:
         mode_suffix = "ph" if mode == "SSB" else "cw"
         base_url = f"{CQ_WW_BASE_URL}{year}{mode_suffix}/"
-    downloaded_paths = []
-    
-    for call in callsigns:
-        filename = f"{call.lower()}.log"
-        file_url = f"{base_url}{filename}"
-        local_path = os.path.join(output_dir, filename)
-        
-        try:
-            response = requests.get(file_url, timeout=15)
-            response.raise_for_status()
-            
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-            
-            downloaded_paths.append(local_path)
-            logger.info(f"Downloaded: {filename}")
-            
-        except Exception as e:
-            logger.error(f"Failed to download {filename}: {e}")
-            
-    return downloaded_paths
+
+    jobs = _directory_archive_jobs(callsigns, base_url, 'cqww', year, mode, output_dir)
+    return _download_concurrently(jobs, "CQ WW log")
 
 
 # ============================================================================
@@ -139,30 +397,14 @@ def fetch_cq160_log_index(year: str, mode: str) -> List[str]:
     mode_suffix = "ph" if mode == "SSB" else "cw"
     target_url = f"{CQ_160_BASE_URL}{year}{mode_suffix}/"
     
-    try:
-        response = requests.get(target_url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # Logs are listed as links in a table: <a href='k3lr.log'>K3LR</a>
-        # We look for links ending in .log
-        links = soup.find_all('a', href=True)
-        callsigns = []
-        
-        for link in links:
-            href = link['href']
-            if href.endswith('.log'):
-                # Extract callsign from filename (k3lr.log -> k3lr, 5b-yt7aw.log -> 5b-yt7aw)
-                filename_part = href[:-4].lower()
-                # Convert filename part back to callsign format (handles portable callsigns)
-                call = filename_part_to_callsign(filename_part)
-                callsigns.append(call)
-                
-        return sorted(list(set(callsigns)))
+    def scrape():
+        try:
+            return {'callsigns': _scrape_log_links(target_url)}
+        except Exception as e:
+            logger.error(f"Failed to fetch CQ 160 log index from {target_url}: {e}")
+            return {'callsigns': []}
 
-    except Exception as e:
-        logger.error(f"Failed to fetch CQ 160 log index from {target_url}: {e}")
-        return []
+    return _cached_index('cq160', year, mode, scrape)['callsigns']
 
 
 def download_cq160_logs(callsigns: List[str], year: str, mode: str, output_dir: str) -> List[str]:
@@ -182,27 +424,9 @@ def download_cq160_logs(callsigns: List[str], year: str, mode: str, output_dir:
     # Construct URL (e.g. 2024ph for SSB, 2024cw for CW)
     mode_suffix = "ph" if mode == "SSB" else "cw"
     base_url = f"{CQ_160_BASE_URL}{year}{mode_suffix}/"
-    downloaded_paths = []
-    
-    for call in callsigns:
-        filename = f"{call.lower()}.log"
-        file_url = f"{base_url}{filename}"
-        local_path = os.path.join(output_dir, filename)
-        
-        try:
-            response = requests.get(file_url, timeout=15)
-            response.raise_for_status()
-            
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-            
-            downloaded_paths.append(local_path)
-            logger.info(f"Downloaded CQ 160 log: {filename}")
-            
-        except Exception as e:
-            logger.error(f"Failed to download CQ 160 log {filename}: {e}")
-    
-    return downloaded_paths
+
+    jobs = _directory_archive_jobs(callsigns, base_url, 'cq160', year, mode, output_dir)
+    return _download_concurrently(jobs, "CQ 160 log")
 
 
 # ============================================================================
@@ -227,26 +451,14 @@ def fetch_cqwpx_log_index(year: str, mode: str) -> List[str]:
     mode_suffix = "ph" if mode == "SSB" else "cw"
     target_url = f"{CQ_WPX_BASE_URL}{year}{mode_suffix}/"
 
-    try:
-        response = requests.get(target_url, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        links = soup.find_all('a', href=True)
-        callsigns = []
-
-        for link in links:
-            href = link['href']
-            if href.endswith('.log'):
-                filename_part = href[:-4].lower()
-                call = filename_part_to_callsign(filename_part)
-                callsigns.append(call)
-
-        return sorted(list(set(callsigns)))
+    def scrape():
+        try:
+            return {'callsigns': _scrape_log_links(target_url)}
+        except Exception as e:
+            logger.error(f"Failed to fetch CQ WPX log index from {target_url}: {e}")
+            return {'callsigns': []}
 
-    except Exception as e:
-        logger.error(f"Failed to fetch CQ WPX log index from {target_url}: {e}")
-        return []
+    return _cached_index('cqwpx', year, mode, scrape)['callsigns']
 
 
 def download_cqwpx_logs(callsigns: List[str], year: str, mode: str, output_dir: str) -> List[str]:
@@ -265,27 +477,9 @@ def download_cqwpx_logs(callsigns: List[str], year: str, mode: str, output_dir:
     """
     mode_suffix = "ph" if mode == "SSB" else "cw"
     base_url = f"{CQ_WPX_BASE_URL}{year}{mode_suffix}/"
-    downloaded_paths = []
-
-    for call in callsigns:
-        filename = f"{call.lower()}.log"
-        file_url = f"{base_url}{filename}"
-        local_path = os.path.join(output_dir, filename)
 
-        try:
-            response = requests.get(file_url, timeout=15)
-            response.raise_for_status()
-
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-
-            downloaded_paths.append(local_path)
-            logger.info(f"Downloaded CQ WPX log: {filename}")
-
-        except Exception as e:
-            logger.error(f"Failed to download CQ WPX log {filename}: {e}")
-
-    return downloaded_paths
+    jobs = _directory_archive_jobs(callsigns, base_url, 'cqwpx', year, mode, output_dir)
+    return _download_concurrently(jobs, "CQ WPX log")
 
 
 # ============================================================================
@@ -311,7 +505,7 @@ def _get_arrl_eid_iid(year: str, contest_code: str, contest_name: str = None) ->
     try:
         # Load selector page with contest code
         selector_url = f"{ARRL_PUBLICLOGS_URL}?cn={contest_code}"
-        response = requests.get(selector_url, timeout=10)
+        response = get_http_session().get(selector_url, timeout=10)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -337,7 +531,7 @@ def _get_arrl_eid_iid(year: str, contest_code: str, contest_name: str = None) ->
                             eid_from_option = option_value
                             # Now navigate to that eid page to get year links
                             eid_url = f"{ARRL_PUBLICLOGS_URL}?eid={eid_from_option}"
-                            response = requests.get(eid_url, timeout=10)
+                            response = get_http_session().get(eid_url, timeout=10)
                             response.raise_for_status()
                             soup = BeautifulSoup(response.text, 'html.parser')
                             break
@@ -345,7 +539,7 @@ def _get_arrl_eid_iid(year: str, contest_code: str, contest_name: str = None) ->
                         if option_value and option_value != '0':  # Skip the "Select" option
                             eid_from_option = option_value
                             eid_url = f"{ARRL_PUBLICLOGS_URL}?eid={eid_from_option}"
-                            response = requests.get(eid_url, timeout=10)
+                            response = get_http_session().get(eid_url, timeout=10)
                             response.raise_for_status()
                             soup = BeautifulSoup(response.text, 'html.parser')
                             break
@@ -370,6 +564,75 @@ def _get_arrl_eid_iid(year: str, contest_code: str, contest_name: str = None) ->
         return None
 
 
+def _fetch_arrl_listing(year: str, contest_code: str, contest_name: str = None) -> dict:
+    """
+    Scrapes the ARRL public log listing for a contest and year in one pass.
+
+    The eid/iid discovery, the callsign list and the callsign -> q parameter
+    mapping all come from the same pages, so they are cached together under
+    (contest_code, year, contest_name).
+
+    Returns:
+        Dict with 'eid', 'iid', 'callsigns' (sorted list) and 'mapping'
+        (callsign -> q parameter). Lists/dicts are empty on failure.
+    """
+    empty = {'eid': None, 'iid': None, 'callsigns': [], 'mapping': {}}
+
+    def scrape():
+        try:
+            # Get event/instance IDs
+            eid_iid = _get_arrl_eid_iid(year, contest_code, contest_name=contest_name)
+            if not eid_iid:
+                logger.error(f"Could not get eid/iid for ARRL {contest_code} {year} (contest_name={contest_name})")
+                return empty
+
+            eid, iid = eid_iid
+
+            # Load log listing page
+            listing_url = f"{ARRL_PUBLICLOGS_URL}?eid={eid}&iid={iid}"
+            response = get_http_session().get(listing_url, timeout=10)
+            response.raise_for_status()
+
+            soup = BeautifulSoup(response.text, 'html.parser')
+
+            # Find the table containing log listings
+            table = soup.find('table')
+            if not table:
+                logger.warning(f"No table found on ARRL log listing page for {contest_code} {year}")
+                return empty
+
+            # Extract callsigns and callsign -> q parameter mapping from table links
+            callsigns = []
+            mapping = {}
+            for row in table.find_all('tr'):
+                for cell in row.find_all('td'):
+                    link = cell.find('a')
+                    if not link:
+                        continue
+                    callsign = link.text.strip().upper()
+                    if callsign:
+                        callsigns.append(callsign)
+                    if not link.has_attr('href'):
+                        continue
+                    href = link.get('href', '')
+
+                    # Extract q parameter from href: "showpubliclog.php?q=<encoded>"
+                    if 'showpubliclog.php?q=' in href:
+                        q_param = href.split('q=', 1)[1]
+                        mapping[callsign] = q_param
+                    else:
+                        logger.warning(f"Unexpected href format for callsign {callsign}: {href}")
+
+            logger.info(f"Fetched ARRL log mapping: {len(mapping)} callsigns for {contest_code} {year}")
+            return {'eid': eid, 'iid': iid, 'callsigns': sorted(list(set(callsigns))), 'mapping': mapping}
+
+        except Exception as e:
+            logger.error(f"Failed to fetch ARRL log listing for {contest_code} {year}: {e}")
+            return empty
+
+    return _cached_index(f"arrl-{contest_code}", year, contest_name, scrape)
+
+
 def fetch_arrl_log_index(year: str, contest_code: str, contest_name: str = None) -> List[str]:
     """
     Fetches list of available callsigns for an ARRL contest and year.
@@ -386,43 +649,7 @@ def fetch_arrl_log_index(year: str, contest_code: str, contest_name: str = None)
     Returns:
         List of callsigns in sorted order (e.g., ['2E0BLN', 'K3LR'])
     """
-    try:
-        # Get event/instance IDs
-        eid_iid = _get_arrl_eid_iid(year, contest_code, contest_name=contest_name)
-        if not eid_iid:
-            logger.error(f"Could not get eid/iid for ARRL {contest_code} {year} (contest_name={contest_name})")
-            return []
-        
-        eid, iid = eid_iid
-        
-        # Load log listing page
-        listing_url = f"{ARRL_PUBLICLOGS_URL}?eid={eid}&iid={iid}"
-        response = requests.get(listing_url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the table containing log listings
-        table = soup.find('table')
-        if not table:
-            logger.warning(f"No table found on ARRL log listing page for {contest_code} {year}")
-            return []
-        
-        # Extract callsigns from table links
-        callsigns = []
-        for row in table.find_all('tr'):
-            for cell in row.find_all('td'):
-                link = cell.find('a')
-                if link:
-                    callsign = link.text.strip()
-                    if callsign:
-                        callsigns.append(callsign.upper())
-        
-        return sorted(list(set(callsigns)))
-        
-    except Exception as e:
-        logger.error(f"Failed to fetch ARRL log index for {contest_code} {year}: {e}")
-        return []
+    return _fetch_arrl_listing(year, contest_code, contest_name=contest_name)['callsigns']
 
 
 def fetch_arrl_log_mapping(year: str, contest_code: str, contest_name: str = None) -> Dict[str, str]:
@@ -441,50 +668,7 @@ def fetch_arrl_log_mapping(year: str, contest_code: str, contest_name: str = Non
     Returns:
         Dictionary mapping callsign (uppercase) -> q parameter
     """
-    try:
-        # Get event/instance IDs
-        eid_iid = _get_arrl_eid_iid(year, contest_code, contest_name=contest_name)
-        if not eid_iid:
-            logger.error(f"Could not get eid/iid for ARRL {contest_code} {year} (contest_name={contest_name})")
-            return {}
-        
-        eid, iid = eid_iid
-        
-        # Load log listing page
-        listing_url = f"{ARRL_PUBLICLOGS_URL}?eid={eid}&iid={iid}"
-        response = requests.get(listing_url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the table containing log listings
-        table = soup.find('table')
-        if not table:
-            logger.warning(f"No table found on ARRL log listing page for {contest_code} {year}")
-            return {}
-        
-        # Extract callsign -> q parameter mapping from table links
-        mapping = {}
-        for row in table.find_all('tr'):
-            for cell in row.find_all('td'):
-                link = cell.find('a', href=True)
-                if link:
-                    callsign = link.text.strip().upper()
-                    href = link.get('href', '')
-                    
-                    # Extract q parameter from href: "showpubliclog.php?q=<encoded>"
-                    if 'showpubliclog.php?q=' in href:
-                        q_param = href.split('q=', 1)[1]
-                        mapping[callsign] = q_param
-                    else:
-                        logger.warning(f"Unexpected href format for callsign {callsign}: {href}")
-        
-        logger.info(f"Fetched ARRL log mapping: {len(mapping)} callsigns for {contest_code} {year}")
-        return mapping
-        
-    except Exception as e:
-        logger.error(f"Failed to fetch ARRL log mapping for {contest_code} {year}: {e}")
-        return {}
+    return _fetch_arrl_listing(year, contest_code, contest_name=contest_name)['mapping']
 
 
 def download_arrl_logs(callsigns: List[str], year: str, contest_code: str, output_dir: str, contest_name: str = None) -> List[str]:
@@ -505,46 +689,38 @@ def download_arrl_logs(callsigns: List[str], year: str, contest_code: str, outpu
     Returns:
         List of full paths to downloaded log files
     """
+    archive = f"arrl-{contest_code}"
     try:
-        # Fetch the callsign -> q parameter mapping
-        mapping = fetch_arrl_log_mapping(year, contest_code, contest_name=contest_name)
-        if not mapping:
-            logger.error(f"Could not get log mapping for ARRL {contest_code} {year} (contest_name={contest_name})")
-            return []
-        
-        downloaded_paths = []
-        
+        jobs = []
+        calls_by_filename = {}
         for call in callsigns:
-            call_upper = call.upper()
-            q_param = mapping.get(call_upper)
-            
+            filename = f"{call.lower()}.log"
+            calls_by_filename[filename] = call
+            jobs.append((filename, None, os.path.join(output_dir, filename),
+                         _mirror_path(archive, year, contest_name, filename)))
+
+        mapping = None
+
+        def resolve_url(filename: str) -> Optional[str]:
+            # Mirrored logs need no q parameter, so the listing is only
+            # fetched when at least one log has to come from the archive.
+            nonlocal mapping
+            if mapping is None:
+                # Fetch the callsign -> q parameter mapping
+                mapping = fetch_arrl_log_mapping(year, contest_code, contest_name=contest_name)
+                if not mapping:
+                    logger.error(f"Could not get log mapping for ARRL {contest_code} {year} (contest_name={contest_name})")
+            call = calls_by_filename[filename]
+            q_param = mapping.get(call.upper())
+
             if not q_param:
                 logger.warning(f"No q parameter found for callsign {call} in ARRL {contest_code} {year}")
-                continue
-            
+                return None
+
             # Construct download URL: showpubliclog.php?q=<encoded>
-            file_url = f"{ARRL_BASE_URL}/showpubliclog.php?q={q_param}"
-            local_path = os.path.join(output_dir, f"{call.lower()}.log")
-            
-            try:
-                response = requests.get(file_url, timeout=15)
-                response.raise_for_status()
-                
-                # Verify it's actually a log file (contains CABRILLO or START-OF-LOG)
-                content_preview = response.text[:100].upper()
-                if 'CABRILLO' not in content_preview and 'START-OF-LOG' not in content_preview:
-                    logger.warning(f"Downloaded file for {call} doesn't appear to be a Cabrillo log")
-                
-                with open(local_path, 'wb') as f:
-                    f.write(response.content)
-                
-                downloaded_paths.append(local_path)
-                logger.info(f"Downloaded ARRL log: {call}.log")
-                
-            except Exception as e:
-                logger.error(f"Failed to download ARRL log for {call}: {e}")
-        
-        return downloaded_paths
+            return f"{ARRL_BASE_URL}/showpubliclog.php?q={q_param}"
+
+        return _download_concurrently(jobs, "ARRL log", resolve_url=resolve_url)
         
     except Exception as e:
         logger.error(f"Failed to download ARRL logs for {contest_code} {year}: {e}")
@@ -0,0 +1,104 @@
+# contest_tools/utils/precompress.py
+#
+# Purpose: Writes gzip and brotli siblings (report.html.gz, report.html.br) for
+#          large text artifacts when they are registered in the session
+#          manifest, and hashes artifact content for HTTP validators. Session
+#          artifacts never change once written, so each file is compressed
+#          once and the web app serves the sibling matching Accept-Encoding.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import gzip
+import hashlib
+import logging
+from typing import Dict, List, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Content-Encoding token -> sibling file suffix, in order of preference.
+ENCODING_SUFFIXES: Dict[str, str] = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_EXTENSIONS = frozenset({'.html', '.htm', '.json', '.txt', '.csv', '.js', '.css', '.svg', '.xml', '.adi'})
+
+# Smaller files gain little and would only add request-time negotiation.
+MIN_COMPRESS_BYTES = 1024
+
+# Levels trade a little ratio for pipeline time on multi-megabyte plotly HTML.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+
+def content_hash(path: str) -> str:
+    """SHA-256 of a file's content (first 32 hex digits), used as its strong ETag."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
+
+def is_precompressed_sibling(path: str) -> bool:
+    """True if path is a .gz/.br sibling written by precompress_file() next to its original."""
+    for suffix in ENCODING_SUFFIXES.values():
+        if path.endswith(suffix):
+            base = path[:-len(suffix)]
+            return os.path.splitext(base)[1].lower() in COMPRESSIBLE_EXTENSIONS and os.path.exists(base)
+    return False
+
+
+def precompress_file(path: str) -> List[str]:
+    """
+    Writes compressed siblings for a text file of at least MIN_COMPRESS_BYTES.
+    A sibling is only kept if it is smaller than the original. Brotli is
+    skipped when the 'brotli' package is not installed; it is in
+    requirements.txt, so only command-line installs without it fall back
+    to gzip alone.
+
+    Returns the Content-Encoding tokens written, in preference order.
+    """
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+        return []
+    try:
+        if os.path.getsize(path) < MIN_COMPRESS_BYTES:
+            return []
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        logger.warning(f"Could not read '{path}' for precompression: {e}")
+        return []
+
+    compressors: List[Tuple[str, object]] = []
+    if brotli is not None:
+        compressors.append(('br', lambda raw: brotli.compress(raw, quality=BROTLI_QUALITY)))
+    # mtime=0 keeps the gzip output identical for identical content
+    compressors.append(('gzip', lambda raw: gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)))
+
+    written = []
+    for encoding, compress in compressors:
+        sibling = path + ENCODING_SUFFIXES[encoding]
+        try:
+            compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+            tmp_path = f"{sibling}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, sibling)
+            written.append(encoding)
+        except Exception as e:
+            logger.warning(f"Could not write {encoding} sibling for '{path}': {e}")
+    return written
@@ -1,7 +1,11 @@
 # contest_tools/utils/profiler.py
 #
 # Purpose: Performance profiling utilities for measuring execution time
-#          of critical code paths when CLA_PROFILE=1 is set.
+#          of critical code paths when CLA_PROFILE=1 is set. Sections are
+#          recorded as nested spans (wall/CPU time, optional tracemalloc
+#          peak memory, custom counters) on the thread's active Profiler,
+#          which exports a Chrome trace (also readable by speedscope) and a
+#          summary table.
 #
 # Copyright (c) 2025 Mark Bailey, KD4D
 # Contact: kd4d@kd4d.org
@@ -16,39 +20,296 @@
 
 import time
 import os
+import json
 import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
 from functools import wraps
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, List, Iterator
 
-def profile_section(section_name: str):
+# Read once at import; use set_profiling_enabled() to change at runtime.
+_PROFILE_ENABLED = os.environ.get('CLA_PROFILE') == '1'
+# tracemalloc slows allocation-heavy code noticeably, so memory is opt-in.
+_MEMORY_ENABLED = os.environ.get('CLA_PROFILE_MEMORY') == '1'
+
+_active = threading.local()
+
+
+def is_profiling_enabled() -> bool:
+    return _PROFILE_ENABLED
+
+
+def set_profiling_enabled(enabled: bool, memory: Optional[bool] = None) -> None:
+    """Turns profiling (and optionally memory tracing) on or off for the process."""
+    global _PROFILE_ENABLED, _MEMORY_ENABLED
+    _PROFILE_ENABLED = enabled
+    if memory is not None:
+        _MEMORY_ENABLED = memory
+
+
+class Span:
+    """One timed section. Times are perf_counter/thread_time nanoseconds."""
+    __slots__ = ('name', 'category', 'args', 'counters', 'start_ns', 'end_ns', 'cpu_start_ns', 'cpu_end_ns',
+                 'peak_bytes', 'base_bytes', 'children', 'thread_id')
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.counters: Dict[str, float] = {}
+        self.children: List['Span'] = []
+        self.thread_id = threading.get_ident()
+        self.start_ns = self.end_ns = 0
+        self.cpu_start_ns = self.cpu_end_ns = 0
+        self.peak_bytes: Optional[int] = None
+        self.base_bytes = 0
+
+    @property
+    def wall_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    @property
+    def cpu_s(self) -> float:
+        return (self.cpu_end_ns - self.cpu_start_ns) / 1e9
+
+    @property
+    def self_s(self) -> float:
+        return self.wall_s - sum(c.wall_s for c in self.children)
+
+
+class Profiler:
+    """
+    Records a tree of spans for one session (e.g. one web analysis).
+
+    Spans nest per thread. Memory peaks come from tracemalloc and are
+    process-wide, so they are only meaningful for work on a single thread.
+    """
+    TRACE_FILENAME = "profile_trace.json"
+    SUMMARY_FILENAME = "profile_summary.txt"
+
+    def __init__(self, name: str = 'session', trace_memory: Optional[bool] = None):
+        self.name = name
+        self.roots: List[Span] = []
+        self.origin_ns = time.perf_counter_ns()
+        self.trace_memory = _MEMORY_ENABLED if trace_memory is None else trace_memory
+        self._stacks = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._stacks, 'spans', None)
+        if stack is None:
+            stack = self._stacks.spans = []
+        return stack
+
+    def start_span(self, name: str, category: str = 'section', **args) -> Span:
+        span = Span(name, category, args)
+        stack = self._stack()
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # reset_peak() is global: fold the peak so far into the enclosing span first
+            if stack:
+                parent = stack[-1]
+                parent.peak_bytes = max(parent.peak_bytes or 0, peak - parent.base_bytes)
+            tracemalloc.reset_peak()
+            span.base_bytes = current
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self.roots.append(span)
+        stack.append(span)
+        span.cpu_start_ns = time.thread_time_ns()
+        span.start_ns = time.perf_counter_ns()
+        return span
+
+    def end_span(self, span: Span) -> None:
+        span.end_ns = time.perf_counter_ns()
+        span.cpu_end_ns = time.thread_time_ns()
+        stack = self._stack()
+        if self.trace_memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            span.peak_bytes = max(span.peak_bytes or 0, peak - span.base_bytes)
+        if stack and stack[-1] is span:
+            stack.pop()
+        elif span in stack:
+            stack.remove(span)
+        if stack and span.peak_bytes is not None:
+            parent = stack[-1]
+            parent.peak_bytes = max(parent.peak_bytes or 0, span.peak_bytes + span.base_bytes - parent.base_bytes)
+
+    @contextmanager
+    def span(self, name: str, category: str = 'section', **args) -> Iterator[Span]:
+        span = self.start_span(name, category, **args)
+        try:
+            yield span
+        finally:
+            self.end_span(span)
+
+    def count(self, key: str, value: float = 1) -> None:
+        """Adds to a counter on the innermost open span of this thread."""
+        stack = self._stack()
+        if stack:
+            counters = stack[-1].counters
+            counters[key] = counters.get(key, 0) + value
+
+    def close(self) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # --- Export ---
+
+    def _walk(self, spans: List[Span], depth: int = 0) -> Iterator[tuple]:
+        for span in spans:
+            yield span, depth
+            yield from self._walk(span.children, depth + 1)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Chrome Trace Event Format (complete 'X' events, microseconds). Opens in
+        chrome://tracing, Perfetto and speedscope.
+        """
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.name}}]
+        for span, _ in self._walk(self.roots):
+            args = dict(span.args)
+            args["cpu_ms"] = round(span.cpu_s * 1000, 3)
+            if span.peak_bytes is not None:
+                args["peak_mb"] = round(span.peak_bytes / 2**20, 2)
+            args.update(span.counters)
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self.origin_ns) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {k: (v if isinstance(v, (int, float, str, bool, type(None))) else str(v)) for k, v in args.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary_rows(self) -> List[Dict[str, Any]]:
+        """
+        Spans in tree order with same-named siblings merged, so repeated
+        sections (e.g. one per log) show as one row with a call count.
+        """
+        rows: List[Dict[str, Any]] = []
+
+        def merge(spans: List[Span], depth: int) -> None:
+            groups: Dict[str, List[Span]] = {}
+            for span in spans:
+                groups.setdefault(span.name, []).append(span)
+            for name, group in groups.items():
+                counters: Dict[str, float] = {}
+                for span in group:
+                    for key, value in span.counters.items():
+                        counters[key] = counters.get(key, 0) + value
+                peaks = [s.peak_bytes for s in group if s.peak_bytes is not None]
+                rows.append({
+                    "depth": depth,
+                    "name": name,
+                    "category": group[0].category,
+                    "calls": len(group),
+                    "wall_s": round(sum(s.wall_s for s in group), 4),
+                    "self_s": round(sum(s.self_s for s in group), 4),
+                    "cpu_s": round(sum(s.cpu_s for s in group), 4),
+                    "peak_mb": round(max(peaks) / 2**20, 2) if peaks else None,
+                    "counters": counters,
+                })
+                merge([c for s in group for c in s.children], depth + 1)
+
+        merge(self.roots, 0)
+        return rows
+
+    def format_summary(self) -> str:
+        """Fixed-width summary table, slowest work visible by indentation."""
+        header = f"{'Section':<70} {'Calls':>6} {'Wall s':>9} {'Self s':>9} {'CPU s':>9} {'Peak MB':>9}  Counters"
+        lines = [f"Profile: {self.name}", header, "-" * len(header)]
+        for row in self.summary_rows():
+            name = ("  " * row["depth"] + row["name"])[:70]
+            peak = f"{row['peak_mb']:.1f}" if row["peak_mb"] is not None else ""
+            counters = ", ".join(f"{k}={v:g}" for k, v in row["counters"].items())
+            lines.append(f"{name:<70} {row['calls']:>6} {row['wall_s']:>9.3f} {row['self_s']:>9.3f} "
+                         f"{row['cpu_s']:>9.3f} {peak:>9}  {counters}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, output_dir: str) -> None:
+        """Writes the trace and summary table into output_dir (next to session_manifest.json)."""
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, self.TRACE_FILENAME), 'w') as f:
+                json.dump(self.to_chrome_trace(), f)
+            with open(os.path.join(output_dir, self.SUMMARY_FILENAME), 'w') as f:
+                f.write(self.format_summary())
+        except Exception as e:
+            logging.error(f"Failed to save profile to {output_dir}: {e}")
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    """The profiler recording on this thread, or None."""
+    return getattr(_active, 'profiler', None) if _PROFILE_ENABLED else None
+
+
+@contextmanager
+def profiling_session(name: str = 'session') -> Iterator[Optional[Profiler]]:
+    """
+    Makes a new Profiler active on this thread for the duration of the block
+    and yields it (None when profiling is disabled). Save it afterwards with
+    profiler.save(directory).
+    """
+    if not _PROFILE_ENABLED:
+        yield None
+        return
+    profiler = Profiler(name)
+    previous = getattr(_active, 'profiler', None)
+    _active.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _active.profiler = previous
+        profiler.close()
+
+
+def add_counter(key: str, value: float = 1) -> None:
+    """Adds to a counter (rows processed, cache hits) on the current span, if profiling."""
+    profiler = get_active_profiler()
+    if profiler is not None:
+        profiler.count(key, value)
+
+
+def profile_section(section_name: str, category: str = 'section'):
     """
     Decorator to profile execution time of functions when CLA_PROFILE=1.
-    
-    When the CLA_PROFILE environment variable is set to '1', this decorator
-    will log the execution time of the wrapped function. Otherwise, the
-    function executes normally without timing overhead.
-    
+
+    When profiling is enabled, this decorator logs the execution time of
+    the wrapped function and records it as a span on the active Profiler.
+    Otherwise, the function executes normally without timing overhead.
+
     Args:
         section_name: A descriptive name for the profiled section (e.g., "Log Parsing")
-    
+        category: Span category in the trace (e.g., 'batch', 'log', 'report')
+
     Usage:
         @profile_section("CTY File Resolution")
         def resolve_cty_file(self, date):
             # ... implementation
             pass
-    
+
     Output (when CLA_PROFILE=1):
         [PROFILE] [CTY File Resolution] completed in 0.342s
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            if os.environ.get('CLA_PROFILE') == '1':
-                start = time.perf_counter()
-                result = func(*args, **kwargs)
-                elapsed = time.perf_counter() - start
-                logging.info(f"[PROFILE] [{section_name}] completed in {elapsed:.3f}s")
-                return result
+            if _PROFILE_ENABLED:
+                with ProfileContext(section_name, category):
+                    return func(*args, **kwargs)
             return func(*args, **kwargs)
         return wrapper
     return decorator
@@ -57,27 +318,42 @@ def profile_section(section_name: str):
 class ProfileContext:
     """
     Context manager for profiling code blocks when CLA_PROFILE=1.
-    
+
     Usage:
         with ProfileContext("Heavy Computation"):
             # ... code to profile
             pass
-    
-    Output (when CLA_PROFILE=1):
+
+        with ProfileContext(f"Report - {r_id}", category='report', report_id=r_id):
+            ...
+
+    Output (when CLA_PROFILE=1, whether or not a profiling session is
+    active; inside a session the block is also recorded as a span):
         [PROFILE] [Heavy Computation] completed in 1.234s
     """
-    def __init__(self, section_name: str):
+    def __init__(self, section_name: str, category: str = 'section', **args):
         self.section_name = section_name
+        self.category = category
+        self.args = args
         self.start_time: Optional[float] = None
-        self.enabled = os.environ.get('CLA_PROFILE') == '1'
-    
+        self.enabled = _PROFILE_ENABLED
+        self._profiler: Optional[Profiler] = None
+        self._span: Optional[Span] = None
+
     def __enter__(self):
         if self.enabled:
+            self._profiler = get_active_profiler()
+            if self._profiler is not None:
+                self._span = self._profiler.start_span(self.section_name, self.category, **self.args)
             self.start_time = time.perf_counter()
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.enabled and self.start_time is not None:
             elapsed = time.perf_counter() - self.start_time
+            if self._span is not None:
+                if exc_type is not None:
+                    self._span.args['error'] = exc_type.__name__
+                self._profiler.end_span(self._span)
             logging.info(f"[PROFILE] [{self.section_name}] completed in {elapsed:.3f}s")
         return False  # Don't suppress exceptions
@@ -0,0 +1,382 @@
+# contest_tools/utils/rbn_store.py
+#
+# Purpose: A partitioned, columnar store for Reverse Beacon Network (RBN) spots.
+#          Each daily RBN ZIP is streamed once into a Parquet dataset
+#          partitioned by date and band (date=YYYYMMDD/band=20m/), with typed
+#          columns sorted by spotted station, so per-station questions are
+#          answered by partition pruning and row-group predicate pushdown
+#          instead of re-reading the raw CSV.
+#
+#          Requires the optional 'pyarrow' package.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import re
+import json
+import shutil
+import logging
+import zipfile
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pa_csv = None
+    ds = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# --- Schema ---
+# Raw RBN CSV: callsign,de_pfx,de_cont,freq,band,dx,dx_pfx,dx_cont,mode,db,date,speed,tx_mode
+# 'callsign' is the skimmer, 'dx' the spotted station, 'mode' the spot type (CQ/BEACON/DX),
+# and 'tx_mode' the emission (CW/RTTY/FT8). Older files may lack some columns.
+_CSV_COLUMNS = ['callsign', 'de_pfx', 'de_cont', 'freq', 'band', 'dx', 'dx_pfx', 'dx_cont',
+                'mode', 'db', 'date', 'speed', 'tx_mode']
+
+# Stored column -> raw column
+_RENAMES = {'callsign': 'skimmer', 'mode': 'spot_type', 'db': 'snr'}
+
+CATEGORICAL_COLUMNS = ['skimmer', 'de_pfx', 'de_cont', 'dx', 'dx_pfx', 'dx_cont', 'spot_type', 'tx_mode']
+FLOAT_COLUMNS = ['freq', 'snr', 'speed']
+SPOT_COLUMNS = ['time', 'skimmer', 'de_pfx', 'de_cont', 'freq', 'dx', 'dx_pfx', 'dx_cont',
+                'spot_type', 'snr', 'speed', 'tx_mode']
+
+_ROW_GROUP_SIZE = 16_384  # Small groups keep per-station reads to a few KB after pruning
+_DEFAULT_BLOCK_SIZE = 32 * 1024 * 1024
+_DATE_RE = re.compile(r'(\d{8})')
+# Per-day record of the source CSV columns (ignored by the dataset selector, like staging dirs)
+_SOURCE_INFO_FILENAME = '_source.json'
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("The RBN spot store requires 'pyarrow'. Install it with: pip install pyarrow")
+
+
+def _spot_schema() -> "pa.Schema":
+    """Arrow schema for stored spot files (partition columns are in the path)."""
+    fields = [pa.field('time', pa.int64())]
+    for col in SPOT_COLUMNS[1:]:
+        fields.append(pa.field(col, pa.float32() if col in FLOAT_COLUMNS else pa.string()))
+    return pa.schema(fields)
+
+
+def _partitioning() -> "ds.Partitioning":
+    return ds.partitioning(pa.schema([('date', pa.string()), ('band', pa.string())]), flavor='hive')
+
+
+def get_default_store_root() -> Optional[str]:
+    """
+    Returns the default RBN store directory.
+
+    Uses CLA_RBN_STORE if set, otherwise <CONTEST_INPUT_DIR>/data/RBN
+    (alongside data/CTY and data/PublicLogs).
+    """
+    root = os.environ.get('CLA_RBN_STORE')
+    if root:
+        return root
+    input_dir = os.environ.get('CONTEST_INPUT_DIR')
+    if not input_dir:
+        return None
+    return os.path.join(input_dir, 'data', 'RBN')
+
+
+def _normalize_calls(calls: Union[str, Iterable[str], None]) -> Optional[List[str]]:
+    if calls is None:
+        return None
+    if isinstance(calls, str):
+        calls = [calls]
+    return sorted({c.strip().upper() for c in calls if c and c.strip()}) or None
+
+
+def _to_epoch_seconds(value: Union[str, datetime, pd.Timestamp, int, None]) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+    return int(ts.value // 10**9)
+
+
+def _to_float32(values: "pa.Array") -> "pa.Array":
+    try:
+        return pc.cast(values, pa.float32())
+    except pa.ArrowInvalid:
+        # Stray non-numeric text: coerce to null rather than fail the day
+        return pa.array(pd.to_numeric(values.to_pandas(), errors='coerce'), type=pa.float32())
+
+
+def _normalize_batch(batch: "pa.RecordBatch") -> "pa.Table":
+    """Types and cleans one streamed CSV batch. Rows without a parseable time are dropped."""
+    t = pc.strptime(batch.column('date'), format='%Y-%m-%d %H:%M:%S', unit='s', error_is_null=True)
+    columns = {'time': pc.cast(t, pa.int64())}
+    for raw, name in zip(_CSV_COLUMNS, [_RENAMES.get(c, c) for c in _CSV_COLUMNS]):
+        if name in CATEGORICAL_COLUMNS:
+            values = pc.utf8_trim_whitespace(batch.column(raw))
+            if name in ('skimmer', 'dx', 'tx_mode', 'spot_type'):
+                values = pc.utf8_upper(values)
+            columns[name] = values
+        elif name in FLOAT_COLUMNS:
+            columns[name] = _to_float32(batch.column(raw))
+
+    band = pc.utf8_lower(pc.utf8_trim_whitespace(batch.column('band')))
+    band = pc.if_else(pc.equal(band, ''), None, band)
+    columns['band'] = pc.fill_null(band, 'unknown')
+    table = pa.table({name: columns[name] for name in SPOT_COLUMNS + ['band']})
+    return table.filter(pc.is_valid(t))
+
+
+def _find_csv_name(zf: zipfile.ZipFile) -> str:
+    names = [n for n in zf.namelist() if n.lower().endswith('.csv')]
+    if not names:
+        raise ValueError(f"No CSV in zip: {zf.namelist()[:10]}...")
+    if len(names) > 1:
+        logger.warning(f"Multiple CSVs in RBN zip, using first: {names}")
+    return names[0]
+
+
+class RbnSpotStore:
+    """
+    Partitioned Parquet dataset of RBN spots with a filtered query API.
+
+    Layout:
+        <root>/date=YYYYMMDD/band=20m/spots.parquet
+
+    Within each partition spots are sorted by (dx, time) and written in
+    row groups, so an equality filter on 'dx' reads only the row groups
+    whose min/max statistics can contain that call.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None):
+        _require_pyarrow()
+        self.root_dir = root_dir or get_default_store_root()
+        if not self.root_dir:
+            raise ValueError("No RBN store directory: pass root_dir or set CLA_RBN_STORE / CONTEST_INPUT_DIR.")
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._dataset_cache = None
+
+    # --- Ingest ---
+
+    def _date_dir(self, yyyymmdd: str) -> str:
+        return os.path.join(self.root_dir, f"date={yyyymmdd}")
+
+    def has_date(self, yyyymmdd: str) -> bool:
+        """True if the given day has been ingested."""
+        return os.path.isdir(self._date_dir(yyyymmdd))
+
+    def dates(self) -> List[str]:
+        """Returns the ingested days (YYYYMMDD), sorted."""
+        return sorted(d[5:] for d in os.listdir(self.root_dir) if d.startswith('date=') and
+                      os.path.isdir(os.path.join(self.root_dir, d)))
+
+    def missing_columns(self, yyyymmdd: str) -> List[str]:
+        """Raw CSV columns the day's source file did not have (empty if unknown)."""
+        try:
+            with open(os.path.join(self._date_dir(yyyymmdd), _SOURCE_INFO_FILENAME), 'r') as f:
+                return json.load(f).get('missing_columns', [])
+        except (OSError, ValueError):
+            return []
+
+    def ingest_zip(self, zip_path: str, yyyymmdd: Optional[str] = None, overwrite: bool = False,
+                   block_size: int = _DEFAULT_BLOCK_SIZE) -> int:
+        """
+        Converts one daily RBN ZIP into the store.
+
+        The CSV is streamed in blocks into per-band staging files, then each
+        band is sorted by (dx, time) and written to its final partition. Peak
+        memory is bounded by the largest single band of the day.
+
+        Args:
+            zip_path: Path to the RBN daily ZIP (e.g., 20250712.zip).
+            yyyymmdd: Partition date; defaults to the date in the ZIP filename.
+            overwrite: Replace the day if it is already in the store.
+            block_size: Bytes of CSV decoded per streamed batch.
+
+        Returns:
+            The number of spots stored (0 if the day was already present).
+        """
+        if yyyymmdd is None:
+            match = _DATE_RE.search(os.path.basename(zip_path))
+            if not match:
+                raise ValueError(f"Cannot infer date from {zip_path}; pass yyyymmdd.")
+            yyyymmdd = match.group(1)
+
+        date_dir = self._date_dir(yyyymmdd)
+        if os.path.isdir(date_dir):
+            if not overwrite:
+                logger.info(f"RBN {yyyymmdd} already in store; skipping ingest.")
+                return 0
+            shutil.rmtree(date_dir)
+
+        staging_dir = os.path.join(self.root_dir, f"_staging_{yyyymmdd}_{os.getpid()}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        schema = _spot_schema()
+        writers = {}
+        total = 0
+
+        try:
+            with zipfile.ZipFile(zip_path, 'r') as zf:
+                csv_name = _find_csv_name(zf)
+                with zf.open(csv_name) as raw:
+                    header = [c.strip() for c in raw.readline().decode('utf-8', errors='replace').split(',')]
+                missing = [c for c in _CSV_COLUMNS if c not in header]
+                with zf.open(csv_name) as raw:
+                    reader = pa_csv.open_csv(
+                        raw,
+                        read_options=pa_csv.ReadOptions(block_size=block_size),
+                        parse_options=pa_csv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+                        convert_options=pa_csv.ConvertOptions(
+                            column_types={c: pa.string() for c in _CSV_COLUMNS},
+                            include_columns=_CSV_COLUMNS,
+                            include_missing_columns=True,
+                            strings_can_be_null=True,
+                            # Only empty fields are null; 'NA' is North America
+                            null_values=[''],
+                        ),
+                    )
+                    for batch in reader:
+                        spots = _normalize_batch(batch)
+                        for band in pc.unique(spots['band']).to_pylist():
+                            part = spots.filter(pc.equal(spots['band'], band)).select(SPOT_COLUMNS)
+                            writer = writers.get(band)
+                            if writer is None:
+                                writer = pq.ParquetWriter(os.path.join(staging_dir, f"{band}.parquet"), schema)
+                                writers[band] = writer
+                            writer.write_table(part)
+                        total += spots.num_rows
+            for writer in writers.values():
+                writer.close()
+            writers = {}
+
+            # Sort each band by (dx, time) so row-group statistics prune per-station queries
+            tmp_date_dir = os.path.join(self.root_dir, f"_tmp_{yyyymmdd}_{os.getpid()}")
+            shutil.rmtree(tmp_date_dir, ignore_errors=True)
+            for staged in sorted(os.listdir(staging_dir)):
+                band = staged[:-len('.parquet')]
+                table = pq.read_table(os.path.join(staging_dir, staged))
+                table = table.sort_by([('dx', 'ascending'), ('time', 'ascending')])
+                band_dir = os.path.join(tmp_date_dir, f"band={band}")
+                os.makedirs(band_dir)
+                pq.write_table(table, os.path.join(band_dir, 'spots.parquet'),
+                               row_group_size=_ROW_GROUP_SIZE, compression='zstd')
+            os.makedirs(tmp_date_dir, exist_ok=True)
+            with open(os.path.join(tmp_date_dir, _SOURCE_INFO_FILENAME), 'w') as f:
+                json.dump({'missing_columns': missing}, f)
+            os.replace(tmp_date_dir, date_dir)
+        finally:
+            for writer in writers.values():
+                writer.close()
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        logger.info(f"RBN {yyyymmdd}: stored {total} spots in {len(os.listdir(date_dir))} band partitions.")
+        return total
+
+    # --- Query ---
+
+    def _dataset(self) -> "ds.Dataset":
+        """Returns the dataset view, rediscovered only when the set of ingested days changes."""
+        dates = tuple(self.dates())
+        if self._dataset_cache is not None and self._dataset_cache[0] == dates:
+            return self._dataset_cache[1]
+        # Staging and temporary directories start with '_' and are ignored by the selector
+        dataset = ds.dataset(self.root_dir, format='parquet', partitioning=_partitioning(),
+                             ignore_prefixes=['_', '.'])
+        self._dataset_cache = (dates, dataset)
+        return dataset
+
+    def query(self, dx: Union[str, Iterable[str], None] = None,
+              skimmer: Union[str, Iterable[str], None] = None,
+              tx_mode: Union[str, Iterable[str], None] = None,
+              start: Union[str, datetime, pd.Timestamp, int, None] = None,
+              end: Union[str, datetime, pd.Timestamp, int, None] = None,
+              bands: Optional[Iterable[str]] = None,
+              dates: Optional[Iterable[str]] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Returns spots matching all given filters.
+
+        Args:
+            dx: Spotted station call(s).
+            skimmer: Skimmer call(s).
+            tx_mode: Emission(s), e.g. 'CW'. Days whose source file had no
+                tx_mode column are not filtered on it (as the CSV filter does).
+            start, end: Inclusive UTC time bounds (timestamp, string, or epoch seconds).
+            bands: Band partitions to read, e.g. ['20m', '40m'].
+            dates: Day partitions to read (YYYYMMDD), e.g. ['20241026', '20241027'].
+            columns: Columns to return (default: all stored columns plus 'band').
+
+        Returns:
+            DataFrame with int64 'time' (epoch seconds, UTC), float32 freq/snr/speed,
+            and categorical call/prefix/mode columns, sorted by time.
+        """
+        if not self.dates():
+            return pd.DataFrame(columns=columns or SPOT_COLUMNS + ['band'])
+
+        start_s = _to_epoch_seconds(start)
+        end_s = _to_epoch_seconds(end)
+        expr = None
+
+        def _and(e):
+            nonlocal expr
+            expr = e if expr is None else expr & e
+
+        # Partition pruning (date directories overlap the time window by UTC day)
+        if start_s is not None:
+            _and(ds.field('date') >= datetime.fromtimestamp(start_s, timezone.utc).strftime('%Y%m%d'))
+            _and(ds.field('time') >= start_s)
+        if end_s is not None:
+            _and(ds.field('date') <= datetime.fromtimestamp(end_s, timezone.utc).strftime('%Y%m%d'))
+            _and(ds.field('time') <= end_s)
+        if bands:
+            _and(ds.field('band').isin([b.strip().lower() for b in bands]))
+        if dates is not None:
+            _and(ds.field('date').isin([str(d) for d in dates]))
+
+        for name, value in (('dx', dx), ('skimmer', skimmer), ('tx_mode', tx_mode)):
+            values = _normalize_calls(value)
+            if values is None:
+                continue
+            match = ds.field(name) == values[0] if len(values) == 1 else ds.field(name).isin(values)
+            if name == 'tx_mode':
+                days_without = [d for d in self.dates() if 'tx_mode' in self.missing_columns(d)]
+                if days_without:
+                    match = match | ds.field('date').isin(days_without)
+            _and(match)
+
+        # Strings are filtered undecoded (dictionary decoding of whole row groups is slower);
+        # only the matching rows are converted to categoricals.
+        table = self._dataset().to_table(filter=expr, columns=columns)
+        df = table.to_pandas()
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        if 'time' in df.columns:
+            df = df.sort_values('time', kind='stable').reset_index(drop=True)
+        return df
+
+
+def epoch_to_timestamp(seconds: Union[pd.Series, np.ndarray]) -> pd.Series:
+    """Converts stored int64 epoch seconds to tz-aware UTC timestamps."""
+    return pd.to_datetime(seconds, unit='s', utc=True)
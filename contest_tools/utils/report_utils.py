@@ -15,6 +15,7 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import pandas as pd
+import plotly.io as pio
 try:
     import matplotlib.pyplot as plt
     from matplotlib.gridspec import GridSpec
@@ -32,6 +33,7 @@ from ..contest_log import ContestLog
 from ..utils.json_encoders import NpEncoder
 from ..core_annotations.get_cty import CtyLookup
 from ..utils.callsign_utils import callsign_to_filename_part, build_callsigns_filename_part
+from ..styles.plotly_style_manager import PlotlyStyleManager
 import datetime
 
 def get_valid_dataframe(log: ContestLog, include_dupes: bool = False) -> pd.DataFrame:
@@ -51,7 +53,7 @@ def normalize_json_to_ascii(s: str) -> str:
     Plotly may emit U+2212 (minus sign), U+2013 (en dash), etc.; Windows charmap
     cannot encode these when writing JSON. Project rule: only 7-bit ASCII in JSON.
     """
-    if not s:
+    if not s or s.isascii():
         return s
     replacements = (
         ("\u2212", "-"),   # MINUS SIGN -> hyphen-minus
@@ -74,6 +76,32 @@ def write_json_ascii(s: str, path: str) -> None:
     with open(path, "w", encoding="ascii") as f:
         f.write(normalized)
 
+
+def write_chart_artifacts(fig, html_path: Optional[str] = None, json_path: Optional[str] = None,
+                          config: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Writes a Plotly figure's JSON and HTML artifacts from a single serialization.
+
+    The figure is serialized once (plotly selects orjson when installed),
+    normalized to 7-bit ASCII, written as the JSON artifact, and embedded
+    in a thin HTML shell for the standalone view.
+
+    Returns:
+        List of paths written (JSON first, then HTML).
+    """
+    fig_json = normalize_json_to_ascii(pio.to_json(fig, validate=False))
+    written = []
+    if json_path:
+        with open(json_path, "w", encoding="ascii") as f:
+            f.write(fig_json)
+        written.append(json_path)
+    if html_path:
+        html = PlotlyStyleManager.render_html_shell(fig, fig_json, html_path, config=config)
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        written.append(html_path)
+    return written
+
 def _sanitize_filename_part(part: str) -> str:
     """
     Sanitizes a string to be used as part of a filename.
@@ -0,0 +1,573 @@
+# contest_tools/utils/synthetic_cabrillo.py
+#
+# Purpose: Generates realistic synthetic Cabrillo logs for any contest
+#          definition (exchange formats, bands, modes, Run/S&P behaviour,
+#          dupes, portable calls) at arbitrary sizes, for benchmarking and
+#          load testing. Logs generated together in one session work each
+#          other, so cross-log features have matching QSOs to find.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import bisect
+import itertools
+import logging
+import os
+import random
+import re
+import string
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+
+import pandas as pd
+
+from ..contest_definitions import ContestDefinition
+from ..contest_log import ContestLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATE = '2024-11-20'
+
+# --- Station Population Tables ---
+
+# US call districts: (CQ zone, ITU zone, [(state, ARRL section), ...])
+_US_DISTRICTS = {
+    '1': (5, 8, [('CT', 'CT'), ('MA', 'EMA'), ('MA', 'WMA'), ('ME', 'ME'), ('NH', 'NH'), ('RI', 'RI'), ('VT', 'VT')]),
+    '2': (5, 8, [('NY', 'ENY'), ('NY', 'NLI'), ('NY', 'NNY'), ('NJ', 'NNJ'), ('NJ', 'SNJ')]),
+    '3': (5, 8, [('PA', 'EPA'), ('PA', 'WPA'), ('MD', 'MDC'), ('DE', 'DE')]),
+    '4': (5, 8, [('VA', 'VA'), ('NC', 'NC'), ('SC', 'SC'), ('GA', 'GA'), ('FL', 'NFL'), ('FL', 'SFL'),
+                 ('AL', 'AL'), ('TN', 'TN'), ('KY', 'KY')]),
+    '5': (4, 7, [('TX', 'NTX'), ('TX', 'STX'), ('OK', 'OK'), ('LA', 'LA'), ('MS', 'MS'), ('AR', 'AR'), ('NM', 'NM')]),
+    '6': (3, 6, [('CA', 'SCV'), ('CA', 'LAX'), ('CA', 'SDG'), ('CA', 'EB'), ('CA', 'SV')]),
+    '7': (3, 6, [('WA', 'WWA'), ('OR', 'OR'), ('ID', 'ID'), ('MT', 'MT'), ('AZ', 'AZ'), ('UT', 'UT'),
+                 ('NV', 'NV'), ('WY', 'WY')]),
+    '8': (4, 8, [('OH', 'OH'), ('MI', 'MI'), ('WV', 'WV')]),
+    '9': (4, 8, [('IL', 'IL'), ('IN', 'IN'), ('WI', 'WI')]),
+    '0': (4, 7, [('MN', 'MN'), ('IA', 'IA'), ('MO', 'MO'), ('KS', 'KS'), ('NE', 'NE'), ('CO', 'CO'),
+                 ('ND', 'ND'), ('SD', 'SD')]),
+}
+_US_PREFIXES = ('K', 'W', 'N', 'AA', 'AB', 'AC', 'KB', 'KC', 'KD', 'WA', 'WB', 'KE', 'NA')
+
+# Canadian call areas: (CQ zone, ITU zone, province, ARRL section)
+_VE_AREAS = {
+    '1': (5, 9, 'NS', 'NS'), '2': (5, 4, 'QC', 'QC'), '3': (4, 4, 'ON', 'ONE'),
+    '4': (4, 3, 'MB', 'MB'), '5': (4, 3, 'SK', 'SK'), '6': (4, 2, 'AB', 'AB'), '7': (3, 2, 'BC', 'BC'),
+}
+_VE_PREFIXES = ('VE', 'VA')
+
+# DX entities: (prefixes, continent, CQ zone, ITU zone, relative activity)
+_DX_ENTITIES = [
+    (('DL', 'DK', 'DJ', 'DF', 'DO'), 'EU', 14, 28, 8),
+    (('G', 'M', '2E'), 'EU', 14, 27, 5),
+    (('F',), 'EU', 14, 27, 4),
+    (('I', 'IK', 'IZ'), 'EU', 15, 28, 5),
+    (('EA',), 'EU', 14, 37, 4),
+    (('OH',), 'EU', 15, 18, 2),
+    (('SM', 'SA'), 'EU', 14, 18, 2),
+    (('OK', 'OL'), 'EU', 15, 28, 3),
+    (('SP', 'SQ'), 'EU', 15, 28, 4),
+    (('UA', 'RA', 'RN'), 'EU', 16, 29, 6),
+    (('UA9', 'RA9'), 'AS', 17, 30, 2),
+    (('UR', 'UT'), 'EU', 16, 29, 3),
+    (('ON',), 'EU', 14, 27, 2),
+    (('PA', 'PD'), 'EU', 14, 27, 3),
+    (('HA', 'HG'), 'EU', 15, 28, 2),
+    (('YU',), 'EU', 15, 28, 1),
+    (('9A',), 'EU', 15, 28, 1),
+    (('S5',), 'EU', 15, 28, 1),
+    (('LZ',), 'EU', 20, 28, 1),
+    (('YO',), 'EU', 20, 28, 1),
+    (('CT',), 'EU', 14, 37, 1),
+    (('EI',), 'EU', 14, 27, 1),
+    (('JA', 'JH', 'JR', 'JE'), 'AS', 25, 45, 6),
+    (('BY', 'BG'), 'AS', 24, 44, 1),
+    (('HL', 'DS'), 'AS', 25, 44, 1),
+    (('4X',), 'AS', 20, 39, 1),
+    (('VK',), 'OC', 30, 59, 1),
+    (('ZL',), 'OC', 32, 60, 1),
+    (('PY', 'PU'), 'SA', 11, 15, 2),
+    (('LU',), 'SA', 13, 14, 1),
+    (('CE',), 'SA', 12, 14, 1),
+    (('ZS',), 'AF', 38, 57, 1),
+    (('EA8',), 'AF', 33, 36, 1),
+    (('CN',), 'AF', 33, 37, 1),
+    (('XE',), 'NA', 6, 10, 1),
+    (('KP4',), 'NA', 8, 11, 1),
+]
+
+_NAMES = ('BOB', 'JIM', 'DAVE', 'MIKE', 'JOHN', 'TOM', 'BILL', 'STEVE', 'MARK', 'DAN', 'ANN', 'SUE',
+          'JOE', 'RON', 'KEN', 'PAT', 'AL', 'ED', 'RICK', 'GARY', 'PAUL', 'MARY', 'LISA', 'CHIP')
+_PRECEDENCES = ('A', 'B', 'U', 'M', 'Q', 'S')
+_FD_CLASSES = ('1A', '2A', '3A', '4A', '1B', '1D', '1E', '2F')
+_POWERS = ('KW', '100', '500', '1K', '5')
+
+# --- Band Plan ---
+
+# Band: (CW/RTTY segment, phone segment, RTTY segment) in kHz
+_BAND_SEGMENTS = {
+    '160M': ((1800, 1860), (1840, 1990), (1800, 1840)),
+    '80M': ((3500, 3580), (3700, 3990), (3570, 3600)),
+    '40M': ((7000, 7060), (7125, 7290), (7030, 7045)),
+    '20M': ((14000, 14070), (14150, 14345), (14080, 14100)),
+    '15M': ((21000, 21080), (21200, 21445), (21080, 21100)),
+    '10M': ((28000, 28080), (28300, 28690), (28080, 28110)),
+    '6M': ((50050, 50100), (50125, 50300), (50290, 50300)),
+}
+# Band: (night weight, day weight); day is roughly 11-21 UTC
+_BAND_PROPAGATION = {
+    '160M': (1.5, 0.05), '80M': (3.0, 0.3), '40M': (4.0, 1.5), '20M': (1.5, 5.0),
+    '15M': (0.3, 4.0), '10M': (0.1, 3.0), '6M': (0.05, 0.5),
+}
+
+
+@dataclass
+class Station:
+    """A synthetic station and the exchange values it sends."""
+    call: str
+    continent: str
+    cq_zone: int
+    itu_zone: int
+    is_wve: bool
+    state: str = 'DX'
+    section: str = 'DX'
+    name: str = 'BOB'
+    precedence: str = 'A'
+    check: str = '85'
+    fd_class: str = '2A'
+    power: str = 'KW'
+    activity: float = 1.0
+    expected_qsos: int = 500
+    portable_suffix: Optional[str] = field(default=None)
+
+    @property
+    def logged_call(self) -> str:
+        return f"{self.call}/{self.portable_suffix}" if self.portable_suffix else self.call
+
+
+def _random_suffix(rng: random.Random) -> str:
+    length = rng.choices((1, 2, 3), weights=(1, 4, 6))[0]
+    return ''.join(rng.choice(string.ascii_uppercase) for _ in range(length))
+
+
+def _make_call(prefix: str, digit: str, suffix: str) -> str:
+    """Joins prefix, digit and suffix; prefixes that already end in a digit take no extra digit."""
+    return f"{prefix}{suffix}" if prefix[-1].isdigit() else f"{prefix}{digit}{suffix}"
+
+
+def _personalize(station: Station, rng: random.Random) -> Station:
+    station.name = rng.choice(_NAMES)
+    station.precedence = rng.choice(_PRECEDENCES)
+    station.check = f"{rng.randint(50, 99):02d}" if rng.random() < 0.7 else f"{rng.randint(0, 24):02d}"
+    station.fd_class = rng.choice(_FD_CLASSES)
+    station.power = rng.choice(_POWERS)
+    # Activity follows a heavy-tailed distribution: a few big guns, many casual stations
+    station.activity = rng.paretovariate(1.2)
+    station.expected_qsos = int(min(8000, 150 * station.activity + rng.randint(20, 300)))
+    return station
+
+
+def random_station(rng: random.Random, wve_share: float = 0.4) -> Station:
+    """Draws a random station; wve_share sets the fraction in the US and Canada."""
+    if rng.random() < wve_share:
+        if rng.random() < 0.88:
+            digit = rng.choice(list(_US_DISTRICTS))
+            cq_zone, itu_zone, places = _US_DISTRICTS[digit]
+            state, section = rng.choice(places)
+            call = _make_call(rng.choice(_US_PREFIXES), digit, _random_suffix(rng))
+        else:
+            digit = rng.choice(list(_VE_AREAS))
+            cq_zone, itu_zone, state, section = _VE_AREAS[digit]
+            call = _make_call(rng.choice(_VE_PREFIXES), digit, _random_suffix(rng)[:2] or 'A')
+        station = Station(call, 'NA', cq_zone, itu_zone, True, state, section)
+    else:
+        prefixes, continent, cq_zone, itu_zone, _ = rng.choices(_DX_ENTITIES, weights=[e[4] for e in _DX_ENTITIES])[0]
+        call = _make_call(rng.choice(prefixes), str(rng.randint(1, 9)), _random_suffix(rng))
+        station = Station(call, continent, cq_zone, itu_zone, False)
+    return _personalize(station, rng)
+
+
+def station_for_call(call: str, rng: random.Random) -> Station:
+    """Builds a Station for a given callsign from the population tables."""
+    call = call.upper()
+    match = re.match(r'^(?:[KWN]|A[A-L])[A-Z]?(\d)', call)
+    if match and not call.startswith('KP4'):
+        cq_zone, itu_zone, places = _US_DISTRICTS[match.group(1)]
+        state, section = rng.choice(places)
+        station = Station(call, 'NA', cq_zone, itu_zone, True, state, section)
+    elif re.match(r'^V[AE](\d)', call):
+        cq_zone, itu_zone, state, section = _VE_AREAS.get(call[2], _VE_AREAS['3'])
+        station = Station(call, 'NA', cq_zone, itu_zone, True, state, section)
+    else:
+        best = None
+        for prefixes, continent, cq_zone, itu_zone, _ in _DX_ENTITIES:
+            for prefix in prefixes:
+                if call.startswith(prefix) and (best is None or len(prefix) > best[0]):
+                    best = (len(prefix), continent, cq_zone, itu_zone)
+        _, continent, cq_zone, itu_zone = best or (0, 'EU', 14, 27)
+        station = Station(call, continent, cq_zone, itu_zone, False)
+    return _personalize(station, rng)
+
+
+# --- Contest Rules ---
+
+def _counterpart_allowed(contest_name: str, me: Station, other: Station) -> bool:
+    """Whether 'other' is a valid contact for 'me' in this contest."""
+    if other.call == me.call:
+        return False
+    if contest_name.startswith('ARRL-DX'):
+        return other.is_wve != me.is_wve
+    if contest_name.startswith(('ARRL-SS', 'ARRL-FD', 'NAQP')):
+        return other.is_wve
+    return True
+
+
+def _select_rules(contest_def: ContestDefinition, contest_name: str, me: Station) -> List[Dict[str, Any]]:
+    """
+    Picks the exchange rules a logger at 'me' would be parsed with, mirroring
+    the lookup in the generic and custom parsers (logger-location variants
+    such as '-W/VE', '-DX', '-WVE-LOGGER' and '-ZONE-LOGGER').
+    """
+    all_rules = contest_def.exchange_parsing_rules
+    rules = all_rules.get(contest_name) or all_rules.get(contest_name.rsplit('-', 1)[0])
+    if not rules:
+        loggers = [k for k in all_rules if 'RCVD' not in k]
+        candidates = [k for k in loggers if k.startswith(contest_name.rsplit('-', 1)[0])] or loggers
+        if me.is_wve:
+            preferred = [k for k in candidates if 'W/VE' in k or 'WVE' in k]
+        else:
+            preferred = [k for k in candidates if k.endswith('-DX') or 'DX-LOGGER' in k]
+        preferred = preferred or [k for k in candidates if 'ZONE' in k] or candidates
+        rules = all_rules.get(preferred[0]) if preferred else []
+    return rules if isinstance(rules, list) else [rules]
+
+
+def _location(contest_name: str, station: Station) -> str:
+    if contest_name.startswith('ARRL-SS'):
+        return station.section
+    return station.state if station.is_wve else 'DX'
+
+
+def _field_value(group: str, contest_name: str, mode: str, me: Station, other: Station,
+                 call_text: str, sent_serial: int, rcvd_serial: int) -> Optional[str]:
+    """The exchange text for one regex group, or None to leave it out."""
+    is_sent = group.startswith('Sent')
+    station = me if is_sent else other
+    name = group[4:] if is_sent else group.replace('Rcvd', '')
+    uses_itu = contest_name.startswith(('IARU', 'WRTC'))
+
+    if name == 'Call':
+        return call_text
+    if name in ('RST', 'RS'):
+        return '59' if mode == 'PH' or name == 'RS' else '599'
+    if name == 'Zone':
+        return str(station.itu_zone if uses_itu else station.cq_zone)
+    if name == 'Mult':
+        return str(station.itu_zone)
+    if name in ('NR', 'Serial'):
+        return str(sent_serial if is_sent else rcvd_serial)
+    if name == 'Location':
+        return _location(contest_name, station)
+    if name == 'Section':
+        return station.section if station.is_wve else 'DX'
+    if name == 'Power':
+        return station.power
+    if name == 'Name':
+        return station.name
+    if name == 'Precedence':
+        return station.precedence
+    if name == 'CK':
+        return station.check
+    if name == 'Class':
+        return station.fd_class
+    if name == 'ExchangeFull':
+        return station.state if station.is_wve else str(rcvd_serial)
+    if name == 'IARU':
+        return 'HQ'
+    return None
+
+
+def compose_exchange(rules: Sequence[Dict[str, Any]], contest_name: str, mode: str, me: Station, other: Station,
+                     call_text: str, sent_serial: int, rcvd_serial: int) -> Optional[str]:
+    """
+    Builds the exchange text (everything after MYCALL) from the first rule
+    whose regex accepts it, so the parser reads back exactly these values.
+    """
+    for rule in rules:
+        values = [_field_value(g, contest_name, mode, me, other, call_text, sent_serial, rcvd_serial)
+                  for g in rule['groups']]
+        text = ' '.join(v for v in values if v is not None)
+        if re.match(rule['regex'], text):
+            return text
+    return None
+
+
+# --- Time Window ---
+
+def contest_window(contest_def: ContestDefinition, date: pd.Timestamp, mode: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    Returns the contest period for the event on or after 'date' (for NAQP,
+    the first event month from the date's month onward), or 48 hours from
+    'date' if the definition has no period.
+    """
+    date = pd.Timestamp(date).tz_localize('UTC') if pd.Timestamp(date).tzinfo is None else pd.Timestamp(date)
+    if contest_def.contest_name.startswith('NAQP'):
+        for offset in range(12):
+            probe = (date.replace(day=1) + pd.DateOffset(months=offset))
+            bounds = ContestLog.contest_period_bounds(contest_def, probe, mode)
+            if bounds:
+                return bounds
+    # Probe forward so the window starts on or after 'date'
+    for days in range(7):
+        bounds = ContestLog.contest_period_bounds(contest_def, date + pd.Timedelta(days=days), mode)
+        if bounds and bounds[0] >= date.normalize():
+            return bounds
+    return date, date + pd.Timedelta(hours=48)
+
+
+# --- QSO Generation ---
+
+@dataclass
+class _Record:
+    time: int  # epoch seconds, on a whole minute
+    band: str
+    mode: str
+    freq: int
+    other: Station
+    call_text: str
+    partner: Optional['_Record'] = None
+    serial: int = 0
+
+
+def _segment_range(band: str, mode: str) -> Tuple[int, int]:
+    cw, ph, ry = _BAND_SEGMENTS[band]
+    return ph if mode == 'PH' else ry if mode in ('RY', 'DG') else cw
+
+
+def _pick_band(rng: random.Random, bands: List[str], when: int) -> str:
+    is_day = 11 <= (when // 3600) % 24 < 21
+    weights = [_BAND_PROPAGATION[b][1 if is_day else 0] for b in bands]
+    return rng.choices(bands, weights=weights)[0]
+
+
+class _Generator:
+    """Builds the QSO records for one station."""
+
+    def __init__(self, contest_def: ContestDefinition, contest_name: str, me: Station, population: List[Station],
+                 rng: random.Random, dupe_rate: float, portable_rate: float, run_share: float):
+        self.contest_def = contest_def
+        self.contest_name = contest_name
+        self.me = me
+        self.rng = rng
+        self.dupe_rate = dupe_rate
+        self.portable_rate = portable_rate
+        self.run_share = run_share
+        self.population = [s for s in population if _counterpart_allowed(contest_name, me, s)]
+        self.by_call = {s.call: s for s in self.population}
+        # Cumulative weights make each weighted draw a binary search
+        self.cum_weights = list(itertools.accumulate(s.activity for s in self.population))
+        self.bands = [b for b in contest_def.valid_bands if b in _BAND_SEGMENTS] or ['20M']
+        self.modes = list(contest_def.valid_modes) or ['CW']
+        self.worked: Dict[Tuple[str, str], set] = {}
+        self.worked_order: Dict[Tuple[str, str], List[str]] = {}
+        self.dupe_scope_all = contest_def.dupe_check_scope == 'all_bands'
+
+    def _segments(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Splits the period into operating segments (Run or S&P, one band and mode) and breaks."""
+        segments = []
+        t = start
+        while t < end:
+            seg_end = min(end, t + 60 * self.rng.randint(10, 75))
+            if self.rng.random() < 0.06:
+                segments.append({'start': t, 'end': seg_end, 'off': True})
+            else:
+                band = _pick_band(self.rng, self.bands, t)
+                mode = self.rng.choice(self.modes)
+                is_run = self.rng.random() < self.run_share
+                lo, hi = _segment_range(band, mode)
+                segments.append({
+                    'start': t, 'end': seg_end, 'off': False, 'band': band, 'mode': mode, 'run': is_run,
+                    'freq': self.rng.randint(lo, hi), 'lo': lo, 'hi': hi,
+                    # Running rates are several times S&P rates
+                    'rate': self.rng.uniform(2.5, 5.0) if is_run else 1.0,
+                })
+            t = seg_end
+        return segments
+
+    def _pick_counterpart(self, band: str, mode: str) -> Tuple[Station, bool]:
+        key = ('ALL', mode) if self.dupe_scope_all else (band, mode)
+        worked = self.worked.setdefault(key, set())
+        worked_order = self.worked_order.setdefault(key, [])
+        if worked_order and self.rng.random() < self.dupe_rate:
+            return self.by_call[self.rng.choice(worked_order)], True
+        for _ in range(20):
+            other = self.population[bisect.bisect_left(self.cum_weights, self.rng.random() * self.cum_weights[-1])]
+            if other.call not in worked:
+                break
+        else:
+            # The active population is worked out on this band; a new station shows up
+            newcomer = random_station(self.rng, 1.0 if self.contest_name.startswith(('ARRL-SS', 'ARRL-FD', 'NAQP')) else 0.4)
+            if not _counterpart_allowed(self.contest_name, self.me, newcomer) or newcomer.call in self.by_call:
+                return other, True
+            other = newcomer
+            self.population.append(other)
+            self.by_call[other.call] = other
+            self.cum_weights.append(self.cum_weights[-1] + other.activity)
+        worked.add(other.call)
+        worked_order.append(other.call)
+        return other, False
+
+    def generate(self, start: int, end: int, qsos: int) -> List[_Record]:
+        segments = [s for s in self._segments(start, end) if not s['off']]
+        if not segments or qsos <= 0:
+            return []
+        # Allocate QSOs to segments in proportion to duration x rate
+        weights = [(s['end'] - s['start']) * s['rate'] for s in segments]
+        total = sum(weights)
+        counts = [int(qsos * w / total) for w in weights]
+        for i in self.rng.choices(range(len(segments)), weights=weights, k=qsos - sum(counts)):
+            counts[i] += 1
+
+        records = []
+        for seg, count in zip(segments, counts):
+            span = seg['end'] - seg['start']
+            offsets = sorted(self.rng.randrange(span) for _ in range(count))
+            freq = seg['freq']
+            for offset in offsets:
+                when = (seg['start'] + offset) // 60 * 60
+                if not seg['run']:
+                    # S&P tunes up the band between contacts
+                    freq += self.rng.randint(1, 4)
+                    if freq > seg['hi']:
+                        freq = seg['lo']
+                other, _ = self._pick_counterpart(seg['band'], seg['mode'])
+                call_text = other.logged_call
+                if other.portable_suffix is None and self.rng.random() < self.portable_rate:
+                    call_text = f"{other.call}/{self.rng.choice(('P', 'M', 'QRP'))}"
+                records.append(_Record(when, seg['band'], seg['mode'], freq, other, call_text))
+        return records
+
+
+def _render_log(contest_name: str, rules: Sequence[Dict[str, Any]], me: Station, records: List[_Record],
+                start: int, end: int, modes: Sequence[str]) -> Tuple[str, int]:
+    """Formats the header and QSO lines; returns the text and the number of QSO lines."""
+    duration = max(1, end - start)
+    category_mode = modes[0] if len(set(modes)) == 1 else 'MIXED'
+    category_mode = {'PH': 'SSB', 'RY': 'RTTY', 'DG': 'DIGI'}.get(category_mode, category_mode)
+    lines = [
+        'START-OF-LOG: 3.0',
+        f'CONTEST: {contest_name}',
+        f'CALLSIGN: {me.call}',
+        f'LOCATION: {me.section if contest_name.startswith(("ARRL-SS", "ARRL-FD")) else me.state}',
+        'CATEGORY-OPERATOR: SINGLE-OP',
+        'CATEGORY-BAND: ALL',
+        f'CATEGORY-MODE: {category_mode}',
+        'CATEGORY-POWER: HIGH',
+        'CATEGORY-TRANSMITTER: ONE',
+        f'NAME: {me.name}',
+        'CREATED-BY: contest_tools synthetic_cabrillo',
+        f'OPERATORS: {me.call}',
+    ]
+    written = 0
+    for rec in records:
+        if rec.partner is not None:
+            rcvd_serial = rec.partner.serial
+        else:
+            progress = (rec.time - start) / duration
+            rcvd_serial = max(1, int(progress * rec.other.expected_qsos))
+        exchange = compose_exchange(rules, contest_name, rec.mode, me, rec.other, rec.call_text, rec.serial, rcvd_serial)
+        if exchange is None:
+            continue
+        when = datetime.fromtimestamp(rec.time, tz=timezone.utc).strftime('%Y-%m-%d %H%M')
+        lines.append(f"QSO: {rec.freq:>5} {rec.mode} {when} {me.call:<13} {exchange}")
+        written += 1
+    lines.append('END-OF-LOG:')
+    return '\n'.join(lines) + '\n', written
+
+
+def generate_session(contest_name: str, output_dir: str, qsos: int = 2000, stations: int = 1,
+                     calls: Optional[Sequence[str]] = None, date: Optional[str] = None, seed: int = 1,
+                     population_size: Optional[int] = None, dupe_rate: float = 0.01,
+                     portable_rate: float = 0.02, run_share: float = 0.6) -> List[str]:
+    """
+    Writes one Cabrillo log per station into output_dir and returns their
+    paths. Each log has about 'qsos' QSOs (contacts between the generated
+    stations are mirrored into both logs, so multi-station logs can be a
+    little longer). 'date' selects the contest weekend; the first one on or
+    after DEFAULT_DATE by default, so a seed always gives the same logs.
+    """
+    contest_def = ContestDefinition.from_json(contest_name)
+    rng = random.Random(seed)
+    modes = list(contest_def.valid_modes) or ['CW']
+    window_start, window_end = contest_window(contest_def, pd.Timestamp(date or DEFAULT_DATE), modes[0])
+    if contest_name.startswith('ARRL-FD'):
+        window_end = min(window_end, window_start + pd.Timedelta(hours=24))
+    start, end = int(window_start.timestamp()), int(window_end.timestamp())
+
+    wve_only = contest_name.startswith(('ARRL-SS', 'ARRL-FD', 'NAQP'))
+    wve_share = 1.0 if wve_only else 0.4
+    population = [random_station(rng, wve_share) for _ in range(population_size or max(3000, qsos))]
+
+    # --- The logging stations ---
+    if calls:
+        log_stations = [station_for_call(c, rng) for c in calls]
+    else:
+        log_stations, seen = [], set()
+        while len(log_stations) < stations:
+            # ARRL DX needs both sides of the pond
+            share = wve_share if not contest_name.startswith('ARRL-DX') else float(len(log_stations) % 2 == 0)
+            candidate = random_station(rng, share)
+            if candidate.call not in seen:
+                seen.add(candidate.call)
+                log_stations.append(candidate)
+    for station in log_stations:
+        station.activity = max(station.activity, 50.0)
+        station.expected_qsos = qsos
+    population.extend(log_stations)
+
+    # Some casual stations operate portable all weekend
+    for station in rng.sample(population, k=int(len(population) * portable_rate / 2)):
+        if station not in log_stations:
+            station.portable_suffix = rng.choice(('P', 'M'))
+
+    # --- Generate, then mirror contacts between logging stations ---
+    by_call = {s.call: s for s in log_stations}
+    all_records: Dict[str, List[_Record]] = {}
+    for me in log_stations:
+        gen = _Generator(contest_def, contest_name, me, population, rng, dupe_rate, portable_rate, run_share)
+        all_records[me.call] = gen.generate(start, end, qsos)
+
+    for me in log_stations:
+        for rec in list(all_records[me.call]):
+            partner_station = by_call.get(rec.other.call)
+            if partner_station is None or rec.partner is not None or rec.call_text != rec.other.call:
+                continue
+            mirror = _Record(rec.time, rec.band, rec.mode, rec.freq, me, me.call, partner=rec)
+            rec.partner = mirror
+            all_records[partner_station.call].append(mirror)
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for me in log_stations:
+        records = sorted(all_records[me.call], key=lambda r: r.time)
+        for i, rec in enumerate(records, 1):
+            rec.serial = i
+    for me in log_stations:
+        records = sorted(all_records[me.call], key=lambda r: r.time)
+        text, written = _render_log(contest_name, _select_rules(contest_def, contest_name, me), me,
+                                    records, start, end, modes)
+        if written < len(records):
+            logger.warning(f"{me.call}: {len(records) - written} QSOs did not fit the {contest_name} exchange format.")
+        path = os.path.join(output_dir, f"{me.call.lower().replace('/', '_')}.log")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f"Wrote {written} QSOs for {me.call} to {path}")
+        paths.append(path)
+    return paths
@@ -0,0 +1,170 @@
+# contest_tools/utils/text_table.py
+#
+# Purpose: Shared renderer for the fixed-width tables in the text reports
+#          (rate sheets, multiplier timelines, breakdown and score summaries).
+#          A table is a list of column specs, each holding the values for
+#          every row as an array; each column is converted to text in one
+#          pass and every row is rendered with a single precompiled row
+#          template, instead of formatting cell by cell inside nested
+#          hour x column loops with per-cell lookups.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+# Special values for TextColumn.total
+TOTAL_SUM = 'sum'
+TOTAL_LAST = 'last'
+
+
+def hourly_values(values: Optional[Sequence[Any]], length: int) -> np.ndarray:
+    """
+    Returns a DAL hourly list as an array of the given length (integer
+    unless the list holds floats). Missing lists are all zeros; short lists
+    are padded with zeros.
+    """
+    if not values:
+        return np.zeros(length, dtype=np.int64)
+    values = np.asarray(values[:length])
+    result = np.zeros(length, dtype=values.dtype if values.dtype.kind == 'f' else np.int64)
+    result[:len(values)] = values
+    return result
+
+
+def cell_text(values: Sequence[Any], fmt: str = '', zero_as_dash: bool = False) -> List[str]:
+    """
+    Converts a column of values to cell strings (unpadded).
+
+    fmt is a format spec applied to each value (e.g. ',' or '.2f'); without
+    one, the whole column is converted in a single astype(str). With
+    zero_as_dash, zero values are shown as '-'.
+    """
+    array = np.asarray(values)
+    if fmt:
+        text = np.array([format(value, fmt) for value in array.tolist()], dtype=str)
+    else:
+        text = array.astype(str)
+    if zero_as_dash and array.dtype.kind in 'iuf' and len(array):
+        text = np.where(array == 0, '-', text)
+    return text.tolist()
+
+
+def format_cells(values: Sequence[Any], width: int = 0, align: str = '>', fmt: str = '',
+                 zero_as_dash: bool = False) -> List[str]:
+    """cell_text() padded to width ('<' pads on the right, anything else on the left)."""
+    text = cell_text(values, fmt, zero_as_dash)
+    if align == '<':
+        return [cell.ljust(width) for cell in text]
+    return [cell.rjust(width) for cell in text]
+
+
+class TextColumn:
+    """
+    One column of a text table.
+
+    values holds the body cells (one per row). If cumulative is set the
+    column shows the running sum of values. total is the cell for the
+    totals row: TOTAL_SUM, TOTAL_LAST (the last body value), a literal, a
+    sequence (one cell per totals row) or None for a blank cell. width is
+    a minimum; the column grows to fit its header and widest cell when
+    fit is set.
+    """
+    def __init__(self, header: str, values: Sequence[Any], width: int = 0, align: str = '>',
+                 fmt: str = '', zero_as_dash: bool = False, cumulative: bool = False,
+                 total: Any = None, total_fmt: Optional[str] = None, fit: bool = False):
+        self.header = header
+        self.values = np.cumsum(values) if cumulative else np.asarray(values)
+        self.width = width
+        self.align = align
+        self.fmt = fmt
+        self.zero_as_dash = zero_as_dash
+        self.total_fmt = fmt if total_fmt is None else total_fmt
+        self.fit = fit
+
+        if isinstance(total, str) and total == TOTAL_SUM:
+            total = [self.values.sum() if len(self.values) else 0]
+        elif isinstance(total, str) and total == TOTAL_LAST:
+            total = [self.values[-1] if len(self.values) else 0]
+        elif total is not None and (isinstance(total, str) or not isinstance(total, (list, tuple, np.ndarray))):
+            total = [total]
+        self.totals = total
+
+    @property
+    def template(self) -> str:
+        """Format field that pads a cell of this column."""
+        return f"{{:{'<' if self.align == '<' else '>'}{self.width}}}"
+
+    def cells(self) -> List[str]:
+        return cell_text(self.values, self.fmt, self.zero_as_dash)
+
+    def total_cells(self, rows: int) -> List[str]:
+        totals = list(self.totals or []) + [''] * (rows - len(self.totals or []))
+        return [value if isinstance(value, str) else format(value, self.total_fmt) for value in totals]
+
+    def fit_width(self) -> None:
+        """Widens the column to its header and widest body or total cell."""
+        widest = max([len(self.header)] + [len(cell) for cell in self.cells()])
+        if self.totals is not None:
+            widest = max([widest] + [len(cell) for cell in self.total_cells(len(self.totals))])
+        self.width = max(self.width, widest)
+
+
+def join_columns(columns: Sequence[Sequence[str]], separator: str = ' ') -> List[str]:
+    """Joins formatted columns (equal-length lists of padded cells) into lines."""
+    if not columns:
+        return []
+    return [separator.join(row) for row in zip(*columns)]
+
+
+def render_text_table(columns: Sequence[TextColumn], title: Optional[str] = None, separator: str = ' ',
+                      rule: str = '-', totals_heading: Optional[str] = None,
+                      total_rule: bool = True) -> List[str]:
+    """
+    Renders a table and returns its lines:
+
+        title (centered on the table width), blank line
+        header
+        ------
+        body rows
+        ------
+        [totals_heading]
+        totals rows
+
+    The title lines are only present when a title is given, and the totals
+    section only when at least one column has a total. Every row is
+    rendered with one precompiled row template.
+    """
+    for column in columns:
+        if column.fit:
+            column.fit_width()
+    row_template = separator.join(column.template for column in columns).format
+    header = row_template(*(column.header for column in columns))
+    table_width = len(header)
+    rule_line = rule * table_width
+
+    lines = []
+    if title is not None:
+        lines.append(title.center(table_width))
+        lines.append("")
+    lines.append(header)
+    lines.append(rule_line)
+    lines.extend(row_template(*row) for row in zip(*(column.cells() for column in columns)))
+
+    total_rows = max((len(column.totals) for column in columns if column.totals is not None), default=0)
+    if total_rows:
+        if total_rule:
+            lines.append(rule_line)
+        if totals_heading:
+            lines.append(totals_heading)
+        lines.extend(row_template(*row) for row in zip(*(column.total_cells(total_rows) for column in columns)))
+    return lines
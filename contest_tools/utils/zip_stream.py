@@ -0,0 +1,147 @@
+# contest_tools/utils/zip_stream.py
+#
+# Purpose: Builds ZIP archives as a stream of byte chunks, so a web response
+#          can send the archive while it is being written instead of building
+#          it on disk first. Entries use data descriptors and ZIP64 records;
+#          files that are already compressed are stored rather than deflated.
+#          The stream can optionally be copied to a cache file, which is only
+#          published once the archive is complete.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import io
+import json
+import uuid
+import hashlib
+import logging
+import zipfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Formats that are already compressed; deflating them again costs CPU for no gain.
+PRECOMPRESSED_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.zip', '.gz', '.br', '.bz2',
+    '.xz', '.7z', '.woff', '.woff2', '.mp4', '.webm',
+})
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Unseekable write target for zipfile; bytes written are collected until drained."""
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def archive_key(entries: Iterable[Tuple[str, str]]) -> str:
+    """
+    Hash identifying an archive's content, from each entry's name, size and
+    modification time. Sessions are written once, so an unchanged key means
+    a cached archive can be reused.
+    """
+    listing = []
+    for source_path, arcname in entries:
+        try:
+            stat = os.stat(source_path)
+            listing.append([arcname, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            listing.append([arcname, None, None])
+    return hashlib.sha256(json.dumps(listing).encode('utf-8')).hexdigest()[:20]
+
+
+def stream_zip(entries: Iterable[Tuple[str, str]], cache_path: Optional[str] = None,
+               chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields a ZIP archive of (source_path, arcname) entries chunk by chunk.
+
+    Entries are written with data descriptors and forced ZIP64 records, so
+    no sizes are needed up front and there is no 4 GiB limit. Entry times
+    come from the files' modification times, so the same files always give
+    the same bytes. Unreadable files are skipped with a warning.
+
+    If cache_path is given, the bytes are also written to a temporary file
+    that is renamed to cache_path only when the archive is complete; an
+    interrupted stream leaves no cache file behind.
+    """
+    buffer = _StreamBuffer()
+    part_path = f"{cache_path}.{uuid.uuid4().hex[:8]}.part" if cache_path else None
+    cache_file = open(part_path, 'wb') if part_path else None
+    completed = False
+
+    def emit() -> Optional[bytes]:
+        data = buffer.drain()
+        if data and cache_file is not None:
+            cache_file.write(data)
+        return data
+
+    try:
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for source_path, arcname in entries:
+                try:
+                    zinfo = zipfile.ZipInfo.from_file(source_path, arcname)
+                    ext = os.path.splitext(arcname)[1].lower()
+                    zinfo.compress_type = zipfile.ZIP_STORED if ext in PRECOMPRESSED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                    with open(source_path, 'rb') as src, zipf.open(zinfo, 'w', force_zip64=True) as dest:
+                        while True:
+                            block = src.read(chunk_size)
+                            if not block:
+                                break
+                            dest.write(block)
+                            data = emit()
+                            if data:
+                                yield data
+                except OSError as e:
+                    logger.warning(f"Skipping '{arcname}' in archive: {e}")
+                    continue
+                data = emit()
+                if data:
+                    yield data
+        data = emit()
+        if data:
+            yield data
+        completed = True
+    finally:
+        if cache_file is not None:
+            cache_file.close()
+            try:
+                if completed:
+                    os.replace(part_path, cache_path)
+                else:
+                    os.remove(part_path)
+            except OSError as e:
+                logger.warning(f"Could not finalize archive cache '{cache_path}': {e}")
+
+
+def write_zip(entries: Iterable[Tuple[str, str]], output_path: str) -> str:
+    """Writes the archive stream_zip() would produce to output_path and returns the path."""
+    for _ in stream_zip(entries, cache_path=output_path):
+        pass
+    return output_path
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# scripts/benchmark.py
+#
+# End-to-end performance benchmark. Times (and optionally memory-profiles)
+# every stage of the pipeline - Cabrillo parsing, each annotation stage,
+# time-series scoring, each data aggregator and each report - on synthetic
+# or real logs, and saves the results as a JSON baseline. 'compare' checks a
+# new run against a baseline and exits non-zero on regressions.
+#
+# Logs are generated with contest_tools.utils.synthetic_cabrillo unless
+# --logs is given. CTY data comes from --cty, or is resolved from
+# CONTEST_INPUT_DIR as in the main app.
+#
+# Examples:
+#   python scripts/benchmark.py generate CQ-WW-CW /tmp/syn --qsos 100000 --stations 3
+#   python scripts/benchmark.py run --contest CQ-WW-CW --qsos 20000 --stations 2 --out baseline.json
+#   python scripts/benchmark.py run --logs a.log b.log --reports none --memory --out current.json
+#   python scripts/benchmark.py compare baseline.json current.json --threshold 0.15
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import numpy as np
+import pandas as pd
+
+from contest_tools.log_manager import LogManager
+from contest_tools.contest_log import ContestLog
+from contest_tools.core_annotations import (
+    CtyLookup, BandAllocator, process_dataframe_for_cty_data, process_contest_log_for_run_s_p
+)
+from contest_tools.report_generator import ReportGenerator
+from contest_tools.reports import AVAILABLE_REPORTS
+from contest_tools.data_aggregators.time_series import TimeSeriesAggregator
+from contest_tools.data_aggregators.matrix_stats import MatrixAggregator
+from contest_tools.data_aggregators.rate_stats import RateStatsAggregator
+from contest_tools.data_aggregators.categorical_stats import CategoricalAggregator
+from contest_tools.data_aggregators.call_incidence import CallIncidenceMatrix
+from contest_tools.data_aggregators.multiplier_stats import MultiplierStatsAggregator
+from contest_tools.data_aggregators.score_stats import ScoreStatsAggregator
+from contest_tools.data_aggregators.qso_matching import QsoMatchingEngine
+from contest_tools.utils.synthetic_cabrillo import generate_session
+from contest_tools.version import __version__, __git_hash__
+
+logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+
+class StageRecorder:
+    """Accumulates wall time and peak traced memory per named stage."""
+
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            # A failing stage is recorded, not fatal, so one broken report doesn't hide the rest
+            error = f"{type(e).__name__}: {e}"
+            logger.error(f"Stage '{name}' failed: {error}")
+        elapsed = time.perf_counter() - start
+        entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] += elapsed
+        entry["calls"] += 1
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            entry["peak_mb"] = max(entry.get("peak_mb", 0.0), round((peak - base) / 2**20, 2))
+        if error:
+            entry["error"] = error
+
+
+def _aggregator_stages(logs: List[ContestLog]) -> List[Tuple[str, Callable[[], Any]]]:
+    """Representative calls for each data aggregator, each on a cold instance."""
+    contest_def = logs[0].contest_definition
+    mult_names = [r['name'] for r in contest_def.multiplier_rules if r.get('name')]
+    stages = [
+        ("time_series", lambda: TimeSeriesAggregator(logs).get_time_series_data()),
+        ("matrix", lambda: MatrixAggregator(logs).get_matrix_data(bin_size='15min')),
+        ("matrix_stacked", lambda: MatrixAggregator(logs).get_stacked_matrix_data(bin_size='60min')),
+        ("rate_best", lambda: RateStatsAggregator(logs).get_best_rates()),
+        ("rate_meter", lambda: RateStatsAggregator(logs).get_rate_meter()),
+        ("categorical_summary", lambda: CategoricalAggregator().get_log_summary_stats(logs)),
+        ("categorical_points", lambda: CategoricalAggregator().get_points_breakdown(logs)),
+        ("score_breakdown", lambda: ScoreStatsAggregator(logs).get_score_breakdown()),
+    ]
+    if mult_names:
+        stages.append(("multiplier_summary", lambda: MultiplierStatsAggregator(logs).get_summary_data(mult_names[0])))
+    if len(logs) >= 2:
+        stages.append(("call_incidence", lambda: CallIncidenceMatrix(logs).compute_comparison_breakdown(logs[0], logs[1])))
+        stages.append(("qso_matching", lambda: QsoMatchingEngine(logs).get_match_summary()))
+    return stages
+
+
+def _select_reports(spec: str) -> List[str]:
+    if spec == 'none':
+        return []
+    if spec == 'all':
+        return list(AVAILABLE_REPORTS)
+    return [r.strip() for r in spec.split(',') if r.strip()]
+
+
+def run_pipeline(log_paths: List[str], root_input_dir: str, cty_dat_path: str, report_ids: List[str],
+                 output_dir: str, recorder: StageRecorder) -> int:
+    """Runs every pipeline stage once under the recorder; returns the total QSO count."""
+    log_manager = LogManager()
+
+    with recorder.stage("setup.cty_lookup"):
+        shared_cty_lookup = CtyLookup(cty_dat_path=cty_dat_path)
+    with recorder.stage("setup.band_allocator"):
+        shared_band_allocator = BandAllocator(root_input_dir)
+
+    for path in log_paths:
+        contest_name = log_manager._get_contest_name_from_header(path)
+        with recorder.stage("parse"):
+            log = ContestLog(contest_name=contest_name, cabrillo_filepath=path, root_input_dir=root_input_dir,
+                             cty_dat_path=cty_dat_path, shared_cty_lookup=shared_cty_lookup,
+                             shared_band_allocator=shared_band_allocator)
+        setattr(log, '_log_manager_ref', log_manager)
+        log_manager.logs.append(log)
+
+        # The steps of ContestLog.apply_annotations(), timed one by one
+        for col in ['Mult1', 'Mult1Name', 'Mult2', 'Mult2Name']:
+            if col in log.qsos_df.columns:
+                log.qsos_df[col] = log.qsos_df[col].astype('object')
+        with recorder.stage("annotate.run_s_p"):
+            log.qsos_df = process_contest_log_for_run_s_p(log.qsos_df)
+        with recorder.stage("annotate.cty"):
+            log.qsos_df = process_dataframe_for_cty_data(log.qsos_df, log.cty_dat_path,
+                                                         shared_cty_lookup=log._shared_cty_lookup)
+        with recorder.stage("annotate.contest_specific"):
+            log.apply_contest_specific_annotations()
+        with recorder.stage("annotate.operating_time"):
+            log.metadata['OperatingTime'] = log._calculate_operating_time()
+
+    logs = sorted(log_manager.logs, key=lambda x: str(x.get_metadata().get('MyCall', 'Unknown')).upper())
+    log_manager.logs = logs
+    if not logs:
+        raise ValueError("No logs could be loaded.")
+
+    with recorder.stage("finalize.master_time_index"):
+        log_manager._create_master_time_index()
+    with recorder.stage("finalize.time_series_score"):
+        for log in logs:
+            log._pre_calculate_time_series_score()
+    event_id = log_manager._get_event_id(logs[0]).lower()
+    for log in logs:
+        log.metadata['EventID'] = event_id
+
+    for name, func in _aggregator_stages(logs):
+        with recorder.stage(f"aggregator.{name}"):
+            func()
+
+    if report_ids:
+        generator = ReportGenerator(logs, root_output_dir=output_dir)
+        for report_id in report_ids:
+            with recorder.stage(f"report.{report_id}"):
+                generator.run_reports(report_id)
+
+    return int(sum(len(log.get_processed_data()) for log in logs))
+
+
+def _resolve_cty(args, log_paths: List[str], root_input_dir: str) -> str:
+    if args.cty:
+        return args.cty
+    return LogManager().resolve_cty_file(log_paths, root_input_dir, 'after')
+
+
+def cmd_generate(args) -> int:
+    calls = args.calls.split(',') if args.calls else None
+    paths = generate_session(args.contest, args.output_dir, qsos=args.qsos, stations=args.stations, calls=calls,
+                             date=args.date, seed=args.seed, dupe_rate=args.dupe_rate,
+                             portable_rate=args.portable_rate)
+    for path in paths:
+        print(path)
+    return 0
+
+
+def cmd_run(args) -> int:
+    root_input_dir = args.input_dir or os.environ.get("CONTEST_INPUT_DIR")
+    if not root_input_dir:
+        logger.error("CONTEST_INPUT_DIR is not set (or pass --input-dir).")
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix="cla_bench_") as work_dir:
+        if args.logs:
+            log_paths = args.logs
+        elif args.contest:
+            log_paths = generate_session(args.contest, os.path.join(work_dir, "logs"), qsos=args.qsos,
+                                         stations=args.stations, seed=args.seed, date=args.date)
+        else:
+            logger.error("Pass --logs or --contest.")
+            return 1
+
+        cty_dat_path = _resolve_cty(args, log_paths, root_input_dir)
+        report_ids = _select_reports(args.reports)
+
+        if args.memory:
+            tracemalloc.start()
+        runs = []
+        total_qsos = 0
+        for i in range(args.repeat):
+            recorder = StageRecorder(args.memory)
+            total_qsos = run_pipeline(log_paths, root_input_dir, cty_dat_path, report_ids,
+                                      os.path.join(work_dir, f"reports_{i}"), recorder)
+            runs.append(recorder.stages)
+        if args.memory:
+            tracemalloc.stop()
+
+    # Best-of-N wall time per stage is the least noisy estimate
+    stages = {}
+    for name in runs[0]:
+        entries = [r[name] for r in runs if name in r]
+        best = min(entries, key=lambda e: e["seconds"])
+        stages[name] = {**best, "seconds": round(best["seconds"], 4)}
+
+    result = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "environment": {
+            "version": __version__,
+            "git_hash": __git_hash__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "config": {
+            "contest": args.contest,
+            "logs": [os.path.basename(p) for p in log_paths],
+            "qsos": total_qsos,
+            "stations": len(log_paths),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            # tracemalloc slows allocation-heavy code; only compare like with like
+            "memory_traced": bool(args.memory),
+        },
+        "total_seconds": round(sum(s["seconds"] for s in stages.values()), 4),
+        "stages": stages,
+    }
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    _print_run(result)
+    print(f"\nSaved benchmark to {args.out}")
+    return 0
+
+
+def _print_run(result: Dict[str, Any]) -> None:
+    print(f"{'Stage':<45} {'Seconds':>10} {'Peak MB':>10}")
+    print("-" * 67)
+    for name, entry in result["stages"].items():
+        peak = f"{entry['peak_mb']:.1f}" if "peak_mb" in entry else ""
+        flag = "  FAILED" if "error" in entry else ""
+        print(f"{name:<45} {entry['seconds']:>10.3f} {peak:>10}{flag}")
+    print("-" * 67)
+    print(f"{'Total':<45} {result['total_seconds']:>10.3f}")
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float, min_delta: float,
+                    memory_threshold: float) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Pairs up stages from two runs. A stage regresses when it is slower by more
+    than 'threshold' (relative) and 'min_delta' seconds (absolute), or its
+    peak memory grew by more than 'memory_threshold'.
+    """
+    rows, regressions = [], []
+    base_stages, cur_stages = baseline.get("stages", {}), current.get("stages", {})
+    for name in list(base_stages) + [n for n in cur_stages if n not in base_stages]:
+        base, cur = base_stages.get(name), cur_stages.get(name)
+        row = {"stage": name, "base": base and base["seconds"], "current": cur and cur["seconds"], "status": ""}
+        if base is None:
+            row["status"] = "new"
+        elif cur is None:
+            row["status"] = "removed"
+        elif "error" in cur and "error" not in base:
+            row["status"] = "FAILED"
+            regressions.append(name)
+        else:
+            delta = cur["seconds"] - base["seconds"]
+            row["change"] = delta / base["seconds"] if base["seconds"] > 0 else 0.0
+            if delta > min_delta and row["change"] > threshold:
+                row["status"] = "SLOWER"
+                regressions.append(name)
+            elif -delta > min_delta and -row["change"] > threshold:
+                row["status"] = "faster"
+            base_mb, cur_mb = base.get("peak_mb"), cur.get("peak_mb")
+            if base_mb and cur_mb and (cur_mb - base_mb) / base_mb > memory_threshold and cur_mb - base_mb > 1.0:
+                row["status"] = (row["status"] + " MEMORY").strip()
+                if name not in regressions:
+                    regressions.append(name)
+        rows.append(row)
+    return rows, regressions
+
+
+def cmd_compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    if baseline.get("config", {}).get("memory_traced") != current.get("config", {}).get("memory_traced"):
+        logger.warning("One run traced memory and the other did not; timings are not directly comparable.")
+    if baseline.get("config", {}).get("qsos") != current.get("config", {}).get("qsos"):
+        logger.warning("The runs processed different QSO counts.")
+
+    rows, regressions = compare_results(baseline, current, args.threshold, args.min_delta, args.memory_threshold)
+    print(f"{'Stage':<45} {'Base s':>9} {'Current s':>10} {'Change':>8}  Status")
+    print("-" * 84)
+    for row in rows:
+        base = f"{row['base']:.3f}" if row['base'] is not None else "-"
+        cur = f"{row['current']:.3f}" if row['current'] is not None else "-"
+        change = f"{row['change']:+.0%}" if "change" in row else ""
+        print(f"{row['stage']:<45} {base:>9} {cur:>10} {change:>8}  {row['status']}")
+    print("-" * 84)
+    print(f"{'Total':<45} {baseline.get('total_seconds', 0):>9.3f} {current.get('total_seconds', 0):>10.3f}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the log processing pipeline.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Write synthetic Cabrillo logs")
+    gen.add_argument("contest", help="Contest name as in the CONTEST: header, e.g. CQ-WW-CW")
+    gen.add_argument("output_dir")
+    gen.add_argument("--qsos", type=int, default=2000, help="QSOs per log (default: 2000)")
+    gen.add_argument("--stations", type=int, default=1, help="Number of logs (default: 1)")
+    gen.add_argument("--calls", help="Comma-separated callsigns for the logs (overrides --stations)")
+    gen.add_argument("--date", help="Generate the first contest weekend on or after this date")
+    gen.add_argument("--seed", type=int, default=1)
+    gen.add_argument("--dupe-rate", type=float, default=0.01)
+    gen.add_argument("--portable-rate", type=float, default=0.02)
+    gen.set_defaults(func=cmd_generate)
+
+    run = sub.add_parser("run", help="Time every pipeline stage and save a JSON baseline")
+    run.add_argument("--logs", nargs="+", help="Existing Cabrillo logs to benchmark")
+    run.add_argument("--contest", help="Generate synthetic logs for this contest instead")
+    run.add_argument("--qsos", type=int, default=5000, help="QSOs per synthetic log (default: 5000)")
+    run.add_argument("--stations", type=int, default=2, help="Number of synthetic logs (default: 2)")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--date")
+    run.add_argument("--reports", default="all", help="'all', 'none' or comma-separated report IDs (default: all)")
+    run.add_argument("--repeat", type=int, default=1, help="Run N times and keep the fastest time per stage")
+    run.add_argument("--memory", action="store_true", help="Record peak traced memory per stage (slower)")
+    run.add_argument("--cty", help="Path to a CTY file (default: resolve from CONTEST_INPUT_DIR)")
+    run.add_argument("--input-dir", help="Input data directory (default: $CONTEST_INPUT_DIR)")
+    run.add_argument("--out", default="benchmark.json", help="Output JSON (default: benchmark.json)")
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="Compare a run against a baseline")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown that counts (default: 0.15)")
+    cmp_.add_argument("--min-delta", type=float, default=0.05, help="Ignore changes below this many seconds (default: 0.05)")
+    cmp_.add_argument("--memory-threshold", type=float, default=0.25, help="Relative peak-memory growth that counts (default: 0.25)")
+    cmp_.set_defaults(func=cmd_compare)
+
+    args = ap.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
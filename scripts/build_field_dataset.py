@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# scripts/build_field_dataset.py
+#
+# Build (or incrementally update) a field-wide columnar dataset from a directory of
+# public Cabrillo logs, e.g. CONTEST_LOGS_REPORTS/Logs/2024/cq-ww-cw, and print the
+# field-wide summaries. Files that fail to parse are reported and skipped.
+#
+# Requires pyarrow. CTY data is resolved from CONTEST_INPUT_DIR as in the main app.
+#
+# Example:
+#   python scripts/build_field_dataset.py CONTEST_LOGS_REPORTS/Logs/2024/cq-ww-cw --out /tmp/cqww_field
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from contest_tools.field_dataset import FieldDataset, find_log_files
+from contest_tools.data_aggregators.field_stats import FieldStatsAggregator
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build a field-wide QSO dataset from a directory of Cabrillo logs.")
+    ap.add_argument("log_dir", help="Directory containing the Cabrillo files")
+    ap.add_argument("--out", required=True, help="Dataset directory (created or updated)")
+    ap.add_argument("--cty", default="after", help="CTY specifier: 'before', 'after' or a CTY filename (default: after)")
+    ap.add_argument("--overwrite", action="store_true", help="Re-ingest files even if unchanged")
+    ap.add_argument("--summary", action="store_true", help="Print field-wide summaries as JSON when done")
+    args = ap.parse_args()
+
+    root_input_dir = os.environ.get("CONTEST_INPUT_DIR")
+    if not root_input_dir:
+        logger.error("CONTEST_INPUT_DIR is not set.")
+        return 1
+
+    log_files = find_log_files(args.log_dir)
+    if not log_files:
+        logger.error("No Cabrillo files found in %s", args.log_dir)
+        return 1
+
+    dataset = FieldDataset(args.out)
+    counts = dataset.build(log_files, root_input_dir, cty_specifier=args.cty, overwrite=args.overwrite)
+    logger.info("Ingested %d, unchanged %d, failed %d", counts["ingested"], counts["skipped"], counts["failed"])
+    for source, error in sorted(dataset.failures.items()):
+        logger.warning("  %s: %s", source, error)
+
+    if args.summary:
+        aggregator = FieldStatsAggregator(dataset)
+        summary = {
+            "unique_calls": aggregator.get_unique_calls(top_n=20),
+            "multiplier_availability": aggregator.get_multiplier_availability(),
+        }
+        print(json.dumps(summary, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# scripts/build_report_manifest.py
+#
+# Regenerates contest_tools/reports/report_manifest.json, the report metadata
+# index that lets AVAILABLE_REPORTS import report modules lazily. Run it after
+# adding a report or changing a report's metadata attributes. With --check it
+# only validates the manifest against the report classes and exits non-zero
+# if they differ (suitable for CI). The check runs twice: with Django
+# configured from web_app, as in the web app, and without it, as in the CLI,
+# where reports that render Django templates are not listed.
+#
+# Examples:
+#   python scripts/build_report_manifest.py
+#   python scripts/build_report_manifest.py --check
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+WEB_APP_DIR = REPO_ROOT / 'web_app'
+
+
+def _setup_django():
+    if str(WEB_APP_DIR) not in sys.path:
+        sys.path.insert(0, str(WEB_APP_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def _check(label: str) -> int:
+    from contest_tools.reports import MANIFEST_FILENAME, validate_manifest
+
+    problems = validate_manifest()
+    for problem in problems:
+        print(f"[{label}] {problem}")
+    if problems:
+        print(f"[{label}] {MANIFEST_FILENAME} is out of date; run scripts/build_report_manifest.py")
+        return 1
+    print(f"[{label}] {MANIFEST_FILENAME} is current.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or validate the report manifest.")
+    parser.add_argument('--check', action='store_true', help="Validate the manifest instead of rewriting it.")
+    parser.add_argument('--no-django', action='store_true',
+                        help="With --check, only validate without Django configured (used internally).")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    if args.check and args.no_django:
+        return _check("without Django")
+
+    _setup_django()
+    if args.check:
+        status = _check("with Django")
+        env = {k: v for k, v in os.environ.items() if k != 'DJANGO_SETTINGS_MODULE'}
+        no_django = subprocess.run([sys.executable, __file__, '--check', '--no-django'], env=env)
+        return status or no_django.returncode
+
+    from contest_tools.reports import MANIFEST_FILENAME, write_manifest
+    manifest = write_manifest()
+    print(f"Wrote {MANIFEST_FILENAME}: {len(manifest['reports'])} reports from {len(manifest['modules'])} modules.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,10 @@
 # Download Reverse Beacon Network daily ZIPs (CSV inside) from data.reversebeacon.net,
 # optionally filter by skimmer (callsign), spotted station (dx), CW, UTC window, and write a combined CSV.
 #
+# When pyarrow is installed, each ZIP is converted once into the partitioned RBN spot
+# store (contest_tools/utils/rbn_store.py) and later queries are answered from the store
+# instead of re-reading the CSV. Use --no-store for the plain streaming CSV filter.
+#
 # RBN: callsign = skimmer; dx = station spotted. For GR2HQ as the heard station use --dx GR2HQ (not --skimmer).
 
 from __future__ import annotations
@@ -19,6 +23,12 @@ from urllib.request import Request, urlopen
 
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from contest_tools.utils.rbn_store import RbnSpotStore, epoch_to_timestamp
+
 RBN_ZIP_BASE = "https://data.reversebeacon.net/rbn_history"
 DEFAULT_DATES = ["20250712", "20250713"]
 USER_AGENT = "ContestLogAnalyzer-RBN-Downloader/1.0"
@@ -58,35 +68,67 @@ def filter_chunk(
     time_start: Optional[pd.Timestamp],
     time_end: Optional[pd.Timestamp],
 ) -> pd.DataFrame:
+    # Build one combined mask; cheap equality filters first, the date parse last and only once
+    mask = pd.Series(True, index=df.index)
     if skimmer:
-        col = "callsign" if "callsign" in df.columns else None
-        if not col:
+        if "callsign" not in df.columns:
             raise KeyError("Expected column 'callsign' for skimmer filter")
-        mask = df[col].astype(str).str.upper().str.strip() == skimmer.upper().strip()
-        df = df.loc[mask].copy()
+        mask &= df["callsign"].astype(str).str.upper().str.strip() == skimmer.upper().strip()
     if dx_spot:
-        col = "dx" if "dx" in df.columns else None
-        if not col:
+        if "dx" not in df.columns:
             raise KeyError("Expected column 'dx' for spotted-station filter")
-        mask = df[col].astype(str).str.upper().str.strip() == dx_spot.upper().strip()
-        df = df.loc[mask].copy()
+        mask &= df["dx"].astype(str).str.upper().str.strip() == dx_spot.upper().strip()
     if cw_only and "tx_mode" in df.columns:
-        df = df.loc[df["tx_mode"].astype(str).str.upper().str.strip() == "CW"].copy()
+        mask &= df["tx_mode"].astype(str).str.upper().str.strip() == "CW"
     elif cw_only:
         logger.warning("No tx_mode column; cw-only filter skipped for this chunk")
 
     if time_start is not None or time_end is not None:
-        date_col = "date" if "date" in df.columns else None
-        if not date_col:
+        if "date" not in df.columns:
             logger.warning("No date column; time window filter skipped")
-        else:
-            t = pd.to_datetime(df[date_col], utc=True, errors="coerce")
+        elif mask.any():
+            t = pd.to_datetime(df.loc[mask, "date"], utc=True, errors="coerce")
+            keep = pd.Series(True, index=t.index)
             if time_start is not None:
-                df = df.loc[t >= time_start].copy()
-                t = pd.to_datetime(df[date_col], utc=True, errors="coerce")
+                keep &= t >= time_start
             if time_end is not None:
-                df = df.loc[t <= time_end].copy()
-    return df
+                keep &= t <= time_end
+            mask.loc[keep.index] &= keep
+    return df.loc[mask]
+
+
+def query_store(
+    store: "RbnSpotStore",
+    dates: List[str],
+    skimmer: Optional[str],
+    dx_spot: Optional[str],
+    cw_only: bool,
+    time_start: Optional[pd.Timestamp],
+    time_end: Optional[pd.Timestamp],
+) -> pd.DataFrame:
+    """
+    Answers the filter from the spot store for exactly the requested days,
+    returned in the raw RBN CSV column layout.
+    """
+    df = store.query(
+        dx=dx_spot,
+        skimmer=skimmer,
+        tx_mode="CW" if cw_only else None,
+        start=time_start,
+        end=time_end,
+        dates=dates,
+    )
+    if df.empty:
+        return pd.DataFrame()
+    out = pd.DataFrame({
+        "callsign": df["skimmer"], "de_pfx": df["de_pfx"], "de_cont": df["de_cont"],
+        "freq": df["freq"], "band": df["band"], "dx": df["dx"], "dx_pfx": df["dx_pfx"],
+        "dx_cont": df["dx_cont"], "mode": df["spot_type"], "db": df["snr"],
+        "date": epoch_to_timestamp(df["time"]).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "speed": df["speed"], "tx_mode": df["tx_mode"],
+    })
+    out["_source_zip"] = df["date"].astype(str) + ".zip"
+    return out
 
 
 def process_one_zip(
@@ -163,6 +205,13 @@ def main() -> None:
     p.add_argument("--no-time-filter", action="store_true", help="Keep full UTC days after other filters")
     p.add_argument("--chunksize", type=int, default=200_000, help="CSV chunksize for reading")
     p.add_argument("--skip-download", action="store_true", help="Use existing zips in downloads dir only")
+    p.add_argument(
+        "--store-dir",
+        type=Path,
+        default=None,
+        help="Partitioned RBN spot store (default: <out-dir>/store). Requires pyarrow.",
+    )
+    p.add_argument("--no-store", action="store_true", help="Filter the CSVs directly instead of using the spot store")
     args = p.parse_args()
 
     dx_val = args.dx.strip() if args.dx else None
@@ -171,8 +220,7 @@ def main() -> None:
         logger.error("Provide at least one of --dx or --skimmer (or defaults).")
         sys.exit(1)
 
-    repo_root = Path(__file__).resolve().parent.parent
-    out_dir = args.out_dir or (repo_root / "data" / "rbn")
+    out_dir = args.out_dir or (REPO_ROOT / "data" / "rbn")
     dl_dir = out_dir / "downloads"
     dl_dir.mkdir(parents=True, exist_ok=True)
 
@@ -203,21 +251,40 @@ def main() -> None:
         time_start = pd.Timestamp(args.contest_start, tz="UTC")
         time_end = pd.Timestamp(args.contest_end, tz="UTC")
 
-    all_frames: List[pd.DataFrame] = []
-    for zp in zip_paths:
-        logger.info("Processing %s", zp)
-        df = process_one_zip(zp, skimmer_val, dx_val, args.cw_only, time_start, time_end, args.chunksize)
-        if not df.empty:
-            df["_source_zip"] = zp.name
-            all_frames.append(df)
-        else:
-            logger.warning("No rows after filter for %s", zp)
+    store = None
+    if not args.no_store:
+        try:
+            store = RbnSpotStore(str(args.store_dir or (out_dir / "store")))
+        except ImportError:
+            logger.warning("pyarrow not installed; falling back to direct CSV filtering (--no-store)")
+
+    if store is not None:
+        for d, zp in zip(dates, zip_paths):
+            if store.has_date(d):
+                logger.info("RBN %s already in store", d)
+            else:
+                logger.info("Ingesting %s into %s", zp, store.root_dir)
+                store.ingest_zip(str(zp), yyyymmdd=d)
+        combined = query_store(store, dates, skimmer_val, dx_val, args.cw_only, time_start, time_end)
+        if combined.empty:
+            logger.error("No data produced.")
+            sys.exit(2)
+    else:
+        all_frames: List[pd.DataFrame] = []
+        for zp in zip_paths:
+            logger.info("Processing %s", zp)
+            df = process_one_zip(zp, skimmer_val, dx_val, args.cw_only, time_start, time_end, args.chunksize)
+            if not df.empty:
+                df["_source_zip"] = zp.name
+                all_frames.append(df)
+            else:
+                logger.warning("No rows after filter for %s", zp)
 
-    if not all_frames:
-        logger.error("No data produced.")
-        sys.exit(2)
+        if not all_frames:
+            logger.error("No data produced.")
+            sys.exit(2)
 
-    combined = pd.concat(all_frames, ignore_index=True)
+        combined = pd.concat(all_frames, ignore_index=True)
     tag_parts = []
     if dx_val:
         tag_parts.append(f"dx_{dx_val}")
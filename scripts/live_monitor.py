@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# scripts/live_monitor.py
+#
+# Watch a log while the contest is running. QSOs are read from a growing
+# Cabrillo or ADIF file, or from N1MM Logger+ UDP contact broadcasts, and are
+# annotated incrementally. Every --interval seconds the live summary (score,
+# multipliers, rates, Run/S&P split, recent QSOs) is written as JSON for a
+# dashboard to poll. An optional benchmark log (e.g. last year's) is compared
+# at the same elapsed time.
+#
+# CTY data is resolved from CONTEST_INPUT_DIR as in the main app.
+#
+# Examples:
+#   python scripts/live_monitor.py CQ-WW-CW K1LZ --cabrillo k1lz.log --out /tmp/live.json
+#   python scripts/live_monitor.py CQ-WW-CW K1LZ --udp 0.0.0.0:12060 --out /tmp/live.json --benchmark k1lz_2023.log
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from contest_tools.log_manager import LogManager
+from contest_tools.live_log import LiveLog, CabrilloTailer, AdifTailer, N1mmContactListener
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Annotate a contest log incrementally while it is being written.")
+    ap.add_argument("contest", help="Contest name, e.g. CQ-WW-CW")
+    ap.add_argument("call", help="Your callsign")
+    source = ap.add_mutually_exclusive_group(required=True)
+    source.add_argument("--cabrillo", help="Cabrillo file to tail")
+    source.add_argument("--adif", help="ADIF file to tail")
+    source.add_argument("--udp", metavar="HOST:PORT", help="Listen for N1MM contact broadcasts (default port 12060)")
+    ap.add_argument("--out", required=True, help="JSON file rewritten with the live summary")
+    ap.add_argument("--interval", type=float, default=5.0, help="Seconds between polls (default: 5)")
+    ap.add_argument("--cty", default="after", help="CTY specifier: 'before', 'after' or a CTY filename (default: after)")
+    ap.add_argument("--benchmark", help="Finished Cabrillo log to compare against")
+    args = ap.parse_args()
+
+    root_input_dir = os.environ.get("CONTEST_INPUT_DIR")
+    if not root_input_dir:
+        logger.error("CONTEST_INPUT_DIR is not set.")
+        return 1
+
+    log_manager = LogManager()
+    # The contest date comes from the Cabrillo files at hand (ADIF and UDP carry none)
+    dated_logs = [path for path in (args.cabrillo, args.benchmark) if path]
+    cty_dat_path = log_manager.resolve_cty_file(dated_logs, root_input_dir, args.cty)
+    live = LiveLog(args.contest, root_input_dir, cty_dat_path, args.call)
+
+    benchmark = None
+    if args.benchmark:
+        log_manager.load_log_batch([args.benchmark], root_input_dir, args.cty)
+        benchmark = log_manager.logs[0] if log_manager.logs else None
+
+    if args.cabrillo:
+        tailer = CabrilloTailer(args.cabrillo, live.contest_definition, shared_cty_lookup=live._shared_cty_lookup)
+        poll = lambda: tailer.poll(root_input_dir, cty_dat_path)
+    elif args.adif:
+        poll = AdifTailer(args.adif).poll
+    else:
+        host, _, port = args.udp.rpartition(':')
+        poll = N1mmContactListener(host or '0.0.0.0', int(port or 12060)).poll
+
+    logger.info("Watching for QSOs; summary is written to %s", args.out)
+    try:
+        while True:
+            added = live.add_records(poll())
+            if added:
+                summary = live.get_live_summary()
+                if benchmark is not None:
+                    summary["benchmark"] = live.compare_to(benchmark)
+                tmp_path = args.out + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, indent=1)
+                os.replace(tmp_path, args.out)
+                logger.info("%d QSOs, score %d (+%d)", summary["qsos"], summary["score"], added)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# web_app/analyzer/dashboard_jobs.py
+#
+# Purpose: Background regeneration of the precomputed dashboard aggregate
+#          bundles. When a dashboard finds its bundle missing or stale (e.g.
+#          a session analyzed before the bundle layout changed), the logs are
+#          re-parsed here on a daemon thread rather than inside the request;
+#          the view shows a short "being prepared" page until the bundle is
+#          written. A lock file under the session keeps concurrent requests
+#          and worker processes from regenerating the same bundle twice, a
+#          failure marker keeps a broken session from being retried on every
+#          request, and the session is marked busy in the session registry so
+#          the janitor does not delete it mid-job.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from contest_tools.log_manager import LogManager
+from contest_tools.manifest_manager import ManifestManager
+from contest_tools.utils.dashboard_aggregates import (
+    build_multiplier_dashboard_bundle,
+    combo_id_for_logs,
+    multiplier_dashboard_bundle_path,
+    write_multiplier_dashboard_bundle,
+)
+from contest_tools.version import __version__
+
+from .session_registry import session_busy
+
+logger = logging.getLogger(__name__)
+
+# A lock file older than this belongs to a job that died; it is taken over.
+REGENERATION_LOCK_TIMEOUT_SECONDS = 15 * 60
+# A failed job is not retried for this long; after that the next request tries again.
+REGENERATION_FAILURE_RETRY_SECONDS = 30 * 60
+
+_jobs_lock = threading.Lock()
+_running_jobs: Set[Tuple[str, str]] = set()
+
+
+def _session_log_paths(session_path: str) -> List[str]:
+    """The uploaded log files at the session root (everything else is generated)."""
+    log_paths = []
+    for f in sorted(os.listdir(session_path)):
+        f_path = os.path.join(session_path, f)
+        if (os.path.isfile(f_path) and not f.startswith(('dashboard_context', 'archive_')) and not f.endswith('.zip')
+                and f != ManifestManager.LOCATOR_FILENAME):
+            log_paths.append(f_path)
+    return log_paths
+
+
+def _acquire_lock(lock_path: str) -> bool:
+    """Creates the lock file, taking over one left behind by a dead job."""
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    try:
+        if time.time() - os.stat(lock_path).st_mtime > REGENERATION_LOCK_TIMEOUT_SECONDS:
+            os.remove(lock_path)
+    except OSError:
+        pass
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
+
+
+def regenerate_multiplier_dashboard_bundle(session_path: str, combo_id: str) -> Optional[str]:
+    """
+    Re-parses the session's logs and writes the multiplier dashboard bundle.
+    Header metadata comes from the persisted dashboard context when present,
+    matching what the analysis pipeline writes. Returns the bundle path, or
+    None on failure.
+    """
+    dashboard_ctx: Dict[str, Any] = {}
+    context_path = os.path.join(session_path, 'dashboard_context.json')
+    if os.path.exists(context_path):
+        try:
+            with open(context_path, 'r') as f:
+                dashboard_ctx = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load dashboard context: {e}")
+
+    custom_cty_path = dashboard_ctx.get('custom_cty_path')
+    if custom_cty_path and not os.path.exists(custom_cty_path):
+        custom_cty_path = None
+    log_paths = [p for p in _session_log_paths(session_path) if p != custom_cty_path]
+
+    root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
+    lm = LogManager()
+    lm.load_log_batch(log_paths, root_input, 'after', custom_cty_path=custom_cty_path)
+    if not lm.logs:
+        logger.error(f"Dashboard regeneration: no logs could be loaded from {session_path}")
+        return None
+
+    if combo_id_for_logs(lm.logs) != combo_id:
+        logger.error(f"Dashboard regeneration: logs in {session_path} do not match combo '{combo_id}'")
+        return None
+
+    report_metadata = None
+    persisted_logs = dashboard_ctx.get('logs') or []
+    if dashboard_ctx.get('full_contest_title') and persisted_logs:
+        calls = sorted([l['callsign'] for l in persisted_logs])
+        is_mode_dimension = (len(lm.logs[0].contest_definition.valid_bands) == 1
+                             and len(lm.logs[0].contest_definition.valid_modes) > 1)
+        cty_info = dashboard_ctx.get('cty_version_info', 'CTY-Unknown Unknown Date')
+        report_metadata = {
+            'context_line': f"{dashboard_ctx['full_contest_title']} - {', '.join(calls)}",
+            'scope_line': "All Modes" if is_mode_dimension else "All Bands",
+            'footer': f"CLA v{__version__}   |   {cty_info}",
+        }
+
+    location_type = dashboard_ctx.get('location_type')
+    if not location_type:
+        location_type = getattr(lm.logs[0], '_my_location_type', None) or lm.logs[0].get_metadata().get('LocationType')
+
+    bundle = build_multiplier_dashboard_bundle(
+        lm.logs,
+        location_type=location_type,
+        report_metadata=report_metadata,
+        manifest_dir=ManifestManager.locate(session_path),
+        root_input_dir=root_input,
+    )
+    return write_multiplier_dashboard_bundle(session_path, bundle)
+
+
+def _failure_marker_path(session_path: str, combo_id: str) -> str:
+    return multiplier_dashboard_bundle_path(session_path, combo_id) + '.failed'
+
+
+def multiplier_dashboard_regeneration_failed(session_path: str, combo_id: str) -> bool:
+    """True if a regeneration job failed for this session and combo within the retry interval."""
+    try:
+        failed_at = os.stat(_failure_marker_path(session_path, combo_id)).st_mtime
+    except OSError:
+        return False
+    return time.time() - failed_at < REGENERATION_FAILURE_RETRY_SECONDS
+
+
+def _run_regeneration(session_path: str, combo_id: str, lock_path: str) -> None:
+    path = None
+    marker_path = _failure_marker_path(session_path, combo_id)
+    try:
+        with session_busy(os.path.basename(os.path.normpath(session_path))):
+            start = time.monotonic()
+            path = regenerate_multiplier_dashboard_bundle(session_path, combo_id)
+        if path:
+            logger.info(f"Regenerated dashboard aggregates {path} in {time.monotonic() - start:.1f}s")
+    except Exception as e:
+        logger.error(f"Dashboard aggregate regeneration failed for {session_path}: {e}", exc_info=True)
+    finally:
+        try:
+            if path:
+                if os.path.exists(marker_path):
+                    os.remove(marker_path)
+            else:
+                # (Re)written so the retry interval counts from this failure
+                with open(marker_path, 'w'):
+                    pass
+        except OSError:
+            pass
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+        with _jobs_lock:
+            _running_jobs.discard((session_path, combo_id))
+
+
+def schedule_multiplier_dashboard_regeneration(session_path: str, combo_id: str) -> bool:
+    """
+    Starts a background job that rebuilds the multiplier dashboard bundle,
+    unless one is already running for this session and combo (in any worker
+    process). Returns True if the bundle is being regenerated, False if
+    it cannot be (a job failed within REGENERATION_FAILURE_RETRY_SECONDS or
+    the lock cannot be created).
+    """
+    if multiplier_dashboard_regeneration_failed(session_path, combo_id):
+        return False
+    key = (session_path, combo_id)
+    lock_path = multiplier_dashboard_bundle_path(session_path, combo_id) + '.lock'
+    with _jobs_lock:
+        if key in _running_jobs:
+            return True
+        try:
+            if not _acquire_lock(lock_path):
+                return True
+        except OSError as e:
+            logger.error(f"Could not lock dashboard aggregate regeneration for {session_path}: {e}")
+            return False
+        _running_jobs.add(key)
+    threading.Thread(target=_run_regeneration, args=(session_path, combo_id, lock_path),
+                     name='dashboard-aggregates', daemon=True).start()
+    return True
@@ -0,0 +1,3 @@
+# web_app/analyzer/management/__init__.py
+#
+# Purpose: Marks the 'management' directory as a Python package.
@@ -0,0 +1,3 @@
+# web_app/analyzer/management/commands/__init__.py
+#
+# Purpose: Marks the 'commands' directory as a Python package.
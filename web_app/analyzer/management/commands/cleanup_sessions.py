@@ -0,0 +1,31 @@
+# web_app/analyzer/management/commands/cleanup_sessions.py
+#
+# Purpose: Runs one session janitor pass (expiry, disk quota, transient file
+#          cleanup) from the command line, for deployments that schedule
+#          cleanup with cron instead of the in-process janitor thread.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from django.core.management.base import BaseCommand
+
+from web_app.analyzer.session_registry import run_janitor_pass
+
+
+class Command(BaseCommand):
+    help = "Expires old analysis sessions and enforces the session disk quota."
+
+    def handle(self, *args, **options):
+        result = run_janitor_pass()
+        self.stdout.write(
+            f"Sessions: {result['synced']} registered from disk, "
+            f"{result['reclaimed']} stale in_progress marked failed, "
+            f"{result['expired']} expired, {result['evicted']} evicted for quota."
+        )
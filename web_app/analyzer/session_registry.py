@@ -0,0 +1,433 @@
+# web_app/analyzer/session_registry.py
+#
+# Purpose: Tracks analysis sessions in a small SQLite registry (id, creation
+#          time, state, size, last access) and expires them from a background
+#          janitor thread or the 'cleanup_sessions' management command, so
+#          request paths never scan the sessions tree. Sessions still being
+#          written ('in_progress') are never removed; one left in_progress by
+#          a worker that died is marked failed after a timeout and then
+#          expires like any other finished session.
+#
+# Copyright (c) 2025 Mark Bailey, KD4D
+# Contact: kd4d@kd4d.org
+#
+# License: Mozilla Public License, v. 2.0
+#          (https://www.mozilla.org/MPL/2.0/)
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import time
+import shutil
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FILENAME = 'session_registry.sqlite3'
+
+STATE_IN_PROGRESS = 'in_progress'
+STATE_READY = 'ready'
+STATE_FAILED = 'failed'
+# Claimed by a janitor; the directory is being removed.
+STATE_DELETING = 'deleting'
+
+# Last-access updates are written at most this often per session and process.
+TOUCH_INTERVAL_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id  TEXT PRIMARY KEY,
+    created     REAL NOT NULL,
+    last_access REAL NOT NULL,
+    state       TEXT NOT NULL,
+    size_bytes  INTEGER NOT NULL DEFAULT 0,
+    started_at  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_state_access ON sessions (state, last_access);
+"""
+
+
+def directory_size(path: str) -> int:
+    """Total size in bytes of the files under path."""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            try:
+                total += os.stat(os.path.join(root, file)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class SessionRegistry:
+    """
+    SQLite-backed index of the session directories under sessions_root.
+    Each call opens a short-lived connection, so one instance can be shared
+    by request threads, the janitor thread and other worker processes.
+    """
+    def __init__(self, sessions_root: str, db_path: str):
+        self.sessions_root = sessions_root
+        self.db_path = db_path
+        self._last_touch: Dict[str, float] = {}
+        self._touch_lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets request threads read while a janitor is writing
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            # Registries created before started_at existed
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if 'started_at' not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN started_at REAL")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection, commits on success (rolls back on error) and closes it."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Runs one write statement and returns the number of rows changed (0 on error)."""
+        try:
+            with self._connect() as conn:
+                return conn.execute(sql, params).rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Session registry update failed: {e}")
+            return 0
+
+    def register(self, session_id: str, state: str = STATE_IN_PROGRESS) -> None:
+        """Records a new session; call this before writing into its directory."""
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO sessions (session_id, created, last_access, state, size_bytes, started_at) "
+            "VALUES (?, ?, ?, ?, 0, ?)",
+            (session_id, now, now, state, now),
+        )
+
+    def set_state(self, session_id: str, state: str, measure_size: bool = False) -> None:
+        """Updates a session's state, optionally re-measuring its size on disk."""
+        if measure_size:
+            size = directory_size(os.path.join(self.sessions_root, session_id))
+            self._execute("UPDATE sessions SET state = ?, size_bytes = ?, last_access = ? WHERE session_id = ?",
+                          (state, size, time.time(), session_id))
+        else:
+            self._execute("UPDATE sessions SET state = ?, last_access = ? WHERE session_id = ?",
+                          (state, time.time(), session_id))
+
+    def mark_busy(self, session_id: str) -> Optional[str]:
+        """
+        Moves a finished session back to in_progress so the janitor leaves it
+        alone while a background job writes into it. Returns the state to
+        restore afterwards, or None if the session is unknown or already
+        in_progress (its current owner restores the state).
+        """
+        row = self.get(session_id)
+        if not row or row['state'] not in (STATE_READY, STATE_FAILED):
+            return None
+        now = time.time()
+        if self._execute(
+                "UPDATE sessions SET state = ?, last_access = ?, started_at = ? WHERE session_id = ? AND state = ?",
+                (STATE_IN_PROGRESS, now, now, session_id, row['state'])) != 1:
+            return None
+        return row['state']
+
+    def update_size(self, session_id: str) -> None:
+        """Re-measures a session's size on disk, e.g. after a file was added to a finished session."""
+        size = directory_size(os.path.join(self.sessions_root, session_id))
+        self._execute("UPDATE sessions SET size_bytes = ? WHERE session_id = ?", (size, session_id))
+
+    def touch(self, session_id: str) -> None:
+        """Records an access to a session. Writes are throttled to one per TOUCH_INTERVAL_SECONDS."""
+        now = time.time()
+        with self._touch_lock:
+            if now - self._last_touch.get(session_id, 0.0) < TOUCH_INTERVAL_SECONDS:
+                return
+            self._last_touch[session_id] = now
+        self._execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+
+    def get(self, session_id: str) -> Optional[Dict[str, object]]:
+        """Returns a session's registry row as a dict, or None."""
+        try:
+            with self._connect() as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Session registry lookup failed: {e}")
+            return None
+
+    def sync_from_disk(self) -> int:
+        """
+        Registers session directories the registry does not know about (e.g.
+        sessions created before the registry existed) as ready, using the
+        directory mtime as creation and last-access time. Returns the count.
+        """
+        if not os.path.isdir(self.sessions_root):
+            return 0
+        try:
+            with self._connect() as conn:
+                known = {row[0] for row in conn.execute("SELECT session_id FROM sessions")}
+        except sqlite3.Error as e:
+            logger.warning(f"Session registry sync failed: {e}")
+            return 0
+
+        added = 0
+        for item in os.listdir(self.sessions_root):
+            item_path = os.path.join(self.sessions_root, item)
+            if item in known or not os.path.isdir(item_path):
+                continue
+            try:
+                mtime = os.stat(item_path).st_mtime
+            except OSError:
+                continue
+            added += self._execute(
+                "INSERT OR IGNORE INTO sessions (session_id, created, last_access, state, size_bytes) VALUES (?, ?, ?, ?, ?)",
+                (item, mtime, mtime, STATE_READY, directory_size(item_path)),
+            )
+        return added
+
+    def _remove(self, session_id: str, expected_state: str) -> bool:
+        """
+        Claims a session for deletion (only if it is still in expected_state,
+        so concurrent janitors and a session moving back to in_progress are
+        safe), deletes its directory and its row.
+        """
+        if self._execute("UPDATE sessions SET state = ? WHERE session_id = ? AND state = ?",
+                         (STATE_DELETING, session_id, expected_state)) != 1:
+            return False
+        session_path = os.path.join(self.sessions_root, session_id)
+        try:
+            if os.path.exists(session_path):
+                shutil.rmtree(session_path)
+        except OSError as e:
+            # Windows/OneDrive file locks are common and non-critical; retry on the next pass
+            logger.debug(f"Could not cleanup session {session_id} (file may be locked): {e}")
+            self._execute("UPDATE sessions SET state = ? WHERE session_id = ?", (expected_state, session_id))
+            return False
+        self._execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        with self._touch_lock:
+            self._last_touch.pop(session_id, None)
+        logger.info(f"Cleaned up session: {session_id}")
+        return True
+
+    def reclaim_stale(self, max_in_progress_seconds: float) -> List[str]:
+        """
+        Marks sessions that have been in_progress for longer than
+        max_in_progress_seconds (their worker died) as failed, re-measuring
+        their size; returns their ids. last_access is left as is, so they
+        expire on the same schedule as other finished sessions.
+        """
+        if max_in_progress_seconds <= 0:
+            return []
+        cutoff = time.time() - max_in_progress_seconds
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT session_id FROM sessions WHERE state = ? AND COALESCE(started_at, created) < ?",
+                    (STATE_IN_PROGRESS, cutoff),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Session registry query failed: {e}")
+            return []
+
+        reclaimed = []
+        for (session_id,) in rows:
+            size = directory_size(os.path.join(self.sessions_root, session_id))
+            if self._execute(
+                    "UPDATE sessions SET state = ?, size_bytes = ? "
+                    "WHERE session_id = ? AND state = ? AND COALESCE(started_at, created) < ?",
+                    (STATE_FAILED, size, session_id, STATE_IN_PROGRESS, cutoff)) == 1:
+                reclaimed.append(session_id)
+        if reclaimed:
+            logger.warning(f"Session registry: marked {len(reclaimed)} stale in_progress session(s) as failed")
+        return reclaimed
+
+    def expire(self, max_age_seconds: float) -> List[str]:
+        """Removes finished sessions not accessed within max_age_seconds; returns their ids."""
+        cutoff = time.time() - max_age_seconds
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT session_id, state FROM sessions WHERE state IN (?, ?) AND last_access < ? ORDER BY last_access",
+                    (STATE_READY, STATE_FAILED, cutoff),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Session registry query failed: {e}")
+            return []
+        return [session_id for session_id, state in rows if self._remove(session_id, state)]
+
+    def enforce_quota(self, quota_bytes: int) -> List[str]:
+        """
+        Removes finished sessions, least recently accessed first, until their
+        total size is within quota_bytes; returns the removed ids.
+        """
+        if quota_bytes <= 0:
+            return []
+        try:
+            with self._connect() as conn:
+                total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM sessions").fetchone()[0]
+                if total <= quota_bytes:
+                    return []
+                rows = conn.execute(
+                    "SELECT session_id, state, size_bytes FROM sessions WHERE state IN (?, ?) ORDER BY last_access",
+                    (STATE_READY, STATE_FAILED),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Session registry query failed: {e}")
+            return []
+
+        removed = []
+        for session_id, state, size in rows:
+            if total <= quota_bytes:
+                break
+            if self._remove(session_id, state):
+                total -= size
+                removed.append(session_id)
+        if removed:
+            logger.info(f"Session quota: evicted {len(removed)} least recently used session(s)")
+        return removed
+
+
+def _cleanup_progress_files(progress_root: str, max_age_seconds: float) -> None:
+    """Deletes transient progress files older than max_age_seconds."""
+    if not os.path.exists(progress_root):
+        return
+    cutoff = time.time() - max_age_seconds
+    for item in os.listdir(progress_root):
+        item_path = os.path.join(progress_root, item)
+        try:
+            if os.stat(item_path).st_mtime < cutoff:
+                os.remove(item_path)
+        except OSError as e:
+            # Windows/OneDrive file locks are common and non-critical
+            logger.debug(f"Could not cleanup progress file {item} (file may be locked by OneDrive/sync): {e}")
+
+
+def _cleanup_partial_archives(sessions_root: str, max_age_seconds: float = 900) -> None:
+    """Deletes .part files left by interrupted archive downloads."""
+    if not os.path.isdir(sessions_root):
+        return
+    cutoff = time.time() - max_age_seconds
+    for item in os.listdir(sessions_root):
+        item_path = os.path.join(sessions_root, item)
+        try:
+            for name in os.listdir(item_path):
+                if name.startswith('archive_') and name.endswith('.part'):
+                    part_path = os.path.join(item_path, name)
+                    if os.stat(part_path).st_mtime < cutoff:
+                        os.remove(part_path)
+        except OSError:
+            continue
+
+
+_registry: Optional[SessionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> SessionRegistry:
+    """Returns the process-wide registry for MEDIA_ROOT/sessions."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            media_root = str(settings.MEDIA_ROOT)
+            _registry = SessionRegistry(os.path.join(media_root, 'sessions'),
+                                        os.path.join(media_root, REGISTRY_FILENAME))
+        return _registry
+
+
+@contextmanager
+def session_lifecycle(session_id: str) -> Iterator[None]:
+    """
+    Registers a new session as in_progress for the duration of the block.
+    On exit the session is marked ready if its dashboard context was written
+    and failed otherwise (errors and validation rejections), and its size is
+    recorded for the quota.
+    """
+    registry = get_registry()
+    registry.register(session_id)
+    try:
+        yield
+    finally:
+        context_path = os.path.join(registry.sessions_root, session_id, 'dashboard_context.json')
+        state = STATE_READY if os.path.exists(context_path) else STATE_FAILED
+        registry.set_state(session_id, state, measure_size=True)
+
+
+@contextmanager
+def session_busy(session_id: str) -> Iterator[None]:
+    """
+    Keeps an existing session from being expired or evicted while a
+    background job writes into it; its previous state and a fresh size are
+    recorded on exit.
+    """
+    registry = get_registry()
+    previous_state = registry.mark_busy(session_id)
+    try:
+        yield
+    finally:
+        if previous_state:
+            registry.set_state(session_id, previous_state, measure_size=True)
+
+
+def record_session_size(session_id: str) -> None:
+    """Re-measures a session's size for the quota after a file was written into it."""
+    get_registry().update_size(session_id)
+
+
+def touch_session(session_id: str) -> None:
+    """Records an access to a session, keeping it from expiring."""
+    get_registry().touch(session_id)
+
+
+def run_janitor_pass() -> Dict[str, int]:
+    """
+    One cleanup pass: sync unknown directories, reclaim stale in_progress
+    sessions, expire, enforce the quota, tidy transient files.
+    """
+    registry = get_registry()
+    max_age = settings.SESSION_MAX_AGE_SECONDS
+    synced = registry.sync_from_disk()
+    reclaimed = registry.reclaim_stale(settings.SESSION_STALE_IN_PROGRESS_SECONDS)
+    expired = registry.expire(max_age)
+    evicted = registry.enforce_quota(settings.SESSION_DISK_QUOTA_MB * 1024 * 1024)
+    _cleanup_progress_files(os.path.join(str(settings.MEDIA_ROOT), 'progress'), max_age)
+    _cleanup_partial_archives(registry.sessions_root)
+    return {'synced': synced, 'reclaimed': len(reclaimed), 'expired': len(expired), 'evicted': len(evicted)}
+
+
+_janitor_thread: Optional[threading.Thread] = None
+
+
+def _janitor_loop(interval: float) -> None:
+    while True:
+        try:
+            run_janitor_pass()
+        except Exception as e:
+            logger.warning(f"Session janitor pass failed: {e}")
+        time.sleep(interval)
+
+
+def ensure_janitor_started() -> None:
+    """Starts the background janitor thread for this process if it is not running."""
+    global _janitor_thread
+    interval = settings.SESSION_JANITOR_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    with _registry_lock:
+        if _janitor_thread is not None and _janitor_thread.is_alive():
+            return
+        _janitor_thread = threading.Thread(target=_janitor_loop, args=(interval,),
+                                           name='session-janitor', daemon=True)
+        _janitor_thread.start()
@@ -41,6 +41,7 @@
 # - Initial creation.
 # - Defined routes for 'home' and 'analyze'.
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -55,6 +56,8 @@ urlpatterns = [
     path('report/<str:session_id>/dashboard/multipliers/', views.multiplier_dashboard, name='multiplier_dashboard'),
     path('report/<str:session_id>/download_all/', views.download_all_reports, name='download_all_reports'),
     path('report/<str:session_id>/<path:file_path>', views.view_report, name='view_report'),
+    # Raw session artifacts; takes precedence over the generic MEDIA_URL static route
+    path(f"{settings.MEDIA_URL.lstrip('/')}sessions/<str:session_id>/<path:file_path>", views.serve_session_file, name='serve_session_file'),
     path('help/about/', views.help_about, name='help_about'),
     path('help/dashboard/', views.help_dashboard, name='help_dashboard'),
     path('help/reports/', views.help_reports, name='help_reports'),
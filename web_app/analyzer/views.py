@@ -207,89 +207,45 @@
 # - Initial creation for Phase 3.
 
 import os
-import shutil
 import logging
 import uuid
 import re
 import json
 import time
 import itertools
-import zipfile
+import mimetypes
 from typing import Dict, List, Optional, Any
 from django.shortcuts import render, redirect, reverse
-from django.http import Http404, JsonResponse, FileResponse
+from django.http import Http404, JsonResponse, FileResponse, HttpResponse, StreamingHttpResponse
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
 from django.conf import settings
 from .forms import UploadLogForm
+from .session_registry import ensure_janitor_started, record_session_size, session_lifecycle, touch_session
+from .dashboard_jobs import schedule_multiplier_dashboard_regeneration
 
 # Import Core Logic
 from contest_tools.log_manager import LogManager
 from contest_tools.data_aggregators.time_series import TimeSeriesAggregator
-from contest_tools.data_aggregators.multiplier_stats import MultiplierStatsAggregator
 from contest_tools.report_generator import ReportGenerator
 from contest_tools.core_annotations import CtyLookup
-from contest_tools.utils.report_utils import _sanitize_filename_part, get_standard_title_lines, get_cty_metadata
-from contest_tools.utils.multiplier_dashboard_utils import build_multiplier_breakdown_chart_context
+from contest_tools.utils.report_utils import _sanitize_filename_part
+from contest_tools.utils.multiplier_dashboard_utils import split_breakdown_dimension_blocks
+from contest_tools.utils.dashboard_aggregates import (
+    build_multiplier_dashboard_bundle, load_multiplier_dashboard_bundle, write_multiplier_dashboard_bundle
+)
 from contest_tools.version import __version__
 from contest_tools.utils.callsign_utils import build_callsigns_filename_part, parse_callsigns_from_filename_part, callsign_to_filename_part
 from contest_tools.utils.log_fetcher import fetch_log_index, download_logs
-from contest_tools.manifest_manager import ManifestManager
-from contest_tools.utils.profiler import ProfileContext
+from contest_tools.manifest_manager import ManifestManager, get_artifact_index
+from contest_tools.utils.profiler import ProfileContext, profiling_session
+from contest_tools.utils.zip_stream import archive_key, stream_zip, write_zip
+from contest_tools.utils.precompress import ENCODING_SUFFIXES, is_precompressed_sibling
 from contest_tools.utils.architecture_validator import ArchitectureValidator
 from contest_tools.contest_definitions import ContestDefinition
 
 logger = logging.getLogger(__name__)
 
-def _cleanup_old_sessions(max_age_seconds=3600):
-    """Lazy cleanup: Deletes session directories older than 1 hour."""
-    sessions_root = os.path.join(settings.MEDIA_ROOT, 'sessions')
-    if not os.path.exists(sessions_root):
-        return
-
-    now = time.time()
-    
-    # Cleanup progress files too
-    progress_root = os.path.join(settings.MEDIA_ROOT, 'progress')
-    if os.path.exists(progress_root):
-        for item in os.listdir(progress_root):
-            item_path = os.path.join(progress_root, item)
-            try:
-                if os.stat(item_path).st_mtime < (now - max_age_seconds):
-                    os.remove(item_path)
-            except Exception as e:
-                # Windows/OneDrive file locks are common and non-critical
-                if isinstance(e, PermissionError) or (isinstance(e, OSError) and e.winerror == 5):
-                    logger.debug(f"Could not cleanup progress file {item} (file may be locked by OneDrive/sync): {e}")
-                else:
-                    logger.warning(f"Failed to cleanup progress file {item}: {e}")
-
-    for item in os.listdir(sessions_root):
-        item_path = os.path.join(sessions_root, item)
-        if os.path.isdir(item_path):
-            try:
-                # Cleanup old archive_temp.zip files (15 minutes) within active sessions
-                zip_path = os.path.join(item_path, 'archive_temp.zip')
-                if os.path.exists(zip_path):
-                    zip_age = now - os.stat(zip_path).st_mtime
-                    if zip_age > 900:  # 15 minutes
-                        os.remove(zip_path)
-                        logger.info(f"Cleaned up old archive_temp.zip in session {item}")
-                
-                # Cleanup entire session if older than max_age_seconds
-                if os.stat(item_path).st_mtime < (now - max_age_seconds):
-                    shutil.rmtree(item_path)
-                    logger.info(f"Cleaned up old session: {item}")
-            except PermissionError as e:
-                # Windows/OneDrive file locks are common and non-critical - log at debug level
-                logger.debug(f"Could not cleanup session {item} (file may be locked by OneDrive/sync): {e}")
-            except OSError as e:
-                # Check for Windows access denied (WinError 5)
-                if hasattr(e, 'winerror') and e.winerror == 5:
-                    logger.debug(f"Could not cleanup session {item} (access denied - file may be locked by OneDrive/sync): {e}")
-                else:
-                    logger.warning(f"Failed to cleanup session {item}: {e}")
-            except Exception as e:
-                logger.warning(f"Failed to cleanup session {item}: {e}")
-
 def _update_progress(request_id, step, message=None, file_count=None, download_url=None):
     """Writes the current progress step to a transient JSON file.
     
@@ -691,12 +647,13 @@ def get_wrtc_contests_view(request):
 
 
 def home(request):
+    ensure_janitor_started()
     form = UploadLogForm()
     return render(request, 'analyzer/home.html', {'form': form})
 
 def analyze_logs(request):
     if request.method == 'POST':
-        _cleanup_old_sessions() # Trigger lazy cleanup
+        ensure_janitor_started()
         
         # Retrieve the request_id from the form to track progress
         request_id = request.POST.get('request_id')
@@ -765,59 +722,60 @@ def analyze_logs(request):
                 # 1. Create Session Context
                 session_key = str(uuid.uuid4())
                 session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_key)
-                os.makedirs(session_path, exist_ok=True)
-
-                try:
-                    # 2. Save Uploads
-                    log_paths = []
-                    # Ensure data directory exists for CTY lookups if not mapped (Docker handles this though)
-                    files = [request.FILES.get('log1'), request.FILES.get('log2'), request.FILES.get('log3')]
-                    files = [f for f in files if f] # Filter None
-
-                    for f in files:
-                        file_path = os.path.join(session_path, f.name)
-                        with open(file_path, 'wb+') as destination:
-                            for chunk in f.chunks():
-                                destination.write(chunk)
-                        log_paths.append(file_path)
+                with session_lifecycle(session_key):
+                    os.makedirs(session_path, exist_ok=True)
 
-                    # 3. Handle Custom CTY File (if uploaded)
-                    custom_cty_path = None
-                    cty_file_choice = form.cleaned_data.get('cty_file_choice', 'default')
-                    if cty_file_choice == 'upload' and 'custom_cty_file' in request.FILES:
-                        cty_file = request.FILES['custom_cty_file']
-                        custom_cty_path = os.path.join(session_path, cty_file.name)
-                        with open(custom_cty_path, 'wb+') as destination:
-                            for chunk in cty_file.chunks():
-                                destination.write(chunk)
-                        logger.info(f"Custom CTY file uploaded: {cty_file.name}")
-
-                    # 4. Handle contest override (for WRTC rules on IARU logs)
-                    contest_override = request.POST.get('contest_override')
-                    if contest_override:
-                        _apply_contest_override(log_paths, contest_override)
-
-                    # 5. Pre-flight validation for ARRL DX (if multiple logs)
-                    if len(log_paths) > 1:
-                        root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
-                        validation_result = _validate_arrl_dx_location_types(
-                            log_paths, root_input, custom_cty_path, cty_specifier='after'
-                        )
-                        if not validation_result['valid']:
-                            logger.warning(f"ARRL DX location type validation failed: {validation_result['error_message']}")
-                            return render(request, 'analyzer/home.html', {
-                                'form': form, 
-                                'error': validation_result['error_message']
-                            })
-
-                    return _run_analysis_pipeline(request_id, log_paths, session_path, session_key, custom_cty_path=custom_cty_path)
-                except ValueError as e:
-                    logger.warning(f"Validation error during manual upload: {e}")
-                    return render(request, 'analyzer/home.html', {'form': form, 'error': str(e)})
+                    try:
+                        # 2. Save Uploads
+                        log_paths = []
+                        # Ensure data directory exists for CTY lookups if not mapped (Docker handles this though)
+                        files = [request.FILES.get('log1'), request.FILES.get('log2'), request.FILES.get('log3')]
+                        files = [f for f in files if f] # Filter None
+
+                        for f in files:
+                            file_path = os.path.join(session_path, f.name)
+                            with open(file_path, 'wb+') as destination:
+                                for chunk in f.chunks():
+                                    destination.write(chunk)
+                            log_paths.append(file_path)
+
+                        # 3. Handle Custom CTY File (if uploaded)
+                        custom_cty_path = None
+                        cty_file_choice = form.cleaned_data.get('cty_file_choice', 'default')
+                        if cty_file_choice == 'upload' and 'custom_cty_file' in request.FILES:
+                            cty_file = request.FILES['custom_cty_file']
+                            custom_cty_path = os.path.join(session_path, cty_file.name)
+                            with open(custom_cty_path, 'wb+') as destination:
+                                for chunk in cty_file.chunks():
+                                    destination.write(chunk)
+                            logger.info(f"Custom CTY file uploaded: {cty_file.name}")
+
+                        # 4. Handle contest override (for WRTC rules on IARU logs)
+                        contest_override = request.POST.get('contest_override')
+                        if contest_override:
+                            _apply_contest_override(log_paths, contest_override)
+
+                        # 5. Pre-flight validation for ARRL DX (if multiple logs)
+                        if len(log_paths) > 1:
+                            root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
+                            validation_result = _validate_arrl_dx_location_types(
+                                log_paths, root_input, custom_cty_path, cty_specifier='after'
+                            )
+                            if not validation_result['valid']:
+                                logger.warning(f"ARRL DX location type validation failed: {validation_result['error_message']}")
+                                return render(request, 'analyzer/home.html', {
+                                    'form': form, 
+                                    'error': validation_result['error_message']
+                                })
+
+                        return _run_analysis_pipeline(request_id, log_paths, session_path, session_key, custom_cty_path=custom_cty_path)
+                    except ValueError as e:
+                        logger.warning(f"Validation error during manual upload: {e}")
+                        return render(request, 'analyzer/home.html', {'form': form, 'error': str(e)})
         
-                except Exception as e:
-                    logger.exception("Log analysis failed")
-                    return render(request, 'analyzer/home.html', {'form': form, 'error': str(e)})
+                    except Exception as e:
+                        logger.exception("Log analysis failed")
+                        return render(request, 'analyzer/home.html', {'form': form, 'error': str(e)})
             else:
                 # Form validation failed - render form with errors
                 # Build detailed error message from form errors
@@ -837,93 +795,94 @@ def analyze_logs(request):
                 # 1. Create Session Context
                 session_key = str(uuid.uuid4())
                 session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_key)
-                os.makedirs(session_path, exist_ok=True)
-
-                # 2. Handle Custom CTY File (if uploaded)
-                custom_cty_path = None
-                cty_file_choice = request.POST.get('fetch_cty_file_choice', 'default')
-                if cty_file_choice == 'upload' and 'fetch_custom_cty_file' in request.FILES:
-                    cty_file = request.FILES['fetch_custom_cty_file']
-                    custom_cty_path = os.path.join(session_path, cty_file.name)
-                    with open(custom_cty_path, 'wb+') as destination:
-                        for chunk in cty_file.chunks():
-                            destination.write(chunk)
-                    logger.info(f"Custom CTY file uploaded via public archive: {cty_file.name}")
-
-                # 3. Fetch Logs
-                callsigns_raw = request.POST.get('fetch_callsigns') # JSON string
-                year = request.POST.get('fetch_year')
-                mode = request.POST.get('fetch_mode')  # May be empty for ARRL-10
-                contest = request.POST.get('fetch_contest', 'CQ-WW')  # Default to CQ-WW for backward compatibility
+                with session_lifecycle(session_key):
+                    os.makedirs(session_path, exist_ok=True)
+
+                    # 2. Handle Custom CTY File (if uploaded)
+                    custom_cty_path = None
+                    cty_file_choice = request.POST.get('fetch_cty_file_choice', 'default')
+                    if cty_file_choice == 'upload' and 'fetch_custom_cty_file' in request.FILES:
+                        cty_file = request.FILES['fetch_custom_cty_file']
+                        custom_cty_path = os.path.join(session_path, cty_file.name)
+                        with open(custom_cty_path, 'wb+') as destination:
+                            for chunk in cty_file.chunks():
+                                destination.write(chunk)
+                        logger.info(f"Custom CTY file uploaded via public archive: {cty_file.name}")
+
+                    # 3. Fetch Logs
+                    callsigns_raw = request.POST.get('fetch_callsigns') # JSON string
+                    year = request.POST.get('fetch_year')
+                    mode = request.POST.get('fetch_mode')  # May be empty for ARRL-10
+                    contest = request.POST.get('fetch_contest', 'CQ-WW')  # Default to CQ-WW for backward compatibility
                 
-                callsigns = json.loads(callsigns_raw)
+                    callsigns = json.loads(callsigns_raw)
                 
-                _update_progress(request_id, 1) # Step 1: Fetching
+                    _update_progress(request_id, 1) # Step 1: Fetching
                 
-                # Route to appropriate download function based on contest
-                if contest == 'CQ-WW' and mode:
-                    log_paths = download_logs(callsigns, year, mode, session_path)
-                elif contest in ('CQ-160-CW', 'CQ-160-SSB'):
-                    from contest_tools.utils.log_fetcher import download_cq160_logs
-                    mode = 'CW' if contest == 'CQ-160-CW' else 'SSB'
-                    log_paths = download_cq160_logs(callsigns, year, mode, session_path)
-                elif contest == 'CQ-WPX' and mode:
-                    from contest_tools.utils.log_fetcher import download_cqwpx_logs
-                    log_paths = download_cqwpx_logs(callsigns, year, mode, session_path)
-                elif contest == 'ARRL-10':
-                    from contest_tools.utils.log_fetcher import download_arrl_logs, ARRL_CONTEST_CODES
-                    contest_code = ARRL_CONTEST_CODES.get('ARRL-10')
-                    if contest_code:
-                        log_paths = download_arrl_logs(callsigns, year, contest_code, session_path)
-                    else:
-                        raise ValueError('ARRL-10 contest code not found')
-                elif contest in ['ARRL-DX-CW', 'ARRL-DX-SSB']:
-                    from contest_tools.utils.log_fetcher import download_arrl_logs, ARRL_CONTEST_CODES
-                    contest_code = ARRL_CONTEST_CODES.get(contest)
-                    if contest_code:
-                        log_paths = download_arrl_logs(callsigns, year, contest_code, session_path, contest_name=contest)
-                    else:
-                        raise ValueError(f'{contest} contest code not found')
-                elif contest in ['ARRL-SS-CW', 'ARRL-SS-PH']:
-                    from contest_tools.utils.log_fetcher import download_arrl_logs, ARRL_CONTEST_CODES
-                    contest_code = ARRL_CONTEST_CODES.get(contest)
-                    if contest_code:
-                        log_paths = download_arrl_logs(callsigns, year, contest_code, session_path)
+                    # Route to appropriate download function based on contest
+                    if contest == 'CQ-WW' and mode:
+                        log_paths = download_logs(callsigns, year, mode, session_path)
+                    elif contest in ('CQ-160-CW', 'CQ-160-SSB'):
+                        from contest_tools.utils.log_fetcher import download_cq160_logs
+                        mode = 'CW' if contest == 'CQ-160-CW' else 'SSB'
+                        log_paths = download_cq160_logs(callsigns, year, mode, session_path)
+                    elif contest == 'CQ-WPX' and mode:
+                        from contest_tools.utils.log_fetcher import download_cqwpx_logs
+                        log_paths = download_cqwpx_logs(callsigns, year, mode, session_path)
+                    elif contest == 'ARRL-10':
+                        from contest_tools.utils.log_fetcher import download_arrl_logs, ARRL_CONTEST_CODES
+                        contest_code = ARRL_CONTEST_CODES.get('ARRL-10')
+                        if contest_code:
+                            log_paths = download_arrl_logs(callsigns, year, contest_code, session_path)
+                        else:
+                            raise ValueError('ARRL-10 contest code not found')
+                    elif contest in ['ARRL-DX-CW', 'ARRL-DX-SSB']:
+                        from contest_tools.utils.log_fetcher import download_arrl_logs, ARRL_CONTEST_CODES
+                        contest_code = ARRL_CONTEST_CODES.get(contest)
+                        if contest_code:
+                            log_paths = download_arrl_logs(callsigns, year, contest_code, session_path, contest_name=contest)
+                        else:
+                            raise ValueError(f'{contest} contest code not found')
+                    elif contest in ['ARRL-SS-CW', 'ARRL-SS-PH']:
+                        from contest_tools.utils.log_fetcher import download_arrl_logs, ARRL_CONTEST_CODES
+                        contest_code = ARRL_CONTEST_CODES.get(contest)
+                        if contest_code:
+                            log_paths = download_arrl_logs(callsigns, year, contest_code, session_path)
+                        else:
+                            raise ValueError(f'{contest} contest code not found')
+                    elif contest == 'IARU-HF':
+                        from contest_tools.utils.log_fetcher import download_iaru_logs
+                        log_paths = download_iaru_logs(callsigns, year, session_path)
+                    elif contest.startswith('WRTC'):
+                        # All WRTC contests use IARU archive (same as IARU-HF)
+                        from contest_tools.utils.log_fetcher import download_iaru_logs
+                        log_paths = download_iaru_logs(callsigns, year, session_path)
                     else:
-                        raise ValueError(f'{contest} contest code not found')
-                elif contest == 'IARU-HF':
-                    from contest_tools.utils.log_fetcher import download_iaru_logs
-                    log_paths = download_iaru_logs(callsigns, year, session_path)
-                elif contest.startswith('WRTC'):
-                    # All WRTC contests use IARU archive (same as IARU-HF)
-                    from contest_tools.utils.log_fetcher import download_iaru_logs
-                    log_paths = download_iaru_logs(callsigns, year, session_path)
-                else:
-                    raise ValueError(f'Unsupported contest: {contest}')
+                        raise ValueError(f'Unsupported contest: {contest}')
                 
-                # Handle contest override (for WRTC rules on IARU logs from public archive)
-                contest_override = request.POST.get('contest_override')
-                if contest_override:
-                    _apply_contest_override(log_paths, contest_override)
-
-                # Pre-flight validation for ARRL DX (if multiple logs)
-                if len(log_paths) > 1:
-                    root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
-                    validation_result = _validate_arrl_dx_location_types(
-                        log_paths, root_input, custom_cty_path, cty_specifier='after'
-                    )
-                    if not validation_result['valid']:
-                        logger.warning(f"ARRL DX location type validation failed: {validation_result['error_message']}")
-                        return render(request, 'analyzer/home.html', {
-                            'form': UploadLogForm(), 
-                            'error': validation_result['error_message']
-                        })
+                    # Handle contest override (for WRTC rules on IARU logs from public archive)
+                    contest_override = request.POST.get('contest_override')
+                    if contest_override:
+                        _apply_contest_override(log_paths, contest_override)
+
+                    # Pre-flight validation for ARRL DX (if multiple logs)
+                    if len(log_paths) > 1:
+                        root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
+                        validation_result = _validate_arrl_dx_location_types(
+                            log_paths, root_input, custom_cty_path, cty_specifier='after'
+                        )
+                        if not validation_result['valid']:
+                            logger.warning(f"ARRL DX location type validation failed: {validation_result['error_message']}")
+                            return render(request, 'analyzer/home.html', {
+                                'form': UploadLogForm(), 
+                                'error': validation_result['error_message']
+                            })
                 
-                # Handle contest override (for WRTC rules on IARU logs from public archive)
-                if contest_override:
-                    _apply_contest_override(log_paths, contest_override)
+                    # Handle contest override (for WRTC rules on IARU logs from public archive)
+                    if contest_override:
+                        _apply_contest_override(log_paths, contest_override)
                 
-                return _run_analysis_pipeline(request_id, log_paths, session_path, session_key, custom_cty_path=custom_cty_path)
+                    return _run_analysis_pipeline(request_id, log_paths, session_path, session_key, custom_cty_path=custom_cty_path)
             
             except ValueError as e:
                 logger.warning(f"Validation error during public log fetch: {e}")
@@ -938,7 +897,8 @@ def analyze_logs(request):
 
 def _run_analysis_pipeline(request_id, log_paths, session_path, session_key, custom_cty_path=None):
     """Shared logic for processing logs (Manual or Fetched)."""
-    with ProfileContext("Web Analysis Pipeline (Total)"):
+    with profiling_session(f"Web Analysis Pipeline - {session_key}") as profiler, \
+            ProfileContext("Web Analysis Pipeline (Total)", 'session'):
         # 3. Process with LogManager
         # Note: We rely on docker-compose env vars for CONTEST_INPUT_DIR
         root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
@@ -1001,6 +961,10 @@ def _run_analysis_pipeline(request_id, log_paths, session_path, session_key, cus
         with ProfileContext("Web - Dashboard Aggregation"):
             ts_agg = TimeSeriesAggregator(lm.logs)
             ts_data = ts_agg.get_time_series_data()
+
+    # Stored next to session_manifest.json so a slow session can be diagnosed after the fact
+    if profiler is not None:
+        profiler.save(generator.base_output_dir)
     
     # Extract basic scalars for dashboard
     # Construct relative path components for the template
@@ -1111,11 +1075,34 @@ def _run_analysis_pipeline(request_id, log_paths, session_path, session_key, cus
     with open(context_path, 'w') as f:
         json.dump(context, f)
 
+    # --- Dashboard Aggregates ---
+    # Everything the multiplier dashboard displays, precomputed once so the view
+    # never re-parses logs. A failure here only means the view rebuilds it later.
+    try:
+        is_mode_dimension = len(valid_bands) == 1 and len(valid_modes) > 1
+        calls = sorted([l['callsign'] for l in context['logs']])
+        bundle = build_multiplier_dashboard_bundle(
+            lm.logs,
+            contest_name=contest_name.replace('_', '-').upper(),
+            location_type=location_type,
+            report_metadata={
+                'context_line': f"{full_contest_title} - {', '.join(calls)}",
+                'scope_line': "All Modes" if is_mode_dimension else "All Bands",
+                'footer': footer_text,
+            },
+            manifest_dir=generator.base_output_dir,
+            root_input_dir=root_input,
+        )
+        write_multiplier_dashboard_bundle(session_path, bundle)
+    except Exception as e:
+        logger.error(f"Failed to build dashboard aggregates: {e}", exc_info=True)
+
     _update_progress(request_id, 5) # Step 5: Finalizing/Ready
     return redirect('dashboard_view', session_id=session_key)
 
 def dashboard_view(request, session_id):
     """Persisted view of the main dashboard, loaded from session JSON."""
+    touch_session(session_id)
     session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id)
     context_path = os.path.join(session_path, 'dashboard_context.json')
 
@@ -1143,19 +1130,14 @@ def dashboard_view(request, session_id):
     
     # Load score report data for dashboard display
     # 1. Discover Manifest (Deep Search)
-    manifest_dir = None
-    for root, dirs, files in os.walk(session_path):
-        if 'session_manifest.json' in files:
-            manifest_dir = root
-            break
+    manifest_dir = ManifestManager.locate(session_path)
     
     score_reports_data = []
     score_report_text_urls = {}
     
     if manifest_dir:
         # 2. Load Manifest & Artifacts
-        manifest_mgr = ManifestManager(manifest_dir)
-        artifacts = manifest_mgr.load()
+        index = get_artifact_index(manifest_dir)
         report_rel_path = os.path.relpath(manifest_dir, session_path).replace("\\", "/")
         
         # 3. Get callsigns from context
@@ -1166,11 +1148,8 @@ def dashboard_view(request, session_id):
         for callsign in callsigns:
             callsign_safe = callsign_to_filename_part(callsign)
             
-            # Find JSON artifact
-            json_filename = f"json_score_report_dashboard_{callsign_safe}.json"
-            json_art = next((a for a in artifacts 
-                            if a['report_id'] == 'json_score_report_dashboard' 
-                            and a['path'].endswith(json_filename)), None)
+            # Find JSON artifact (json_score_report_dashboard_{callsign}.json)
+            json_art = index.find_first('json_score_report_dashboard', [callsign_safe], 'json')
             
             if json_art:
                 try:
@@ -1181,11 +1160,8 @@ def dashboard_view(request, session_id):
                 except Exception as e:
                     logger.error(f"Failed to load JSON score report for {callsign}: {e}")
             
-            # Find text report artifact for score summary link
-            text_filename = f"score_report_{callsign_safe}.txt"
-            text_art = next((a for a in artifacts 
-                           if a['report_id'] == 'score_report' 
-                           and a['path'].endswith(text_filename)), None)
+            # Find text report artifact for score summary link (score_report_{callsign}.txt)
+            text_art = index.find_first('score_report', [callsign_safe], 'txt')
             
             if text_art:
                 # Build URL for view_report with chromeless=1
@@ -1197,11 +1173,8 @@ def dashboard_view(request, session_id):
         for callsign in callsigns:
             callsign_safe = callsign_to_filename_part(callsign)
             
-            # Find breakdown report artifact
-            breakdown_filename = f"breakdown_report_{callsign_safe}.txt"
-            breakdown_art = next((a for a in artifacts 
-                                if a['report_id'] == 'breakdown_report' 
-                                and a['path'].endswith(breakdown_filename)), None)
+            # Find breakdown report artifact (breakdown_report_{callsign}.txt)
+            breakdown_art = index.find_first('breakdown_report', [callsign_safe], 'txt')
             
             if breakdown_art:
                 # Build URL for view_report with chromeless=1
@@ -1337,16 +1310,18 @@ def _build_report_manifest_tree(session_id, session_path):
     Returns a list of nodes: { 'label': str, 'children': [ { 'label': str, 'href': str, 'title': str } | ... ] }.
     Used by the report drawer (persistent drawer / off-canvas sidebar).
     """
-    manifest_dir = None
-    for root, dirs, files in os.walk(session_path):
-        if 'session_manifest.json' in files:
-            manifest_dir = root
-            break
+    manifest_dir = ManifestManager.locate(session_path)
     if not manifest_dir:
         return []
 
-    manifest_mgr = ManifestManager(manifest_dir)
-    artifacts = manifest_mgr.load()
+    index = get_artifact_index(manifest_dir)
+    # Artifacts never change after generation, so the tree (including its
+    # file-existence checks) is built once per manifest and session.
+    memo_key = f"report_manifest_tree:{session_id}"
+    if memo_key in index.memo:
+        return index.memo[memo_key]
+
+    artifacts = index.artifacts
     report_rel_path = os.path.relpath(manifest_dir, session_path).replace("\\", "/")
 
     excluded = {'dashboard_context.json', 'session_manifest.json', 'archive_temp.zip'}
@@ -1397,15 +1372,132 @@ def _build_report_manifest_tree(session_id, session_path):
         'label': 'Bulk Actions',
         'children': [{'label': 'Download All (.zip)', 'href': '#', 'title': 'Download all reports as ZIP', 'data_action': 'download'}]
     })
+    index.memo[memo_key] = tree
     return tree
 
 
+# Session artifacts are write-once, so clients may cache them for as long as they like.
+_ARTIFACT_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parses an Accept-Encoding header into {coding: q-value}."""
+    codings = {}
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[token] = q
+    return codings
+
+
+def _negotiate_encoding(request, abs_path: str, available: List[str]) -> Optional[str]:
+    """Picks the preferred precompressed sibling the client accepts, or None for identity."""
+    accepted = _parse_accept_encoding(request.headers.get('Accept-Encoding', ''))
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q and os.path.exists(abs_path + ENCODING_SUFFIXES[encoding]):
+            best, best_q = encoding, q
+    return best
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag, as RFC 9110 requires for GET."""
+    if if_none_match.strip() == '*':
+        return True
+    bare = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith('W/') else candidate) == bare:
+            return True
+    return False
+
+
+def _serve_session_artifact(request, session_path: str, file_path: str, content_type: Optional[str] = None):
+    """
+    Serves a file from a session with validators and compression.
+
+    - ETag: the artifact's manifest content hash (size and mtime for files
+      outside the manifest, such as the shared plotly.js bundle), with the
+      content coding appended, since each representation needs its own tag.
+    - If-None-Match is answered with 304 Not Modified.
+    - A gzip/brotli sibling written at registration time is served when the
+      client's Accept-Encoding allows it.
+    """
+    try:
+        abs_path = safe_join(session_path, file_path)
+    except SuspiciousFileOperation:
+        raise Http404("Report not found")
+    if not os.path.isfile(abs_path):
+        raise Http404("Report not found")
+
+    artifact = None
+    manifest_dir = ManifestManager.locate(session_path)
+    if manifest_dir:
+        rel_path = os.path.relpath(abs_path, manifest_dir)
+        if not rel_path.startswith('..'):
+            artifact = get_artifact_index(manifest_dir).get_by_path(rel_path)
+
+    if artifact and artifact.get('sha256'):
+        tag = artifact['sha256']
+        available = artifact.get('encodings', [])
+    else:
+        stat = os.stat(abs_path)
+        tag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        available = [e for e, suffix in ENCODING_SUFFIXES.items() if os.path.exists(abs_path + suffix)]
+
+    encoding = _negotiate_encoding(request, abs_path, available) if available else None
+    etag = f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+    if content_type is None:
+        content_type = mimetypes.guess_type(abs_path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/json', 'application/javascript'):
+            content_type += '; charset=utf-8'
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and _etag_matches(if_none_match, etag):
+        response = HttpResponse(status=304)
+    else:
+        serve_path = abs_path + ENCODING_SUFFIXES[encoding] if encoding else abs_path
+        response = FileResponse(open(serve_path, 'rb'), content_type=content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Cache-Control'] = _ARTIFACT_CACHE_CONTROL
+    if available:
+        response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def serve_session_file(request, session_id, file_path):
+    """
+    Serves raw session files under MEDIA_URL/sessions/ (report HTML/JSON loaded
+    by dashboards and the report viewer iframe) with ETags and precompressed
+    content. Other media falls through to Django's static serving.
+    """
+    touch_session(session_id)
+    session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id)
+    return _serve_session_artifact(request, session_path, file_path)
+
+
 def view_report(request, session_id, file_path):
     """
     Wraps a generated report file in the application shell (header/footer).
     Supports 'chromeless' mode for iframe embedding and context-aware 'Back' links.
     Also supports 'format=text' to return raw text content for AJAX fetching.
     """
+    touch_session(session_id)
 
     # Security Check: Verify file exists within the session
     abs_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id, file_path)
@@ -1421,12 +1513,12 @@ def view_report(request, session_id, file_path):
     # If format=text, return raw text content for AJAX fetching
     if format_type == 'text' and file_path.endswith('.txt'):
         try:
-            with open(abs_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            from django.http import HttpResponse
-            response = HttpResponse(content, content_type='text/plain; charset=utf-8')
+            response = _serve_session_artifact(request, os.path.join(settings.MEDIA_ROOT, 'sessions', session_id),
+                                               file_path, content_type='text/plain; charset=utf-8')
             response['Content-Disposition'] = f'inline; filename="{os.path.basename(file_path)}"'
             return response
+        except Http404:
+            raise
         except Exception as e:
             logger.error(f"Error reading text file {abs_path}: {e}")
             raise Http404("Error reading report file")
@@ -1459,47 +1551,23 @@ def multiplier_dashboard(request, session_id):
     Renders the dedicated Multiplier Reports Sub-Dashboard.
     Dynamically discovers and display multiplier reports in a tabbed interface.
     """
+    touch_session(session_id)
     session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id)
     if not os.path.exists(session_path):
         raise Http404("Session not found")
 
     # 1. Discover Manifest (Deep Search)
-    manifest_dir = None
-    for root, dirs, files in os.walk(session_path):
-        if 'session_manifest.json' in files:
-            manifest_dir = root
-            break
+    manifest_dir = ManifestManager.locate(session_path)
     
     if not manifest_dir:
         raise Http404("Analysis manifest not found")
 
     # 2. Load Manifest & Context
-    manifest_mgr = ManifestManager(manifest_dir)
-    artifacts = manifest_mgr.load()
+    index = get_artifact_index(manifest_dir)
     report_rel_path = os.path.relpath(manifest_dir, session_path).replace("\\", "/")
     combo_id = os.path.basename(manifest_dir)
 
-    # 3. Data Hydration Strategy
-    breakdown_data = None
-
-    # Strategy A: Fast Load (JSON Artifact)
-    # Look for the JSON file generated by json_multiplier_breakdown.py
-    # New format: --{combo_id}.json, Old format (backward compat): _{combo_id}.json
-    json_suffix_new = f"--{combo_id}.json"
-    json_suffix_old = f"_{combo_id}.json"
-    json_art = next((a for a in artifacts 
-                    if a['report_id'] == 'json_multiplier_breakdown' 
-                    and (a['path'].endswith(json_suffix_new) or a['path'].endswith(json_suffix_old))), None)
-    
-    if json_art:
-        try:
-            full_path = os.path.join(manifest_dir, json_art['path'])
-            with open(full_path, 'r') as json_file:
-                breakdown_data = json.load(json_file)
-        except Exception as e:
-            logger.error(f"Failed to load JSON artifact: {e}")
-
-    # 4. Fetch Persisted Dashboard Context (EARLY LOAD)
+    # 3. Fetch Persisted Dashboard Context (scoreboard)
     context_path = os.path.join(session_path, 'dashboard_context.json')
     dashboard_ctx = {}
     persisted_logs = []
@@ -1513,7 +1581,7 @@ def multiplier_dashboard(request, session_id):
         except Exception as e:
             logger.error(f"Failed to load dashboard context: {e}")
 
-    # 5. Load contest definition to determine dimension (band vs mode)
+    # 4. Load contest definition (multiplier labels)
     # Prefer contest name from path; fallback to persisted dashboard context (no log needed)
     contest_name = _extract_contest_name_from_path(report_rel_path)
     if not contest_name and dashboard_ctx:
@@ -1524,147 +1592,37 @@ def multiplier_dashboard(request, session_id):
     if contest_name and contest_name.upper().startswith('CQ-WPX'):
         return render(request, 'analyzer/multiplier_dashboard_unavailable.html', {'session_id': session_id})
 
-    valid_bands = ['80M', '40M', '20M', '15M', '10M']  # Default fallback
-    valid_modes = []  # Default: empty list
     contest_def = None
-    
     if contest_name:
         try:
             # Load contest definition directly from JSON (no log parsing needed)
             contest_def = ContestDefinition.from_json(contest_name)
-            valid_bands = contest_def.valid_bands
-            valid_modes = contest_def.valid_modes
         except (FileNotFoundError, ValueError, Exception) as e:
             logger.warning(f"Failed to load contest definition for '{contest_name}': {e}. Using defaults.")
     else:
         logger.warning(f"Could not get contest name from path or dashboard context. Using defaults.")
-    
-    # Determine dimension (band vs mode) based on contest type
-    is_single_band = len(valid_bands) == 1
-    is_multi_mode = len(valid_modes) > 1
-    dimension = 'mode' if (is_single_band and is_multi_mode) else 'band'
-    is_mode_dimension = (dimension == 'mode')
-    
-    # 6. Metadata Strategy (Fast Path vs Slow Path)
-    lm = None
-    report_metadata = {}
-    
-    # Check if we have both breakdown data and persisted logs (not just empty dict)
-    # Note: breakdown_data may be None if we detected wrong dimension in fast path
-    if breakdown_data and persisted_logs:
-        # --- FAST PATH: Hydrate from Cache ---
-        # No LogManager, No Parsing. Instant load.
-        
-        # Detect dimension from breakdown_data structure first
-        if 'modes' in breakdown_data:
-            is_mode_dimension = True
-            dimension = 'mode'
-        elif 'bands' in breakdown_data:
-            # Check if contest should actually be mode dimension (for backward compatibility)
-            if is_single_band and is_multi_mode:
-                # Contest should be mode dimension, but JSON has bands (old format)
-                # Regenerate with correct dimension (requires slow path)
-                breakdown_data = None  # Force regeneration
-                is_mode_dimension = True
-                dimension = 'mode'
-            else:
-                is_mode_dimension = False
-                dimension = 'band'
-        else:
-            # Fallback: use contest definition we just loaded
-            if is_single_band and is_multi_mode:
-                is_mode_dimension = True
-                dimension = 'mode'
-        
-        full_title = dashboard_ctx.get('full_contest_title', '')
-        cty_info = dashboard_ctx.get('cty_version_info', 'CTY-Unknown Unknown Date')
-        
-        # Reconstruct calls from persisted logs to match combo_id logic
-        calls = sorted([l['callsign'] for l in persisted_logs])
-        call_str = ", ".join(calls)
-        
-        # Line 2: Context
-        context_line = f"{full_title} - {call_str}"
-        
-        # Footer: One line with CLA abbreviation
-        footer_text = f"CLA v{__version__}   |   {cty_info}"
-        
-        scope_line = "All Modes" if is_mode_dimension else "All Bands"
-        report_metadata = {
-            'context_line': context_line,
-            'scope_line': scope_line,
-            'footer': footer_text
-        }
-        
-    else:
-        # --- SLOW PATH: Fallback to Log Parsing ---
-        # Required if JSON artifact is missing or context is corrupted
-        # Note: valid_bands and valid_modes already loaded from ContestDefinition above
-        lm = LogManager()
-        log_candidates = []
-        for f in os.listdir(session_path):
-            f_path = os.path.join(session_path, f)
-            if os.path.isfile(f_path) and not f.startswith('dashboard_context') and not f.endswith('.zip'):
-                log_candidates.append(f_path)
-        
-        root_input = os.environ.get('CONTEST_INPUT_DIR', '/app/CONTEST_LOGS_REPORTS')
-        lm.load_log_batch(log_candidates, root_input, 'after')
-        
-        # Dimension already determined from ContestDefinition above, no need to recalculate
-        
-        # Generate Aggregation if missing
-        if not breakdown_data:
-            mult_agg = MultiplierStatsAggregator(lm.logs)
-            breakdown_data = mult_agg.get_multiplier_breakdown_data(dimension=dimension)
-        else:
-            # Detect dimension from existing breakdown_data structure
-            if 'modes' in breakdown_data:
-                is_mode_dimension = True
-                dimension = 'mode'
-            elif 'bands' in breakdown_data:
-                is_mode_dimension = False
-                dimension = 'band'
-            
-        # Generate Metadata using Utilities
-        modes_present = set()
-        for log in lm.logs:
-            df = log.get_processed_data()
-            if 'Mode' in df.columns:
-                 modes_present.update(df['Mode'].dropna().unique())
-
-        scope_label = "All Modes" if is_mode_dimension else "All Bands"
-        title_lines = get_standard_title_lines("Multiplier Breakdown", lm.logs, scope_label, None, modes_present)
-        
-        # Footer with Newline
-        # Extract CTY info in new format
-        cty_info = get_cty_metadata(lm.logs)
-        footer_text = f"CLA v{__version__}   |   {cty_info}"
-        
-        report_metadata = {
-            'context_line': title_lines[1],
-            'scope_line': title_lines[2],
-            'footer': footer_text
-        }
-    
-    # Chart layout/scaling shared with html_multiplier_breakdown (partials)
-    location_type = dashboard_ctx.get('location_type')
-    chart_ctx = build_multiplier_breakdown_chart_context(
-        breakdown_data,
-        contest_def,
-        is_mode_dimension,
-        location_type=location_type,
-        contest_name=contest_name,
+
+    # 5. Precomputed Dashboard Aggregates
+    # Written by the analysis pipeline; a missing or stale bundle is rebuilt in the
+    # background (never inside the request) while a "being prepared" page polls.
+    bundle = load_multiplier_dashboard_bundle(session_path, combo_id)
+    if bundle is None:
+        if schedule_multiplier_dashboard_regeneration(session_path, combo_id):
+            return render(request, 'analyzer/multiplier_dashboard_pending.html', {'session_id': session_id})
+        return render(request, 'analyzer/multiplier_dashboard_unavailable.html', {'session_id': session_id})
+
+    breakdown_data = bundle['breakdown']
+    is_mode_dimension = bundle['is_mode_dimension']
+    report_metadata = bundle['report_metadata']
+    low_bands_data, high_bands_data, low_modes_data, high_modes_data = (
+        split_breakdown_dimension_blocks(breakdown_data, is_mode_dimension)
     )
-    low_bands_data = chart_ctx['low_bands_data']
-    high_bands_data = chart_ctx['high_bands_data']
-    low_modes_data = chart_ctx['low_modes_data']
-    high_modes_data = chart_ctx['high_modes_data']
-    multiplier_names = chart_ctx['multiplier_names']
-    applicable_multiplier_count = chart_ctx['multiplier_count']
-    global_max = chart_ctx['global_max']
-    is_sweepstakes = chart_ctx['is_sweepstakes']
-    fixed_multiplier_max = chart_ctx['fixed_multiplier_max']
-    all_logs_same_mult_count = chart_ctx['all_logs_same_mult_count']
+    multiplier_names = bundle['multiplier_names']
+    applicable_multiplier_count = bundle['multiplier_count']
+    global_max = bundle['global_max']
+    is_sweepstakes = bundle['is_sweepstakes']
+    fixed_multiplier_max = bundle['fixed_multiplier_max']
+    all_logs_same_mult_count = bundle['all_logs_same_mult_count']
 
     # Calculate optimal column width for scoreboard
     log_count = len(persisted_logs) if persisted_logs else 0
@@ -1673,17 +1631,18 @@ def multiplier_dashboard(request, session_id):
     # Common suffix for text reports
     suffix = f"_{combo_id}"
 
+    # Session-level artifacts are keyed by the full callsign set of the combo
+    combo_callsigns = [callsign_to_filename_part(c) for c in parse_callsigns_from_filename_part(combo_id)]
+
     # 4. Discover Text Version of Breakdown
     breakdown_txt_rel_path = None
-    txt_suffix = f"_{combo_id}.txt"
-    txt_bd_art = next((a for a in artifacts if a['report_id'] == 'text_multiplier_breakdown' and a['path'].endswith(txt_suffix)), None)
+    txt_bd_art = index.find_first('text_multiplier_breakdown', combo_callsigns, 'txt', band='', mode='')
     if txt_bd_art:
         breakdown_txt_rel_path = f"{report_rel_path}/{txt_bd_art['path']}"
 
     # 5. Discover HTML Version of Breakdown
     breakdown_html_rel_path = None
-    html_suffix = f"_{combo_id}.html"
-    html_bd_art = next((a for a in artifacts if a['report_id'] == 'html_multiplier_breakdown' and a['path'].endswith(html_suffix)), None)
+    html_bd_art = index.find_first('html_multiplier_breakdown', combo_callsigns, 'html', band='', mode='')
     if html_bd_art:
         breakdown_html_rel_path = f"{report_rel_path}/{html_bd_art['path']}"
 
@@ -1753,13 +1712,8 @@ def multiplier_dashboard(request, session_id):
         else:
             return mult_name
     
-    # Get contest definition for multiplier name lookup.
-    # Use lm.logs[0] when on slow path; otherwise use contest_def already loaded from JSON in step 5 (no log load).
-    contest_def_for_label = None
-    if lm and lm.logs:
-        contest_def_for_label = lm.logs[0].contest_definition
-    else:
-        contest_def_for_label = contest_def  # Already loaded via ContestDefinition.from_json(contest_name); no log needed
+    # Contest definition for multiplier name lookup (loaded from JSON above; no log load)
+    contest_def_for_label = contest_def
 
     # 2. Scan and Group Reports
     # Use Manifest to find Missed/Summary reports
@@ -1777,9 +1731,8 @@ def multiplier_dashboard(request, session_id):
 
     target_ids = ['missed_multipliers', 'multiplier_summary']
     
-    for art in artifacts:
+    for art in [a for rid in target_ids for a in index.by_report_id(rid)]:
         rid = art['report_id']
-        if rid not in target_ids: continue
         
         mult_type = None
         report_key = None
@@ -1913,30 +1866,10 @@ def multiplier_dashboard(request, session_id):
     # Convert dict to sorted list for template
     sorted_mults = sorted(multipliers.values(), key=lambda x: x['label'])
 
-    # Discover Enhanced Missed Multipliers report (Sweepstakes only)
-    # Note: This report is generated for the session (all logs), so we need to match the session suffix
+    # Enhanced Missed Multipliers report (Sweepstakes only), located when the bundle was built
     enhanced_missed_mult_rel_path = None
-    if contest_name and contest_name.startswith("ARRL-SS"):
-        # Build callsigns_part from all persisted logs for session-level report
-        # This should match: enhanced_missed_multipliers--{all_callsigns}.txt
-        session_callsigns = sorted([l['callsign'] for l in persisted_logs])
-        session_callsigns_part = build_callsigns_filename_part(session_callsigns)
-        enhanced_suffix = f"--{session_callsigns_part}.txt"
-        # Check basename of path, not full path (path may include subdirectories like 'text/')
-        enhanced_art = next((a for a in artifacts 
-                           if a['report_id'] == 'enhanced_missed_multipliers' 
-                           and os.path.basename(a['path']).endswith(enhanced_suffix)), None)
-        if enhanced_art:
-            # Check if report has content (not empty/skipped)
-            try:
-                full_path = os.path.join(manifest_dir, enhanced_art['path'])
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # Check if report was skipped (contains "Skipped:" message)
-                    if 'Skipped:' not in content and len(content.strip()) > 100:
-                        enhanced_missed_mult_rel_path = f"{report_rel_path}/{enhanced_art['path']}"
-            except Exception as e:
-                logger.warning(f"Failed to check enhanced missed multipliers report content: {e}")
+    if bundle.get('enhanced_missed_multipliers_path'):
+        enhanced_missed_mult_rel_path = f"{report_rel_path}/{bundle['enhanced_missed_multipliers_path']}"
 
     context = {
         'session_id': session_id,
@@ -1968,6 +1901,7 @@ def multiplier_dashboard(request, session_id):
 
 def qso_dashboard(request, session_id):
     """Renders the dedicated QSO Reports Sub-Dashboard."""
+    touch_session(session_id)
     from contest_tools.utils.callsign_utils import callsign_to_filename_part, parse_callsigns_from_filename_part
     
     session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id)
@@ -1975,18 +1909,13 @@ def qso_dashboard(request, session_id):
         raise Http404("Session not found")
 
     # 1. Discover Manifest (Deep Search)
-    manifest_dir = None
-    for root, dirs, files in os.walk(session_path):
-        if 'session_manifest.json' in files:
-            manifest_dir = root
-            break
+    manifest_dir = ManifestManager.locate(session_path)
     
     if not manifest_dir:
         raise Http404("Analysis manifest not found")
 
     # 2. Load Manifest & Calculate Relative Path
-    manifest_mgr = ManifestManager(manifest_dir)
-    artifacts = manifest_mgr.load()
+    index = get_artifact_index(manifest_dir)
     
     # Derive combo_id from the directory name (Authoritative source from ReportGenerator)
     combo_id = os.path.basename(manifest_dir)
@@ -2024,35 +1953,23 @@ def qso_dashboard(request, session_id):
             
             # If contest-wide, discover the new reports
             if is_contest_wide_qso and not is_solo:
-                # Discover contest-wide QSO breakdown report
-                # Search by report_id (both files will have same report_id)
-                contest_wide_qso_report = next(
-                    (f"{report_rel_path}/{a['path']}" 
-                     for a in artifacts 
-                     if a['report_id'] == 'qso_breakdown_chart_contest_wide' 
-                     and 'qso_breakdown_chart_contest_wide' in a['path']
-                     and a['path'].endswith('.html')),
-                    None
-                )
-                
+                # Both charts share one report_id and are generated per pair; the
+                # band distribution is told apart by its name. With more than two
+                # logs the first pair is shown.
+                contest_wide_calls = callsigns_safe[:2]
+                contest_wide_art = index.find_first('qso_breakdown_chart_contest_wide', contest_wide_calls, 'html', variant='')
+                if contest_wide_art:
+                    contest_wide_qso_report = f"{report_rel_path}/{contest_wide_art['path']}"
+
                 # Discover band distribution report (HTML and JSON for direct embedding)
-                band_distribution_html = next(
-                    (f"{report_rel_path}/{a['path']}" 
-                     for a in artifacts 
-                     if a['report_id'] == 'qso_breakdown_chart_contest_wide' 
-                     and 'qso_band_distribution' in a['path']
-                     and a['path'].endswith('.html')),
-                    None
-                )
-                band_distribution_json = next(
-                    (f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{a['path']}" 
-                     for a in artifacts 
-                     if a['report_id'] == 'qso_breakdown_chart_contest_wide' 
-                     and 'qso_band_distribution' in a['path']
-                     and a['path'].endswith('.json')),
-                    None
-                )
-                band_distribution_report = band_distribution_html  # Keep HTML for full-screen link
+                band_distribution_html = index.find_first('qso_breakdown_chart_contest_wide', contest_wide_calls, 'html',
+                                                          variant='qso_band_distribution')
+                band_distribution_json_art = index.find_first('qso_breakdown_chart_contest_wide', contest_wide_calls, 'json',
+                                                              variant='qso_band_distribution')
+                if band_distribution_json_art:
+                    band_distribution_json = f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{band_distribution_json_art['path']}"
+                if band_distribution_html:
+                    band_distribution_report = f"{report_rel_path}/{band_distribution_html['path']}"  # Keep HTML for full-screen link
         except (FileNotFoundError, ValueError, Exception) as e:
             logger.warning(f"Failed to load contest definition for '{contest_name}': {e}. Using defaults.")
     else:
@@ -2162,17 +2079,11 @@ def qso_dashboard(request, session_id):
             diff_paths_points = {}
             diff_json_paths_points = {}
             
-            # Build expected callsigns part for this pair (lowercase, underscore-separated)
-            pair_callsigns = f"{c1}_{c2}"
-            target_suffix = f"--{pair_callsigns}"
-            
-            # Filter artifacts for this pair's difference plots (qsos and points variants)
-            for art in artifacts:
-                if art['report_id'] != 'cumulative_difference_plots':
-                    continue
+            # Keyed lookup of this pair's difference plots (qsos and points variants)
+            pair_artifacts = (index.find('cumulative_difference_plots', (c1, c2), 'html')
+                              + index.find('cumulative_difference_plots', (c1, c2), 'json'))
+            for art in pair_artifacts:
                 fname = os.path.basename(art['path'])
-                if target_suffix not in fname:
-                    continue
                 for prefix, paths_dict, json_dict in [
                     ("cumulative_difference_plots_qsos_", diff_paths, diff_json_paths),
                     ("cumulative_difference_plots_points_", diff_paths_points, diff_json_paths_points),
@@ -2187,14 +2098,19 @@ def qso_dashboard(request, session_id):
                         json_dict[structured_key] = f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{art['path']}"
                     break
         
-            # Find breakdown chart
-            bk_path = next((f"{report_rel_path}/{a['path']}" for a in artifacts if a['report_id'] == 'qso_breakdown_chart' and f"_{c1}_{c2}" in a['path'] and a['path'].endswith('.html')), "")
-            bk_json = next((f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{a['path']}" for a in artifacts if a['report_id'] == 'qso_breakdown_chart' and f"_{c1}_{c2}" in a['path'] and a['path'].endswith('.json')), "")
-            
-            # Explicitly target HTML for interactive view
-            ba_path = next((f"{report_rel_path}/{a['path']}" for a in artifacts if a['report_id'] == 'chart_comparative_activity_butterfly' and f"_{c1}_{c2}" in a['path'] and a['path'].endswith('.html')), "")
-            ba_json = next((f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{a['path']}" for a in artifacts if a['report_id'] == 'chart_comparative_activity_butterfly' and f"_{c1}_{c2}" in a['path'] and a['path'].endswith('.json')), "")
-            cont_path = next((f"{report_rel_path}/{a['path']}" for a in artifacts if a['report_id'] == 'comparative_continent_summary' and f"_{c1}_{c2}" in a['path']), "")
+            # Keyed lookups of this pair's charts (HTML for the interactive view, JSON for embedding)
+            def pair_file(report_id, ext, media=False):
+                art = index.find_first(report_id, (c1, c2), ext)
+                if not art:
+                    return ""
+                prefix = f"{settings.MEDIA_URL}sessions/{session_id}/" if media else ""
+                return f"{prefix}{report_rel_path}/{art['path']}"
+
+            bk_path = pair_file('qso_breakdown_chart', 'html')
+            bk_json = pair_file('qso_breakdown_chart', 'json', media=True)
+            ba_path = pair_file('chart_comparative_activity_butterfly', 'html')
+            ba_json = pair_file('chart_comparative_activity_butterfly', 'json', media=True)
+            cont_path = pair_file('text_comparative_continent_summary', 'txt')
             
             # Find rate chart files (bar graph alternatives for cumulative difference plots)
             # These follow similar naming patterns but need mode-aware variants
@@ -2205,17 +2121,11 @@ def qso_dashboard(request, session_id):
             rate_chart_paths_points = {}
             rate_chart_json_paths_points = {}
             
-            # Build exact suffix patterns for this pair
-            rate_suffix_html = f"--{pair_callsigns}.html"
-            rate_suffix_json = f"--{pair_callsigns}.json"
-            
-            for art in artifacts:
-                if art['report_id'] != 'chart_rate':
-                    continue
+            # Keyed lookup on the exact pair callsign set (never matches 3-way files)
+            pair_artifacts = (index.find('chart_rate', (c1, c2), 'html')
+                              + index.find('chart_rate', (c1, c2), 'json'))
+            for art in pair_artifacts:
                 fname = os.path.basename(art['path'])
-                # Strict match: filename must END with exact pair callsigns
-                if not (fname.endswith(rate_suffix_html) or fname.endswith(rate_suffix_json)):
-                    continue
                 for prefix, paths_dict, json_dict in [
                     ("chart_rate_qsos_", rate_chart_paths, rate_chart_json_paths),
                     ("chart_rate_points_", rate_chart_paths_points, rate_chart_json_paths_points),
@@ -2252,101 +2162,74 @@ def qso_dashboard(request, session_id):
     # 4. Discover Point Rate Plots (Manifest Scan)
     point_plots = []
     
-    # For multi-log: Only show comparison plots (ending with combo_id)
-    # For single-log: Show individual station plots (ending with single callsign)
-    # New format: --{combo_id}.html, Old format: _{combo_id}.html
-    target_suffix_new = f"--{combo_id}.html" if not is_solo else None
-    target_suffix_old = f"_{combo_id}.html" if not is_solo else None
-    target_callsigns = callsigns_safe if is_solo else None
+    # Multi-log: the comparison plots (all callsigns of the combo).
+    # Single-log: the station's own plots. Both are keyed by the combo's callsign set.
+    for art in index.find('point_rate_plots', callsigns_safe, 'html'):
+        fname = os.path.basename(art['path'])
 
-    for art in artifacts:
-        if art['report_id'] == 'point_rate_plots' and art['path'].endswith('.html'):
-            fname = os.path.basename(art['path'])
-            
-            # Filter by suffix pattern
-            if not is_solo:
-                # Multi-log: Only include comparison plots (ending with combo_id)
-                # Check both new and old formats
-                if not (target_suffix_new and fname.endswith(target_suffix_new)) and not (target_suffix_old and fname.endswith(target_suffix_old)):
-                    continue
+        # Handle new format with -- delimiter: point_rate_plots_{band}--{callsigns}.html
+        # or old format: point_rate_plots_{band}_{callsigns}.html
+        if '--' in fname:
+            # New format: point_rate_plots_all--k1lz_k3lr_w3lpl.html or point_rate_plots_20m--k1lz_k3lr_w3lpl.html
+            # Split on -- to separate band/mode from callsigns
+            parts_before_dash = fname.replace('point_rate_plots_', '').split('--')[0]
+            # Extract band from first part (e.g., "all", "20m", "20m_cw", "10_cw", "10_ph")
+            band_parts = parts_before_dash.split('_')
+            band_key = band_parts[0].upper()
+            mode_key = band_parts[1].upper() if len(band_parts) > 1 else None
+        else:
+            # Old format (backward compatibility): point_rate_plots_20m_k1lz_k3lr.html
+            remainder = fname.replace('point_rate_plots_', '')
+            parts = remainder.split('_')
+            if parts:
+                band_key = parts[0].upper()
+                mode_key = parts[1].upper() if len(parts) > 1 else None
             else:
-                # Single-log: Only include individual station plots (ending with single callsign)
-                # Exclude comparison plots (those ending with combo_id which is same as single callsign)
-                # For single log, combo_id IS the callsign, so we need to check if it's exactly one callsign
-                # Pattern: point_rate_plots_{band}--{callsign}.html (new) or point_rate_plots_{band}_{callsign}.html (old)
-                matches_single = False
-                for call in target_callsigns:
-                    single_suffix_new = f"--{call}.html"
-                    single_suffix_old = f"_{call}.html"
-                    if fname.endswith(single_suffix_new) or fname.endswith(single_suffix_old):
-                        matches_single = True
-                        break
-                if not matches_single:
-                    continue
-            
-            # Handle new format with -- delimiter: point_rate_plots_{band}--{callsigns}.html
-            # or old format: point_rate_plots_{band}_{callsigns}.html
-            if '--' in fname:
-                # New format: point_rate_plots_all--k1lz_k3lr_w3lpl.html or point_rate_plots_20m--k1lz_k3lr_w3lpl.html
-                # Split on -- to separate band/mode from callsigns
-                parts_before_dash = fname.replace('point_rate_plots_', '').split('--')[0]
-                # Extract band from first part (e.g., "all", "20m", "20m_cw", "10_cw", "10_ph")
-                band_parts = parts_before_dash.split('_')
-                band_key = band_parts[0].upper()
-                mode_key = band_parts[1].upper() if len(band_parts) > 1 else None
+                continue
+        
+        if band_key.isdigit(): band_key += 'M'
+        
+        # For single-band, multi-mode contests: use mode labels instead of band labels
+        # e.g., ARRL 10: "All", "CW", "PH" instead of all showing "10"
+        if is_single_band and is_multi_mode and mode_key:
+            # Extract mode from filename (e.g., "10_cw" -> "CW", "10_ph" -> "PH")
+            mode_upper = mode_key
+            if mode_upper in ['CW', 'PH', 'RY', 'DG']:
+                label = mode_upper
+            elif mode_upper in ['SSB', 'USB', 'LSB']:
+                label = 'PH'  # Cabrillo uses PH
             else:
-                # Old format (backward compatibility): point_rate_plots_20m_k1lz_k3lr.html
-                remainder = fname.replace('point_rate_plots_', '')
-                parts = remainder.split('_')
-                if parts:
-                    band_key = parts[0].upper()
-                    mode_key = parts[1].upper() if len(parts) > 1 else None
-                else:
-                    continue
-            
-            if band_key.isdigit(): band_key += 'M'
-            
-            # For single-band, multi-mode contests: use mode labels instead of band labels
-            # e.g., ARRL 10: "All", "CW", "PH" instead of all showing "10"
-            if is_single_band and is_multi_mode and mode_key:
-                # Extract mode from filename (e.g., "10_cw" -> "CW", "10_ph" -> "PH")
+                label = mode_upper  # Fallback
+            # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
+            sort_val = 50  # Temporary, will be overridden
+        elif is_single_band and is_multi_mode and not mode_key:
+            # "All" mode for single-band, multi-mode (e.g., "10" without mode suffix)
+            label = "All"
+            # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
+            sort_val = 50  # Temporary, will be overridden
+        else:
+            # Multi-band contests: use band labels, or band+mode for multi-mode contests
+            if is_multi_mode and mode_key:
+                # Multi-band, multi-mode: include mode in label (e.g., "80M CW", "80M PH", "All Bands CW")
                 mode_upper = mode_key
-                if mode_upper in ['CW', 'PH', 'RY', 'DG']:
-                    label = mode_upper
-                elif mode_upper in ['SSB', 'USB', 'LSB']:
-                    label = 'PH'  # Cabrillo uses PH
+                if mode_upper in ['SSB', 'USB', 'LSB']:
+                    mode_upper = 'PH'  # Cabrillo uses PH
+                if band_key == 'ALL':
+                    label = f"All Bands {mode_upper}"
                 else:
-                    label = mode_upper  # Fallback
-                # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
-                sort_val = 50  # Temporary, will be overridden
-            elif is_single_band and is_multi_mode and not mode_key:
-                # "All" mode for single-band, multi-mode (e.g., "10" without mode suffix)
-                label = "All"
-                # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
-                sort_val = 50  # Temporary, will be overridden
+                    label = f"{band_key} {mode_upper}"
             else:
-                # Multi-band contests: use band labels, or band+mode for multi-mode contests
-                if is_multi_mode and mode_key:
-                    # Multi-band, multi-mode: include mode in label (e.g., "80M CW", "80M PH", "All Bands CW")
-                    mode_upper = mode_key
-                    if mode_upper in ['SSB', 'USB', 'LSB']:
-                        mode_upper = 'PH'  # Cabrillo uses PH
-                    if band_key == 'ALL':
-                        label = f"All Bands {mode_upper}"
-                    else:
-                        label = f"{band_key} {mode_upper}"
-                else:
-                    # Multi-band, single-mode: just band label
-                    label = "All Bands" if band_key == 'ALL' else band_key
-                sort_val = BAND_SORT_ORDER.get(band_key, 99)
-            
-            point_plots.append({
-                'label': label,
-                'file_html': f"{report_rel_path}/{art['path']}",
-                'file_json': f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{art['path'].replace('.html', '.json')}",
-                'sort_val': sort_val
-            })
-    
+                # Multi-band, single-mode: just band label
+                label = "All Bands" if band_key == 'ALL' else band_key
+            sort_val = BAND_SORT_ORDER.get(band_key, 99)
+        
+        point_plots.append({
+            'label': label,
+            'file_html': f"{report_rel_path}/{art['path']}",
+            'file_json': f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{art['path'].replace('.html', '.json')}",
+            'sort_val': sort_val
+        })
+
     # Sort: For single-band, multi-mode, sort by mode order (All first, then CW, PH, etc.)
     # For multi-band, sort by band order (All Bands first, then 20M, etc.)
     if is_single_band and is_multi_mode:
@@ -2390,100 +2273,73 @@ def qso_dashboard(request, session_id):
     # 5. Discover QSO Rate Plots (Manifest Scan)
     qso_band_plots = []
     
-    # For multi-log: Only show comparison plots (ending with combo_id)
-    # For single-log: Show individual station plots (ending with single callsign)
-    # New format: --{combo_id}.html, Old format: _{combo_id}.html
-    target_suffix_new = f"--{combo_id}.html" if not is_solo else None
-    target_suffix_old = f"_{combo_id}.html" if not is_solo else None
-    target_callsigns = callsigns_safe if is_solo else None
-    
-    for art in artifacts:
-        if art['report_id'] == 'qso_rate_plots' and art['path'].endswith('.html'):
-            fname = os.path.basename(art['path'])
-            
-            # Filter by suffix pattern
-            if not is_solo:
-                # Multi-log: Only include comparison plots (ending with combo_id)
-                # Check both new and old formats
-                if not (target_suffix_new and fname.endswith(target_suffix_new)) and not (target_suffix_old and fname.endswith(target_suffix_old)):
-                    continue
+    # Multi-log: the comparison plots (all callsigns of the combo).
+    # Single-log: the station's own plots. Both are keyed by the combo's callsign set.
+    for art in index.find('qso_rate_plots', callsigns_safe, 'html'):
+        fname = os.path.basename(art['path'])
+
+        # Handle new format with -- delimiter: qso_rate_plots_{band}--{callsigns}.html
+        # or old format: qso_rate_plots_{band}_{callsigns}.html
+        if '--' in fname:
+            # New format: qso_rate_plots_all--k1lz_k3lr_w3lpl.html or qso_rate_plots_20m--k1lz_k3lr_w3lpl.html
+            # Split on -- to separate band/mode from callsigns
+            parts_before_dash = fname.replace('qso_rate_plots_', '').split('--')[0]
+            # Extract band from first part (e.g., "all", "20m", "20m_cw", "10_cw", "10_ph")
+            band_parts = parts_before_dash.split('_')
+            band_key = band_parts[0].upper()
+            mode_key = band_parts[1].upper() if len(band_parts) > 1 else None
+        else:
+            # Old format (backward compatibility): qso_rate_plots_20m_k1lz_k3lr.html
+            remainder = fname.replace('qso_rate_plots_', '')
+            parts = remainder.split('_')
+            if parts:
+                band_key = parts[0].upper()
+                mode_key = parts[1].upper() if len(parts) > 1 else None
             else:
-                # Single-log: Only include individual station plots (ending with single callsign)
-                # Exclude comparison plots (those ending with combo_id which is same as single callsign)
-                # For single log, combo_id IS the callsign, so we need to check if it's exactly one callsign
-                # Pattern: qso_rate_plots_{band}--{callsign}.html (new) or qso_rate_plots_{band}_{callsign}.html (old)
-                matches_single = False
-                for call in target_callsigns:
-                    single_suffix_new = f"--{call}.html"
-                    single_suffix_old = f"_{call}.html"
-                    if fname.endswith(single_suffix_new) or fname.endswith(single_suffix_old):
-                        matches_single = True
-                        break
-                if not matches_single:
-                    continue
-            
-            # Handle new format with -- delimiter: qso_rate_plots_{band}--{callsigns}.html
-            # or old format: qso_rate_plots_{band}_{callsigns}.html
-            if '--' in fname:
-                # New format: qso_rate_plots_all--k1lz_k3lr_w3lpl.html or qso_rate_plots_20m--k1lz_k3lr_w3lpl.html
-                # Split on -- to separate band/mode from callsigns
-                parts_before_dash = fname.replace('qso_rate_plots_', '').split('--')[0]
-                # Extract band from first part (e.g., "all", "20m", "20m_cw", "10_cw", "10_ph")
-                band_parts = parts_before_dash.split('_')
-                band_key = band_parts[0].upper()
-                mode_key = band_parts[1].upper() if len(band_parts) > 1 else None
+                continue
+        
+        if band_key.isdigit(): band_key += 'M'
+        
+        # For single-band, multi-mode contests: use mode labels instead of band labels
+        # e.g., ARRL 10: "All", "CW", "PH" instead of all showing "10"
+        if is_single_band and is_multi_mode and mode_key:
+            # Extract mode from filename (e.g., "10_cw" -> "CW", "10_ph" -> "PH")
+            mode_upper = mode_key
+            if mode_upper in ['CW', 'PH', 'RY', 'DG']:
+                label = mode_upper
+            elif mode_upper in ['SSB', 'USB', 'LSB']:
+                label = 'PH'  # Cabrillo uses PH
             else:
-                # Old format (backward compatibility): qso_rate_plots_20m_k1lz_k3lr.html
-                remainder = fname.replace('qso_rate_plots_', '')
-                parts = remainder.split('_')
-                if parts:
-                    band_key = parts[0].upper()
-                    mode_key = parts[1].upper() if len(parts) > 1 else None
-                else:
-                    continue
-            
-            if band_key.isdigit(): band_key += 'M'
-            
-            # For single-band, multi-mode contests: use mode labels instead of band labels
-            # e.g., ARRL 10: "All", "CW", "PH" instead of all showing "10"
-            if is_single_band and is_multi_mode and mode_key:
-                # Extract mode from filename (e.g., "10_cw" -> "CW", "10_ph" -> "PH")
+                label = mode_upper  # Fallback
+            # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
+            sort_val = 50  # Temporary, will be overridden
+        elif is_single_band and is_multi_mode and not mode_key:
+            # "All" mode for single-band, multi-mode (e.g., "10" without mode suffix)
+            label = "All"
+            # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
+            sort_val = 50  # Temporary, will be overridden
+        else:
+            # Multi-band contests: use band labels, or band+mode for multi-mode contests
+            if is_multi_mode and mode_key:
+                # Multi-band, multi-mode: include mode in label (e.g., "80M CW", "80M PH", "All Bands CW")
                 mode_upper = mode_key
-                if mode_upper in ['CW', 'PH', 'RY', 'DG']:
-                    label = mode_upper
-                elif mode_upper in ['SSB', 'USB', 'LSB']:
-                    label = 'PH'  # Cabrillo uses PH
+                if mode_upper in ['SSB', 'USB', 'LSB']:
+                    mode_upper = 'PH'  # Cabrillo uses PH
+                if band_key == 'ALL':
+                    label = f"All Bands {mode_upper}"
                 else:
-                    label = mode_upper  # Fallback
-                # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
-                sort_val = 50  # Temporary, will be overridden
-            elif is_single_band and is_multi_mode and not mode_key:
-                # "All" mode for single-band, multi-mode (e.g., "10" without mode suffix)
-                label = "All"
-                # Sort value will be set later by MODE_SORT_ORDER, use temp value for now
-                sort_val = 50  # Temporary, will be overridden
+                    label = f"{band_key} {mode_upper}"
             else:
-                # Multi-band contests: use band labels, or band+mode for multi-mode contests
-                if is_multi_mode and mode_key:
-                    # Multi-band, multi-mode: include mode in label (e.g., "80M CW", "80M PH", "All Bands CW")
-                    mode_upper = mode_key
-                    if mode_upper in ['SSB', 'USB', 'LSB']:
-                        mode_upper = 'PH'  # Cabrillo uses PH
-                    if band_key == 'ALL':
-                        label = f"All Bands {mode_upper}"
-                    else:
-                        label = f"{band_key} {mode_upper}"
-                else:
-                    # Multi-band, single-mode: just band label
-                    label = "All Bands" if band_key == 'ALL' else band_key
-                sort_val = BAND_SORT_ORDER.get(band_key, 99)
-            
-            qso_band_plots.append({
-                'label': label,
-                'file_html': f"{report_rel_path}/{art['path']}",
-                'file_json': f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{art['path'].replace('.html', '.json')}",
-                'sort_val': sort_val
-            })
+                # Multi-band, single-mode: just band label
+                label = "All Bands" if band_key == 'ALL' else band_key
+            sort_val = BAND_SORT_ORDER.get(band_key, 99)
+        
+        qso_band_plots.append({
+            'label': label,
+            'file_html': f"{report_rel_path}/{art['path']}",
+            'file_json': f"{settings.MEDIA_URL}sessions/{session_id}/{report_rel_path}/{art['path'].replace('.html', '.json')}",
+            'sort_val': sort_val
+        })
 
     # Sort: For single-band, multi-mode, sort by mode order (All first, then CW, PH, etc.)
     # For multi-band, sort by band order (All Bands first, then 20M, etc.)
@@ -2525,53 +2381,32 @@ def qso_dashboard(request, session_id):
             if not active_set:
                 qso_band_plots[0]['active'] = True
 
-    # Global files via manifest lookup
-    # Handle both multi-band and single-band contests
+    # Global files via manifest lookup, keyed by the combo's callsign set
+    # (the station itself for a single log)
     # Multi-band: qso_rate_plots_all--{callsigns}.html
     # Single-band: qso_rate_plots_{band}--{callsigns}.html (e.g., qso_rate_plots_10--{callsigns}.html)
     # Old format (backward compat): qso_rate_plots_all_{callsigns}.html
     single_band_name = valid_bands[0].replace('M', '').lower() if is_single_band else None  # e.g., "10" for "10M"
-    
-    if is_solo:
-        # Single log: Look for qso_rate_plots_all--{callsign}.html or qso_rate_plots_{band}--{callsign}.html or old format
-        call_safe = callsigns_safe[0] if callsigns_safe else combo_id
-        # Try multi-band format first, then single-band format if applicable
-        global_qso = next((f"{report_rel_path}/{a['path']}" for a in artifacts 
-                          if a['report_id'] == 'qso_rate_plots' 
-                          and (f"all--{call_safe}.html" in a['path'] or f"_all_{call_safe}.html" in a['path'])), "")
-        # If not found and single-band contest, try single-band format
-        if not global_qso and is_single_band and single_band_name:
-            global_qso = next((f"{report_rel_path}/{a['path']}" for a in artifacts 
-                              if a['report_id'] == 'qso_rate_plots' 
-                              and (f"{single_band_name}--{call_safe}.html" in a['path'] or f"_{single_band_name}_{call_safe}.html" in a['path'])), "")
-    else:
-        # Multi log: Look for qso_rate_plots_all--{combo_id}.html or qso_rate_plots_{band}--{combo_id}.html or old format
-        # Try multi-band format first, then single-band format if applicable
-        global_qso = next((f"{report_rel_path}/{a['path']}" for a in artifacts 
-                          if a['report_id'] == 'qso_rate_plots' 
-                          and (f"all--{combo_id}.html" in a['path'] or f"_all_{combo_id}.html" in a['path'])), "")
-        # If not found and single-band contest, try single-band format
-        if not global_qso and is_single_band and single_band_name:
-            global_qso = next((f"{report_rel_path}/{a['path']}" for a in artifacts 
-                              if a['report_id'] == 'qso_rate_plots' 
-                              and (f"{single_band_name}--{combo_id}.html" in a['path'] or f"_{single_band_name}_{combo_id}.html" in a['path'])), "")
-    
+
+    # The all-modes plot; try multi-band format first, then single-band format if applicable
+    global_qso_art = index.find_first('qso_rate_plots', callsigns_safe, 'html', band='all', mode='')
+    if not global_qso_art and is_single_band and single_band_name:
+        global_qso_art = index.find_first('qso_rate_plots', callsigns_safe, 'html', band=single_band_name, mode='')
+    global_qso = f"{report_rel_path}/{global_qso_art['path']}" if global_qso_art else ""
+
     if not global_qso:
         logger.warning(f"QSO Dashboard: Global QSO Rate Plot not found for combo_id '{combo_id}' in '{report_rel_path}'.")
 
     # Rate Sheet Comparison: QSO and Points variants (rate_sheet_comparison_qsos--..., rate_sheet_comparison_points--...)
     # Also accept legacy single-file format for backward compatibility
-    rate_sheet_comp_qsos = next((f"{report_rel_path}/{a['path']}" for a in artifacts
-                                if a['report_id'] == 'rate_sheet_comparison'
-                                and a['path'].endswith(f"rate_sheet_comparison_qsos--{combo_id}.txt")), "")
-    rate_sheet_comp_points = next((f"{report_rel_path}/{a['path']}" for a in artifacts
-                                  if a['report_id'] == 'rate_sheet_comparison'
-                                  and a['path'].endswith(f"rate_sheet_comparison_points--{combo_id}.txt")), "")
+    def combo_text_file(report_id, variant):
+        art = index.find_first(report_id, callsigns_safe, 'txt', variant=variant)
+        return f"{report_rel_path}/{art['path']}" if art else ""
+
+    rate_sheet_comp_qsos = combo_text_file('rate_sheet_comparison', 'qsos')
+    rate_sheet_comp_points = combo_text_file('rate_sheet_comparison', 'points')
     if not rate_sheet_comp_qsos and not rate_sheet_comp_points:
-        rate_sheet_comp_legacy = next((f"{report_rel_path}/{a['path']}" for a in artifacts
-                                      if a['report_id'] == 'rate_sheet_comparison'
-                                      and (a['path'].endswith(f"rate_sheet_comparison--{combo_id}.txt")
-                                           or a['path'].endswith(f"rate_sheet_comparison_{combo_id}.txt"))), "")
+        rate_sheet_comp_legacy = combo_text_file('rate_sheet_comparison', '')
         if rate_sheet_comp_legacy and not is_solo:
             rate_sheet_comp_qsos = rate_sheet_comp_legacy
     if not rate_sheet_comp_qsos and not rate_sheet_comp_points and not is_solo:
@@ -2585,27 +2420,16 @@ def qso_dashboard(request, session_id):
 
     # Build rate_sheet_urls dictionary: map display callsigns to their rate sheet paths
     # Rate sheets use format: rate_sheet_qsos--{callsign}.txt (QSO variant); also accept legacy formats
-    from contest_tools.utils.callsign_utils import callsign_to_filename_part
     rate_sheet_urls = {}
     for idx, call_safe in enumerate(callsigns_safe):
         call_display = callsigns_display[idx]
         call_filename_part = callsign_to_filename_part(call_safe)
         rate_sheet_target = f"rate_sheet_qsos--{call_filename_part}.txt"
-        rate_sheet_found = next((f"{report_rel_path}/{a['path']}" for a in artifacts
-                                if a['report_id'] == 'rate_sheet'
-                                and a['path'].endswith(rate_sheet_target)), None)
-        if not rate_sheet_found:
-            rate_sheet_legacy = f"rate_sheet--{call_filename_part}.txt"
-            rate_sheet_found = next((f"{report_rel_path}/{a['path']}" for a in artifacts
-                                    if a['report_id'] == 'rate_sheet'
-                                    and a['path'].endswith(rate_sheet_legacy)), None)
-        if not rate_sheet_found:
-            rate_sheet_old_format = f"rate_sheet_{call_filename_part}.txt"
-            rate_sheet_found = next((f"{report_rel_path}/{a['path']}" for a in artifacts
-                                    if a['report_id'] == 'rate_sheet'
-                                    and a['path'].endswith(rate_sheet_old_format)), None)
-        if rate_sheet_found:
-            rate_sheet_urls[call_display] = rate_sheet_found
+        # QSO variant first; variant '' covers rate_sheet--{call}.txt and the older rate_sheet_{call}.txt
+        rate_sheet_art = (index.find_first('rate_sheet', [call_filename_part], 'txt', variant='qsos')
+                          or index.find_first('rate_sheet', [call_filename_part], 'txt', variant=''))
+        if rate_sheet_art:
+            rate_sheet_urls[call_display] = f"{report_rel_path}/{rate_sheet_art['path']}"
         else:
             logger.warning(f"QSO Dashboard: Expected rate sheet not found for callsign '{call_display}' (safe: '{call_safe}'). Expected: '{rate_sheet_target}' or legacy formats.")
 
@@ -2673,79 +2497,15 @@ def qso_dashboard(request, session_id):
     
     return render(request, 'analyzer/qso_dashboard.html', context)
 
-def download_all_reports(request, session_id):
+def _archive_filename(context: Dict[str, Any]) -> str:
     """
-    Zips the 'reports' directory and original Cabrillo log files for the session.
-    
-    POST: Initiates zip creation with progress tracking. Returns request_id.
-    GET with request_id: Serves the completed zip file.
-    
-    Filename format: YYYY_CONTEST_NAME--callsigns.zip
+    Download filename for the session archive: YYYY_CONTEST_NAME--callsigns.zip
     - Callsigns use filename-safe format (e.g., "5b-yt7aw_k3lr" for "5B/YT7AW" and "K3LR")
     - "/" in callsigns is converted to "-" (e.g., "5B/YT7AW" -> "5b-yt7aw")
     - Multiple callsigns are joined with "_" (e.g., "k3lr_w3lpl")
     - Format uses "--" delimiter to separate contest info from callsigns
-    
-    Structure:
-        - reports/ (all generated reports)
-        - logs/ (original Cabrillo log files)
     """
-    session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id)
-    context_path = os.path.join(session_path, 'dashboard_context.json')
-
-    if not os.path.exists(session_path) or not os.path.exists(context_path):
-        raise Http404("Session or context not found")
-
-    # Handle GET request with request_id (serve file)
-    request_id = request.GET.get('request_id')
-    if request.method == 'GET' and request_id:
-        zip_output_path = os.path.join(session_path, 'archive_temp.zip')
-        if os.path.exists(zip_output_path):
-            # Get filename from context
-            try:
-                with open(context_path, 'r') as f:
-                    context = json.load(f)
-                # report_url_path format: "YYYY/contest_name/event/calls" or "YYYY/contest_name/calls"
-                # Callsigns are always the last part (already filename-safe from build_callsigns_filename_part)
-                path_parts = [p for p in context.get('report_url_path', '').split('/') if p]
-                if len(path_parts) >= 3:
-                    # Has callsigns: format is "YYYY/contest_name/[event/]calls"
-                    year = _sanitize_filename_part(path_parts[0])
-                    contest = _sanitize_filename_part(path_parts[1])
-                    callsigns = path_parts[-1]  # Last part is always callsigns
-                    zip_filename = f"{year}_{contest}--{callsigns}.zip"
-                elif len(path_parts) >= 2:
-                    # No callsigns (shouldn't happen, but handle gracefully)
-                    year = _sanitize_filename_part(path_parts[0])
-                    contest = _sanitize_filename_part(path_parts[1])
-                    zip_filename = f"{year}_{contest}.zip"
-                else:
-                    zip_filename = "contest_reports.zip"
-            except Exception:
-                zip_filename = "contest_reports.zip"
-            
-            # Mark as done
-            _update_progress(request_id, 3, message="Done")
-            
-            # Serve file
-            response = FileResponse(open(zip_output_path, 'rb'), as_attachment=True, filename=zip_filename)
-            return response
-        else:
-            raise Http404("Archive not found")
-
-    # Handle POST request (initiate download) or GET without request_id (backward compat)
-    # Generate request_id if not provided (for POST)
-    if request.method == 'POST':
-        request_id = request.POST.get('request_id') or f"zip_{uuid.uuid4().hex[:12]}"
-    else:
-        # Backward compatibility: direct GET serves file immediately (no progress)
-        request_id = None
-
-    # 1. Get Metadata for Filename
     try:
-        with open(context_path, 'r') as f:
-            context = json.load(f)
-        
         # report_url_path format: "YYYY/contest_name/event/calls" or "YYYY/contest_name/calls"
         # Callsigns are always the last part (already filename-safe from build_callsigns_filename_part)
         path_parts = [p for p in context.get('report_url_path', '').split('/') if p]
@@ -2754,139 +2514,212 @@ def download_all_reports(request, session_id):
             year = _sanitize_filename_part(path_parts[0])
             contest = _sanitize_filename_part(path_parts[1])
             callsigns = path_parts[-1]  # Last part is always callsigns
-            zip_filename = f"{year}_{contest}--{callsigns}.zip"
+            return f"{year}_{contest}--{callsigns}.zip"
         elif len(path_parts) >= 2:
             # No callsigns (shouldn't happen, but handle gracefully)
             year = _sanitize_filename_part(path_parts[0])
             contest = _sanitize_filename_part(path_parts[1])
-            zip_filename = f"{year}_{contest}.zip"
-        else:
-            zip_filename = "contest_reports.zip"
+            return f"{year}_{contest}.zip"
     except Exception:
-        zip_filename = "contest_reports.zip"
+        pass
+    return "contest_reports.zip"
 
-    # 2. Verify Required Directories/Files
-    reports_root = os.path.join(session_path, 'reports')
-    logger.warning("[DIAG] Download All: session_path=%s reports_root=%s exists=%s",
-                  session_path, reports_root, os.path.exists(reports_root))
-    if not os.path.exists(reports_root):
-        logger.error("[DIAG] Download All: reports_dir does not exist: %s", reports_root)
-        raise Http404("No reports found to archive")
 
-    # 3. Find and Count Files
+def _archive_entries(session_path: str, context: Dict[str, Any]) -> List[tuple]:
+    """
+    Lists the (source_path, arcname) entries of the session archive:
+        - reports/ (all generated reports, plus the CTY file used)
+        - logs/ (original Cabrillo log files, plus a custom CTY file if one was uploaded)
+    Entries are sorted so the archive, and its cache key, are reproducible.
+    """
+    entries = []
+
+    # Add reports directory (recursive)
+    reports_dir = os.path.join(session_path, 'reports')
+    for root, dirs, files in os.walk(reports_dir):
+        dirs.sort()
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            # Compressed siblings duplicate their originals
+            if is_precompressed_sibling(file_path):
+                continue
+            # Calculate relative path from session_path
+            entries.append((file_path, os.path.relpath(file_path, session_path)))
+
+    # Add log files to logs/ subdirectory
     log_extensions = ('.log', '.cbr', '.txt')
+    excluded_files = {'dashboard_context.json', 'session_manifest.json'}
     log_files = []
-    excluded_files = {'dashboard_context.json', 'session_manifest.json', 'archive_temp.zip'}
-    
-    if os.path.exists(session_path):
-        for item in os.listdir(session_path):
-            item_path = os.path.join(session_path, item)
-            # Only include files (not directories) with log extensions
-            if os.path.isfile(item_path) and item.lower().endswith(log_extensions):
-                # Exclude known non-log files
-                if item not in excluded_files:
-                    log_files.append((item, item_path))
-    
-    # Count report files
-    report_file_count = 0
-    reports_dir = os.path.join(session_path, 'reports')
-    if os.path.exists(reports_dir):
-        for root, dirs, files in os.walk(reports_dir):
-            report_file_count += len(files)
-    
-    total_file_count = report_file_count + len(log_files)
-    logger.warning("[DIAG] Download All: report_file_count=%d total_file_count=%d",
-                  report_file_count, total_file_count)
-    
-    # Update progress: Step 1 - Zipping
-    if request_id:
-        _update_progress(request_id, 1, message="Zipping...", file_count=total_file_count)
-    
-    # 4. Warning if no log files found
+    for item in sorted(os.listdir(session_path)):
+        item_path = os.path.join(session_path, item)
+        # Only include files (not directories) with log extensions
+        if os.path.isfile(item_path) and item.lower().endswith(log_extensions) and item not in excluded_files:
+            log_files.append((item_path, os.path.join('logs', item)))
     if not log_files:
-        logger.warning(f"download_all_reports: No Cabrillo log files found in session {session_id}. "
-                      f"Expected files with extensions: {log_extensions}")
+        logger.warning(f"download_all_reports: No Cabrillo log files found in session {os.path.basename(session_path)}. "
+                       f"Expected files with extensions: {log_extensions}")
+    entries.extend(log_files)
+
+    # Add CTY file to reports root directory (e.g., reports/YYYY/contest/event/calls/cty_file.dat)
+    cty_dat_path_from_context = context.get('cty_dat_path')
+    if cty_dat_path_from_context and os.path.exists(cty_dat_path_from_context):
+        cty_filename = os.path.basename(cty_dat_path_from_context)
+        report_url_path = context.get('report_url_path', '')
+        # Fallback: place at reports root if path structure unknown
+        arcname = os.path.join('reports', report_url_path, cty_filename) if report_url_path else os.path.join('reports', cty_filename)
+        entries.append((cty_dat_path_from_context, arcname))
     else:
-        logger.info(f"download_all_reports: Found {len(log_files)} log file(s) to include in archive")
+        logger.warning(f"CTY file not found or not specified in context: {cty_dat_path_from_context}")
 
-    # 5. Create Zip Archive using zipfile for more control
-    zip_output_path = os.path.join(session_path, 'archive_temp.zip')
-    
-    try:
-        with zipfile.ZipFile(zip_output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add reports directory (recursive)
-            if os.path.exists(reports_dir):
-                for root, dirs, files in os.walk(reports_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        # Calculate relative path from session_path
-                        arcname = os.path.relpath(file_path, session_path)
-                        zipf.write(file_path, arcname)
-                        logger.debug(f"Added to archive: {arcname}")
-            
-            # Add log files to logs/ subdirectory
-            if log_files:
-                for log_name, log_path in log_files:
-                    # Store in logs/ subdirectory in ZIP
-                    arcname = os.path.join('logs', log_name)
-                    zipf.write(log_path, arcname)
-                    logger.debug(f"Added log to archive: {arcname}")
-            else:
-                # Create empty logs directory marker (optional, but helps with structure)
-                logger.warning(f"Archive created without log files - logs/ directory will be empty")
-            
-            # Add CTY file to reports root directory (e.g., reports/YYYY/contest/event/calls/cty_file.dat)
-            try:
-                cty_dat_path_from_context = context.get('cty_dat_path')
-                if cty_dat_path_from_context and os.path.exists(cty_dat_path_from_context):
-                    cty_filename = os.path.basename(cty_dat_path_from_context)
-                    # Get report_url_path to determine reports subdirectory structure
-                    report_url_path = context.get('report_url_path', '')
-                    if report_url_path:
-                        # Construct path: reports/YYYY/contest/event/calls/cty_file.dat
-                        arcname = os.path.join('reports', report_url_path, cty_filename)
-                    else:
-                        # Fallback: place at reports root if path structure unknown
-                        arcname = os.path.join('reports', cty_filename)
-                    zipf.write(cty_dat_path_from_context, arcname)
-                    logger.debug(f"Added CTY file to archive: {arcname}")
-                else:
-                    logger.warning(f"CTY file not found or not specified in context: {cty_dat_path_from_context}")
-            except Exception as e:
-                logger.warning(f"Could not add CTY file to bundle: {e}")
-            
-            # Add custom CTY file to logs/ subdirectory if custom CTY was used (backward compatibility)
-            try:
-                custom_cty_path_from_context = context.get('custom_cty_path')
-                if custom_cty_path_from_context and os.path.exists(custom_cty_path_from_context):
-                    cty_filename = os.path.basename(custom_cty_path_from_context)
-                    arcname = os.path.join('logs', cty_filename)
-                    zipf.write(custom_cty_path_from_context, arcname)
-                    logger.debug(f"Added custom CTY file to logs subdirectory: {arcname}")
-            except Exception as e:
-                logger.debug(f"Could not add custom CTY file to logs subdirectory: {e}")
-        
-        # Update progress: Step 2 - Downloading (file ready)
-        if request_id:
-            download_url = f"/report/{session_id}/download_all/?request_id={request_id}"
-            _update_progress(request_id, 2, message="Downloading...", file_count=total_file_count, download_url=download_url)
-        
-        # If POST, return request_id. If GET (backward compat), serve file immediately.
-        if request.method == 'POST':
-            return JsonResponse({'request_id': request_id, 'status': 'ready'})
+    # Add custom CTY file to logs/ subdirectory if custom CTY was used (backward compatibility)
+    custom_cty_path_from_context = context.get('custom_cty_path')
+    if custom_cty_path_from_context and os.path.exists(custom_cty_path_from_context):
+        entries.append((custom_cty_path_from_context, os.path.join('logs', os.path.basename(custom_cty_path_from_context))))
+
+    return entries
+
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _iter_file_range(path: str, start: int, length: int, chunk_size: int = 64 * 1024):
+    """Yields length bytes of a file starting at offset start."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(chunk_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def _ranged_file_response(request, path: str, filename: str, etag: str, content_type: str):
+    """
+    Serves a file as an attachment with HTTP Range support (single byte
+    ranges), so interrupted downloads can be resumed. If-Range is honoured
+    against the ETag; multi-range requests get the whole file.
+    """
+    size = os.path.getsize(path)
+    range_header = request.headers.get('Range', '')
+    if_range = request.headers.get('If-Range')
+    match = _RANGE_RE.match(range_header.strip()) if range_header else None
+
+    if match and (not if_range or if_range == etag):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        elif last:
+            start, end = max(size - int(last), 0), size - 1
         else:
-            # Backward compatibility: serve file immediately
-            response = FileResponse(open(zip_output_path, 'rb'), as_attachment=True, filename=zip_filename)
+            start, end = 0, -1
+        if start >= size or end < start:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{size}"
             return response
-        
+        response = StreamingHttpResponse(_iter_file_range(path, start, end - start + 1), status=206,
+                                         content_type=content_type)
+        response['Content-Range'] = f"bytes {start}-{end}/{size}"
+        response['Content-Length'] = str(end - start + 1)
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
+
+
+def _call_after_stream(chunks, on_complete):
+    """Yields the chunks, then calls on_complete; not called if the stream is interrupted."""
+    yield from chunks
+    on_complete()
+
+
+def _serve_archive(request, session_path: str, context: Dict[str, Any], on_complete=None):
+    """
+    Serves the session archive. A complete archive for the same content is
+    cached in the session as archive_<key>.zip and served from disk with
+    Range support. Otherwise the archive is streamed while it is built, and
+    cached for later requests; a Range request with no cached archive builds
+    the cache first, since byte offsets are only known once it exists.
+
+    on_complete, if given, is called once the archive has been written: at
+    once for a cached archive, otherwise after the last streamed chunk.
+    Writing the cache re-measures the session's size for the disk quota.
+    """
+    session_id = os.path.basename(os.path.normpath(session_path))
+    entries = _archive_entries(session_path, context)
+    key = archive_key(entries)
+    etag = f'"{key}"'
+    cache_path = os.path.join(session_path, f"archive_{key}.zip")
+    zip_filename = _archive_filename(context)
+
+    if not os.path.exists(cache_path) and request.headers.get('Range'):
+        write_zip(entries, cache_path)
+        record_session_size(session_id)
+    if os.path.exists(cache_path):
+        if on_complete:
+            on_complete()
+        return _ranged_file_response(request, cache_path, zip_filename, etag, 'application/zip')
+
+    chunks = _call_after_stream(stream_zip(entries, cache_path=cache_path),
+                                lambda: record_session_size(session_id))
+    if on_complete:
+        chunks = _call_after_stream(chunks, on_complete)
+    response = StreamingHttpResponse(chunks, content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="{zip_filename}"'
+    response['ETag'] = etag
+    return response
+
+
+def download_all_reports(request, session_id):
+    """
+    Serves the 'reports' directory and original Cabrillo log files for the
+    session as a ZIP archive (see _archive_filename for the filename format).
+
+    POST: Prepares the download with progress tracking. Returns request_id.
+    GET with request_id: Streams the archive and marks the progress as done
+        once the archive has been written.
+    GET without request_id (backward compat): Streams the archive.
+
+    Structure:
+        - reports/ (all generated reports)
+        - logs/ (original Cabrillo log files)
+    """
+    touch_session(session_id)
+    session_path = os.path.join(settings.MEDIA_ROOT, 'sessions', session_id)
+    context_path = os.path.join(session_path, 'dashboard_context.json')
+
+    if not os.path.exists(session_path) or not os.path.exists(context_path):
+        raise Http404("Session or context not found")
+
+    reports_root = os.path.join(session_path, 'reports')
+    if not os.path.exists(reports_root):
+        logger.error("Download All: reports_dir does not exist: %s", reports_root)
+        raise Http404("No reports found to archive")
+
+    try:
+        with open(context_path, 'r') as f:
+            context = json.load(f)
+    except Exception:
+        context = {}
+
+    if request.method == 'POST':
+        # The archive is streamed by the GET, so preparing it only records progress.
+        request_id = request.POST.get('request_id') or f"zip_{uuid.uuid4().hex[:12]}"
+        file_count = len(_archive_entries(session_path, context))
+        download_url = f"/report/{session_id}/download_all/?request_id={request_id}"
+        _update_progress(request_id, 2, message="Downloading...", file_count=file_count, download_url=download_url)
+        return JsonResponse({'request_id': request_id, 'status': 'ready'})
+
+    request_id = request.GET.get('request_id')
+    # Marked done only once the archive has been written, not when streaming starts
+    on_complete = (lambda: _update_progress(request_id, 3, message="Done")) if request_id else None
+    try:
+        return _serve_archive(request, session_path, context, on_complete=on_complete)
     except Exception as e:
         logger.error(f"Failed to create archive for session {session_id}: {e}")
-        # Clean up partial zip if it exists
-        if os.path.exists(zip_output_path):
-            try:
-                os.remove(zip_output_path)
-            except:
-                pass
         raise Http404("Failed to generate archive")
 
 def help_about(request):
@@ -135,6 +135,16 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Session lifecycle (see analyzer/session_registry.py)
+# Finished sessions not accessed for this long are removed.
+SESSION_MAX_AGE_SECONDS = int(os.environ.get('CLA_SESSION_MAX_AGE', 3600))
+# Total disk budget for finished sessions; least recently used are evicted first. 0 disables.
+SESSION_DISK_QUOTA_MB = int(os.environ.get('CLA_SESSION_QUOTA_MB', 2048))
+# A session in_progress for longer than this was left by a worker that died; it is marked failed. 0 disables.
+SESSION_STALE_IN_PROGRESS_SECONDS = int(os.environ.get('CLA_SESSION_STALE_IN_PROGRESS', 7200))
+# Background janitor period; 0 disables the thread (use 'manage.py cleanup_sessions' from cron instead).
+SESSION_JANITOR_INTERVAL_SECONDS = int(os.environ.get('CLA_SESSION_JANITOR_INTERVAL', 300))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Security: Allow iframes from the same origin (Required for Sub-Page Views)